@@ -0,0 +1,99 @@
+"""Measure reading many archives concurrently from a single event loop.
+
+Run with `uv run python benchmarks/async_streams.py [--archives N] [--members M]`.
+Creates a .tar.gz with M small members, and reads N copies of it concurrently, once
+by wrapping each blocking call in `run_in_executor` by hand, and once with
+`open_archive_async`.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import functools
+import io
+import tarfile
+import time
+
+from archivey import (
+    ArchiveFormat,
+    ContainerFormat,
+    StreamFormat,
+    open_archive,
+    open_archive_async,
+)
+
+TAR_GZ = ArchiveFormat(ContainerFormat.TAR, StreamFormat.GZIP)
+
+
+def _create_tar(count: int) -> bytes:
+    buffer = io.BytesIO()
+    with tarfile.open(fileobj=buffer, mode="w:gz") as tar:
+        for i in range(count):
+            data = f"line {i}\n".encode() * 8000
+            info = tarfile.TarInfo(f"data/file_{i:06d}.txt")
+            info.size = len(data)
+            tar.addfile(info, io.BytesIO(data))
+    return buffer.getvalue()
+
+
+async def _read_with_executor(data: bytes) -> int:
+    loop = asyncio.get_running_loop()
+    archive = await loop.run_in_executor(
+        None,
+        functools.partial(
+            open_archive, io.BytesIO(data), streaming_only=True, format=TAR_GZ
+        ),
+    )
+    members = archive.iter_members_with_streams()
+    total = 0
+    while True:
+        item = await loop.run_in_executor(None, next, members, None)
+        if item is None:
+            break
+        _, stream = item
+        if stream is None:
+            continue
+        while chunk := await loop.run_in_executor(None, stream.read, 4096):
+            total += len(chunk)
+    await loop.run_in_executor(None, archive.close)
+    return total
+
+
+async def _read_with_async_api(data: bytes) -> int:
+    total = 0
+    async with await open_archive_async(
+        io.BytesIO(data), streaming_only=True, format=TAR_GZ
+    ) as archive:
+        async for _, stream in archive.iter_members_with_streams():
+            if stream is None:
+                continue
+            while chunk := await stream.read(4096):
+                total += len(chunk)
+    return total
+
+
+async def _time(read, data: bytes, count: int) -> tuple[float, int]:
+    start = time.perf_counter()
+    totals = await asyncio.gather(*(read(data) for _ in range(count)))
+    return time.perf_counter() - start, sum(totals)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--archives", type=int, default=200)
+    parser.add_argument("--members", type=int, default=100)
+    args = parser.parse_args()
+
+    data = _create_tar(args.members)
+    print(f"{args.archives} concurrent archives with {args.members} members each")
+    for label, read in (
+        ("run_in_executor per call", _read_with_executor),
+        ("open_archive_async", _read_with_async_api),
+    ):
+        elapsed, total = asyncio.run(_time(read, data, args.archives))
+        print(f"  {label:26} {elapsed:7.2f}s  {total / elapsed / 1e6:7.1f} MB/s")
+
+
+if __name__ == "__main__":
+    main()
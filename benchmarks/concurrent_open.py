@@ -0,0 +1,91 @@
+"""Measure reading members of one archive from many threads at once.
+
+Run with `uv run python benchmarks/concurrent_open.py [--members N] [--size S]`.
+Creates a stored .zip and an uncompressed .tar with N members of S bytes, and reads
+all members with 1 to 32 threads sharing a single reader. For the ZIP, the same
+reads are also timed with positional reads disabled, so that all threads share the
+ZipFile's file handle and lock.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import tarfile
+import tempfile
+import time
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+
+from archivey import open_archive
+
+THREAD_COUNTS = (1, 2, 4, 8, 16, 32)
+
+
+def _create_archives(tmpdir: str, count: int, size: int) -> tuple[str, str]:
+    zip_path = os.path.join(tmpdir, "archive.zip")
+    tar_path = os.path.join(tmpdir, "archive.tar")
+    with (
+        zipfile.ZipFile(zip_path, "w", zipfile.ZIP_STORED) as zf,
+        tarfile.open(tar_path, "w") as tar,
+    ):
+        for i in range(count):
+            data = os.urandom(size)
+            name = f"data/file_{i:06d}.bin"
+            zf.writestr(name, data)
+            info = tarfile.TarInfo(name)
+            info.size = size
+            with tempfile.TemporaryFile() as f:
+                f.write(data)
+                f.seek(0)
+                tar.addfile(info, f)
+    return zip_path, tar_path
+
+
+def _read_member(archive, name: str) -> int:
+    total = 0
+    with archive.open(name) as stream:
+        while chunk := stream.read(64 * 1024):
+            total += len(chunk)
+    return total
+
+
+def _time_reads(archive, names: list[str], threads: int) -> tuple[float, int]:
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        total = sum(executor.map(lambda name: _read_member(archive, name), names))
+    return time.perf_counter() - start, total
+
+
+def _run(label: str, path: str, disable_pread: bool = False) -> None:
+    with open_archive(path) as archive:
+        if disable_pread:
+            archive._pread_fd = None
+        names = [m.filename for m in archive.get_members() if m.is_file]
+        print(label)
+        baseline = None
+        for threads in THREAD_COUNTS:
+            elapsed, total = _time_reads(archive, names, threads)
+            baseline = baseline or elapsed
+            print(
+                f"  {threads:3} threads {elapsed:7.2f}s"
+                f"  {total / elapsed / 1e6:8.1f} MB/s  ({baseline / elapsed:4.1f}x)"
+            )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--members", type=int, default=2000)
+    parser.add_argument("--size", type=int, default=256 * 1024)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        zip_path, tar_path = _create_archives(tmpdir, args.members, args.size)
+        print(f"members: {args.members}, {args.size} bytes each")
+        _run("zip, shared file handle", zip_path, disable_pread=True)
+        _run("zip, os.pread", zip_path)
+        _run("tar, os.pread", tar_path)
+
+
+if __name__ == "__main__":
+    main()
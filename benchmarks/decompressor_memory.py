@@ -0,0 +1,132 @@
+"""Measure the peak memory and throughput of small reads from compressed streams.
+
+Run with `uv run python benchmarks/decompressor_memory.py [--size S]
+[--read-size R] [--formats F ...]`.
+Compresses S bytes of highly compressible data (zeros, like a decompression bomb)
+and S bytes of text-like data, and reads each back R bytes at a time through
+`open_compressed_stream()`. Each case runs in a separate process, so that the
+reported peak RSS is its own; the RSS of a process that only imports archivey is
+shown for reference. brotli and lzip are skipped if not installed.
+"""
+
+from __future__ import annotations
+
+import argparse
+import gzip
+import os
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import zlib
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import lzip
+except ImportError:
+    lzip = None
+
+
+def _create_text(size: int) -> bytes:
+    rng = random.Random(0)
+    words = [
+        bytes(rng.choice(b"abcdefghijklmnop") for _ in range(rng.randint(1, 10)))
+        for _ in range(5000)
+    ]
+    data = b" ".join(rng.choice(words) for _ in range(size // 5))
+    return data[:size]
+
+
+def _compressors() -> dict[str, object]:
+    compressors = {"gz": gzip.compress, "zz": zlib.compress}
+    if brotli is not None:
+        compressors["br"] = brotli.compress
+    if lzip is not None:
+        compressors["lz"] = lzip.compress_to_buffer
+    return compressors
+
+
+def _peak_rss_mib() -> float:
+    # ru_maxrss is kept across exec(), so it would include the peak of the parent
+    # process; VmHWM isn't. Both are in KiB.
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _measure(path: str, read_size: int) -> None:
+    """Read the file in this process and print the results, for `main()`."""
+    from archivey.core import open_compressed_stream
+
+    if not path:
+        print(f"0 0 {_peak_rss_mib()}")
+        return
+    start = time.perf_counter()
+    total = 0
+    with open_compressed_stream(path) as stream:
+        while data := stream.read(read_size):
+            total += len(data)
+    print(f"{total} {time.perf_counter() - start} {_peak_rss_mib()}")
+
+
+def _run(path: str, read_size: int) -> tuple[int, float, float]:
+    output = subprocess.run(
+        [sys.executable, __file__, "--measure", path, "--read-size", str(read_size)],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout.split()
+    return int(output[0]), float(output[1]), float(output[2])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size", type=int, default=64 * 1024 * 1024)
+    parser.add_argument("--read-size", type=int, default=64 * 1024)
+    parser.add_argument("--formats", nargs="+", default=None)
+    parser.add_argument("--measure", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.measure is not None:
+        _measure(args.measure, args.read_size)
+        return
+
+    compressors = _compressors()
+    formats = args.formats or list(compressors)
+    _, _, baseline = _run("", args.read_size)
+    print(
+        f"{args.size / 2**20:.0f} MiB, reads of {args.read_size} bytes,"
+        f" baseline RSS {baseline:.1f} MiB"
+    )
+    print(f"  {'':12} {'compressed':>12} {'time':>8} {'MB/s':>8} {'peak RSS':>10}")
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for kind, data in [("zeros", bytes(args.size)), ("text", None)]:
+            if data is None:
+                data = _create_text(args.size)
+            for ext in formats:
+                path = os.path.join(tmpdir, f"{kind}.{ext}")
+                with open(path, "wb") as f:
+                    f.write(compressors[ext](data))
+                total, elapsed, rss = _run(path, args.read_size)
+                assert total == len(data)
+                print(
+                    f"  {kind + ' .' + ext:12} {os.path.getsize(path):12}"
+                    f" {elapsed:7.2f}s {total / elapsed / 1e6:8.1f}"
+                    f" {rss:8.1f} MiB"
+                )
+            del data
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""Measure random reads from members of a .tar.gz and from a large deflated ZIP member.
+
+Run with `uv run python benchmarks/deflate_seek.py [--size S] [--reads N]`.
+Creates a .tar.gz with 64 members totalling S bytes and a .zip with a single member of
+S bytes, and reads N random members (or N random 4 KiB ranges of the ZIP member),
+with decompression checkpoints disabled and with the default interval.
+"""
+
+from __future__ import annotations
+
+import argparse
+import io
+import os
+import random
+import tarfile
+import tempfile
+import time
+import zipfile
+
+from archivey import ArchiveyConfig, open_archive
+
+MEMBERS = 64
+
+
+def _create_archives(tmpdir: str, size: int) -> tuple[str, str]:
+    # Compressible but not trivially so.
+    block = os.urandom(64 * 1024).hex().encode()
+    data = (block * (size // len(block) + 1))[:size]
+
+    tar_path = os.path.join(tmpdir, "archive.tar.gz")
+    member_size = size // MEMBERS
+    with tarfile.open(tar_path, "w:gz", compresslevel=1) as tf:
+        for i in range(MEMBERS):
+            info = tarfile.TarInfo(f"member_{i:02d}.bin")
+            info.size = member_size
+            tf.addfile(info, io.BytesIO(data[i * member_size : (i + 1) * member_size]))
+
+    zip_path = os.path.join(tmpdir, "archive.zip")
+    with zipfile.ZipFile(zip_path, "w", zipfile.ZIP_DEFLATED, compresslevel=1) as zf:
+        zf.writestr("big.bin", data)
+    return tar_path, zip_path
+
+
+def _read_tar_members(path: str, config: ArchiveyConfig, names: list[str]) -> None:
+    with open_archive(path, config=config) as archive:
+        for name in names:
+            archive.open(name).read()
+
+
+def _read_zip_ranges(path: str, config: ArchiveyConfig, offsets: list[int]) -> None:
+    with open_archive(path, config=config) as archive:
+        with archive.open("big.bin") as stream:
+            for offset in offsets:
+                stream.seek(offset)
+                stream.read(4096)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size", type=int, default=256 * 1024 * 1024)
+    parser.add_argument("--reads", type=int, default=50)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    names = [f"member_{rng.randrange(MEMBERS):02d}.bin" for _ in range(args.reads)]
+    offsets = [rng.randrange(args.size - 4096) for _ in range(args.reads)]
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        tar_path, zip_path = _create_archives(tmpdir, args.size)
+        print(f"{args.reads} random reads, {args.size / 2**20:.0f} MiB uncompressed")
+        for interval in (0, ArchiveyConfig().decompression_checkpoint_interval):
+            config = ArchiveyConfig(decompression_checkpoint_interval=interval)
+            label = f"interval={interval}"
+            start = time.perf_counter()
+            _read_tar_members(tar_path, config, names)
+            tar_elapsed = time.perf_counter() - start
+            start = time.perf_counter()
+            _read_zip_ranges(zip_path, config, offsets)
+            zip_elapsed = time.perf_counter() - start
+            print(
+                f"  {label:18} tar.gz members {tar_elapsed:7.2f}s"
+                f"   zip ranges {zip_elapsed:7.2f}s"
+            )
+
+
+if __name__ == "__main__":
+    main()
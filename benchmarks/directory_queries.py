@@ -0,0 +1,70 @@
+"""Compare directory queries with scanning the whole member list.
+
+Run with `uv run python benchmarks/directory_queries.py [--members N]`. Lists one
+directory and globs for files in it, using listdir()/glob() and using a scan over
+get_members(), which is what callers had to do before. The first query also builds
+the directory tree, so its time is reported separately.
+"""
+
+from __future__ import annotations
+
+import argparse
+import fnmatch
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from synthetic_reader import SyntheticReader, unique_names  # noqa: E402
+
+DIRECTORY = "data/00/42"
+PATTERN = "data/00/42/file_*5.bin"
+
+
+def _time(fn, repeat: int = 20) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--members", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    reader = SyntheticReader(unique_names(args.members))
+    members = reader.get_members()
+
+    start = time.perf_counter()
+    reader.stat(DIRECTORY)
+    build = time.perf_counter() - start
+
+    prefix = DIRECTORY + "/"
+    scan_listdir = _time(
+        lambda: [
+            m.filename[len(prefix) :]
+            for m in members
+            if m.filename.startswith(prefix) and "/" not in m.filename[len(prefix) :]
+        ]
+    )
+    scan_glob = _time(
+        lambda: [
+            m.filename for m in members if fnmatch.fnmatchcase(m.filename, PATTERN)
+        ]
+    )
+    listdir = _time(lambda: reader.listdir(DIRECTORY))
+    glob = _time(lambda: reader.glob(PATTERN))
+    reader.close()
+
+    print(f"members:               {args.members}")
+    print(f"build directory tree:  {build * 1e3:10.2f} ms (once)")
+    print(f"scan for listdir:      {scan_listdir * 1e3:10.2f} ms")
+    print(f"listdir():             {listdir * 1e3:10.2f} ms")
+    print(f"scan for glob:         {scan_glob * 1e3:10.2f} ms")
+    print(f"glob():                {glob * 1e3:10.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""Measure link resolution in archives with many hardlinks and symlinks.
+
+Run with `uv run python benchmarks/link_resolution.py [--members N]`. Registers N
+synthetic members, like a container image layer: a third are files, a third are
+hardlinks to them, and a third are symlinks to the hardlinks through a chain of
+two other symlinks. Then resolves every link twice, which is what extraction does.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from synthetic_reader import SyntheticReader, make_member  # noqa: E402
+
+from archivey.types import ArchiveMember, MemberType  # noqa: E402
+
+
+def _make_link_member(name: str, i: int) -> ArchiveMember:
+    member = make_member(name, i)
+    kind, _, target = name.partition(":")
+    if kind == "hardlink":
+        member.type = MemberType.HARDLINK
+        member.link_target = target
+    elif kind.startswith("symlink"):
+        member.type = MemberType.SYMLINK
+        member.link_target = target
+    else:
+        return member
+    member.filename = f"{kind}/{i:08d}"
+    return member
+
+
+def _names(count: int) -> list[str]:
+    files = count // 3
+    names = [f"files/{i:08d}" for i in range(files)]
+    names += [f"hardlink:files/{i:08d}" for i in range(files)]
+    # Each symlink points to the previous one, and the first one to a hardlink.
+    for i in range(count - 2 * files):
+        names.append(
+            f"symlink:../hardlink/{files + i:08d}"
+            if i % 3 == 0
+            else f"symlink:{2 * files + i - 1:08d}"
+        )
+    return names
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--members", type=int, default=600_000)
+    args = parser.parse_args()
+
+    reader = SyntheticReader(iter(_names(args.members)), _make_link_member)
+    links = [m for m in reader.get_members() if m.is_link]
+
+    for label in ("first pass", "second pass"):
+        start = time.perf_counter()
+        resolved = [reader.resolve_link(m) for m in links]
+        elapsed = time.perf_counter() - start
+        assert all(m is not None and m.is_file for m in resolved)
+        print(
+            f"{label}: {len(links)} links in {elapsed:6.2f}s"
+            f"  {elapsed / len(links) * 1e9:7.0f} ns/link"
+        )
+    reader.close()
+
+
+if __name__ == "__main__":
+    main()
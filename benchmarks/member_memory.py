@@ -0,0 +1,66 @@
+"""Measure the memory used per registered archive member.
+
+Run with `uv run python benchmarks/member_memory.py [--members N]`. Reports the
+bytes allocated per member for the ArchiveMember objects themselves and for the
+lookup structures kept by BaseArchiveReader, and checks that get_members() doesn't
+copy the member list.
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from synthetic_reader import SyntheticReader, make_member, unique_names  # noqa: E402
+
+
+def _measure(fn):
+    gc.collect()
+    tracemalloc.start()
+    try:
+        result = fn()
+        gc.collect()
+        current, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, current
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--members", type=int, default=200_000)
+    args = parser.parse_args()
+    n = args.members
+
+    names = list(unique_names(n))
+    names_size = sum(sys.getsizeof(name) for name in names)
+
+    members, members_bytes = _measure(
+        lambda: [make_member(name, i) for i, name in enumerate(names)]
+    )
+    del members
+
+    reader, reader_bytes = _measure(
+        lambda: (r := SyntheticReader(iter(names)), r.get_members())[0]
+    )
+
+    _, get_members_bytes = _measure(reader.get_members)
+    reader.close()
+
+    print(f"members:                      {n}")
+    print(f"name strings (not included):  {names_size / n:8.1f} bytes/member")
+    print(f"ArchiveMember objects:        {members_bytes / n:8.1f} bytes/member")
+    print(f"registered in a reader:       {reader_bytes / n:8.1f} bytes/member")
+    print(
+        f"  of which reader indexes:    {(reader_bytes - members_bytes) / n:8.1f} bytes/member"
+    )
+    print(f"get_members() call:           {get_members_bytes / n:8.1f} bytes/member")
+
+
+if __name__ == "__main__":
+    main()
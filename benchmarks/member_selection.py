@@ -0,0 +1,78 @@
+"""Measure streaming iteration over a few members of large archives.
+
+Run with `uv run python benchmarks/member_selection.py [--members N]`. Creates a
+temporary .tar.gz and .zip with N small files each, and iterates over them in
+streaming mode selecting 1% of the files, once with an equivalent lambda predicate
+and once with a MemberSelection, which lets the reader skip building members for the
+other files.
+"""
+
+from __future__ import annotations
+
+import argparse
+import io
+import os
+import tarfile
+import tempfile
+import time
+import zipfile
+
+from archivey import MemberSelection, open_archive
+
+
+def _name(i: int) -> str:
+    return f"data/{i // 1000:04d}/file_{i:08d}.bin"
+
+
+def _create_tar(path: str, count: int) -> None:
+    with tarfile.open(path, "w:gz", compresslevel=1) as tar:
+        for i in range(count):
+            info = tarfile.TarInfo(_name(i))
+            info.size = 16
+            info.mtime = 1_700_000_000
+            tar.addfile(info, io.BytesIO(bytes(16)))
+
+
+def _create_zip(path: str, count: int) -> None:
+    with zipfile.ZipFile(path, "w") as zf:
+        for i in range(count):
+            zf.writestr(_name(i), bytes(16))
+
+
+def _time_iteration(path: str, members) -> tuple[float, int]:
+    start = time.perf_counter()
+    count = 0
+    with open_archive(path, streaming_only=True) as archive:
+        for _, stream in archive.iter_members_with_streams(members):
+            if stream is not None:
+                stream.read()
+            count += 1
+    return time.perf_counter() - start, count
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--members", type=int, default=200_000)
+    args = parser.parse_args()
+
+    print(f"members: {args.members} ({args.members // 100} selected)")
+    for extension, create in ((".tar.gz", _create_tar), (".zip", _create_zip)):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "archive" + extension)
+            create(path, args.members)
+
+            lambda_time, lambda_count = _time_iteration(
+                path, lambda m: m.filename.endswith("00.bin")
+            )
+            selection_time, selection_count = _time_iteration(
+                path, MemberSelection(patterns=["data/*/*00.bin"])
+            )
+            assert lambda_count == selection_count == args.members // 100
+
+        print(extension)
+        print(f"  lambda predicate:  {lambda_time:7.2f}s")
+        print(f"  MemberSelection:   {selection_time:7.2f}s")
+
+
+if __name__ == "__main__":
+    main()
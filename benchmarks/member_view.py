@@ -0,0 +1,60 @@
+"""Compare `open().read()` and `read_member_view()` on large stored ZIP members.
+
+Run with `uv run python benchmarks/member_view.py [--members N] [--size S]`.
+Creates a stored .zip with N members of S bytes, and loads each member once with
+each method, reading a byte from every page of the result so that the mapped pages
+are actually loaded.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import tempfile
+import time
+import zipfile
+
+from archivey import open_archive
+
+
+def _create_zip(path: str, count: int, size: int) -> None:
+    block = os.urandom(1024 * 1024)
+    data = (block * (size // len(block) + 1))[:size]
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_STORED) as zf:
+        for i in range(count):
+            zf.writestr(f"blobs/blob_{i:03d}.bin", data)
+
+
+def _touch_pages(data: bytes | memoryview) -> int:
+    return sum(data[i] for i in range(0, len(data), 4096))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--members", type=int, default=8)
+    parser.add_argument("--size", type=int, default=128 * 1024 * 1024)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, "blobs.zip")
+        _create_zip(path, args.members, args.size)
+        total = args.members * args.size
+        print(f"{args.members} stored members of {args.size / 2**20:.0f} MiB")
+
+        with open_archive(path) as archive:
+            names = [m.filename for m in archive.get_members() if m.is_file]
+            for label, load in (
+                ("open().read()", lambda name: archive.open(name).read()),
+                ("read_member_view()", archive.read_member_view),
+            ):
+                start = time.perf_counter()
+                for name in names:
+                    _touch_pages(load(name))
+                elapsed = time.perf_counter() - start
+                print(
+                    f"  {label:20} {elapsed:7.2f}s  {total / elapsed / 1e9:6.2f} GB/s"
+                )
+
+
+if __name__ == "__main__":
+    main()
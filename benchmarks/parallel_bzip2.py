@@ -0,0 +1,79 @@
+"""Compare bzip2 decompression throughput of the available backends.
+
+Run with `uv run python benchmarks/parallel_bzip2.py [--size S] [--threads T ...]`.
+Compresses S bytes of text-like data into a .bz2 file and reads it back through
+`open_compressed_stream()` with the builtin bz2 module, with the parallel bz2 backend
+(`decompression_threads`) for each thread count, and with indexed_bzip2 if it is
+installed. Each time is the best of 3 runs.
+"""
+
+from __future__ import annotations
+
+import argparse
+import bz2
+import os
+import random
+import tempfile
+import time
+
+from archivey import ArchiveyConfig
+from archivey.core import open_compressed_stream
+
+try:
+    import indexed_bzip2
+except ImportError:
+    indexed_bzip2 = None
+
+
+def _create_data(size: int) -> bytes:
+    rng = random.Random(0)
+    words = [
+        bytes(rng.choice(b"abcdefghijklmnop") for _ in range(rng.randint(1, 10)))
+        for _ in range(5000)
+    ]
+    data = b" ".join(rng.choice(words) for _ in range(size // 5))
+    return data[:size]
+
+
+def _time_read(path: str, config: ArchiveyConfig) -> float:
+    start = time.perf_counter()
+    with open_compressed_stream(path, config=config) as stream:
+        while stream.read(1024 * 1024):
+            pass
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size", type=int, default=64 * 1024 * 1024)
+    parser.add_argument(
+        "--threads", type=int, nargs="+", default=[1, 2, 4, os.cpu_count() or 1]
+    )
+    args = parser.parse_args()
+
+    data = _create_data(args.size)
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, "data.bz2")
+        with open(path, "wb") as f:
+            f.write(bz2.compress(data, 9))
+
+        cases = [("bz2", ArchiveyConfig())]
+        for threads in sorted(set(args.threads)):
+            config = ArchiveyConfig(decompression_threads=threads)
+            cases.append((f"parallel bz2, {threads} threads", config))
+        if indexed_bzip2 is not None:
+            cases.append(("indexed_bzip2", ArchiveyConfig(use_indexed_bzip2=True)))
+
+        print(
+            f"{len(data) / 2**20:.0f} MiB, {os.path.getsize(path) / 2**20:.1f} MiB"
+            f" compressed, {os.cpu_count()} CPUs"
+        )
+        for label, config in cases:
+            elapsed = min(_time_read(path, config) for _ in range(3))
+            print(
+                f"  {label:28} {elapsed:7.2f}s  {len(data) / elapsed / 1e6:7.1f} MB/s"
+            )
+
+
+if __name__ == "__main__":
+    main()
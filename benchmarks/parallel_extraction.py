@@ -0,0 +1,64 @@
+"""Measure extractall() on a ZIP archive with worker threads and processes.
+
+Run with `uv run python benchmarks/parallel_extraction.py [--members N] [--size S]`.
+Creates a temporary deflated .zip with N members of compressible data with sizes
+up to S bytes, and extracts it sequentially and with 4 worker threads or processes.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import tempfile
+import time
+import zipfile
+
+from archivey import open_archive
+
+
+def _create_zip(path: str, count: int, max_size: int) -> None:
+    rng = random.Random(0)
+    words = [bytes(rng.choices(b"abcdefghij", k=8)) for _ in range(256)]
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as zf:
+        for i in range(count):
+            size = int(max_size * rng.random() ** 4)
+            data = b" ".join(rng.choices(words, k=size // 9 + 1))[:size]
+            zf.writestr(f"data/{i // 1000:04d}/file_{i:06d}.txt", data)
+
+
+def _time_extraction(path: str, dest: str, **kwargs) -> tuple[float, int]:
+    start = time.perf_counter()
+    with open_archive(path) as archive:
+        extracted = archive.extractall(dest, **kwargs)
+    return time.perf_counter() - start, len(extracted)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--members", type=int, default=20_000)
+    parser.add_argument("--size", type=int, default=256 * 1024)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, "archive.zip")
+        _create_zip(path, args.members, args.size)
+
+        print(f"members: {args.members}, up to {args.size} bytes")
+        baseline = None
+        for label, kwargs in (
+            ("sequential", {}),
+            ("4 threads", {"workers": 4}),
+            ("4 processes", {"workers": 4, "executor": "process"}),
+        ):
+            dest = tempfile.mkdtemp(dir=tmpdir)
+            elapsed, count = _time_extraction(path, dest, **kwargs)
+            baseline = baseline or elapsed
+            print(
+                f"  {label:12} {elapsed:7.2f}s  ({baseline / elapsed:4.1f}x)"
+                f"  {count} paths"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""Compare decompression throughput of multi-member .gz files across backends.
+
+Run with `uv run python benchmarks/parallel_gzip.py [--size S] [--member-size M]
+[--threads T ...]`.
+Compresses S bytes of text-like data into a .gz file with a member every M bytes
+(like bgzip or an appending log writer), and reads it through
+`open_compressed_stream()` with the zlib-based gzip stream, with the parallel backend
+(`decompression_threads`) for each thread count, both from the file and from a
+non-seekable pipe-like stream, and with rapidgzip if it is installed. Each time is
+the best of 3 runs.
+"""
+
+from __future__ import annotations
+
+import argparse
+import gzip
+import io
+import os
+import random
+import tempfile
+import time
+from typing import BinaryIO
+
+from archivey import ArchiveyConfig
+from archivey.core import open_compressed_stream
+
+try:
+    import rapidgzip
+except ImportError:
+    rapidgzip = None
+
+
+class _NonSeekableReader(io.RawIOBase):
+    """A file that can only be read sequentially, like a pipe."""
+
+    def __init__(self, f: BinaryIO):
+        self._f = f
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, b) -> int:
+        return self._f.readinto(b)
+
+
+def _create_data(size: int) -> bytes:
+    rng = random.Random(0)
+    words = [
+        bytes(rng.choice(b"abcdefghijklmnop") for _ in range(rng.randint(1, 10)))
+        for _ in range(5000)
+    ]
+    data = b" ".join(rng.choice(words) for _ in range(size // 5))
+    return data[:size]
+
+
+def _time_read(path: str, config: ArchiveyConfig, seekable: bool) -> float:
+    start = time.perf_counter()
+    with open(path, "rb") as f:
+        source = f if seekable else io.BufferedReader(_NonSeekableReader(f))
+        with open_compressed_stream(source, config=config) as stream:
+            while stream.read(1024 * 1024):
+                pass
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size", type=int, default=64 * 1024 * 1024)
+    parser.add_argument("--member-size", type=int, default=1024 * 1024)
+    parser.add_argument(
+        "--threads", type=int, nargs="+", default=[1, 2, 4, os.cpu_count() or 1]
+    )
+    args = parser.parse_args()
+
+    data = _create_data(args.size)
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, "data.gz")
+        with open(path, "wb") as f:
+            f.writelines(
+                gzip.compress(data[i : i + args.member_size], mtime=0)
+                for i in range(0, len(data), args.member_size)
+            )
+
+        cases = [("zlib", ArchiveyConfig(), True)]
+        for threads in sorted(set(args.threads)):
+            config = ArchiveyConfig(decompression_threads=threads)
+            cases.append((f"parallel zlib, {threads} threads", config, True))
+            cases.append(("  non-seekable", config, False))
+        if rapidgzip is not None:
+            cases.append(("rapidgzip", ArchiveyConfig(use_rapidgzip=True), True))
+
+        print(
+            f"{len(data) / 2**20:.0f} MiB in members of"
+            f" {args.member_size / 2**20:.1f} MiB,"
+            f" {os.path.getsize(path) / 2**20:.1f} MiB compressed, {os.cpu_count()} CPUs"
+        )
+        for label, config, seekable in cases:
+            elapsed = min(_time_read(path, config, seekable) for _ in range(3))
+            print(
+                f"  {label:30} {elapsed:7.2f}s  {len(data) / elapsed / 1e6:7.1f} MB/s"
+            )
+
+
+if __name__ == "__main__":
+    main()
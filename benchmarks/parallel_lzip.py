@@ -0,0 +1,94 @@
+"""Compare sequential and random-access reads of multi-member .lz files.
+
+Run with `uv run python benchmarks/parallel_lzip.py [--size S] [--member-size M]
+[--threads T ...] [--seeks N]`.
+Compresses S bytes of text-like data into an .lz file with a member every M bytes
+(like the output of plzip), and reads it through `open_compressed_stream()` with the
+lzip package, sequentially and with the parallel backend (`decompression_threads`)
+for each thread count. Then reads 4 KiB at N random positions. Each time is the best
+of 3 runs.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import tempfile
+import time
+
+import lzip
+
+from archivey import ArchiveyConfig
+from archivey.core import open_compressed_stream
+
+
+def _create_data(size: int) -> bytes:
+    rng = random.Random(0)
+    words = [
+        bytes(rng.choice(b"abcdefghijklmnop") for _ in range(rng.randint(1, 10)))
+        for _ in range(5000)
+    ]
+    data = b" ".join(rng.choice(words) for _ in range(size // 5))
+    return data[:size]
+
+
+def _time_read(path: str, config: ArchiveyConfig) -> float:
+    start = time.perf_counter()
+    with open_compressed_stream(path, config=config) as stream:
+        while stream.read(1024 * 1024):
+            pass
+    return time.perf_counter() - start
+
+
+def _time_seeks(path: str, config: ArchiveyConfig, positions: list[int]) -> float:
+    start = time.perf_counter()
+    with open_compressed_stream(path, config=config) as stream:
+        for pos in positions:
+            stream.seek(pos)
+            stream.read(4096)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size", type=int, default=64 * 1024 * 1024)
+    parser.add_argument("--member-size", type=int, default=2 * 1024 * 1024)
+    parser.add_argument(
+        "--threads", type=int, nargs="+", default=[1, 2, 4, os.cpu_count() or 1]
+    )
+    parser.add_argument("--seeks", type=int, default=20)
+    args = parser.parse_args()
+
+    data = _create_data(args.size)
+    positions = [random.randrange(len(data)) for _ in range(args.seeks)]
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, "data.lz")
+        with open(path, "wb") as f:
+            f.writelines(
+                lzip.compress_to_buffer(data[i : i + args.member_size], level=6)
+                for i in range(0, len(data), args.member_size)
+            )
+
+        cases = [("lzip", ArchiveyConfig())]
+        for threads in sorted(set(args.threads)):
+            config = ArchiveyConfig(decompression_threads=threads)
+            cases.append((f"parallel lzip, {threads} threads", config))
+
+        print(
+            f"{len(data) / 2**20:.0f} MiB in members of {args.member_size / 2**20:.0f}"
+            f" MiB, {os.path.getsize(path) / 2**20:.1f} MiB compressed,"
+            f" {os.cpu_count()} CPUs"
+        )
+        print(f"  {'':30} {'read':>8} {'MB/s':>8} {f'{args.seeks} seeks':>10}")
+        for label, config in cases:
+            elapsed = min(_time_read(path, config) for _ in range(3))
+            seeks = min(_time_seeks(path, config, positions) for _ in range(3))
+            print(
+                f"  {label:30} {elapsed:7.2f}s {len(data) / elapsed / 1e6:8.1f}"
+                f" {seeks:9.2f}s"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""Compare sequential and random-access reads of multi-block .xz files across backends.
+
+Run with `uv run python benchmarks/parallel_xz.py [--size S] [--block-size B]
+[--threads T ...] [--seeks N]`.
+Compresses S bytes of text-like data into an .xz file with a block every B bytes
+(as separate streams, like concatenated `xz -T0` outputs), and reads it through
+`open_compressed_stream()` with the builtin lzma module, with the parallel lzma
+backend (`decompression_threads`) for each thread count, and with python-xz if it is
+installed. Then reads 4 KiB at N random positions. Each time is the best of 3 runs.
+"""
+
+from __future__ import annotations
+
+import argparse
+import lzma
+import os
+import random
+import tempfile
+import time
+
+from archivey import ArchiveyConfig
+from archivey.core import open_compressed_stream
+
+try:
+    import xz
+except ImportError:
+    xz = None
+
+
+def _create_data(size: int) -> bytes:
+    rng = random.Random(0)
+    words = [
+        bytes(rng.choice(b"abcdefghijklmnop") for _ in range(rng.randint(1, 10)))
+        for _ in range(5000)
+    ]
+    data = b" ".join(rng.choice(words) for _ in range(size // 5))
+    return data[:size]
+
+
+def _time_read(path: str, config: ArchiveyConfig) -> float:
+    start = time.perf_counter()
+    with open_compressed_stream(path, config=config) as stream:
+        while stream.read(1024 * 1024):
+            pass
+    return time.perf_counter() - start
+
+
+def _time_seeks(path: str, config: ArchiveyConfig, positions: list[int]) -> float:
+    start = time.perf_counter()
+    with open_compressed_stream(path, config=config) as stream:
+        for pos in positions:
+            stream.seek(pos)
+            stream.read(4096)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size", type=int, default=64 * 1024 * 1024)
+    parser.add_argument("--block-size", type=int, default=4 * 1024 * 1024)
+    parser.add_argument(
+        "--threads", type=int, nargs="+", default=[1, 2, 4, os.cpu_count() or 1]
+    )
+    parser.add_argument("--seeks", type=int, default=20)
+    args = parser.parse_args()
+
+    data = _create_data(args.size)
+    positions = [random.randrange(len(data)) for _ in range(args.seeks)]
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, "data.xz")
+        with open(path, "wb") as f:
+            f.writelines(
+                lzma.compress(data[i : i + args.block_size])
+                for i in range(0, len(data), args.block_size)
+            )
+
+        cases = [("lzma", ArchiveyConfig())]
+        for threads in sorted(set(args.threads)):
+            config = ArchiveyConfig(decompression_threads=threads)
+            cases.append((f"parallel lzma, {threads} threads", config))
+        if xz is not None:
+            cases.append(("python-xz", ArchiveyConfig(use_python_xz=True)))
+
+        print(
+            f"{len(data) / 2**20:.0f} MiB in blocks of {args.block_size / 2**20:.0f}"
+            f" MiB, {os.path.getsize(path) / 2**20:.1f} MiB compressed,"
+            f" {os.cpu_count()} CPUs"
+        )
+        print(f"  {'':30} {'read':>8} {'MB/s':>8} {f'{args.seeks} seeks':>10}")
+        for label, config in cases:
+            elapsed = min(_time_read(path, config) for _ in range(3))
+            seeks = min(_time_seeks(path, config, positions) for _ in range(3))
+            print(
+                f"  {label:30} {elapsed:7.2f}s {len(data) / elapsed / 1e6:8.1f}"
+                f" {seeks:9.2f}s"
+            )
+
+
+if __name__ == "__main__":
+    main()
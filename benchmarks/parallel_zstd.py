@@ -0,0 +1,121 @@
+"""Compare sequential and random-access reads of multi-frame .zst files.
+
+Run with `uv run python benchmarks/parallel_zstd.py [--size S] [--frame-size F]
+[--threads T ...] [--seeks N]`.
+Compresses S bytes of text-like data into a .zst file with a frame every F bytes,
+and reads it through `open_compressed_stream()` with pyzstd and zstandard (whichever
+are installed), sequentially and with the parallel backend (`decompression_threads`)
+for each thread count. Then reads 4 KiB at N random positions. Each time is the best
+of 3 runs.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from archivey import ArchiveyConfig
+from archivey.core import open_compressed_stream
+
+try:
+    import pyzstd
+except ImportError:
+    pyzstd = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+def _create_data(size: int) -> bytes:
+    rng = random.Random(0)
+    words = [
+        bytes(rng.choice(b"abcdefghijklmnop") for _ in range(rng.randint(1, 10)))
+        for _ in range(5000)
+    ]
+    data = b" ".join(rng.choice(words) for _ in range(size // 5))
+    return data[:size]
+
+
+def _compress(data: bytes, frame_size: int) -> bytes:
+    if pyzstd is not None:
+        compress = pyzstd.compress
+    else:
+        compress = zstandard.ZstdCompressor().compress
+    return b"".join(
+        compress(data[i : i + frame_size]) for i in range(0, len(data), frame_size)
+    )
+
+
+def _time_read(path: str, config: ArchiveyConfig) -> float:
+    start = time.perf_counter()
+    with open_compressed_stream(path, config=config) as stream:
+        while stream.read(1024 * 1024):
+            pass
+    return time.perf_counter() - start
+
+
+def _time_seeks(path: str, config: ArchiveyConfig, positions: list[int]) -> float:
+    start = time.perf_counter()
+    with open_compressed_stream(path, config=config) as stream:
+        for pos in positions:
+            stream.seek(pos)
+            stream.read(4096)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size", type=int, default=64 * 1024 * 1024)
+    parser.add_argument("--frame-size", type=int, default=4 * 1024 * 1024)
+    parser.add_argument(
+        "--threads", type=int, nargs="+", default=[1, 2, 4, os.cpu_count() or 1]
+    )
+    parser.add_argument("--seeks", type=int, default=20)
+    args = parser.parse_args()
+
+    if pyzstd is None and zstandard is None:
+        parser.error("pyzstd or zstandard must be installed")
+
+    data = _create_data(args.size)
+    positions = [random.randrange(len(data)) for _ in range(args.seeks)]
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, "data.zst")
+        with open(path, "wb") as f:
+            f.write(_compress(data, args.frame_size))
+
+        cases = []
+        for name, use_zstandard, module in [
+            ("pyzstd", False, pyzstd),
+            ("zstandard", True, zstandard),
+        ]:
+            if module is None:
+                continue
+            cases.append((name, ArchiveyConfig(use_zstandard=use_zstandard)))
+            for threads in sorted(set(args.threads)):
+                config = ArchiveyConfig(
+                    use_zstandard=use_zstandard, decompression_threads=threads
+                )
+                cases.append((f"parallel {name}, {threads} threads", config))
+
+        print(
+            f"{len(data) / 2**20:.0f} MiB in frames of {args.frame_size / 2**20:.0f}"
+            f" MiB, {os.path.getsize(path) / 2**20:.1f} MiB compressed,"
+            f" {os.cpu_count()} CPUs"
+        )
+        print(f"  {'':34} {'read':>8} {'MB/s':>8} {f'{args.seeks} seeks':>10}")
+        for label, config in cases:
+            elapsed = min(_time_read(path, config) for _ in range(3))
+            seeks = min(_time_seeks(path, config, positions) for _ in range(3))
+            print(
+                f"  {label:34} {elapsed:7.2f}s {len(data) / elapsed / 1e6:8.1f}"
+                f" {seeks:9.2f}s"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""Measure iteration over a ZIP archive with members decompressed by worker threads.
+
+Run with `uv run python benchmarks/prefetch_iteration.py [--members N] [--size S]`.
+Creates a temporary deflated .zip with N members of S bytes of compressible data,
+and reads every member with `iter_members_with_streams`, first on the caller's
+thread and then with an increasing number of workers.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import tempfile
+import time
+import zipfile
+
+from archivey import open_archive
+
+
+def _create_zip(path: str, count: int, size: int) -> None:
+    rng = random.Random(0)
+    words = [bytes(rng.choices(b"abcdefghij", k=8)) for _ in range(256)]
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as zf:
+        for i in range(count):
+            data = b" ".join(rng.choices(words, k=size // 9 + 1))[:size]
+            zf.writestr(f"data/file_{i:06d}.txt", data)
+
+
+def _time_iteration(path: str, workers: int | None) -> tuple[float, int]:
+    start = time.perf_counter()
+    total = 0
+    with open_archive(path) as archive:
+        for _, stream in archive.iter_members_with_streams(workers=workers):
+            if stream is not None:
+                total += len(stream.read())
+    return time.perf_counter() - start, total
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--members", type=int, default=2_000)
+    parser.add_argument("--size", type=int, default=256 * 1024)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, "archive.zip")
+        _create_zip(path, args.members, args.size)
+
+        print(f"members: {args.members} x {args.size} bytes")
+        baseline, expected_total = _time_iteration(path, None)
+        print(f"  sequential:  {baseline:7.2f}s")
+        for workers in (2, 4, 8):
+            elapsed, total = _time_iteration(path, workers)
+            assert total == expected_total
+            print(
+                f"  workers={workers}:   {elapsed:7.2f}s  ({baseline / elapsed:4.1f}x)"
+            )
+
+
+if __name__ == "__main__":
+    main()
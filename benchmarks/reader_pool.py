@@ -0,0 +1,73 @@
+"""Measure serving single members out of many archives, with and without a pool.
+
+Run with `uv run python benchmarks/reader_pool.py [--archives N] [--members M]`.
+Creates N .zip files with M small members each, and reads random members from random
+archives, once opening the archive for each read and once through an
+`ArchiveReaderPool`.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import tempfile
+import time
+import zipfile
+
+from archivey import ArchiveReaderPool, open_archive
+
+
+def _create_zips(tmpdir: str, count: int, members: int) -> list[str]:
+    paths = []
+    for i in range(count):
+        path = os.path.join(tmpdir, f"archive_{i:04d}.zip")
+        with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as zf:
+            for j in range(members):
+                zf.writestr(f"data/file_{j:05d}.txt", f"member {j}\n" * 20)
+        paths.append(path)
+    return paths
+
+
+def _read_member(archive, name: str) -> int:
+    with archive.open(name) as stream:
+        return len(stream.read())
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--archives", type=int, default=50)
+    parser.add_argument("--members", type=int, default=2000)
+    parser.add_argument("--reads", type=int, default=2000)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    with tempfile.TemporaryDirectory() as tmpdir:
+        paths = _create_zips(tmpdir, args.archives, args.members)
+        requests = [
+            (rng.choice(paths), f"data/file_{rng.randrange(args.members):05d}.txt")
+            for _ in range(args.reads)
+        ]
+        print(
+            f"{args.reads} reads from {args.archives} archives"
+            f" with {args.members} members each"
+        )
+
+        start = time.perf_counter()
+        for path, name in requests:
+            with open_archive(path) as archive:
+                _read_member(archive, name)
+        baseline = time.perf_counter() - start
+        print(f"  open_archive per read  {baseline:7.2f}s")
+
+        with ArchiveReaderPool() as pool:
+            start = time.perf_counter()
+            for path, name in requests:
+                with pool.open(path) as archive:
+                    _read_member(archive, name)
+            elapsed = time.perf_counter() - start
+        print(f"  ArchiveReaderPool      {elapsed:7.2f}s  ({baseline / elapsed:4.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
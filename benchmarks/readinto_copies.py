@@ -0,0 +1,118 @@
+"""Estimate how many times the stream wrappers copy each byte they deliver.
+
+Run with `uv run python benchmarks/readinto_copies.py [--size S] [--chunk C]`.
+Reads S bytes of in-memory data through each wrapper with `readinto()` into a reused
+buffer of C bytes, and with `read(C)`. With large chunks, the Python call overhead is
+negligible, so the time per byte divided by the time of a single `memcpy` of the same
+data approximates the number of copies per byte delivered (reading from a `BytesIO`
+is one copy).
+"""
+
+from __future__ import annotations
+
+import argparse
+import io
+import os
+import time
+import zlib
+from typing import Any, Callable
+
+from archivey.formats.compressed_streams import ZlibDecompressorStream
+from archivey.internal.archive_stream import ArchiveStream
+from archivey.internal.io_helpers import (
+    ConcatenationStream,
+    IOStats,
+    RecordableStream,
+    SlicingStream,
+    StatsIO,
+)
+
+
+def _archive_stream(inner: Any) -> ArchiveStream:
+    return ArchiveStream(
+        open_fn=lambda: inner,
+        exception_translator=lambda e: None,
+        lazy=False,
+        archive_path=None,
+        member_name="member",
+        seekable=False,
+    )
+
+
+def _time_readinto(stream: Any, chunk: int) -> float:
+    buf = memoryview(bytearray(chunk))
+    start = time.perf_counter()
+    while stream.readinto(buf):
+        pass
+    return time.perf_counter() - start
+
+
+def _time_read(stream: Any, chunk: int) -> float:
+    start = time.perf_counter()
+    while stream.read(chunk):
+        pass
+    return time.perf_counter() - start
+
+
+def _time_memcpy(data: bytes, chunk: int) -> float:
+    buf = memoryview(bytearray(chunk))
+    view = memoryview(data)
+    start = time.perf_counter()
+    for i in range(0, len(data), chunk):
+        part = view[i : i + chunk]
+        buf[: len(part)] = part
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size", type=int, default=256 * 1024 * 1024)
+    parser.add_argument("--chunk", type=int, default=1024 * 1024)
+    args = parser.parse_args()
+
+    data = os.urandom(1024 * 1024) * (args.size // (1024 * 1024))
+    compressed = zlib.compress(data, 1)
+    half = len(data) // 2
+
+    stacks: list[tuple[str, Callable[[], Any]]] = [
+        ("BytesIO", lambda: io.BytesIO(data)),
+        ("SlicingStream", lambda: SlicingStream(io.BytesIO(data))),
+        (
+            "ConcatenationStream",
+            lambda: ConcatenationStream(
+                [io.BytesIO(data[:half]), io.BytesIO(data[half:])]
+            ),
+        ),
+        ("RecordableStream", lambda: RecordableStream(io.BytesIO(data))),
+        ("StatsIO", lambda: StatsIO(io.BytesIO(data), IOStats())),
+        ("ArchiveStream", lambda: _archive_stream(io.BytesIO(data))),
+        (
+            "ArchiveStream(Slicing(Stats))",
+            lambda: _archive_stream(
+                SlicingStream(StatsIO(io.BytesIO(data), IOStats()))
+            ),
+        ),
+    ]
+
+    memcpy = min(_time_memcpy(data, args.chunk) for _ in range(3))
+    print(
+        f"{len(data) / 2**20:.0f} MiB in {args.chunk} byte chunks,"
+        f" memcpy {len(data) / memcpy / 1e9:.2f} GB/s"
+    )
+    print(f"  {'stream':32} {'readinto copies':>16} {'read copies':>12}")
+    for label, create in stacks:
+        readinto = _time_readinto(create(), args.chunk)
+        read = _time_read(create(), args.chunk)
+        print(f"  {label:32} {readinto / memcpy:16.1f} {read / memcpy:12.1f}")
+
+    # Decompression dominates here, so report throughput instead.
+    for method in (_time_readinto, _time_read):
+        elapsed = method(ZlibDecompressorStream(io.BytesIO(compressed)), args.chunk)
+        print(
+            f"  ZlibDecompressorStream {method.__name__[6:]:9}"
+            f" {len(data) / elapsed / 1e9:.2f} GB/s"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""Measure how member registration scales with the number of members.
+
+Run with `uv run python benchmarks/registration.py [--members N] [--distinct K]`.
+Registers N synthetic members (by default 1M), first with unique names and then
+with only K distinct names, as in a tar archive that was appended to many times.
+Each case is also run with N/8, N/4 and N/2 members, so that the time per member
+can be compared: it should stay roughly constant if registration is linear.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from synthetic_reader import (  # noqa: E402
+    SyntheticReader,
+    duplicated_names,
+    make_member,
+    unique_names,
+)
+
+
+def _time_registration(names: list[str]) -> float:
+    # Create the members upfront, so that only the registration is timed.
+    prepared = [make_member(name, i) for i, name in enumerate(names)]
+    reader = SyntheticReader(iter(names), lambda _, i: prepared[i])
+    start = time.perf_counter()
+    members = reader.get_members()
+    elapsed = time.perf_counter() - start
+    assert len(members) == len(names)
+
+    # Last-wins lookups still work.
+    last = members[-1]
+    assert reader.get_member(last.filename) is last
+    reader.close()
+    return elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--members", type=int, default=1_000_000)
+    parser.add_argument("--distinct", type=int, default=1_000)
+    args = parser.parse_args()
+
+    cases = {
+        "unique names": lambda n: list(unique_names(n)),
+        f"{args.distinct} distinct names": lambda n: list(
+            duplicated_names(n, args.distinct)
+        ),
+    }
+    for label, make_names in cases.items():
+        print(label)
+        for fraction in (8, 4, 2, 1):
+            n = args.members // fraction
+            elapsed = _time_registration(make_names(n))
+            print(
+                f"  {n:>9} members: {elapsed:7.2f}s  {elapsed / n * 1e9:7.0f} ns/member"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""Measure the first random read into a large compressed file, with a seek index.
+
+Run with `uv run python benchmarks/seek_index.py [--size S]`.
+Creates a .gz and a .bz2 file with S bytes of data, and times opening each of them
+and reading 4 KiB from the middle with rapidgzip and indexed_bzip2, once without a
+seek index and once with the index stored by a previous full pass.
+"""
+
+from __future__ import annotations
+
+import argparse
+import bz2
+import gzip
+import os
+import tempfile
+import time
+from dataclasses import replace
+
+from archivey import ArchiveyConfig, open_archive
+
+
+def _read_middle(path: str, config: ArchiveyConfig, size: int) -> float:
+    start = time.perf_counter()
+    with open_archive(path, config=config) as archive:
+        with archive.open(archive.get_members()[0]) as stream:
+            stream.seek(size // 2)
+            stream.read(4096)
+    return time.perf_counter() - start
+
+
+def _read_all(path: str, config: ArchiveyConfig) -> None:
+    with open_archive(path, config=config, streaming_only=True) as archive:
+        for _, stream in archive.iter_members_with_streams():
+            if stream is not None:
+                stream.read()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size", type=int, default=256 * 1024 * 1024)
+    args = parser.parse_args()
+
+    block = os.urandom(64 * 1024).hex().encode()
+    data = (block * (args.size // len(block) + 1))[: args.size]
+    config = ArchiveyConfig(use_rapidgzip=True, use_indexed_bzip2=True)
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        paths = {
+            "gzip": os.path.join(tmpdir, "data.bin.gz"),
+            "bzip2": os.path.join(tmpdir, "data.bin.bz2"),
+        }
+        with open(paths["gzip"], "wb") as f:
+            f.write(gzip.compress(data, 1))
+        with open(paths["bzip2"], "wb") as f:
+            f.write(bz2.compress(data, 9))
+
+        indexed_config = replace(config, seek_index_dir=os.path.join(tmpdir, "index"))
+        print(f"{args.size / 2**20:.0f} MiB, open and read 4 KiB from the middle")
+        for label, path in paths.items():
+            without_index = _read_middle(path, config, args.size)
+            _read_all(path, indexed_config)
+            with_index = _read_middle(path, indexed_config, args.size)
+            print(
+                f"  {label:6} no index {without_index:7.3f}s"
+                f"   stored index {with_index:7.3f}s"
+            )
+
+
+if __name__ == "__main__":
+    main()
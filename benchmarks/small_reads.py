@@ -0,0 +1,72 @@
+"""Measure small-read throughput of member streams against the raw library objects.
+
+Run with `uv run python benchmarks/small_reads.py [--size S]`.
+Creates a .zip and a .tar.gz with a single member of S bytes, and reads it with
+read(n) calls for n in (1, 64, 4096), through `archive.open()` and through the
+zipfile/tarfile objects directly. Each rate is the best of 3 runs.
+"""
+
+from __future__ import annotations
+
+import argparse
+import io
+import os
+import tarfile
+import tempfile
+import time
+import zipfile
+from typing import BinaryIO, Callable
+
+from archivey import open_archive
+
+
+def _time_reads(open_stream: Callable[[], BinaryIO], n: int) -> float:
+    with open_stream() as stream:
+        start = time.perf_counter()
+        while stream.read(n):
+            pass
+        return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size", type=int, default=4 * 1024 * 1024)
+    args = parser.parse_args()
+
+    data = os.urandom(args.size // 2) * 2
+    with tempfile.TemporaryDirectory() as tmpdir:
+        zip_path = os.path.join(tmpdir, "archive.zip")
+        with zipfile.ZipFile(zip_path, "w", zipfile.ZIP_DEFLATED) as zf:
+            zf.writestr("member.bin", data)
+        tar_path = os.path.join(tmpdir, "archive.tar.gz")
+        with tarfile.open(tar_path, "w:gz") as tf:
+            info = tarfile.TarInfo("member.bin")
+            info.size = len(data)
+            tf.addfile(info, io.BytesIO(data))
+
+        with (
+            zipfile.ZipFile(zip_path) as zf,
+            tarfile.open(tar_path, "r:gz") as tf,
+            open_archive(zip_path) as zip_archive,
+            open_archive(tar_path) as tar_archive,
+        ):
+            tar_info = tf.getmember("member.bin")
+            cases: list[tuple[str, Callable[[], BinaryIO]]] = [
+                ("zipfile", lambda: zf.open("member.bin")),  # type: ignore[list-item]
+                ("archivey zip", lambda: zip_archive.open("member.bin")),
+                ("tarfile", lambda: tf.extractfile(tar_info)),  # type: ignore[list-item]
+                ("archivey tar.gz", lambda: tar_archive.open("member.bin")),
+            ]
+
+            print(f"member size: {len(data)} bytes")
+            print(f"  {'':16} {'read(1)':>12} {'read(64)':>12} {'read(4096)':>12}")
+            for label, open_stream in cases:
+                rates = []
+                for n in (1, 64, 4096):
+                    elapsed = min(_time_reads(open_stream, n) for _ in range(3))
+                    rates.append(len(data) / elapsed / 1e6)
+                print(f"  {label:16}" + "".join(f" {r:9.1f}MB/s" for r in rates))
+
+
+if __name__ == "__main__":
+    main()
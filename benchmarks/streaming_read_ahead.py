@@ -0,0 +1,83 @@
+"""Measure streaming reads of a .tar.gz with and without the background read-ahead.
+
+Run with `uv run python benchmarks/streaming_read_ahead.py [--size S]
+[--files N] [--work-per-mib W] [--read-ahead B ...]`.
+Creates a .tar.gz with N members totalling S bytes, and iterates over it with
+`open_archive(streaming_only=True)`, simulating W seconds of processing (sleeping,
+like network or disk I/O would) per MiB of member data. Each run is repeated with
+`streaming_read_ahead_bytes` set to each value of B (0 disables the read-ahead).
+With the read-ahead, the decompression overlaps with the processing, so the total
+time approaches the larger of the two instead of their sum.
+"""
+
+from __future__ import annotations
+
+import argparse
+import io
+import os
+import random
+import tarfile
+import tempfile
+import time
+
+from archivey import ArchiveyConfig
+from archivey.core import open_archive
+
+
+def _create_archive(path: str, size: int, files: int) -> None:
+    rng = random.Random(0)
+    words = [
+        bytes(rng.choice(b"abcdefghijklmnop") for _ in range(rng.randint(1, 10)))
+        for _ in range(5000)
+    ]
+    with tarfile.open(path, "w:gz") as tar:
+        for i in range(files):
+            data = b" ".join(rng.choice(words) for _ in range(size // files // 5))
+            info = tarfile.TarInfo(f"file_{i}.txt")
+            info.size = len(data)
+            tar.addfile(info, io.BytesIO(data))
+
+
+def _time_iteration(path: str, config: ArchiveyConfig, work_per_mib: float) -> float:
+    start = time.perf_counter()
+    with open_archive(path, streaming_only=True, config=config) as archive:
+        for _, stream in archive.iter_members_with_streams():
+            if stream is None:
+                continue
+            while data := stream.read(1024 * 1024):
+                time.sleep(work_per_mib * len(data) / 2**20)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size", type=int, default=64 * 1024 * 1024)
+    parser.add_argument("--files", type=int, default=16)
+    parser.add_argument("--work-per-mib", type=float, default=0.005)
+    parser.add_argument(
+        "--read-ahead", type=int, nargs="+", default=[0, 1024 * 1024, 8 * 1024 * 1024]
+    )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, "data.tar.gz")
+        _create_archive(path, args.size, args.files)
+        print(
+            f"{args.size / 2**20:.0f} MiB in {args.files} files,"
+            f" {os.path.getsize(path) / 2**20:.1f} MiB compressed,"
+            f" {args.work_per_mib * 1000:.1f} ms of work per MiB,"
+            f" {os.cpu_count()} CPUs"
+        )
+        for read_ahead in args.read_ahead:
+            config = ArchiveyConfig(streaming_read_ahead_bytes=read_ahead)
+            elapsed = min(
+                _time_iteration(path, config, args.work_per_mib) for _ in range(3)
+            )
+            print(
+                f"  read-ahead {read_ahead / 2**20:6.1f} MiB: {elapsed:7.2f}s"
+                f" {args.size / elapsed / 1e6:8.1f} MB/s"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""An in-memory archive reader used by the benchmarks to exercise BaseArchiveReader.
+
+The members look like the ones TarReader creates (including the `extra` dict), but
+no archive file is involved, so the benchmarks measure only the cost of the
+bookkeeping done by BaseArchiveReader.
+"""
+
+from __future__ import annotations
+
+import io
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, BinaryIO
+
+from archivey.internal.base_reader import BaseArchiveReader
+from archivey.types import ArchiveFormat, ArchiveInfo, ArchiveMember, MemberType
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterator
+
+    from archivey.exceptions import ArchiveError
+
+
+def make_member(name: str, i: int) -> ArchiveMember:
+    return ArchiveMember(
+        filename=name,
+        file_size=i % 65536,
+        compress_size=None,
+        mtime_with_tz=datetime.fromtimestamp(1_700_000_000 + i, tz=timezone.utc),
+        type=MemberType.FILE,
+        mode=0o644,
+        compression_method="store",
+        extra={
+            "type": b"0",
+            "mode": 0o644,
+            "linkname": "",
+            "devmajor": 0,
+            "devminor": 0,
+        },
+    )
+
+
+def unique_names(count: int) -> Iterator[str]:
+    """Names spread over a directory tree, like a typical large archive."""
+    for i in range(count):
+        yield f"data/{i // 100_000:02d}/{(i // 1000) % 100:02d}/file_{i:08d}.bin"
+
+
+def duplicated_names(count: int, distinct: int) -> Iterator[str]:
+    """Names from a small set, like a tar archive that was appended to many times."""
+    for i in range(count):
+        yield f"logs/app_{i % distinct:05d}.log"
+
+
+class SyntheticReader(BaseArchiveReader):
+    """A reader whose members come from a list of names."""
+
+    def __init__(
+        self,
+        names: Iterator[str],
+        member_factory: Callable[[str, int], ArchiveMember] = make_member,
+    ):
+        super().__init__(
+            format=ArchiveFormat.TAR,
+            archive_path="synthetic.tar",
+            pwd=None,
+            streaming_only=False,
+            members_list_supported=True,
+        )
+        self._names = names
+        self._member_factory = member_factory
+
+    def iter_members_for_registration(self) -> Iterator[ArchiveMember]:
+        for i, name in enumerate(self._names):
+            yield self._member_factory(name, i)
+
+    def get_archive_info(self) -> ArchiveInfo:
+        return ArchiveInfo(format=self.format)
+
+    def _translate_exception(self, e: Exception) -> ArchiveError | None:
+        return None
+
+    def _open_member(
+        self, member: ArchiveMember, pwd: bytes | str | None, for_iteration: bool
+    ) -> BinaryIO:
+        return io.BytesIO(bytes(member.file_size or 0))
+
+    def _close_archive(self) -> None:
+        pass
@@ -1,4 +1,9 @@
 from archivey.archive_reader import ArchiveReader
+from archivey.async_reader import (
+    AsyncArchiveReader,
+    AsyncArchiveStream,
+    open_archive_async,
+)
 from archivey.config import (
     ArchiveyConfig,
     archivey_config,
@@ -7,6 +12,8 @@ from archivey.config import (
 )
 from archivey.core import open_archive, open_compressed_stream
 from archivey.exceptions import ArchiveError
+from archivey.reader_pool import ArchiveReaderPool
+from archivey.selection import MemberSelection
 from archivey.types import (
     ArchiveFormat,
     ArchiveInfo,
@@ -24,12 +31,20 @@ __all__ = [
     "ArchiveReader",
     "ArchiveInfo",
     "ArchiveMember",
+    # Async
+    "open_archive_async",
+    "AsyncArchiveReader",
+    "AsyncArchiveStream",
+    # Reader pool
+    "ArchiveReaderPool",
     # Enums
     "ArchiveFormat",
     "ContainerFormat",
     "StreamFormat",
     "MemberType",
     "ExtractionFilter",
+    # Member selection
+    "MemberSelection",
     # Config
     "ArchiveyConfig",
     "archivey_config",
@@ -1,6 +1,6 @@
 import abc
 import os
-from typing import BinaryIO, Callable, Collection, Iterator, List
+from typing import BinaryIO, Callable, Collection, Iterator, Literal, Sequence
 
 from archivey.internal.io_helpers import is_stream
 from archivey.types import (
@@ -62,11 +62,13 @@ class ArchiveReader(abc.ABC):
 
         This method is idempotent (callable multiple times without error).
         It is automatically called when the reader is used as a context manager.
+        Readers checked out of an [`ArchiveReaderPool`][archivey.ArchiveReaderPool]
+        are returned to the pool instead.
         """
         pass
 
     @abc.abstractmethod
-    def get_members(self) -> List[ArchiveMember]:
+    def get_members(self) -> Sequence[ArchiveMember]:
         """
         Return a list of all members in the archive.
 
@@ -75,7 +77,10 @@ class ArchiveReader(abc.ABC):
         avoid misuse.
 
         Returns:
-            A list of ArchiveMember objects.
+            A read-only sequence of ArchiveMember objects, in archive order. It is a
+            view of the reader's member list rather than a copy, so it's cheap to call
+            repeatedly even for very large archives; use `list()` to get a mutable
+            copy.
 
         Raises:
             ArchiveError: If member metadata cannot be read.
@@ -84,7 +89,7 @@ class ArchiveReader(abc.ABC):
         pass
 
     @abc.abstractmethod
-    def get_members_if_available(self) -> List[ArchiveMember] | None:
+    def get_members_if_available(self) -> Sequence[ArchiveMember] | None:
         """
         Return a list of members if available without full archive traversal.
 
@@ -92,7 +97,8 @@ class ArchiveReader(abc.ABC):
         Returns None if not readily available (e.g. TAR streams).
 
         Returns:
-            A list of ArchiveMember objects, or None if unavailable.
+            A read-only sequence of ArchiveMember objects (see `get_members()`), or
+            None if unavailable.
         """
         pass
 
@@ -105,6 +111,8 @@ class ArchiveReader(abc.ABC):
         *,
         pwd: bytes | str | None = None,
         filter: IteratorFilterFunc | ExtractionFilter | None = None,
+        workers: int | None = None,
+        prefetch: int | None = None,
     ) -> Iterator[tuple[ArchiveMember, BinaryIO | None]]:
         """
         Iterate over archive members, yielding each with a readable stream if applicable.
@@ -117,12 +125,24 @@ class ArchiveReader(abc.ABC):
         Parameters:
             members: A collection of `ArchiveMember` or filenames, or a predicate
                 function that returns True for members to include. If `None`, all
-                members are included.
+                members are included. A `MemberSelection` is more efficient in
+                streaming mode, as files that it excludes are skipped before their
+                metadata is fully processed.
             pwd: Optional password to use for encrypted members, if needed; by default,
                 the password passed when opening the archive is used.
             filter: Optional filter or sanitizer applied to each member. Either
                 a predefined `ExtractionFilter` policy, or a callable that returns
                 a sanitized member or `None` to exclude it.
+            workers: If greater than 1, decompress the members that follow the one
+                being yielded on this many threads, each with its own file handle.
+                Members are still yielded in archive order. Only supported in random
+                access mode, and for formats whose members can be decompressed
+                independently (currently ZIP archives and folders); otherwise, members
+                are decompressed one at a time on the caller's thread.
+            prefetch: Maximum number of members decompressed ahead of the one being
+                yielded when using `workers`. Defaults to twice the number of workers.
+                Their total size is also limited by
+                `ArchiveyConfig.max_prefetch_bytes`.
 
         Yields:
             Tuples of `(ArchiveMember, BinaryIO | None)`, one per selected member.
@@ -197,6 +217,113 @@ class ArchiveReader(abc.ABC):
         """
         pass
 
+    @abc.abstractmethod
+    def stat(self, path: str, *, follow_symlinks: bool = True) -> ArchiveMember:
+        """
+        Return the member at a path, like `os.stat()` for the archive contents.
+
+        Unlike `get_member()`, the path is normalized: trailing slashes, repeated
+        slashes and "." components are ignored, so `stat("dir")` finds the member
+        `dir/`. Directories that are not stored in the archive but are implied by the
+        paths of other members (e.g. `a/` for a member `a/b.txt`) are returned as a
+        new `ArchiveMember` of type `DIR` with no size or modification time. Symlinks
+        in intermediate path components are not followed.
+
+        Requires random access support (see `has_random_access()`).
+
+        Args:
+            path: The path to look up, relative to the root of the archive.
+            follow_symlinks: If True (the default) and the member is a symlink or
+                hardlink, return the member it resolves to instead.
+
+        Returns:
+            The ArchiveMember at the path.
+
+        Raises:
+            ArchiveMemberNotFoundError: If there is no member at the path.
+            ArchiveLinkTargetNotFoundError: If `follow_symlinks` is True and the member
+                is a link whose target is not in the archive.
+            ValueError: If the archive was opened in streaming mode.
+        """
+        pass
+
+    @abc.abstractmethod
+    def listdir(self, path: str = "") -> list[str]:
+        """
+        Return the names of the entries in a directory of the archive.
+
+        Like `os.listdir()`, this returns only the last component of each name, in
+        archive order, and includes implied directories. The time taken is
+        proportional to the number of entries in the directory, not the size of the
+        archive.
+
+        Requires random access support (see `has_random_access()`).
+
+        Args:
+            path: The directory to list. Defaults to the root of the archive.
+
+        Returns:
+            A list of entry names.
+
+        Raises:
+            ArchiveMemberNotFoundError: If the path doesn't exist or is not a
+                directory.
+            ValueError: If the archive was opened in streaming mode.
+        """
+        pass
+
+    @abc.abstractmethod
+    def walk(self, top: str = "") -> Iterator[tuple[str, list[str], list[str]]]:
+        """
+        Walk the directory tree of the archive, like `os.walk()`.
+
+        Yields a `(dirpath, dirnames, filenames)` tuple for `top` and each directory
+        below it, top-down. `dirpath` is a normalized path without a trailing slash
+        (`""` for the root of the archive). As with `os.walk()`, symlinks to
+        directories are listed in `dirnames` but not descended into, and removing
+        names from `dirnames` prevents the walk from descending into them.
+
+        Requires random access support (see `has_random_access()`).
+
+        Args:
+            top: The directory to start from. Defaults to the root of the archive.
+
+        Yields:
+            Tuples of `(dirpath, dirnames, filenames)`.
+
+        Raises:
+            ArchiveMemberNotFoundError: If `top` doesn't exist or is not a directory.
+            ValueError: If the archive was opened in streaming mode.
+        """
+        pass
+
+    @abc.abstractmethod
+    def glob(self, pattern: str) -> list[str]:
+        """
+        Return the paths in the archive that match a shell-style pattern.
+
+        The pattern is matched one path component at a time, as with `glob.glob()`:
+        `*`, `?` and `[...]` don't match slashes, and a `**` component matches any
+        number of directories (e.g. `logs/**/*.parquet`). Only the directories that
+        can contain matches are visited. Matching is case-sensitive, and unlike
+        `glob.glob()`, wildcards also match names starting with a dot.
+
+        The returned paths are normalized and have no trailing slash; use `stat()`
+        to get the corresponding members.
+
+        Requires random access support (see `has_random_access()`).
+
+        Args:
+            pattern: The pattern, relative to the root of the archive.
+
+        Returns:
+            A list of matching paths, in depth-first archive order.
+
+        Raises:
+            ValueError: If the archive was opened in streaming mode.
+        """
+        pass
+
     @abc.abstractmethod
     def open(
         self, member_or_filename: ArchiveMember | str, *, pwd: bytes | str | None = None
@@ -228,6 +355,37 @@ class ArchiveReader(abc.ABC):
         """
         pass
 
+    @abc.abstractmethod
+    def read_member_view(
+        self, member_or_filename: ArchiveMember | str, *, pwd: bytes | str | None = None
+    ) -> memoryview:
+        """
+        Return the full contents of a member as a read-only memoryview.
+
+        For members stored uncompressed in ZIP archives, members of uncompressed TAR
+        archives and files in folders, the view is backed by a memory map of the
+        file, so no data is copied. The checksum of ZIP members is not verified in
+        that case. Other members are read into memory as with `open().read()`.
+
+        Mapped views stay valid after the archive is closed, and the file is unmapped
+        once all views of it are released. The file should not be modified while
+        views of it are in use.
+
+        Requires random access support (see `has_random_access()`).
+
+        Args:
+            member_or_filename: The member or its filename. Links are resolved as in
+                `open()`.
+            pwd: Optional password to use for encrypted members, if needed.
+
+        Returns:
+            A memoryview of the member's content.
+
+        Raises:
+            The same exceptions as `open()`.
+        """
+        pass
+
     @abc.abstractmethod
     def extract(
         self,
@@ -266,6 +424,8 @@ class ArchiveReader(abc.ABC):
         *,
         pwd: bytes | str | None = None,
         filter: ExtractFilterFunc | ExtractionFilter | None = None,
+        workers: int | None = None,
+        executor: Literal["thread", "process"] = "thread",
     ) -> dict[str, ArchiveMember]:
         """
         Extract all (or selected) members to a given directory.
@@ -278,12 +438,22 @@ class ArchiveReader(abc.ABC):
             members: Optional. A collection of member names or `ArchiveMember` objects
                 to extract. If None, all members are extracted. Can also be a callable
                 that takes an `ArchiveMember` and returns `True` if it should be
-                extracted.
+                extracted, such as a `MemberSelection`.
             pwd: Optional password to use for encrypted members, if needed; by default,
                 the password passed when opening the archive is used.
             filter: Optional filter or sanitizer applied to each member. Either
                 a predefined `ExtractionFilter` policy, or a callable that returns
                 a sanitized member or `None` to exclude it.
+            workers: If greater than 1, write the extracted files with this many
+                workers, starting with the largest ones. Only used in random access
+                mode, for formats whose members can be decompressed independently
+                (currently ZIP archives and folders); otherwise, files are extracted
+                one at a time.
+            executor: `"thread"` to use worker threads, each reading the archive
+                through its own file handle, or `"process"` to use worker processes,
+                each opening its own reader. Processes also scale for archives with
+                many small files, where the time isn't spent in decompression (which
+                releases the GIL), but they need the archive to be opened from a path.
 
         Returns:
             A mapping from extracted file paths (including the target directory) to
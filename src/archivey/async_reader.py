@@ -0,0 +1,448 @@
+"""Asyncio interface for reading archives.
+
+Archive readers are blocking: they read the archive file and decompress data on the
+calling thread. The classes in this module run that work on an executor, in batches
+of up to `batch_size` bytes, so that reading a member doesn't require a thread hop
+per `read()` call. Work is only done when the caller asks for more data, so a slow
+consumer doesn't cause data to pile up in memory.
+
+Archives can also be read from async byte sources, such as the body of an async HTTP
+response. The source is read on the event loop, before each batch of work is sent to
+the executor.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import inspect
+import io
+import threading
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import (
+    TYPE_CHECKING,
+    AsyncIterable,
+    AsyncIterator,
+    Awaitable,
+    BinaryIO,
+    Callable,
+    Collection,
+    Iterator,
+    Literal,
+    Sequence,
+    TypeVar,
+)
+
+from archivey.config import ArchiveyConfig, get_archivey_config
+from archivey.core import open_archive
+from archivey.types import (
+    ArchiveFormat,
+    ArchiveInfo,
+    ArchiveMember,
+    AsyncReadableBinaryStream,
+    ContainerFormat,
+    ExtractFilterFunc,
+    ExtractionFilter,
+    IteratorFilterFunc,
+    ReadableBinaryStream,
+    StreamFormat,
+)
+
+if TYPE_CHECKING:
+    import os
+
+    from archivey.archive_reader import ArchiveReader
+
+_T = TypeVar("_T")
+
+DEFAULT_BATCH_SIZE = 1024 * 1024
+"""Default maximum amount of data decompressed by each call to the executor."""
+
+_default_executor: ThreadPoolExecutor | None = None
+_default_executor_lock = threading.Lock()
+
+
+def _get_default_executor() -> ThreadPoolExecutor:
+    global _default_executor
+    with _default_executor_lock:
+        if _default_executor is None:
+            _default_executor = ThreadPoolExecutor(thread_name_prefix="archivey-async")
+        return _default_executor
+
+
+def _is_async_source(obj: object) -> bool:
+    if isinstance(obj, AsyncReadableBinaryStream) and inspect.iscoroutinefunction(
+        obj.read
+    ):
+        return True
+    return hasattr(obj, "__aiter__")
+
+
+class _AsyncSourceStream(io.RawIOBase):
+    """A blocking, non-seekable stream that reads from an async byte source.
+
+    The source is read on the event loop by `fill()`, which `AsyncArchiveReader`
+    awaits before sending work to the executor, so that the worker usually finds the
+    data it needs already buffered. If it needs more, `readinto()` blocks the worker
+    thread (never the event loop) until the event loop has read it.
+    """
+
+    def __init__(
+        self,
+        source: AsyncReadableBinaryStream | AsyncIterable[bytes],
+        loop: asyncio.AbstractEventLoop,
+        chunk_size: int,
+    ):
+        super().__init__()
+        self._loop = loop
+        self._read_chunk: Callable[[], Awaitable[bytes]]
+        if isinstance(source, AsyncReadableBinaryStream) and (
+            inspect.iscoroutinefunction(source.read)
+        ):
+            self._read_chunk = functools.partial(source.read, chunk_size)
+        else:
+            iterator = aiter(source)  # type: ignore[arg-type]
+            self._read_chunk = functools.partial(anext, iterator, b"")
+
+        self._buffer = bytearray()
+        self._offset = 0
+        self._eof = False
+
+    async def fill(self, size: int) -> None:
+        """Read from the source until at least `size` bytes are buffered."""
+        while not self._eof and len(self._buffer) - self._offset < size:
+            chunk = await self._read_chunk()
+            if chunk:
+                self._buffer += chunk
+            else:
+                self._eof = True
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, b) -> int:  # type: ignore[override]
+        if self._offset >= len(self._buffer) and not self._eof:
+            asyncio.run_coroutine_threadsafe(self.fill(len(b)), self._loop).result()
+
+        size = min(len(b), len(self._buffer) - self._offset)
+        b[:size] = self._buffer[self._offset : self._offset + size]
+        self._offset += size
+        # Drop the consumed data once it's most of the buffer.
+        if self._offset > len(self._buffer) // 2:
+            del self._buffer[: self._offset]
+            self._offset = 0
+        return size
+
+
+def _read_batch(stream: BinaryIO, size: int) -> bytes:
+    """Read `size` bytes from `stream`, or less only at the end of the stream."""
+    chunks = []
+    remaining = size
+    while remaining > 0:
+        chunk = stream.read(remaining)
+        if not chunk:
+            break
+        chunks.append(chunk)
+        remaining -= len(chunk)
+    return b"".join(chunks)
+
+
+def _next_member_with_data(
+    members_iter: Iterator[tuple[ArchiveMember, BinaryIO | None]], batch_size: int
+) -> tuple[ArchiveMember, BinaryIO | None, bytes | None] | None:
+    item = next(members_iter, None)
+    if item is None:
+        return None
+    member, stream = item
+    # Read small members in the same call, so they don't need another thread hop.
+    if (
+        stream is not None
+        and member.file_size is not None
+        and member.file_size < batch_size
+    ):
+        return member, stream, _read_batch(stream, batch_size)
+    return member, stream, None
+
+
+class AsyncArchiveStream:
+    """An archive member opened by `AsyncArchiveReader`, with async read methods.
+
+    Data is decompressed on the reader's executor in batches of up to `batch_size`
+    bytes, and returned from the buffered batch until it runs out.
+    """
+
+    def __init__(
+        self,
+        archive: AsyncArchiveReader,
+        stream: BinaryIO,
+        data: bytes | None = None,
+    ):
+        self._archive = archive
+        self._stream = stream
+        self._data = memoryview(data or b"")
+        self._offset = 0
+        # A batch shorter than requested is the last one.
+        self._eof = data is not None and len(data) < archive.batch_size
+
+    async def _fill(self) -> bool:
+        """Read the next batch if the buffered one was consumed; return False at EOF."""
+        if self._offset < len(self._data):
+            return True
+        if self._eof:
+            return False
+
+        data = await self._archive._run(
+            _read_batch, self._stream, self._archive.batch_size
+        )
+        self._data = memoryview(data)
+        self._offset = 0
+        self._eof = len(data) < self._archive.batch_size
+        return bool(data)
+
+    async def read(self, n: int = -1) -> bytes:
+        """Read up to `n` bytes, or until the end of the member if `n` is negative.
+
+        Returns less than `n` bytes only at the end of the member.
+        """
+        chunks = []
+        while n != 0 and await self._fill():
+            end = len(self._data) if n < 0 else min(len(self._data), self._offset + n)
+            chunks.append(self._data[self._offset : end])
+            if n > 0:
+                n -= end - self._offset
+            self._offset = end
+        return b"".join(chunks)
+
+    def __aiter__(self) -> AsyncIterator[bytes]:
+        return self
+
+    async def __anext__(self) -> bytes:
+        """Return the buffered data, one batch at a time."""
+        if not await self._fill():
+            raise StopAsyncIteration
+        data = bytes(self._data[self._offset :])
+        self._offset = len(self._data)
+        return data
+
+    async def close(self) -> None:
+        await self._archive._run(self._stream.close)
+
+    async def __aenter__(self) -> AsyncArchiveStream:
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        await self.close()
+
+
+class AsyncArchiveReader:
+    """Async version of [ArchiveReader][archivey.ArchiveReader].
+
+    Returned by [open_archive_async][archivey.open_archive_async]. The methods have
+    the same semantics as the corresponding `ArchiveReader` methods, but the blocking
+    work runs on an executor, one call at a time for each archive, so many archives
+    can be read concurrently from a single event loop.
+    """
+
+    def __init__(
+        self,
+        reader: ArchiveReader,
+        *,
+        executor: Executor,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        source: _AsyncSourceStream | None = None,
+    ):
+        self.reader = reader
+        """The underlying blocking reader."""
+        self.batch_size = batch_size
+        self._executor = executor
+        self._source = source
+        self._lock = asyncio.Lock()
+
+    @property
+    def format(self) -> ArchiveFormat:
+        return self.reader.format
+
+    async def _run(self, func: Callable[..., _T], *args, **kwargs) -> _T:
+        async with self._lock:
+            if self._source is not None:
+                await self._source.fill(self.batch_size)
+            return await asyncio.get_running_loop().run_in_executor(
+                self._executor, functools.partial(func, *args, **kwargs)
+            )
+
+    def has_random_access(self) -> bool:
+        return self.reader.has_random_access()
+
+    async def get_archive_info(self) -> ArchiveInfo:
+        return await self._run(self.reader.get_archive_info)
+
+    async def get_members(self) -> Sequence[ArchiveMember]:
+        return await self._run(self.reader.get_members)
+
+    async def get_members_if_available(self) -> Sequence[ArchiveMember] | None:
+        return await self._run(self.reader.get_members_if_available)
+
+    async def get_member(
+        self, member_or_filename: ArchiveMember | str
+    ) -> ArchiveMember:
+        return await self._run(self.reader.get_member, member_or_filename)
+
+    async def open(
+        self, member_or_filename: ArchiveMember | str, *, pwd: bytes | str | None = None
+    ) -> AsyncArchiveStream:
+        stream = await self._run(self.reader.open, member_or_filename, pwd=pwd)
+        return AsyncArchiveStream(self, stream)
+
+    async def read_member_view(
+        self, member_or_filename: ArchiveMember | str, *, pwd: bytes | str | None = None
+    ) -> memoryview:
+        return await self._run(
+            self.reader.read_member_view, member_or_filename, pwd=pwd
+        )
+
+    async def iter_members_with_streams(
+        self,
+        members: Collection[ArchiveMember | str]
+        | Callable[[ArchiveMember], bool]
+        | None = None,
+        *,
+        pwd: bytes | str | None = None,
+        filter: IteratorFilterFunc | ExtractionFilter | None = None,
+        workers: int | None = None,
+        prefetch: int | None = None,
+    ) -> AsyncIterator[tuple[ArchiveMember, AsyncArchiveStream | None]]:
+        """Iterate over archive members, yielding each with a stream if applicable.
+
+        See [ArchiveReader.iter_members_with_streams][archivey.ArchiveReader.iter_members_with_streams].
+        The contents of members smaller than `batch_size` are decompressed together
+        with their headers, so iterating over small files needs a single executor
+        call per member. With `workers`, the following members are decompressed
+        on the reader's own threads while the current one is being consumed.
+        """
+        members_iter = self.reader.iter_members_with_streams(
+            members, pwd=pwd, filter=filter, workers=workers, prefetch=prefetch
+        )
+        try:
+            while True:
+                item = await self._run(
+                    _next_member_with_data, members_iter, self.batch_size
+                )
+                if item is None:
+                    return
+                member, stream, data = item
+                yield (
+                    member,
+                    AsyncArchiveStream(self, stream, data)
+                    if stream is not None
+                    else None,
+                )
+        finally:
+            # Readers implement the iterator as a generator; closing it releases the
+            # current member and any prefetching threads.
+            close = getattr(members_iter, "close", None)
+            if close is not None:
+                await self._run(close)
+
+    async def extractall(
+        self,
+        path: str | os.PathLike | None = None,
+        members: Collection[ArchiveMember | str]
+        | Callable[[ArchiveMember], bool]
+        | None = None,
+        *,
+        pwd: bytes | str | None = None,
+        filter: ExtractFilterFunc | ExtractionFilter | None = None,
+        workers: int | None = None,
+        executor: Literal["thread", "process"] = "thread",
+    ) -> dict[str, ArchiveMember]:
+        return await self._run(
+            self.reader.extractall,
+            path,
+            members,
+            pwd=pwd,
+            filter=filter,
+            workers=workers,
+            executor=executor,
+        )
+
+    async def close(self) -> None:
+        await self._run(self.reader.close)
+
+    async def __aenter__(self) -> AsyncArchiveReader:
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        await self.close()
+
+
+async def open_archive_async(
+    path_or_stream: str
+    | bytes
+    | os.PathLike
+    | ReadableBinaryStream
+    | AsyncReadableBinaryStream
+    | AsyncIterable[bytes],
+    *,
+    config: ArchiveyConfig | None = None,
+    streaming_only: bool = False,
+    pwd: bytes | str | None = None,
+    format: ArchiveFormat | ContainerFormat | StreamFormat | None = None,
+    executor: Executor | None = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> AsyncArchiveReader:
+    """
+    Open an archive for use from asyncio code.
+
+    Takes the same arguments as [open_archive][archivey.open_archive], and also
+    accepts async byte sources: objects with an async `read(n)` method, or async
+    iterables of `bytes` chunks, such as the body of an async HTTP response. These
+    are read as non-seekable streams, so formats that need random access (like ZIP)
+    can't be read from them.
+
+    Args:
+        executor: The executor that runs the blocking work. By default, a thread pool
+            shared by all the archives opened with this function.
+        batch_size: Maximum amount of data decompressed (and read from an async
+            source) in each call to the executor.
+
+    Example:
+        ```python
+        async with await open_archive_async(response.content) as archive:
+            async for member, stream in archive.iter_members_with_streams():
+                if stream is not None:
+                    async for chunk in stream:
+                        ...
+        ```
+    """
+    # The default config is a context variable, which is not propagated to the
+    # executor threads.
+    if config is None:
+        config = get_archivey_config()
+    if executor is None:
+        executor = _get_default_executor()
+
+    loop = asyncio.get_running_loop()
+    source: _AsyncSourceStream | None = None
+    if _is_async_source(path_or_stream):
+        source = _AsyncSourceStream(
+            path_or_stream,  # type: ignore[arg-type]
+            loop,
+            chunk_size=batch_size,
+        )
+        await source.fill(batch_size)
+        path_or_stream = source
+
+    reader = await loop.run_in_executor(
+        executor,
+        functools.partial(
+            open_archive,
+            path_or_stream,  # type: ignore[arg-type]
+            config=config,
+            streaming_only=streaming_only,
+            pwd=pwd,
+            format=format,
+        ),
+    )
+    return AsyncArchiveReader(
+        reader, executor=executor, batch_size=batch_size, source=source
+    )
@@ -53,6 +53,24 @@ class ArchiveyConfig:
     extraction_filter: ExtractionFilter | FilterFunc = ExtractionFilter.DATA
     "A filter function that can be used to filter members when iterating over an archive. It can be a function that takes an ArchiveMember and returns a possibly-modified ArchiveMember object, or None to skip the member."
 
+    member_index_dir: str | None = None
+    "If set, a directory where the member lists of archives opened from a file path are cached, so that reopening an unchanged archive doesn't rescan it. See the user guide for the supported formats and how entries are invalidated."
+
+    max_prefetch_bytes: int = 64 * 1024 * 1024
+    "Maximum total uncompressed size of the members that are decompressed ahead of the caller when iterating with multiple workers (see the `workers` argument of `iter_members_with_streams`). Members larger than this are not prefetched, and are decompressed on the caller's thread when they are reached."
+
+    decompression_checkpoint_interval: int = 4 * 1024 * 1024
+    "Distance in uncompressed bytes between the decompressor state snapshots kept while reading gzip, zlib and large deflated ZIP members, so that seeking backwards resumes from the nearest one. Set to 0 to disable."
+
+    seek_index_dir: str | None = None
+    "If set, a directory where the seek indexes built by rapidgzip, indexed_bzip2 and uncompresspy are saved after a stream is read to the end, and loaded when the unchanged file is opened again."
+
+    decompression_threads: int = 0
+    "If greater than 0, decompress gzip, bzip2, xz, Zstandard, lzip and LZ4 streams made of several independent members, blocks or frames on this many threads. See the user guide for which files benefit and the backends used for each format."
+
+    streaming_read_ahead_bytes: int = 0
+    "If greater than 0, compressed tar and single-file archives opened in streaming-only mode are decompressed on a background thread, up to this many bytes ahead of the caller."
+
 
 # Allow both enum and string literals for StrEnum fields
 OverwriteModeLiteral: TypeAlias = Literal["overwrite", "skip", "error"]
@@ -70,6 +88,12 @@ class ConfigOverrides(TypedDict, total=False):
     tar_check_integrity: bool | None
     overwrite_mode: OverwriteMode | OverwriteModeLiteral | None
     extraction_filter: ExtractionFilter | FilterFunc | ExtractionFilterLiteral | None
+    member_index_dir: str | None
+    max_prefetch_bytes: int | None
+    decompression_checkpoint_interval: int | None
+    seek_index_dir: str | None
+    decompression_threads: int | None
+    streaming_read_ahead_bytes: int | None
 
 
 def _convert_str_enum_literals(overrides: Any) -> dict[str, Any]:
@@ -1,16 +1,21 @@
 import abc
+import bisect
 import bz2
+import functools
 import gzip
 import io
 import lzma
 import os
 import zlib
+from dataclasses import dataclass
 from typing import (
     TYPE_CHECKING,
+    Any,
     BinaryIO,
     Callable,
     Generic,
     Optional,
+    TypeAlias,
     TypeVar,
     cast,
 )
@@ -19,11 +24,20 @@ from typing_extensions import Buffer
 
 from archivey.config import ArchiveyConfig, get_archivey_config
 from archivey.internal.archive_stream import ArchiveStream
+from archivey.internal.index_cache import (
+    ArchiveFingerprint,
+    load_binary_index,
+    load_index,
+    save_binary_index,
+    save_index,
+)
 from archivey.internal.io_helpers import (
     ExceptionTranslatorFn,
+    ReadAheadStream,
     ensure_bufferedio,
     is_seekable,
     is_stream,
+    readinto_from,
 )
 from archivey.types import StreamFormat
 
@@ -102,35 +116,35 @@ from archivey.internal.io_helpers import ensure_binaryio
 logger = logging.getLogger(__name__)
 
 
+# Default distance in uncompressed bytes between the decompressor state snapshots
+# kept by streams that support them (see `DecompressorStream`).
+DEFAULT_CHECKPOINT_INTERVAL = 4 * 1024 * 1024
+# Most decompressor state snapshots kept by a stream. Each one takes about 40 KB for
+# zlib streams; once there are this many, every other one is dropped and the
+# interval is doubled, so that they stay evenly spread over long streams.
+_MAX_CHECKPOINTS = 256
+
+# How much data is decompressed at a time when skipping forward in a stream.
+_SKIP_READ_SIZE = 1024 * 1024
+# The least data decompressed at a time by streams that limit their output, as
+# smaller limits make small reads slower.
+_MIN_DECOMPRESS_SIZE = 65536
+
+
 def _translate_gzip_exception(e: Exception) -> Optional[ArchiveError]:
-    if isinstance(e, gzip.BadGzipFile):
+    if isinstance(e, (gzip.BadGzipFile, zlib.error)):
         return ArchiveCorruptedError(f"Error reading GZIP archive: {repr(e)}")
     if isinstance(e, EOFError):
         return ArchiveEOFError(f"GZIP file is truncated: {repr(e)}")
     return None  # pragma: no cover -- all possible exceptions should have been handled
 
 
-def open_gzip_stream(path: str | BinaryIO) -> BinaryIO:
-    if isinstance(path, (str, bytes, os.PathLike)):
-        gz = gzip.open(path, mode="rb")
-        underlying_seekable = True
-    else:
-        assert not path.closed
-        gz = gzip.GzipFile(fileobj=ensure_bufferedio(path), mode="rb")
-        assert not path.closed
-        underlying_seekable = is_seekable(path)
-
-    if not underlying_seekable:
-        # GzipFile always returns True for seekable, even if the underlying stream
-        # is not seekable.
-        gz.seekable = lambda: False
-
-        def _unsupported_seek(offset, whence=io.SEEK_SET):
-            raise io.UnsupportedOperation("seek")
-
-        gz.seek = _unsupported_seek
-
-    return ensure_binaryio(gz)
+def open_gzip_stream(
+    path: str | BinaryIO, checkpoint_interval: int = DEFAULT_CHECKPOINT_INTERVAL
+) -> BinaryIO:
+    # gzip.GzipFile decompresses again from the start of the file when seeking
+    # backwards, so decompress with zlib directly, keeping checkpoints.
+    return GzipDecompressorStream(path, checkpoint_interval=checkpoint_interval)
 
 
 def _translate_rapidgzip_exception(e: Exception) -> Optional[ArchiveError]:
@@ -400,8 +414,10 @@ def open_lzip_stream(path: str | BinaryIO) -> BinaryIO:
     return LzipDecompressorStream(path)
 
 
-def open_zlib_stream(path: str | BinaryIO) -> BinaryIO:
-    return ZlibDecompressorStream(path)
+def open_zlib_stream(
+    path: str | BinaryIO, checkpoint_interval: int = DEFAULT_CHECKPOINT_INTERVAL
+) -> BinaryIO:
+    return ZlibDecompressorStream(path, checkpoint_interval=checkpoint_interval)
 
 
 def _translate_zlib_exception(e: Exception) -> Optional[ArchiveError]:
@@ -421,9 +437,19 @@ class DecompressorStream(io.RawIOBase, BinaryIO, Generic[DecompressorT]):
     """
     A base class for decompressor streams that follow the `_compression.DecompressReader` model.
     It supports seeking by re-reading the stream from the beginning.
+
+    Subclasses that can limit the output of their decompressor (see
+    `_decompress_bounded`) decompress only about as much data as each read asks for,
+    so that highly compressible data doesn't fill memory with a single input chunk.
+
+    Subclasses that can snapshot their decompressor state (see `_save_state`) also
+    support checkpoints: while decompressing, a snapshot is kept every
+    `checkpoint_interval` uncompressed bytes, and seeks resume decompression from the
+    nearest checkpoint before the target instead of from the beginning. The interval
+    grows on long streams to keep at most `_MAX_CHECKPOINTS` snapshots.
     """
 
-    def __init__(self, path: str | BinaryIO) -> None:
+    def __init__(self, path: str | BinaryIO, checkpoint_interval: int = 0) -> None:
         super().__init__()
         if isinstance(path, (str, bytes, os.PathLike)):
             self._inner = open(path, "rb")
@@ -432,10 +458,20 @@ class DecompressorStream(io.RawIOBase, BinaryIO, Generic[DecompressorT]):
             self._inner = ensure_bufferedio(path)
             self._should_close = False
         self._decompressor: DecompressorT = self._create_decompressor()
-        self._buffer = bytearray()
+        # Input that the decompressor didn't consume yet, when its output was limited.
+        self._pending_input: bytes = b""
+        # Decompressed data that hasn't been returned yet: _buffer[_buffer_pos:]. The
+        # decompressor output is kept as is, so that it can be returned or copied
+        # into the caller's buffer without intermediate copies.
+        self._buffer = b""
+        self._buffer_pos = 0
         self._eof = False
         self._pos = 0
         self._size: int | None = None
+        self._checkpoint_interval = checkpoint_interval if self.seekable() else 0
+        # (uncompressed position, compressed position, decompressor state), sorted by
+        # position. The start of the stream is an implicit checkpoint.
+        self._checkpoints: list[tuple[int, int, object]] = []
 
     @abc.abstractmethod
     def _create_decompressor(self) -> DecompressorT: ...
@@ -443,12 +479,42 @@ class DecompressorStream(io.RawIOBase, BinaryIO, Generic[DecompressorT]):
     @abc.abstractmethod
     def _decompress_chunk(self, chunk: bytes) -> bytes: ...
 
+    def _decompress_bounded(self, chunk: bytes, max_length: int) -> tuple[bytes, bytes]:
+        """Decompress `chunk`, returning about `max_length` bytes at most.
+
+        Returns the decompressed data and the part of `chunk` that wasn't consumed,
+        which is passed again in the next call. A negative `max_length` means no
+        limit. The default implementation doesn't limit the output.
+        """
+        return self._decompress_chunk(chunk), b""
+
+    def _needs_input(self) -> bool:
+        """Whether the decompressor can accept more input.
+
+        Decompressors that keep the output they couldn't return internally return
+        False until it has been returned; `_decompress_bounded` is then called with
+        an empty chunk.
+        """
+        return True
+
     @abc.abstractmethod
     def _flush_decompressor(self) -> bytes: ...
 
     @abc.abstractmethod
     def _is_decompressor_finished(self) -> bool: ...
 
+    def _save_state(self) -> object | None:
+        """Return a snapshot of the decompressor state, or None if not supported.
+
+        This is called between input chunks, when all the input read so far has been
+        fed to the decompressor. The snapshot may be restored any number of times.
+        """
+        return None
+
+    def _restore_state(self, state: object) -> None:
+        """Restore a snapshot returned by `_save_state`."""
+        raise NotImplementedError  # pragma: no cover
+
     def readable(self) -> bool:
         return True
 
@@ -461,12 +527,68 @@ class DecompressorStream(io.RawIOBase, BinaryIO, Generic[DecompressorT]):
     def _rewind(self) -> None:
         self._inner.seek(0)
         self._decompressor = self._create_decompressor()
-        self._buffer.clear()
+        self._pending_input = b""
+        self._set_buffer(b"")
         self._eof = False
         self._pos = 0
         self._size = None
 
-    def _read_decompressed_chunk(self) -> bytes:
+    def _add_checkpoint(self) -> None:
+        if len(self._checkpoints) >= _MAX_CHECKPOINTS:
+            self._checkpoints = self._checkpoints[1::2]
+            self._checkpoint_interval *= 2
+        pos = self._pos + self._buffered_size()
+        last = self._checkpoints[-1][0] if self._checkpoints else 0
+        if pos - last < self._checkpoint_interval:
+            return
+        state = self._save_state()
+        if state is not None:
+            self._checkpoints.append((pos, self._inner.tell(), state))
+
+    def _restore_checkpoint(self, index: int) -> None:
+        pos, inner_pos, state = self._checkpoints[index]
+        self._inner.seek(inner_pos)
+        self._restore_state(state)
+        self._pending_input = b""
+        self._set_buffer(b"")
+        self._eof = False
+        self._pos = pos
+
+    def _set_buffer(self, data: bytes) -> None:
+        self._buffer = data
+        self._buffer_pos = 0
+
+    def _buffered_size(self) -> int:
+        return len(self._buffer) - self._buffer_pos
+
+    def _take_buffered(self, n: int) -> bytes:
+        """Return up to `n` buffered bytes, without copying if they're all of them."""
+        start = self._buffer_pos
+        end = min(start + n, len(self._buffer))
+        if start == 0 and end == len(self._buffer):
+            data = self._buffer
+            self._set_buffer(b"")
+        else:
+            data = self._buffer[start:end]
+            self._buffer_pos = end
+        self._pos += len(data)
+        return data
+
+    def _read_decompressed_chunk(self, max_length: int = -1) -> bytes:
+        """Decompress the pending input, or the next input chunk if there is none.
+
+        Returns about `max(max_length, _MIN_DECOMPRESS_SIZE)` bytes at most, if
+        `max_length` is not negative and the subclass supports it.
+        """
+        if max_length >= 0:
+            max_length = max(max_length, _MIN_DECOMPRESS_SIZE)
+        chunk = self._pending_input
+        if chunk or not self._needs_input():
+            data, self._pending_input = self._decompress_bounded(chunk, max_length)
+            return data
+
+        if self._checkpoint_interval:
+            self._add_checkpoint()
         chunk = self._inner.read(65536)
         if not chunk:
             self._eof = True
@@ -474,48 +596,54 @@ class DecompressorStream(io.RawIOBase, BinaryIO, Generic[DecompressorT]):
             logger.info("EOF reached, leftover: %d", len(leftover))
             if not self._is_decompressor_finished():
                 raise ArchiveEOFError("File is truncated")
-            self._size = self._pos + len(self._buffer) + len(leftover)
+            self._size = self._pos + self._buffered_size() + len(leftover)
             logger.info("EOF reached, size: %d", self._size)
             return leftover
-        return self._decompress_chunk(chunk)
+        data, self._pending_input = self._decompress_bounded(chunk, max_length)
+        return data
+
+    def _fill_buffer(self, max_length: int = -1) -> None:
+        """Decompress more data if the buffer is empty and EOF was not reached."""
+        while self._buffered_size() == 0 and not self._eof:
+            self._set_buffer(self._read_decompressed_chunk(max_length))
 
     def _seek_to_pos(self, pos: int) -> None:
         if pos == self._pos:
             return
 
-        if pos < self._pos:
+        # The last checkpoint at or before the target position, if any.
+        index = bisect.bisect_right(self._checkpoints, pos, key=lambda c: c[0]) - 1
+        if index >= 0 and (
+            pos < self._pos
+            or self._checkpoints[index][0] > self._pos + self._buffered_size()
+        ):
+            self._restore_checkpoint(index)
+        elif pos < self._pos:
             self._rewind()
             assert self._pos == 0
 
-        if self._pos + len(self._buffer) >= pos:
-            del self._buffer[: pos - self._pos]
-            self._pos = pos
-            return
-
-        self._pos += len(self._buffer)
-        self._buffer.clear()
-
-        while not self._eof:
-            decompressed = self._read_decompressed_chunk()
-            if self._pos + len(decompressed) >= pos:
-                self._buffer.extend(decompressed[pos - self._pos :])
+        while pos > self._pos:
+            self._fill_buffer(min(pos - self._pos, _SKIP_READ_SIZE))
+            if self._buffered_size() == 0:
+                # The position is past EOF
                 self._pos = pos
                 return
-            self._pos += len(decompressed)
-
-        # The position is past EOF
-        self._pos = pos
+            skip = min(pos - self._pos, self._buffered_size())
+            self._buffer_pos += skip
+            self._pos += skip
 
     def readall(self) -> bytes:
+        chunks = [self._take_buffered(self._buffered_size())]
         while not self._eof:
-            self._buffer.extend(self._read_decompressed_chunk())
+            chunk = self._read_decompressed_chunk()
+            self._pos += len(chunk)
+            chunks.append(chunk)
 
-        data = bytes(self._buffer)
-        self._pos += len(data)
+        # Avoid a copy in the common case of a single chunk.
+        data = chunks[0] if len(chunks) == 1 else b"".join(chunks)
         if self._size is not None:
             assert self._size == self._pos
         self._size = self._pos
-        self._buffer.clear()
         return data
 
     def read(self, n: int = -1) -> bytes:
@@ -524,19 +652,33 @@ class DecompressorStream(io.RawIOBase, BinaryIO, Generic[DecompressorT]):
         if n is None or n < 0:
             return self.readall()
 
-        if len(self._buffer) < n and not self._eof:
-            # Read only one more block
-            self._buffer.extend(self._read_decompressed_chunk())
-
-        data = bytes(self._buffer[:n])
-        del self._buffer[:n]
-        self._pos += len(data)
-        return data
+        # Decompress until n bytes are available or EOF is reached, joining the
+        # pieces only if there is more than one.
+        chunks = []
+        size = 0
+        while size < n:
+            self._fill_buffer(n - size)
+            if self._buffered_size() == 0:
+                break
+            chunk = self._take_buffered(n - size)
+            chunks.append(chunk)
+            size += len(chunk)
+
+        if len(chunks) == 1:
+            return chunks[0]
+        return b"".join(chunks)
 
     def readinto(self, b: bytearray | memoryview) -> int:
-        data = self.read(len(b))
-        b[: len(data)] = data
-        return len(data)
+        view = memoryview(b).cast("B")
+        if len(view) == 0:
+            return 0
+        self._fill_buffer(len(view))
+        n = min(len(view), self._buffered_size())
+        # A single copy, from the decompressor output to the caller's buffer.
+        view[:n] = memoryview(self._buffer)[self._buffer_pos : self._buffer_pos + n]
+        self._buffer_pos += n
+        self._pos += n
+        return n
 
     def close(self) -> None:
         if self._should_close:
@@ -568,6 +710,18 @@ class DecompressorStream(io.RawIOBase, BinaryIO, Generic[DecompressorT]):
         return self._pos
 
 
+# lzip_extension.Decoder can't limit its output, so the input is fed to it in pieces
+# sized to produce about max(read size, _LZIP_TARGET_OUTPUT_SIZE) bytes at the last
+# compression ratio, starting with _LZIP_INITIAL_RATIO. Each call to the decoder has
+# a high fixed cost (about 1 ms), so the pieces can't be too small. LZMA can reach
+# ratios of about 7000:1, so a piece of highly compressible data can still expand to
+# about 7 MB, instead of 450 MB for a whole input chunk.
+_LZIP_TARGET_OUTPUT_SIZE = 1024 * 1024
+_LZIP_INITIAL_RATIO = 1024
+_LZIP_MIN_INPUT_SIZE = 1024
+_LZIP_MAX_INPUT_SIZE = 65536
+
+
 class LzipDecompressorStream(DecompressorStream["lzip_extension.Decoder"]):
     def __init__(self, path: str | BinaryIO) -> None:
         super().__init__(path)
@@ -575,11 +729,24 @@ class LzipDecompressorStream(DecompressorStream["lzip_extension.Decoder"]):
 
     def _create_decompressor(self) -> "lzip_extension.Decoder":
         self._finished = False
+        # Compression ratio of the last input fed to the decoder, rounded up.
+        self._ratio = _LZIP_INITIAL_RATIO
         return lzip_extension.Decoder(1)
 
     def _decompress_chunk(self, chunk: bytes) -> bytes:
         return self._decompressor.decompress(chunk)
 
+    def _decompress_bounded(self, chunk: bytes, max_length: int) -> tuple[bytes, bytes]:
+        if max_length < 0:
+            return self._decompress_chunk(chunk), b""
+        size = max(max_length, _LZIP_TARGET_OUTPUT_SIZE) // self._ratio
+        size = min(max(size, _LZIP_MIN_INPUT_SIZE), _LZIP_MAX_INPUT_SIZE)
+        piece = memoryview(chunk)[:size]
+        data = self._decompressor.decompress(piece)
+        if data:
+            self._ratio = -(-len(data) // len(piece))
+        return data, chunk[size:]
+
     def _flush_decompressor(self) -> bytes:
         decoded, remaining = self._decompressor.finish()
         self._finished = True
@@ -592,12 +759,104 @@ class LzipDecompressorStream(DecompressorStream["lzip_extension.Decoder"]):
         return self._finished
 
 
-class ZlibDecompressorStream(DecompressorStream):
+if TYPE_CHECKING:
+    # zlib's decompressor class is only declared in the type stubs, so it can't be
+    # used as a type argument at runtime.
+    _ZlibDecompressorStreamBase: TypeAlias = "DecompressorStream[zlib._Decompress]"
+else:
+    _ZlibDecompressorStreamBase = DecompressorStream[Any]
+
+
+class ZlibDecompressorStream(_ZlibDecompressorStreamBase):
+    """Decompress a zlib stream, or a raw deflate stream if `wbits` is negative.
+
+    If `expected_crc` is given, the CRC-32 of the decompressed data is checked against
+    it at the end of the stream, as raw deflate streams don't include a checksum.
+    """
+
+    def __init__(
+        self,
+        path: str | BinaryIO,
+        wbits: int = zlib.MAX_WBITS,
+        expected_crc: int | None = None,
+        checkpoint_interval: int = DEFAULT_CHECKPOINT_INTERVAL,
+    ) -> None:
+        self._wbits = wbits
+        self._expected_crc = expected_crc
+        self._crc = 0
+        super().__init__(path, checkpoint_interval)
+
     def _create_decompressor(self) -> "zlib._Decompress":
-        return zlib.decompressobj()
+        self._crc = 0
+        return zlib.decompressobj(self._wbits)
 
     def _decompress_chunk(self, chunk: bytes) -> bytes:
-        return self._decompressor.decompress(chunk)
+        return self._decompress_bounded(chunk, -1)[0]
+
+    def _decompress_bounded(self, chunk: bytes, max_length: int) -> tuple[bytes, bytes]:
+        # A max_length of 0 means no limit for zlib.
+        data = self._decompressor.decompress(chunk, max(max_length, 0))
+        if self._expected_crc is not None:
+            self._crc = zlib.crc32(data, self._crc)
+        return data, self._decompressor.unconsumed_tail
+
+    def _flush_decompressor(self) -> bytes:
+        data = self._decompressor.flush()
+        if self._expected_crc is not None:
+            self._crc = zlib.crc32(data, self._crc)
+            if self._decompressor.eof and self._crc != self._expected_crc:
+                raise ArchiveCorruptedError("CRC-32 check failed")
+        return data
+
+    def _is_decompressor_finished(self) -> bool:
+        return self._decompressor.eof
+
+    def _save_state(self) -> object | None:
+        return (self._decompressor.copy(), self._crc)
+
+    def _restore_state(self, state: object) -> None:
+        decompressor, self._crc = cast("tuple[zlib._Decompress, int]", state)
+        self._decompressor = decompressor.copy()
+
+
+class GzipDecompressorStream(_ZlibDecompressorStreamBase):
+    """Decompress a gzip stream, which may contain several members, with `zlib`."""
+
+    def __init__(
+        self,
+        path: str | BinaryIO,
+        checkpoint_interval: int = DEFAULT_CHECKPOINT_INTERVAL,
+    ) -> None:
+        super().__init__(path, checkpoint_interval)
+
+    def _create_decompressor(self) -> "zlib._Decompress":
+        # zlib parses the gzip header and checks the CRC-32 and size in the trailer.
+        return zlib.decompressobj(16 + zlib.MAX_WBITS)
+
+    def _decompress_chunk(self, chunk: bytes) -> bytes:
+        return self._decompress_bounded(chunk, -1)[0]
+
+    def _decompress_bounded(self, chunk: bytes, max_length: int) -> tuple[bytes, bytes]:
+        output = []
+        while True:
+            if self._decompressor.eof:
+                # Another member follows, possibly after some zero padding.
+                chunk = chunk.lstrip(b"\x00")
+                if not chunk:
+                    break
+                self._decompressor = self._create_decompressor()
+            # A max_length of 0 means no limit for zlib.
+            data = self._decompressor.decompress(chunk, max(max_length, 0))
+            output.append(data)
+            if not self._decompressor.eof:
+                chunk = self._decompressor.unconsumed_tail
+                break
+            chunk = self._decompressor.unused_data
+            if max_length >= 0:
+                max_length -= len(data)
+                if max_length <= 0:
+                    break
+        return output[0] if len(output) == 1 else b"".join(output), chunk
 
     def _flush_decompressor(self) -> bytes:
         return self._decompressor.flush()
@@ -605,16 +864,46 @@ class ZlibDecompressorStream(DecompressorStream):
     def _is_decompressor_finished(self) -> bool:
         return self._decompressor.eof
 
+    def _save_state(self) -> object | None:
+        return self._decompressor.copy()
+
+    def _restore_state(self, state: object) -> None:
+        self._decompressor = cast("zlib._Decompress", state).copy()
+
 
 class BrotliDecompressorStream(DecompressorStream):
     """Wrap a file-like object and decompress it using ``brotli``."""
 
     def _create_decompressor(self) -> "brotli.Decompressor":
+        # Whether the last output reached its limit, so there may be more of it.
+        self._output_full = False
         return brotli.Decompressor()
 
     def _decompress_chunk(self, chunk: bytes) -> bytes:
         return self._decompressor.process(chunk)
 
+    def _decompress_bounded(self, chunk: bytes, max_length: int) -> tuple[bytes, bytes]:
+        # Limiting the output needs brotli 1.2.0 or later.
+        if not hasattr(self._decompressor, "can_accept_more_data"):
+            return self._decompressor.process(chunk), b""
+        if not self._needs_input():
+            # Return the output kept from the previous input before feeding more.
+            return self._process(b"", max_length), chunk
+        return self._process(chunk, max_length), b""
+
+    def _process(self, chunk: bytes, max_length: int) -> bytes:
+        if max_length < 0:
+            self._output_full = False
+            return self._decompressor.process(chunk)
+        data = self._decompressor.process(chunk, output_buffer_limit=max_length)
+        self._output_full = len(data) >= max_length
+        return data
+
+    def _needs_input(self) -> bool:
+        if not hasattr(self._decompressor, "can_accept_more_data"):
+            return True
+        return self._decompressor.can_accept_more_data() and not self._output_full
+
     def _flush_decompressor(self) -> bytes:
         # brotli's decompressor doesn't have a flush method.
         # The remaining data is processed when `process` is called with an empty chunk,
@@ -652,7 +941,15 @@ if uncompresspy is not None:
     class UncompresspyStream(uncompresspy.LZWFile):
         def __init__(self, path: str | BinaryIO) -> None:
             super().__init__(path)
-            self._total_size = None
+            self._total_size: int | None = None
+
+        def read(self, size: int = -1) -> bytes:
+            data = super().read(size)
+            # uncompresspy only returns fewer bytes than requested at EOF.
+            at_eof = size is None or not 0 <= size <= len(data)
+            if at_eof and self._total_size is None:
+                self._total_size = self.tell()
+            return data
 
         def _find_total_size(self) -> int:
             if self._total_size is not None:
@@ -675,7 +972,7 @@ if uncompresspy is not None:
 
             assert current_pos == self.tell()
             self._total_size = current_pos
-            return self._total_size
+            return current_pos
 
         def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
             # Override the seek method to allow seeking from the end.
@@ -696,6 +993,292 @@ def open_uncompresspy_stream(path: str | BinaryIO) -> BinaryIO:
     return ensure_binaryio(UncompresspyStream(path))
 
 
+@dataclass(frozen=True)
+class _SeekIndexFormat:
+    """How to export and import the seek index of the streams of a library."""
+
+    # Name of the index kind, used in the index file name.
+    kind: str
+    # Return the index of a stream, or None if it's not complete yet.
+    export_index: Callable[[Any], Any]
+    import_index: Callable[[Any, Any], None]
+    # Whether the index is stored as bytes instead of JSON-serializable data.
+    binary: bool = False
+
+
+def _export_rapidgzip_index(stream: "rapidgzip.RapidgzipFile") -> bytes | None:
+    if not stream.block_offsets_complete():
+        return None
+    buffer = io.BytesIO()
+    stream.export_index(buffer)
+    return buffer.getvalue()
+
+
+def _import_rapidgzip_index(stream: "rapidgzip.RapidgzipFile", data: bytes) -> None:
+    stream.import_index(io.BytesIO(data))
+
+
+def _export_indexed_bzip2_index(
+    stream: "indexed_bzip2.IndexedBzip2File",
+) -> list[list[int]] | None:
+    if not stream.block_offsets_complete():
+        return None
+    # Maps the bit offsets of the blocks in the compressed stream to their offsets
+    # in the decompressed data.
+    return [[bits, offset] for bits, offset in sorted(stream.block_offsets().items())]
+
+
+def _import_indexed_bzip2_index(
+    stream: "indexed_bzip2.IndexedBzip2File", data: list[list[int]]
+) -> None:
+    stream.set_block_offsets({int(bits): int(offset) for bits, offset in data})
+
+
+def _export_uncompresspy_index(stream: Any) -> dict[str, Any] | None:
+    if stream._total_size is None:
+        return None
+    return {
+        "size": stream._total_size,
+        "compressed": stream._checkpoints_compressed,
+        "uncompressed": stream._checkpoints_uncompressed,
+    }
+
+
+def _import_uncompresspy_index(stream: Any, data: dict[str, Any]) -> None:
+    if len(data["compressed"]) != len(data["uncompressed"]):
+        raise ValueError("Mismatched checkpoint lists")
+    stream._checkpoints_compressed = [int(pos) for pos in data["compressed"]]
+    stream._checkpoints_uncompressed = [int(pos) for pos in data["uncompressed"]]
+    stream._total_size = int(data["size"])
+
+
+_RAPIDGZIP_SEEK_INDEX = _SeekIndexFormat(
+    "rapidgzip", _export_rapidgzip_index, _import_rapidgzip_index, binary=True
+)
+_INDEXED_BZIP2_SEEK_INDEX = _SeekIndexFormat(
+    "indexed_bzip2", _export_indexed_bzip2_index, _import_indexed_bzip2_index
+)
+_UNCOMPRESSPY_SEEK_INDEX = _SeekIndexFormat(
+    "uncompresspy", _export_uncompresspy_index, _import_uncompresspy_index
+)
+
+
+class SeekIndexStream(io.RawIOBase, BinaryIO):
+    """
+    Wraps a stream whose seek index was imported from, or will be stored in, a seek
+    index directory (see `ArchiveyConfig.seek_index_dir`).
+
+    If no index was imported when the stream was opened, the index is stored when the
+    stream is closed, provided that the library completed it while reading (usually
+    after a first pass over the whole file).
+    """
+
+    def __init__(
+        self,
+        inner: BinaryIO,
+        index_format: _SeekIndexFormat,
+        index_dir: str,
+        archive_path: str,
+        fingerprint: ArchiveFingerprint,
+        index_imported: bool,
+    ) -> None:
+        super().__init__()
+        self._inner = inner
+        self._index_format = index_format
+        self._index_dir = index_dir
+        self._archive_path = archive_path
+        self._fingerprint = fingerprint
+        self._index_stored = index_imported
+
+    def readable(self) -> bool:
+        return True
+
+    def writable(self) -> bool:
+        return False
+
+    def seekable(self) -> bool:
+        return self._inner.seekable()
+
+    def read(self, n: int = -1) -> bytes:
+        return self._inner.read(n)
+
+    def readinto(self, b: bytearray | memoryview) -> int:  # type: ignore[override]
+        return readinto_from(self._inner, b)
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        return self._inner.seek(offset, whence)
+
+    def tell(self) -> int:
+        return self._inner.tell()
+
+    def _store_index(self) -> None:
+        index_format = self._index_format
+        try:
+            data = index_format.export_index(self._inner)
+            if data is None:
+                return
+            save = save_binary_index if index_format.binary else save_index
+            save(
+                self._index_dir,
+                self._archive_path,
+                index_format.kind,
+                self._fingerprint,
+                data,
+            )
+            self._index_stored = True
+        except Exception as e:  # noqa: BLE001
+            logger.warning(
+                "Could not save seek index for %s: %r", self._archive_path, e
+            )
+
+    def close(self) -> None:
+        if self.closed:
+            return
+        if not self._index_stored:
+            self._store_index()
+        self._inner.close()
+        super().close()
+
+
+class KnownSizeStream(io.RawIOBase, BinaryIO):
+    """
+    Wraps a seekable decompressed stream whose size is known from the file metadata.
+
+    Seeks from the end are answered from the size, and seeks only record the new
+    position; the inner stream is moved on the next read. Finding the size with
+    `seek(0, io.SEEK_END)` and going back then doesn't decompress anything.
+
+    `size` can also be a function that finds it, called on the first seek from the
+    end. If it returns None, that seek goes through the inner stream.
+    """
+
+    def __init__(self, inner: BinaryIO, size: int | Callable[[], int | None]) -> None:
+        super().__init__()
+        self._inner = inner
+        self._size: int | None = None
+        self._find_size: Callable[[], int | None] | None = None
+        if isinstance(size, int):
+            self._size = size
+        else:
+            self._find_size = size
+        self._pos = inner.tell()
+        # Position of the inner stream, which lags behind _pos after a seek.
+        self._inner_pos = self._pos
+
+    def readable(self) -> bool:
+        return True
+
+    def writable(self) -> bool:
+        return False
+
+    def seekable(self) -> bool:
+        return True
+
+    def _move_inner(self) -> None:
+        if self._inner_pos != self._pos:
+            self._inner.seek(self._pos)
+            self._inner_pos = self._pos
+
+    def read(self, n: int = -1) -> bytes:
+        self._move_inner()
+        data = self._inner.read(n)
+        self._pos += len(data)
+        self._inner_pos = self._pos
+        return data
+
+    def readinto(self, b: bytearray | memoryview) -> int:  # type: ignore[override]
+        self._move_inner()
+        n = readinto_from(self._inner, b)
+        self._pos += n
+        self._inner_pos = self._pos
+        return n
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_SET:
+            new_pos = offset
+        elif whence == io.SEEK_CUR:
+            new_pos = self._pos + offset
+        elif whence == io.SEEK_END:
+            if self._find_size is not None:
+                self._size = self._find_size()
+                self._find_size = None
+            if self._size is None:
+                self._pos = self._inner_pos = self._inner.seek(offset, io.SEEK_END)
+                return self._pos
+            new_pos = self._size + offset
+        else:
+            raise ValueError(f"Invalid whence: {whence}")
+
+        if new_pos < 0:
+            raise ValueError(f"Invalid offset: {offset}")
+        self._pos = new_pos
+        return new_pos
+
+    def tell(self) -> int:
+        return self._pos
+
+    def close(self) -> None:
+        self._inner.close()
+        super().close()
+
+
+def _open_with_seek_index(
+    open_fn: Callable[[str | BinaryIO], BinaryIO],
+    index_format: _SeekIndexFormat,
+    index_dir: str,
+    path: str | BinaryIO,
+) -> BinaryIO:
+    stream = open_fn(path)
+    if not isinstance(path, str):
+        return stream
+    fingerprint = ArchiveFingerprint.from_path(path)
+    if fingerprint is None:
+        return stream
+
+    load = load_binary_index if index_format.binary else load_index
+    data = load(index_dir, path, index_format.kind, fingerprint)
+    if data is not None:
+        try:
+            index_format.import_index(stream, data)
+            logger.debug("Imported seek index for %s", path)
+        except Exception as e:  # noqa: BLE001
+            # The stream may be in an inconsistent state, so start over without it.
+            logger.warning("Ignoring invalid seek index for %s: %r", path, e)
+            stream.close()
+            stream = open_fn(path)
+            data = None
+
+    return SeekIndexStream(
+        stream, index_format, index_dir, path, fingerprint, data is not None
+    )
+
+
+def _with_seek_index(
+    open_fn: Callable[[str | BinaryIO], BinaryIO],
+    index_format: _SeekIndexFormat,
+    config: ArchiveyConfig,
+) -> Callable[[str | BinaryIO], BinaryIO]:
+    if config.seek_index_dir is None:
+        return open_fn
+    return functools.partial(
+        _open_with_seek_index, open_fn, index_format, config.seek_index_dir
+    )
+
+
+def with_read_ahead(
+    open_fn: Callable[[str | BinaryIO], BinaryIO], config: ArchiveyConfig
+) -> Callable[[str | BinaryIO], BinaryIO]:
+    """Make `open_fn` read and decompress on a background thread, for streaming reads.
+
+    The returned streams are not seekable. Returns `open_fn` as is if
+    `config.streaming_read_ahead_bytes` is not set.
+    """
+    if config.streaming_read_ahead_bytes <= 0:
+        return open_fn
+    max_buffered = config.streaming_read_ahead_bytes
+    return lambda path: ReadAheadStream(open_fn(path), max_buffered)
+
+
 def get_stream_open_fn(
     format: StreamFormat, config: ArchiveyConfig | None = None
 ) -> tuple[Callable[[str | BinaryIO], BinaryIO], ExceptionTranslatorFn]:
@@ -703,38 +1286,125 @@ def get_stream_open_fn(
         config = get_archivey_config()
     if format == StreamFormat.GZIP:
         if config.use_rapidgzip:
-            return open_rapidgzip_stream, _translate_rapidgzip_exception
-        return open_gzip_stream, _translate_gzip_exception
+            return (
+                _with_seek_index(open_rapidgzip_stream, _RAPIDGZIP_SEEK_INDEX, config),
+                _translate_rapidgzip_exception,
+            )
+        if config.decompression_threads > 0:
+            # Imported here, as the parallel streams are built on DecompressorStream.
+            from archivey.formats.parallel_streams import open_parallel_gzip_stream
+
+            return (
+                functools.partial(
+                    open_parallel_gzip_stream, threads=config.decompression_threads
+                ),
+                _translate_gzip_exception,
+            )
+        return (
+            functools.partial(
+                open_gzip_stream,
+                checkpoint_interval=config.decompression_checkpoint_interval,
+            ),
+            _translate_gzip_exception,
+        )
 
     if format == StreamFormat.BZIP2:
         if config.use_indexed_bzip2:
-            return open_indexed_bzip2_stream, _translate_indexed_bzip2_exception
+            return (
+                _with_seek_index(
+                    open_indexed_bzip2_stream, _INDEXED_BZIP2_SEEK_INDEX, config
+                ),
+                _translate_indexed_bzip2_exception,
+            )
+        if config.decompression_threads > 0:
+            from archivey.formats.parallel_streams import open_parallel_bzip2_stream
+
+            return (
+                functools.partial(
+                    open_parallel_bzip2_stream, threads=config.decompression_threads
+                ),
+                _translate_bz2_exception,
+            )
         return open_bzip2_stream, _translate_bz2_exception
 
     if format == StreamFormat.XZ:
         if config.use_python_xz:
             return open_python_xz_stream, _translate_python_xz_exception
+        if config.decompression_threads > 0:
+            from archivey.formats.parallel_streams import open_parallel_xz_stream
+
+            return (
+                functools.partial(
+                    open_parallel_xz_stream, threads=config.decompression_threads
+                ),
+                _translate_lzma_exception,
+            )
         return open_lzma_stream, _translate_lzma_exception
 
     if format == StreamFormat.LZ4:
+        if config.decompression_threads > 0:
+            from archivey.formats.parallel_streams import open_parallel_lz4_stream
+
+            return (
+                functools.partial(
+                    open_parallel_lz4_stream, threads=config.decompression_threads
+                ),
+                _translate_lz4_exception,
+            )
         return open_lz4_stream, _translate_lz4_exception
 
     if format == StreamFormat.LZIP:
+        if config.decompression_threads > 0:
+            from archivey.formats.parallel_streams import open_parallel_lzip_stream
+
+            return (
+                functools.partial(
+                    open_parallel_lzip_stream, threads=config.decompression_threads
+                ),
+                _translate_lzip_exception,
+            )
         return open_lzip_stream, _translate_lzip_exception
 
     if format == StreamFormat.ZLIB:
-        return open_zlib_stream, _translate_zlib_exception
+        return (
+            functools.partial(
+                open_zlib_stream,
+                checkpoint_interval=config.decompression_checkpoint_interval,
+            ),
+            _translate_zlib_exception,
+        )
 
     if format == StreamFormat.BROTLI:
         return open_brotli_stream, _translate_brotli_exception
 
     if format == StreamFormat.ZSTD:
+        translator = (
+            _translate_zstandard_exception
+            if config.use_zstandard
+            else _translate_pyzstd_exception
+        )
+        if config.decompression_threads > 0:
+            from archivey.formats.parallel_streams import open_parallel_zstd_stream
+
+            return (
+                functools.partial(
+                    open_parallel_zstd_stream,
+                    threads=config.decompression_threads,
+                    use_zstandard=config.use_zstandard,
+                ),
+                translator,
+            )
         if config.use_zstandard:
             return open_zstandard_stream, _translate_zstandard_exception
         return open_pyzstd_stream, _translate_pyzstd_exception
 
     if format == StreamFormat.UNIX_COMPRESS:
-        return open_uncompresspy_stream, _translate_uncompresspy_exception
+        return (
+            _with_seek_index(
+                open_uncompresspy_stream, _UNCOMPRESSPY_SEEK_INDEX, config
+            ),
+            _translate_uncompresspy_exception,
+        )
 
     raise ValueError(f"Unsupported archive format: {format}")  # pragma: no cover
 
@@ -743,11 +1413,14 @@ def open_stream(
     format: StreamFormat,
     path_or_stream: str | BinaryIO,
     config: ArchiveyConfig,
+    streaming_only: bool = False,
 ) -> BinaryIO:
     logger.debug(
         f"open_stream: format={format} path_or_stream={path_or_stream} config={config}"
     )
     open_fn, exception_translator = get_stream_open_fn(format, config)
+    if streaming_only:
+        open_fn = with_read_ahead(open_fn, config)
     return ArchiveStream(
         open_fn=lambda: open_fn(path_or_stream),
         exception_translator=exception_translator,
@@ -1,9 +1,11 @@
+import contextlib
 import logging
+import mmap
 import os
 import stat
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import BinaryIO, Iterator, Optional
+from typing import BinaryIO, Callable, Iterator, Optional
 
 from archivey.exceptions import (
     ArchiveError,
@@ -154,12 +156,8 @@ class FolderReader(BaseArchiveReader):
             return ArchiveMemberNotFoundError(f"Member not found: {e}")
         return None
 
-    def _open_member(
-        self,
-        member: ArchiveMember,
-        pwd: str | bytes | None,
-        for_iteration: bool,
-    ) -> BinaryIO:
+    def _get_member_path(self, member: ArchiveMember) -> Path:
+        """Return the path of a file member, checking that it's inside the folder."""
         assert member.type == MemberType.FILE
 
         # Convert archive path (with '/') to OS-specific path
@@ -197,7 +195,15 @@ class FolderReader(BaseArchiveReader):
                 f"Error resolving path for member '{member.filename}': {e}"
             ) from e
 
-        return full_path.open("rb")
+        return full_path
+
+    def _open_member(
+        self,
+        member: ArchiveMember,
+        pwd: str | bytes | None,
+        for_iteration: bool,
+    ) -> BinaryIO:
+        return self._get_member_path(member).open("rb")
         # try:
         #     return ArchiveStream(
         #         open_fn=lambda: full_path.open("rb"),
@@ -210,6 +216,26 @@ class FolderReader(BaseArchiveReader):
         #         f"Cannot open member '{member.filename}': {e}"
         #     ) from e
 
+    def _get_member_view(
+        self, member: ArchiveMember, pwd: bytes | str | None
+    ) -> memoryview | None:
+        with self._get_member_path(member).open("rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            if size == 0:
+                return memoryview(b"")
+            # The map stays alive as long as the view does, and is independent of
+            # the file descriptor.
+            return memoryview(mmap.mmap(f.fileno(), size, access=mmap.ACCESS_READ))
+
+    def _supports_concurrent_reads(self) -> bool:
+        return True
+
+    def _create_worker_member_opener(
+        self, stack: contextlib.ExitStack
+    ) -> Callable[[ArchiveMember, bytes | str | None], BinaryIO] | None:
+        # Each member is opened as a separate file, so workers can share the reader.
+        return lambda member, pwd: self._open_member(member, pwd, for_iteration=False)
+
     def get_archive_info(self) -> ArchiveInfo:
         self.check_archive_open()
 
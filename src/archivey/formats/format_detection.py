@@ -103,7 +103,12 @@ def _is_brotli_stream(stream: IO[bytes]) -> bool:
     try:
         sample = stream.read(256)
         decompressor = brotli.Decompressor()
-        decompressor.process(sample)
+        if hasattr(decompressor, "can_accept_more_data"):
+            # The sample can expand to a lot of data; limiting the output needs
+            # brotli 1.2.0 or later, which stubs/brotli.pyi doesn't declare.
+            decompressor.process(sample, output_buffer_limit=65536)  # pyright: ignore[reportCallIssue]
+        else:
+            decompressor.process(sample)
         return True
     except brotli.error:
         return False
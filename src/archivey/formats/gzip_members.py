@@ -0,0 +1,46 @@
+"""Finding the members of gzip files without decompressing them.
+
+A .gz file is a sequence of members, each of which can be decompressed on its own.
+Members don't store their compressed size, so the only way to find where a member
+starts without decompressing the previous one is to look for the bytes that start a
+member header. These can also appear by chance inside the compressed data.
+"""
+
+from __future__ import annotations
+
+from typing import BinaryIO
+
+# The magic bytes and compression method (deflate) that start every gzip member.
+GZIP_MEMBER_MAGIC = b"\x1f\x8b\x08"
+
+
+def is_gzip_member_header(data: bytes | bytearray, index: int) -> bool:
+    """Check the fixed fields of the gzip header at `index`, after the magic."""
+    flags, extra_flags, os_id = data[index + 3], data[index + 8], data[index + 9]
+    return (
+        flags & 0xE0 == 0 and extra_flags in (0, 2, 4) and (os_id <= 13 or os_id == 255)
+    )
+
+
+def contains_gzip_member_header(f: BinaryIO, start: int, end: int) -> bool:
+    """Check whether a gzip member header may start between `start` and `end` in `f`.
+
+    The header bytes may appear by chance in the compressed data, so only a False
+    result is certain.
+    """
+    f.seek(start)
+    data = b""
+    pos = start
+    while pos < end:
+        chunk = f.read(min(1024 * 1024, end - pos))
+        if not chunk:
+            break
+        pos += len(chunk)
+        # Keep the end of the previous chunk, in case a header started there.
+        data = data[-9:] + chunk
+        index = data.find(GZIP_MEMBER_MAGIC)
+        while 0 <= index and index + 10 <= len(data):
+            if is_gzip_member_header(data, index):
+                return True
+            index = data.find(GZIP_MEMBER_MAGIC, index + 1)
+    return False
@@ -0,0 +1,141 @@
+"""Listing the frames of LZ4 files without decompressing them.
+
+A .lz4 file is a sequence of frames, each of which can be decompressed on its own.
+The frame header optionally stores the decompressed size of the frame, and is
+followed by blocks prefixed with their compressed size, so the frames can be found by
+walking the block headers.
+"""
+
+from __future__ import annotations
+
+import io
+import logging
+import struct
+from dataclasses import dataclass
+from typing import BinaryIO
+
+from archivey.internal.io_helpers import read_exact
+
+logger = logging.getLogger(__name__)
+
+LZ4_FRAME_MAGIC = 0x184D2204
+LZ4_SKIPPABLE_MAGIC = 0x184D2A50
+LZ4_SKIPPABLE_MAGIC_MASK = 0xFFFFFFF0
+
+_LZ4_BLOCK_MAX_SIZES = {4: 64 * 1024, 5: 256 * 1024, 6: 1024 * 1024, 7: 4 * 1024 * 1024}
+
+
+@dataclass
+class Lz4Frame:
+    """A frame of an LZ4 file."""
+
+    offset: int
+    "Position of the frame in the file."
+    size: int
+    "Size of the frame in the file."
+    uncompressed_size: int | None
+    "Size of the decompressed data of the frame, if stored in its header."
+    max_uncompressed_size: int
+    "Upper bound of the size of the decompressed data, from the number of blocks."
+
+
+def _read_frame(
+    f: BinaryIO, offset: int, end: int, max_blocks: int | None
+) -> tuple[Lz4Frame, int] | None:
+    """Read the frame at `offset`, walking its block headers to find its size.
+
+    Returns the frame and the number of headers read (the block headers and end mark,
+    or one for skippable frames), or None if it's not valid or needs more than
+    `max_blocks` of them.
+    """
+    f.seek(offset)
+    header = read_exact(f, 19)
+    if len(header) < 8:
+        return None
+    magic = struct.unpack_from("<I", header)[0]
+    if magic & LZ4_SKIPPABLE_MAGIC_MASK == LZ4_SKIPPABLE_MAGIC:
+        return Lz4Frame(offset, 8 + struct.unpack_from("<I", header, 4)[0], 0, 0), 1
+    if magic != LZ4_FRAME_MAGIC:
+        # Includes the legacy frame format, which has no end mark.
+        return None
+
+    flags, block_descriptor = header[4], header[5]
+    if flags >> 6 != 1 or flags & 0x02 or block_descriptor & 0x8F:
+        # Unknown version or reserved bits set
+        return None
+    block_max_size = _LZ4_BLOCK_MAX_SIZES.get(block_descriptor >> 4)
+    if block_max_size is None:
+        return None
+    has_block_checksum = flags & 0x10
+    has_content_size = flags & 0x08
+    has_content_checksum = flags & 0x04
+    has_dict_id = flags & 0x01
+
+    uncompressed_size = None
+    if has_content_size:
+        if len(header) < 14:
+            return None
+        uncompressed_size = struct.unpack_from("<Q", header, 6)[0]
+    # Magic, flags, block descriptor, content size, dictionary ID and header checksum
+    pos = offset + 7 + (8 if has_content_size else 0) + (4 if has_dict_id else 0)
+
+    blocks = 0
+    while True:
+        if max_blocks is not None and blocks >= max_blocks:
+            return None
+        f.seek(pos)
+        block_header = read_exact(f, 4)
+        if len(block_header) < 4:
+            return None
+        pos += 4
+        value = struct.unpack("<I", block_header)[0]
+        if value == 0:
+            # End mark
+            break
+        # The highest bit marks uncompressed blocks.
+        block_size = value & 0x7FFFFFFF
+        if block_size > block_max_size:
+            return None
+        pos += block_size + (4 if has_block_checksum else 0)
+        blocks += 1
+
+    if has_content_checksum:
+        pos += 4
+    if pos > end:
+        return None
+    frame = Lz4Frame(offset, pos - offset, uncompressed_size, blocks * block_max_size)
+    return frame, blocks + 1
+
+
+def read_lz4_frames(
+    f: BinaryIO, start: int = 0, max_blocks: int | None = None
+) -> list[Lz4Frame] | None:
+    """Find the frames of an .lz4 file by walking the frame and block headers.
+
+    This reads each block header, but doesn't decompress anything. `f` must be
+    seekable, and `start` is the position of the first frame in it. Returns None if
+    the data is not a valid sequence of frames, for example if it's truncated, if
+    it has more than `max_blocks` blocks, or if the end of the file can't be reached.
+    """
+    try:
+        end = f.seek(0, io.SEEK_END)
+    except OSError:
+        # Includes io.UnsupportedOperation, raised by streams that claim to be
+        # seekable but can't seek to the end, such as the ones used for format
+        # detection.
+        return None
+    frames = []
+    offset = start
+    while offset < end:
+        if max_blocks is not None and max_blocks <= 0:
+            return None
+        result = _read_frame(f, offset, end, max_blocks)
+        if result is None:
+            return None
+        frame, blocks = result
+        if max_blocks is not None:
+            max_blocks -= blocks
+        frames.append(frame)
+        offset += frame.size
+    logger.debug("LZ4 frames: %d", len(frames))
+    return frames
@@ -0,0 +1,72 @@
+"""Listing the members of .lz files from their trailers.
+
+An .lz file is a sequence of members, each of which can be decompressed on its own
+(plzip writes many of them). Each member ends with a trailer that stores the size of
+the decompressed data and of the whole member, so reading the trailers from the end
+of the file gives the position of every member without decompressing anything.
+"""
+
+from __future__ import annotations
+
+import io
+import logging
+import struct
+from dataclasses import dataclass
+from typing import BinaryIO
+
+from archivey.internal.io_helpers import read_exact
+
+logger = logging.getLogger(__name__)
+
+LZIP_MAGIC = b"LZIP"
+LZIP_HEADER_SIZE = 6
+LZIP_TRAILER_SIZE = 20
+
+
+@dataclass
+class LzipMember:
+    """A member of an .lz file, as described by its trailer."""
+
+    offset: int
+    "Position of the member header in the file."
+    size: int
+    "Size of the member in the file, including its header and trailer."
+    uncompressed_size: int
+    "Size of the decompressed data of the member."
+
+
+def read_lzip_index(f: BinaryIO, start: int = 0) -> list[LzipMember] | None:
+    """Read the members of an .lz file from their trailers, starting from the end.
+
+    `f` must be seekable, and `start` is the position of the first member in it.
+    Returns None if the members don't cover the whole file, for example if it's
+    truncated or has trailing data, or if the end of the file can't be reached.
+    """
+    members = []
+    try:
+        end = f.seek(0, io.SEEK_END)
+    except OSError:
+        # Includes io.UnsupportedOperation, raised by streams that claim to be
+        # seekable but can't seek to the end, such as the ones used for format
+        # detection.
+        return None
+    while end > start:
+        if end - start < LZIP_HEADER_SIZE + LZIP_TRAILER_SIZE:
+            return None
+        f.seek(end - LZIP_TRAILER_SIZE)
+        _, uncompressed_size, member_size = struct.unpack(
+            "<IQQ", read_exact(f, LZIP_TRAILER_SIZE)
+        )
+        offset = end - member_size
+        if member_size < LZIP_HEADER_SIZE + LZIP_TRAILER_SIZE or offset < start:
+            return None
+        f.seek(offset)
+        header = read_exact(f, LZIP_HEADER_SIZE)
+        if header[:4] != LZIP_MAGIC or header[4] != 1:
+            return None
+        members.append(LzipMember(offset, member_size, uncompressed_size))
+        end = offset
+
+    members.reverse()
+    logger.debug("Lzip index: %d members", len(members))
+    return members
@@ -0,0 +1,1158 @@
+"""Decompressor streams that decode independent blocks of a stream on a thread pool.
+
+Some formats split the data into blocks that can be decompressed independently of
+each other. The streams here find the block boundaries in the compressed data,
+decompress the blocks on a pool of threads and return their output in order, so that
+reading a stream uses several cores. The standard library decompressors release the
+GIL while working, so threads are enough.
+"""
+
+from __future__ import annotations
+
+import abc
+import bz2
+import collections
+import lzma
+import struct
+import zlib
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, BinaryIO, Callable, Generic, Sequence, TypeVar, cast
+
+from archivey.formats.compressed_streams import (
+    DecompressorStream,
+    open_lz4_stream,
+    open_lzip_stream,
+    open_lzma_stream,
+    open_pyzstd_stream,
+    open_zstandard_stream,
+)
+from archivey.formats.gzip_members import GZIP_MEMBER_MAGIC, is_gzip_member_header
+from archivey.formats.lz4_frames import Lz4Frame, read_lz4_frames
+from archivey.formats.lzip_index import LzipMember, read_lzip_index
+from archivey.formats.xz_index import (
+    XZ_MAGIC_FOOTER,
+    XZ_STREAM_HEADER_MAGIC,
+    XzBlock,
+    encode_xz_multibyte_integer,
+    read_xz_index,
+)
+from archivey.formats.zstd_frames import ZstdFrame, read_zstd_frames
+from archivey.internal.io_helpers import is_seekable, is_stream, open_if_file
+
+if TYPE_CHECKING:
+    import lz4.frame
+    import lzip_extension
+    import pyzstd
+    import zstandard
+else:
+    try:
+        import lz4.frame
+    except ImportError:
+        lz4 = None
+
+    try:
+        import lzip_extension
+    except ImportError:
+        lzip_extension = None
+
+    try:
+        import pyzstd
+    except ImportError:
+        pyzstd = None
+
+    try:
+        import zstandard
+    except ImportError:
+        zstandard = None
+
+BlockT = TypeVar("BlockT")
+
+
+class BlockSplitter(abc.ABC, Generic[BlockT]):
+    """Splits compressed data into blocks that can be decompressed independently."""
+
+    @abc.abstractmethod
+    def feed(self, chunk: bytes) -> list[BlockT]:
+        """Add the next chunk of compressed data, and return the blocks it completes."""
+
+    @abc.abstractmethod
+    def finish(self) -> list[BlockT]:
+        """Return the remaining blocks once all the compressed data has been fed."""
+
+    @property
+    @abc.abstractmethod
+    def finished(self) -> bool:
+        """Whether the data fed so far ends at the end of a complete stream."""
+
+
+class BlockParallelDecompressorStream(
+    DecompressorStream[BlockSplitter[BlockT]], Generic[BlockT]
+):
+    """
+    A `DecompressorStream` that decompresses the blocks found by a `BlockSplitter` on
+    a thread pool.
+
+    Compressed data is read ahead until up to `2 * threads` blocks are being
+    decompressed, and the output of each block is returned once all the previous ones
+    have been. The read-ahead starts at a single block after opening the stream or
+    seeking, and doubles with each block returned, so that random accesses don't
+    decompress blocks that are not needed. Seeking backwards starts over from the
+    beginning of the stream, or from the nearest checkpoint if the subclass sets them
+    up.
+    """
+
+    def __init__(self, path: str | BinaryIO, threads: int) -> None:
+        self._executor = ThreadPoolExecutor(
+            max_workers=threads, thread_name_prefix="archivey-decompress"
+        )
+        # Enough blocks to keep all the threads busy while the oldest one is read.
+        self._max_pending = 2 * threads
+        self._read_ahead = 1
+        self._pending: collections.deque[tuple[BlockT, Future[bytes]]] = (
+            collections.deque()
+        )
+        super().__init__(path)
+
+    @abc.abstractmethod
+    def _create_splitter(self) -> BlockSplitter[BlockT]: ...
+
+    @abc.abstractmethod
+    def _decode_block(self, block: BlockT) -> bytes:
+        """Decompress a block. Called from the pool threads."""
+
+    def _decode_failed(self, block: BlockT, error: Exception) -> bytes:
+        """Called when decompressing `block` raised `error`.
+
+        Subclasses may recover and return the data of the block; the default is to
+        raise the error.
+        """
+        raise error
+
+    def _create_decompressor(self) -> BlockSplitter[BlockT]:
+        self._reset_pending()
+        return self._create_splitter()
+
+    def _reset_pending(self) -> None:
+        for _, future in self._pending:
+            future.cancel()
+        self._pending.clear()
+        self._read_ahead = 1
+
+    def _submit(self, blocks: list[BlockT]) -> None:
+        for block in blocks:
+            future = self._executor.submit(self._decode_block, block)
+            self._pending.append((block, future))
+
+    def _next_pending_block(self) -> BlockT | None:
+        """Return the next pending block, reading more data if there are none."""
+        while not self._pending and not self._decompressor.finished:
+            chunk = self._inner.read(65536)
+            if not chunk:
+                self._submit(self._decompressor.finish())
+                break
+            self._submit(self._decompressor.feed(chunk))
+        return self._pending[0][0] if self._pending else None
+
+    def _next_result(self) -> bytes:
+        block, future = self._pending.popleft()
+        self._read_ahead = min(2 * self._read_ahead, self._max_pending)
+        try:
+            return future.result()
+        except Exception as e:  # noqa: BLE001
+            return self._decode_failed(block, e)
+
+    def _decompress_chunk(self, chunk: bytes) -> bytes:
+        self._submit(self._decompressor.feed(chunk))
+        # Only wait for a block when enough blocks are being decompressed; until
+        # then, keep reading so that more blocks can be started.
+        if self._pending and (
+            len(self._pending) >= self._read_ahead or self._pending[0][1].done()
+        ):
+            return self._next_result()
+        return b""
+
+    def _flush_decompressor(self) -> bytes:
+        self._submit(self._decompressor.finish())
+        results = []
+        while self._pending:
+            results.append(self._next_result())
+        return b"".join(results)
+
+    def _is_decompressor_finished(self) -> bool:
+        return self._decompressor.finished
+
+    def close(self) -> None:
+        self._reset_pending()
+        self._executor.shutdown(wait=False)
+        super().close()
+
+
+class IndexedBlockSplitter(BlockSplitter[tuple[int, bytes]]):
+    """Cuts blocks at known positions out of the compressed data.
+
+    `extents` are the `(offset, size)` of the blocks in the file, in order. `offset`
+    is the position in the file of the first chunk that will be fed, and
+    `first_block` the index of the first block to return. Blocks are returned as
+    `(index, data)`.
+    """
+
+    def __init__(
+        self, extents: list[tuple[int, int]], first_block: int, offset: int
+    ) -> None:
+        self._extents = extents
+        self._next = first_block
+        self._data = bytearray()
+        self._offset = offset
+
+    @property
+    def finished(self) -> bool:
+        return self._next == len(self._extents)
+
+    def feed(self, chunk: bytes) -> list[tuple[int, bytes]]:
+        if self.finished:
+            # Anything after the last block is metadata that was already read.
+            return []
+        self._data += chunk
+        result = []
+        while not self.finished:
+            offset, size = self._extents[self._next]
+            start = offset - self._offset
+            if start + size > len(self._data):
+                break
+            data = bytes(memoryview(self._data)[start : start + size])
+            result.append((self._next, data))
+            self._next += 1
+
+        # Discard the data before the next block.
+        end = self._offset + len(self._data)
+        keep = end if self.finished else min(self._extents[self._next][0], end)
+        del self._data[: keep - self._offset]
+        self._offset = keep
+        return result
+
+    def finish(self) -> list[tuple[int, bytes]]:
+        return []
+
+
+class IndexedParallelDecompressorStream(
+    BlockParallelDecompressorStream[tuple[int, bytes]]
+):
+    """
+    A `BlockParallelDecompressorStream` for formats whose blocks are listed in an
+    index, with their compressed extents and uncompressed sizes.
+
+    Every block start is a checkpoint, so seeks go straight to the block that
+    contains the target position, and the size of the stream is known up front.
+    Uncompressed sizes may be None if they are not known; the checkpoints after them
+    are then added as the blocks are decompressed.
+    """
+
+    def __init__(
+        self,
+        path: str | BinaryIO,
+        extents: list[tuple[int, int]],
+        uncompressed_sizes: Sequence[int | None],
+        threads: int,
+    ) -> None:
+        self._extents = extents
+        super().__init__(path, threads)
+        pos = 0
+        for i, ((offset, _), size) in enumerate(zip(extents, uncompressed_sizes)):
+            self._checkpoints.append((pos, offset, i))
+            if size is None:
+                break
+            pos += size
+        else:
+            self._size = pos
+
+    def _create_splitter(self) -> IndexedBlockSplitter:
+        return IndexedBlockSplitter(self._extents, 0, self._inner.tell())
+
+    def _next_result(self) -> bytes:
+        index = self._pending[0][0][0]
+        data = super()._next_result()
+        # Blocks are decompressed in order from a checkpoint, so the start of the
+        # next block is known once this one is.
+        if index + 1 == len(self._checkpoints) and index + 1 < len(self._extents):
+            pos = self._checkpoints[index][0] + len(data)
+            self._checkpoints.append((pos, self._extents[index + 1][0], index + 1))
+        return data
+
+    def _restore_state(self, state: object) -> None:
+        index = cast("int", state)
+        self._reset_pending()
+        self._decompressor = IndexedBlockSplitter(
+            self._extents, index, self._extents[index][0]
+        )
+
+
+# Each thread holds a whole block in memory, so files with larger blocks are
+# decompressed as a single stream instead.
+MAX_PARALLEL_BLOCK_SIZE = 256 * 1024 * 1024
+
+IndexT = TypeVar("IndexT")
+
+
+def _read_block_index(
+    path: str | BinaryIO, read_index: Callable[[BinaryIO, int], IndexT | None]
+) -> IndexT | None:
+    """Read the index of a file from its current position, if it's seekable."""
+    if is_stream(path) and not is_seekable(path):
+        return None
+    with open_if_file(path) as f:
+        try:
+            return read_index(f, f.tell())
+        except OSError:
+            # Includes io.UnsupportedOperation, raised by streams that claim to be
+            # seekable but can't seek to the end, such as the ones used for format
+            # detection.
+            return None
+
+
+# Block and end of stream markers of bzip2 (the BCD digits of pi and sqrt(pi)). They
+# are not byte-aligned, so they can start at any bit of the compressed data.
+_BZIP2_BLOCK_MAGIC = 0x314159265359
+_BZIP2_EOS_MAGIC = 0x177245385090
+
+
+def _bit_patterns(magic: int) -> list[tuple[int, bytes, int, int, int, int]]:
+    """Return how a 48-bit magic number looks when it starts at each bit of a byte.
+
+    For each shift, a magic starting at bit `shift` (from the most significant) of
+    byte `i` spans bytes `i` to `i + 6`. Bytes `i + 1` to `i + 5` are fully covered
+    and can be searched for; the two outer bytes are checked with a mask. Returns
+    tuples of `(shift, middle bytes, first mask, first value, last mask, last value)`.
+    """
+    patterns = []
+    for shift in range(8):
+        value = (magic << (8 - shift)).to_bytes(7, "big")
+        first_mask = 0xFF >> shift
+        last_mask = (0xFF << (8 - shift)) & 0xFF
+        patterns.append((shift, value[1:6], first_mask, value[0], last_mask, value[6]))
+    return patterns
+
+
+_BZIP2_MAGIC_PATTERNS = [
+    (is_eos, pattern)
+    for is_eos, magic in ((False, _BZIP2_BLOCK_MAGIC), (True, _BZIP2_EOS_MAGIC))
+    for pattern in _bit_patterns(magic)
+]
+
+
+def _rotate_crc(crc: int) -> int:
+    return ((crc << 1) | (crc >> 31)) & 0xFFFFFFFF
+
+
+@dataclass
+class Bzip2Block:
+    """A bzip2 block, from its block magic to the start of the next marker."""
+
+    data: bytes
+    "The bytes containing the block."
+    offset: int
+    "Position of `data` in the compressed stream."
+    start_bit: int
+    "Position of the block in `data`, in bits."
+    size_bits: int
+    "Size of the block, in bits."
+    level: int
+    "Compression level of the stream the block belongs to (the block size / 100k)."
+
+    @property
+    def end_bit(self) -> int:
+        """Position of the end of the block in the compressed stream, in bits."""
+        return self.offset * 8 + self.start_bit + self.size_bits
+
+    def merge(self, other: Bzip2Block) -> Bzip2Block:
+        """Return a block that spans this block and `other`, which must follow it."""
+        assert other.offset * 8 + other.start_bit == self.end_bit
+        return Bzip2Block(
+            self.data[: other.offset - self.offset] + other.data,
+            self.offset,
+            self.start_bit,
+            self.size_bits + other.size_bits,
+            self.level,
+        )
+
+
+def decode_bzip2_block(block: Bzip2Block) -> bytes:
+    """Decompress a single bzip2 block.
+
+    The block is shifted to a byte boundary and wrapped in a stream of its own, with
+    the header of the original stream and an end of stream marker whose combined CRC
+    is the CRC of the block.
+    """
+    value = int.from_bytes(block.data, "big")
+    value >>= len(block.data) * 8 - block.start_bit - block.size_bits
+    value &= (1 << block.size_bits) - 1
+    # The CRC of the block follows its magic.
+    crc = (value >> (block.size_bits - 80)) & 0xFFFFFFFF
+    size_bits = block.size_bits + 80
+    padding = -size_bits % 8
+    value = ((value << 48 | _BZIP2_EOS_MAGIC) << 32 | crc) << padding
+
+    decompressor = bz2.BZ2Decompressor()
+    data = decompressor.decompress(
+        b"BZh%d" % block.level + value.to_bytes((size_bits + padding) // 8, "big")
+    )
+    if not decompressor.eof:
+        raise OSError("Invalid data stream")
+    return data
+
+
+class Bzip2BlockSplitter(BlockSplitter[Bzip2Block]):
+    """
+    Finds the blocks of a bzip2 file, which may contain several concatenated streams.
+
+    Block boundaries are found by searching for the block and end of stream magic
+    numbers at every bit offset. These can also appear by chance inside the
+    compressed data, so:
+
+    - block magics are only accepted if the block header that follows is valid;
+    - end of stream magics are only accepted if they are followed by the combined
+      CRC of the blocks of the stream, by the end of the file, or by the start of
+      another stream.
+
+    A block magic found by chance splits a block in two, and is detected by
+    `ParallelBzip2DecompressorStream` when decompressing the first half fails.
+    """
+
+    def __init__(self) -> None:
+        self._data = bytearray()
+        # Position of _data[0] in the compressed stream.
+        self._offset = 0
+        # Position up to which magics have been searched for.
+        self._scanned = 0
+        # Bit positions of the magics found and not processed yet, and whether they
+        # are end of stream markers.
+        self._magics: collections.deque[tuple[int, bool]] = collections.deque()
+        # Position of the header of the next stream, when not inside a stream.
+        self._header_pos: int | None = 0
+        self._streams = 0
+        self._trailing_data = False
+        # State of the current stream.
+        self._level = 0
+        self._stream_crc = 0
+        self._block_start: int | None = None
+        self._min_magic_bit = 0
+
+    @property
+    def finished(self) -> bool:
+        return self._header_pos is not None
+
+    def feed(self, chunk: bytes) -> list[Bzip2Block]:
+        if self._trailing_data:
+            return []
+        self._data += chunk
+        return self._split(at_eof=False)
+
+    def finish(self) -> list[Bzip2Block]:
+        if self._trailing_data:
+            return []
+        return self._split(at_eof=True)
+
+    def _end(self) -> int:
+        return self._offset + len(self._data)
+
+    def _read_bits(self, bit: int, count: int) -> int:
+        start = bit // 8 - self._offset
+        size = (bit % 8 + count + 7) // 8
+        value = int.from_bytes(self._data[start : start + size], "big")
+        return (value >> (size * 8 - bit % 8 - count)) & ((1 << count) - 1)
+
+    def _split(self, at_eof: bool) -> list[Bzip2Block]:
+        blocks: list[Bzip2Block] = []
+        while True:
+            if self._header_pos is not None:
+                if not self._read_header(at_eof):
+                    break
+                continue
+
+            # The last bytes may contain the start of a magic; they are searched once
+            # more data is available.
+            scan_end = self._end() - 6
+            if self._scanned < scan_end:
+                self._find_magics(scan_end)
+            if not self._magics:
+                break
+
+            bit, is_eos = self._magics[0]
+            if bit < self._min_magic_bit:
+                self._magics.popleft()
+                continue
+
+            if is_eos:
+                accepted = self._is_end_of_stream(bit, at_eof)
+                if accepted is None:
+                    break
+                self._magics.popleft()
+                if accepted:
+                    if self._block_start is not None:
+                        blocks.append(self._take_block(bit))
+                    self._block_start = None
+                    self._header_pos = (bit + 80 + 7) // 8
+                continue
+
+            # Block magic, CRC, randomized flag and BWT origin pointer.
+            if self._end() * 8 < bit + 105:
+                if not at_eof:
+                    break
+                self._magics.popleft()
+                continue
+            self._magics.popleft()
+            if self._read_bits(bit + 81, 24) >= self._level * 100000:
+                continue
+            if self._block_start is not None:
+                blocks.append(self._take_block(bit))
+            self._block_start = bit
+            self._min_magic_bit = bit + 80
+            self._stream_crc = _rotate_crc(self._stream_crc) ^ self._read_bits(
+                bit + 48, 32
+            )
+
+        self._discard_processed_data()
+        return blocks
+
+    def _read_header(self, at_eof: bool) -> bool:
+        """Read the header of the stream at `_header_pos`.
+
+        Returns False if more data is needed, or if there are no more streams.
+        """
+        assert self._header_pos is not None
+        start = self._header_pos - self._offset
+        header = bytes(self._data[start : start + 4])
+        if len(header) < 4 and (not at_eof or not header):
+            return False
+        if len(header) == 4 and header[:3] == b"BZh" and 0x31 <= header[3] <= 0x39:
+            self._level = header[3] - 0x30
+            self._stream_crc = 0
+            self._streams += 1
+            self._min_magic_bit = (self._header_pos + 4) * 8
+            self._scanned = max(self._scanned, self._header_pos + 4)
+            self._header_pos = None
+            return True
+        if self._streams == 0:
+            raise OSError("Invalid data stream")
+
+        # Like the bz2 module, ignore any data after the last stream.
+        self._trailing_data = True
+        self._data.clear()
+        return False
+
+    def _find_magics(self, scan_end: int) -> None:
+        """Find the magics starting between `_scanned` and `scan_end`."""
+        data = self._data
+        start = self._scanned - self._offset
+        end = scan_end - self._offset
+        found = []
+        for is_eos, pattern in _BZIP2_MAGIC_PATTERNS:
+            shift, middle, first_mask, first, last_mask, last = pattern
+            i = data.find(middle, start + 1, end + 5)
+            while i != -1:
+                if (
+                    data[i - 1] & first_mask == first
+                    and data[i + 5] & last_mask == last
+                ):
+                    found.append(((self._offset + i - 1) * 8 + shift, is_eos))
+                i = data.find(middle, i + 1, end + 5)
+        found.sort()
+        self._magics.extend(found)
+        self._scanned = scan_end
+
+    def _is_end_of_stream(self, bit: int, at_eof: bool) -> bool | None:
+        """Check if an end of stream magic is genuine; None if more data is needed."""
+        next_header = (bit + 80 + 7) // 8
+        if next_header + 10 > self._end() and not at_eof:
+            return None
+        if next_header > self._end():
+            return False
+        if self._read_bits(bit + 48, 32) == self._stream_crc:
+            return True
+        if next_header == self._end():
+            return True
+        start = next_header - self._offset
+        header = self._data[start : start + 10]
+        return (
+            header[:3] == b"BZh"
+            and 0x31 <= header[3] <= 0x39
+            and int.from_bytes(header[4:10], "big")
+            in (_BZIP2_BLOCK_MAGIC, _BZIP2_EOS_MAGIC)
+        )
+
+    def _take_block(self, end_bit: int) -> Bzip2Block:
+        assert self._block_start is not None
+        start = self._block_start // 8
+        end = (end_bit + 7) // 8
+        data = bytes(memoryview(self._data)[start - self._offset : end - self._offset])
+        return Bzip2Block(
+            data,
+            start,
+            self._block_start - start * 8,
+            end_bit - self._block_start,
+            self._level,
+        )
+
+    def _discard_processed_data(self) -> None:
+        if self._block_start is not None:
+            keep = self._block_start // 8
+        elif self._header_pos is not None:
+            keep = self._header_pos
+        else:
+            keep = self._min_magic_bit // 8
+        keep = min(keep, self._end())
+        if keep > self._offset:
+            del self._data[: keep - self._offset]
+            self._offset = keep
+            self._scanned = max(self._scanned, keep)
+
+
+class ParallelBzip2DecompressorStream(BlockParallelDecompressorStream[Bzip2Block]):
+    """Decompress a bzip2 file with the `bz2` module, one block per thread."""
+
+    def _create_splitter(self) -> Bzip2BlockSplitter:
+        return Bzip2BlockSplitter()
+
+    def _decode_block(self, block: Bzip2Block) -> bytes:
+        return decode_bzip2_block(block)
+
+    def _decode_failed(self, block: Bzip2Block, error: Exception) -> bytes:
+        # If a block magic appeared by chance inside the block, the block was split
+        # in two, and decompressing it together with the next part will succeed. The
+        # next part may not have been split off yet when reading ahead one block.
+        if isinstance(error, OSError):
+            next_block = self._next_pending_block()
+            if (
+                next_block is not None
+                and next_block.offset * 8 + next_block.start_bit == block.end_bit
+            ):
+                try:
+                    data = decode_bzip2_block(block.merge(next_block))
+                except OSError:
+                    pass
+                else:
+                    self._pending.popleft()[1].cancel()
+                    return data
+        raise error
+
+
+def open_parallel_bzip2_stream(path: str | BinaryIO, threads: int) -> BinaryIO:
+    return ParallelBzip2DecompressorStream(path, threads)
+
+
+# A header, an empty deflate block and a trailer.
+_GZIP_MIN_MEMBER_SIZE = 20
+# Members whose compressed data is larger than this are decompressed sequentially, to
+# avoid holding them in memory.
+MAX_PARALLEL_GZIP_MEMBER_SIZE = 16 * 1024 * 1024
+
+
+@dataclass
+class GzipMembers:
+    """Compressed data of one or more consecutive gzip members."""
+
+    data: bytes
+    offset: int
+    "Position of the data in the file."
+    complete: bool = True
+    """
+    False if the data is (part of) a member too large to be decompressed in
+    parallel, which is left to be decompressed sequentially.
+    """
+
+    @property
+    def end(self) -> int:
+        return self.offset + len(self.data)
+
+
+class _GzipMembersTooLarge(Exception):
+    pass
+
+
+def decode_gzip_members(data: bytes) -> bytes:
+    """Decompress complete gzip members, which may be followed by zero padding."""
+    output = []
+    size = 0
+    while data:
+        decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        # Stop as soon as the output is too large, as the member size is not known.
+        output.append(decompressor.decompress(data, MAX_PARALLEL_BLOCK_SIZE - size + 1))
+        size += len(output[-1])
+        if size > MAX_PARALLEL_BLOCK_SIZE:
+            raise _GzipMembersTooLarge()
+        if not decompressor.eof:
+            raise EOFError(
+                "Compressed file ended before the end-of-stream marker was reached"
+            )
+        data = decompressor.unused_data.lstrip(b"\x00")
+    return output[0] if len(output) == 1 else b"".join(output)
+
+
+class GzipMemberSplitter(BlockSplitter[GzipMembers]):
+    """Cuts a gzip stream at the start of each member.
+
+    Members don't store their compressed size, so the splitter looks for the bytes
+    that start a member header instead. They may also appear by chance inside the
+    compressed data (or in the data of members stored uncompressed), so a block may
+    be cut short and fail to decompress; see `ParallelGzipDecompressorStream`.
+
+    Once more than `max_member_size` bytes are buffered without finding a member
+    start, the rest of the data is returned as incomplete blocks.
+    """
+
+    def __init__(
+        self, offset: int = 0, max_member_size: int = MAX_PARALLEL_GZIP_MEMBER_SIZE
+    ) -> None:
+        self._data = bytearray()
+        self._offset = offset
+        self._search_pos = _GZIP_MIN_MEMBER_SIZE
+        self._max_member_size = max_member_size
+        self._too_large = False
+        self._finished = False
+
+    @property
+    def finished(self) -> bool:
+        return self._finished
+
+    def feed(self, chunk: bytes) -> list[GzipMembers]:
+        if self._too_large:
+            block = GzipMembers(chunk, self._offset, complete=False)
+            self._offset += len(chunk)
+            return [block]
+
+        self._data += chunk
+        result = []
+        while True:
+            index = self._data.find(GZIP_MEMBER_MAGIC, self._search_pos)
+            if index < 0:
+                # The magic may continue in the next chunk.
+                self._search_pos = max(self._search_pos, len(self._data) - 2)
+                break
+            if index + 10 > len(self._data):
+                # Wait for the rest of the header.
+                self._search_pos = index
+                break
+            if not is_gzip_member_header(self._data, index):
+                self._search_pos = index + 1
+                continue
+
+            data = bytes(memoryview(self._data)[:index])
+            result.append(GzipMembers(data, self._offset))
+            del self._data[:index]
+            self._offset += index
+            self._search_pos = _GZIP_MIN_MEMBER_SIZE
+
+        if len(self._data) > self._max_member_size:
+            result += self.take_remaining()
+        return result
+
+    def take_remaining(self) -> list[GzipMembers]:
+        """Return the buffered data as an incomplete block, and stop splitting."""
+        self._too_large = True
+        if not self._data:
+            return []
+        block = GzipMembers(bytes(self._data), self._offset, complete=False)
+        self._offset += len(self._data)
+        self._data.clear()
+        return [block]
+
+    def finish(self) -> list[GzipMembers]:
+        if self._finished:
+            return []
+        self._finished = True
+        if not self._data:
+            return []
+        block = GzipMembers(
+            bytes(self._data), self._offset, complete=not self._too_large
+        )
+        self._data.clear()
+        return [block]
+
+
+class ParallelGzipDecompressorStream(BlockParallelDecompressorStream[GzipMembers]):
+    """Decompress a gzip file with several members with `zlib`, one member per thread.
+
+    This helps with files made of many members, such as those written by bgzip or
+    by appending to a compressed log file. The first member is decompressed
+    sequentially, like `GzipDecompressorStream` does, and the following ones are
+    only split and decompressed in parallel once the second one starts; files with a
+    single member are not buffered at all. If a member is too large to decompress in
+    memory, that member and the rest of the file are decompressed sequentially.
+
+    The start of every member decompressed in parallel is kept as a checkpoint, so
+    seeking backwards resumes from the nearest member.
+    """
+
+    _decompressor: GzipMemberSplitter
+
+    def __init__(
+        self,
+        path: str | BinaryIO,
+        threads: int,
+        max_member_size: int = MAX_PARALLEL_GZIP_MEMBER_SIZE,
+    ) -> None:
+        self._max_member_size = max_member_size
+        super().__init__(path, threads)
+
+    def _create_splitter(self) -> GzipMemberSplitter:
+        offset = self._inner.tell() if self.seekable() else 0
+        # The decompressor used for the first member or once a member is too large,
+        # its pending input and the position of that input in the file.
+        self._sequential: zlib._Decompress | None = zlib.decompressobj(
+            16 + zlib.MAX_WBITS
+        )
+        self._sequential_input = bytearray()
+        self._sequential_offset = offset
+        # Whether to switch to parallel decompression when the next member starts.
+        self._split_next_member = True
+        # Position in the uncompressed data of the next block returned.
+        self._block_pos = 0
+        return GzipMemberSplitter(offset, self._max_member_size)
+
+    def _restore_checkpoint(self, index: int) -> None:
+        super()._restore_checkpoint(index)
+        self._block_pos = self._pos
+
+    def _restore_state(self, state: object) -> None:
+        # Checkpoints are at the start of members found by splitting the file.
+        self._reset_pending()
+        self._decompressor = self._create_splitter()
+        self._sequential = None
+
+    def _decode_block(self, block: GzipMembers) -> bytes:
+        if not block.complete:
+            raise _GzipMembersTooLarge()
+        return decode_gzip_members(block.data)
+
+    def _next_result(self) -> bytes:
+        block = self._pending[0][0]
+        last_checkpoint = self._checkpoints[-1][1] if self._checkpoints else 0
+        if block.complete and block.offset > last_checkpoint and self.seekable():
+            self._checkpoints.append((self._block_pos, block.offset, None))
+        data = super()._next_result()
+        self._block_pos += len(data)
+        return data
+
+    def _decode_failed(self, block: GzipMembers, error: Exception) -> bytes:
+        if isinstance(error, EOFError):
+            # If a member start appeared by chance inside a member, the member was
+            # split in two, and decompressing it together with the next part will
+            # succeed.
+            next_block = self._next_pending_block()
+            if next_block is not None and next_block.offset == block.end:
+                self._pending.popleft()[1].cancel()
+                merged = GzipMembers(
+                    block.data + next_block.data, block.offset, next_block.complete
+                )
+                try:
+                    return self._decode_block(merged)
+                except (EOFError, _GzipMembersTooLarge) as e:
+                    return self._decode_failed(merged, e)
+        if isinstance(error, _GzipMembersTooLarge):
+            return self._start_sequential(block)
+        raise error
+
+    def _start_sequential(self, block: GzipMembers) -> bytes:
+        """Decompress the rest of the file sequentially, starting with `block`."""
+        for _, future in self._pending:
+            future.cancel()
+        data = [block.data] + [pending.data for pending, _ in self._pending]
+        data += [remaining.data for remaining in self._decompressor.take_remaining()]
+        self._pending.clear()
+        self._sequential = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        self._sequential_input = bytearray(b"".join(data))
+        self._sequential_offset = block.offset
+        self._split_next_member = False
+        return self._decompress_sequential(b"")
+
+    def _start_parallel(self, data: bytes, offset: int) -> bytes:
+        """Split the rest of the file, starting with the member at the start of
+        `data`, and decompress the members in parallel."""
+        data += self._sequential_input
+        self._sequential = None
+        self._sequential_input = bytearray()
+        self._decompressor = GzipMemberSplitter(offset, self._max_member_size)
+        return super()._decompress_chunk(data)
+
+    def _decompress_sequential(self, chunk: bytes, size: int | None = None) -> bytes:
+        """Add `chunk` to the pending input and decompress `size` bytes of it.
+
+        By default, a bit more than `chunk` is decompressed, so that the input that
+        was pending when switching to sequential decompression is slowly used up.
+        """
+        assert self._sequential is not None
+        self._sequential_input += chunk
+        if size is None:
+            size = len(chunk) + 65536
+        data = bytes(memoryview(self._sequential_input)[:size])
+        del self._sequential_input[:size]
+        self._sequential_offset += len(data)
+        output = []
+        while data:
+            if self._sequential.eof:
+                # Another member follows, possibly after some zero padding.
+                data = data.lstrip(b"\x00")
+                if not data:
+                    break
+                if self._split_next_member:
+                    offset = self._sequential_offset - len(data)
+                    self._block_pos += sum(len(part) for part in output)
+                    return b"".join(output) + self._start_parallel(data, offset)
+                self._sequential = zlib.decompressobj(16 + zlib.MAX_WBITS)
+            output.append(self._sequential.decompress(data))
+            data = self._sequential.unused_data if self._sequential.eof else b""
+        self._block_pos += sum(len(part) for part in output)
+        return b"".join(output)
+
+    def _decompress_chunk(self, chunk: bytes) -> bytes:
+        if self._sequential is not None:
+            return self._decompress_sequential(chunk)
+        return super()._decompress_chunk(chunk)
+
+    def _flush_decompressor(self) -> bytes:
+        output = []
+        while True:
+            if self._sequential is None:
+                output.append(super()._flush_decompressor())
+                if self._sequential is None:
+                    break
+            # Decompressing the first member, or a member was too large, possibly
+            # one of the last ones. The rest of the input may still switch to
+            # parallel decompression.
+            output.append(self._decompress_sequential(b"", len(self._sequential_input)))
+            if self._sequential is not None:
+                output.append(self._sequential.flush())
+                break
+        return b"".join(output)
+
+    def _is_decompressor_finished(self) -> bool:
+        if self._sequential is not None:
+            return self._sequential.eof
+        return self._decompressor.finished
+
+
+def open_parallel_gzip_stream(path: str | BinaryIO, threads: int) -> BinaryIO:
+    return ParallelGzipDecompressorStream(path, threads)
+
+
+def decode_xz_block(block: XzBlock, data: bytes) -> bytes:
+    """Decompress a single xz block.
+
+    The block is wrapped in a stream of its own, with the stream flags of the
+    original stream and an index that lists only this block, so that `lzma` checks
+    the block sizes and its integrity check as usual.
+    """
+    flags = block.stream_flags
+    header = XZ_STREAM_HEADER_MAGIC + flags + struct.pack("<I", zlib.crc32(flags))
+    index = b"\x00" + b"".join(
+        encode_xz_multibyte_integer(value)
+        for value in (1, block.unpadded_size, block.uncompressed_size)
+    )
+    index += b"\x00" * (-len(index) % 4)
+    index += struct.pack("<I", zlib.crc32(index))
+    footer = struct.pack("<I", len(index) // 4 - 1) + flags
+    footer = struct.pack("<I", zlib.crc32(footer)) + footer + XZ_MAGIC_FOOTER
+
+    decompressor = lzma.LZMADecompressor(lzma.FORMAT_XZ)
+    result = decompressor.decompress(b"".join((header, data, index, footer)))
+    if not decompressor.eof:
+        raise lzma.LZMAError("Corrupt input data")
+    return result
+
+
+class ParallelXzDecompressorStream(IndexedParallelDecompressorStream):
+    """Decompress an .xz file with the `lzma` module, one block per thread.
+
+    The blocks are found from the index at the end of the file.
+    """
+
+    def __init__(self, path: str | BinaryIO, blocks: list[XzBlock], threads: int):
+        self._blocks = blocks
+        super().__init__(
+            path,
+            [(block.offset, block.padded_size) for block in blocks],
+            [block.uncompressed_size for block in blocks],
+            threads,
+        )
+
+    def _decode_block(self, block: tuple[int, bytes]) -> bytes:
+        index, data = block
+        return decode_xz_block(self._blocks[index], data)
+
+
+def open_parallel_xz_stream(path: str | BinaryIO, threads: int) -> BinaryIO:
+    blocks = _read_block_index(path, read_xz_index)
+    # Invalid files are left to the lzma module, to report the errors as usual.
+    if (
+        blocks is None
+        or len(blocks) < 2
+        or max(block.uncompressed_size for block in blocks) > MAX_PARALLEL_BLOCK_SIZE
+    ):
+        return open_lzma_stream(path)
+    return ParallelXzDecompressorStream(path, blocks, threads)
+
+
+def decode_zstd_frame(data: bytes, size: int, use_zstandard: bool) -> bytes:
+    """Decompress a single Zstandard frame of `size` bytes with pyzstd or zstandard."""
+    if use_zstandard:
+        result = zstandard.ZstdDecompressor().decompressobj().decompress(data)
+        error: type[Exception] = zstandard.ZstdError
+    else:
+        result = pyzstd.decompress(data)
+        error = pyzstd.ZstdError
+    if len(result) != size:
+        raise error(f"Frame decompressed to {len(result)} bytes, expected {size}")
+    return result
+
+
+class ParallelZstdDecompressorStream(IndexedParallelDecompressorStream):
+    """Decompress a multi-frame .zst file, one frame per thread.
+
+    The frames are listed from the seek table of files in the seekable format, or
+    otherwise by walking the frame and block headers.
+    """
+
+    def __init__(
+        self,
+        path: str | BinaryIO,
+        frames: list[ZstdFrame],
+        threads: int,
+        use_zstandard: bool,
+    ):
+        self._uncompressed_sizes = [
+            cast("int", frame.uncompressed_size) for frame in frames
+        ]
+        self._use_zstandard = use_zstandard
+        super().__init__(
+            path,
+            [(frame.offset, frame.size) for frame in frames],
+            self._uncompressed_sizes,
+            threads,
+        )
+
+    def _decode_block(self, block: tuple[int, bytes]) -> bytes:
+        index, data = block
+        return decode_zstd_frame(
+            data, self._uncompressed_sizes[index], self._use_zstandard
+        )
+
+
+def open_parallel_zstd_stream(
+    path: str | BinaryIO, threads: int, use_zstandard: bool = False
+) -> BinaryIO:
+    fallback = open_zstandard_stream if use_zstandard else open_pyzstd_stream
+    if (zstandard if use_zstandard else pyzstd) is None:
+        # Let the fallback report the missing package.
+        return fallback(path)
+
+    frames = _read_block_index(path, read_zstd_frames)
+    # The decompressed size of each frame is needed to bound the memory used, and to
+    # seek to the frames.
+    if (
+        frames is None
+        or len(frames) < 2
+        or any(
+            frame.uncompressed_size is None
+            or frame.uncompressed_size > MAX_PARALLEL_BLOCK_SIZE
+            for frame in frames
+        )
+    ):
+        return fallback(path)
+    return ParallelZstdDecompressorStream(path, frames, threads, use_zstandard)
+
+
+def decode_lz4_frame(data: bytes, size: int | None) -> bytes:
+    """Decompress a single LZ4 frame, checking its size if it's known."""
+    result = lz4.frame.decompress(data)
+    if size is not None and len(result) != size:
+        raise RuntimeError(
+            f"LZ4 frame decompressed to {len(result)} bytes, expected {size}"
+        )
+    return result
+
+
+class ParallelLz4DecompressorStream(IndexedParallelDecompressorStream):
+    """Decompress a multi-frame .lz4 file, one frame per thread.
+
+    The frames are found by walking the frame and block headers. Frames that don't
+    store their decompressed size can be decompressed in parallel too, but seeks can
+    only jump to the frames before the furthest one decompressed so far.
+    """
+
+    def __init__(self, path: str | BinaryIO, frames: list[Lz4Frame], threads: int):
+        self._uncompressed_sizes = [frame.uncompressed_size for frame in frames]
+        super().__init__(
+            path,
+            [(frame.offset, frame.size) for frame in frames],
+            self._uncompressed_sizes,
+            threads,
+        )
+
+    def _decode_block(self, block: tuple[int, bytes]) -> bytes:
+        index, data = block
+        return decode_lz4_frame(data, self._uncompressed_sizes[index])
+
+
+def open_parallel_lz4_stream(path: str | BinaryIO, threads: int) -> BinaryIO:
+    if lz4 is None:
+        # Let the fallback report the missing package.
+        return open_lz4_stream(path)
+
+    frames = _read_block_index(path, read_lz4_frames)
+    # The number of blocks in each frame bounds its decompressed size, and so the
+    # memory used.
+    if (
+        frames is None
+        or len(frames) < 2
+        or any(
+            frame.max_uncompressed_size > MAX_PARALLEL_BLOCK_SIZE for frame in frames
+        )
+    ):
+        return open_lz4_stream(path)
+    return ParallelLz4DecompressorStream(path, frames, threads)
+
+
+def decode_lzip_member(data: bytes, size: int) -> bytes:
+    """Decompress a single lzip member, checking its size against the trailer."""
+    decoder = lzip_extension.Decoder(1)
+    result = decoder.decompress(data)
+    decoded, remaining = decoder.finish()
+    result += decoded
+    if remaining or len(result) != size:
+        raise RuntimeError("Lzip error: Data error")
+    return result
+
+
+class ParallelLzipDecompressorStream(IndexedParallelDecompressorStream):
+    """Decompress a multi-member .lz file, one member per thread.
+
+    The members are found by reading their trailers from the end of the file.
+    """
+
+    def __init__(self, path: str | BinaryIO, members: list[LzipMember], threads: int):
+        self._uncompressed_sizes = [member.uncompressed_size for member in members]
+        super().__init__(
+            path,
+            [(member.offset, member.size) for member in members],
+            self._uncompressed_sizes,
+            threads,
+        )
+
+    def _decode_block(self, block: tuple[int, bytes]) -> bytes:
+        index, data = block
+        return decode_lzip_member(data, self._uncompressed_sizes[index])
+
+
+def open_parallel_lzip_stream(path: str | BinaryIO, threads: int) -> BinaryIO:
+    if lzip_extension is None:
+        # Let the fallback report the missing package.
+        return open_lzip_stream(path)
+
+    members = _read_block_index(path, read_lzip_index)
+    if (
+        members is None
+        or len(members) < 2
+        or any(member.uncompressed_size > MAX_PARALLEL_BLOCK_SIZE for member in members)
+    ):
+        return open_lzip_stream(path)
+    return ParallelLzipDecompressorStream(path, members, threads)
@@ -24,6 +24,7 @@ from typing import (
     Iterable,
     Iterator,
     Optional,
+    Sequence,
     cast,
 )
 
@@ -389,7 +390,7 @@ class RarStreamReader:
     def __init__(
         self,
         archive_path: BinaryIO | str,
-        members: list[ArchiveMember],
+        members: Sequence[ArchiveMember],
         *,
         pwd: bytes | str | None = None,
     ):
@@ -607,11 +608,38 @@ class RarReader(BaseArchiveReader):
             return rarfile.to_datetime(info.date_time)
         return None
 
+    def _member_index_supported(self) -> bool:
+        return True
+
+    def _restore_members_from_index(
+        self, members: list[ArchiveMember], data: list[Any]
+    ) -> bool:
+        # rarfile always parses the headers when opening the archive, but restoring
+        # the members avoids calling unrar to read link targets.
+        assert self._archive is not None
+        infos: list[RarInfo] = self._archive.infolist()
+        if len(infos) != len(members):
+            return False
+        for member, info in zip(members, infos):
+            if member.filename != (get_non_corrupted_filename(info) or ""):
+                return False
+            member.raw_info = info
+        return True
+
     def iter_members_for_registration(self) -> Iterator[ArchiveMember]:
         assert self._archive is not None
 
         rarinfos: list[RarInfo] = self._archive.infolist()
         for info in rarinfos:
+            if (
+                info.is_file()
+                and not is_rar_info_hardlink(info)
+                and self._is_excluded_from_registration(
+                    get_non_corrupted_filename(info) or "", info.file_size
+                )
+            ):
+                continue
+
             compression_method = (
                 _RAR_COMPRESSION_METHODS.get(info.compress_type, "unknown")
                 if info.compress_type is not None
@@ -789,19 +817,21 @@ class RarReader(BaseArchiveReader):
         *,
         pwd: bytes | str | None = None,
         filter: IteratorFilterFunc | ExtractionFilter | None = None,
+        workers: int | None = None,
+        prefetch: int | None = None,
     ) -> Iterator[tuple[ArchiveMember, BinaryIO | None]]:
         if self.config.use_rar_stream:
             logger.debug("iter_members_with_streams: using rar_stream_reader")
             pwd_to_use = pwd if pwd is not None else self.get_archive_password()
 
             # This never returns None for archives with member list support.
-            members = self.get_members_if_available()
-            assert members is not None
+            all_members = self.get_members_if_available()
+            assert all_members is not None
 
             if self.path_str is None:
                 raise ValueError("RAR stream reader cannot be opened from a stream")
 
-            stream_reader = RarStreamReader(self.path_str, members, pwd=pwd_to_use)
+            stream_reader = RarStreamReader(self.path_str, all_members, pwd=pwd_to_use)
             filter_func = _build_filter(
                 members, filter or self.config.extraction_filter, None
             )
@@ -817,6 +847,8 @@ class RarReader(BaseArchiveReader):
                 members,
                 pwd=pwd,
                 filter=filter,
+                workers=workers,
+                prefetch=prefetch,
             )
 
     @classmethod
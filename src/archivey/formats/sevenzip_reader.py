@@ -10,6 +10,7 @@ from queue import Empty, Queue
 from threading import Lock, Thread
 from typing import (
     TYPE_CHECKING,
+    Any,
     BinaryIO,
     Callable,
     Collection,
@@ -411,6 +412,24 @@ class SevenZipReader(BaseArchiveReader):
 
         return py7zr.compressor.SupportedMethods.needs_password(file.folder.coders)
 
+    def _member_index_supported(self) -> bool:
+        return True
+
+    def _restore_members_from_index(
+        self, members: list[ArchiveMember], data: list[Any]
+    ) -> bool:
+        # py7zr always parses the header when opening the archive, but restoring
+        # the members avoids decompressing the link members to read their targets.
+        assert self._archive is not None
+        files = list(self._archive.files)
+        if len(files) != len(members):
+            return False
+        for member, file in zip(members, files):
+            if member.filename.rstrip("/") != file.filename.rstrip("/"):
+                return False
+            member.raw_info = file
+        return True
+
     def iter_members_for_registration(self) -> Iterator[ArchiveMember]:
         assert self._archive is not None
 
@@ -635,6 +654,8 @@ class SevenZipReader(BaseArchiveReader):
         *,
         pwd: bytes | str | None = None,
         filter: IteratorFilterFunc | ExtractionFilter | None = None,
+        workers: int | None = None,
+        prefetch: int | None = None,
         close_streams: bool = True,
     ) -> Iterator[tuple[ArchiveMember, BinaryIO | None]]:
         """Yield members and their streams using a worker thread and queue.
@@ -644,6 +665,9 @@ class SevenZipReader(BaseArchiveReader):
         streams, we spin up a background thread that performs the extraction and
         places each stream into a ``Queue``. This generator consumes from the
         queue so callers can process files as they are decompressed.
+
+        ``workers`` and ``prefetch`` are ignored: py7zr already decompresses on its
+        own thread, and members of solid blocks can't be decompressed independently.
         """
         self.check_archive_open()
         assert self._archive is not None
@@ -1,17 +1,27 @@
+import functools
 import io
 import logging
 import os
 import struct
 from datetime import datetime, timezone
-from typing import BinaryIO, Iterator, Optional
+from typing import BinaryIO, Callable, Iterator, Optional, cast
 
 from archivey.exceptions import (
     ArchiveCorruptedError,
     ArchiveError,
     ArchiveStreamNotSeekableError,
 )
-from archivey.formats.compressed_streams import get_stream_open_fn
+from archivey.formats.compressed_streams import (
+    KnownSizeStream,
+    get_stream_open_fn,
+    with_read_ahead,
+)
 from archivey.formats.format_detection import EXTENSION_TO_FORMAT
+from archivey.formats.gzip_members import contains_gzip_member_header
+from archivey.formats.lz4_frames import read_lz4_frames
+from archivey.formats.lzip_index import read_lzip_index
+from archivey.formats.xz_index import read_xz_index
+from archivey.formats.zstd_frames import read_zstd_frames
 from archivey.internal.base_reader import BaseArchiveReader
 from archivey.internal.io_helpers import (  # Updated import
     is_seekable,
@@ -33,6 +43,18 @@ from archivey.types import (
 
 logger = logging.getLogger(__name__)
 
+# The most that deflate data can expand, per byte.
+_DEFLATE_MAX_RATIO = 1032
+# Deflate data up to this size can't expand past 4 GiB, so the size in the gzip
+# trailer is exact if the file has a single member.
+_MAX_EXACT_GZIP_DATA_SIZE = (1 << 32) // _DEFLATE_MAX_RATIO - 1
+
+# How much of the metadata is read when opening a file: the compressed gzip data
+# scanned for other members, and the zstd and LZ4 block headers walked. The rest is
+# only read when a seek from the end needs the exact size.
+_GZIP_SCAN_SIZE_ON_OPEN = 256 * 1024
+_MAX_BLOCKS_READ_ON_OPEN = 256
+
 
 def _read_null_terminated_bytes(f: BinaryIO) -> bytes:
     str_bytes = bytearray()
@@ -45,18 +67,29 @@ def _read_null_terminated_bytes(f: BinaryIO) -> bytes:
 
 
 def read_gzip_metadata(
-    path: str | BinaryIO, member: ArchiveMember, use_stored_metadata: bool = False
-):
+    path: str | BinaryIO,
+    member: ArchiveMember,
+    use_stored_metadata: bool = False,
+    scan_size: int = _GZIP_SCAN_SIZE_ON_OPEN,
+) -> bool:
     """
     Extract metadata from a .gz file without decompressing and update the ArchiveMember:
     - original internal filename (if present) goes into extra field
     - modification time (as POSIX timestamp)
     - CRC32 of uncompressed data
-    - uncompressed size (modulo 2^32)
+    - uncompressed size, unless the file has several members
     - compression method
     - compression level
     - operating system
     - extra field data
+
+    The CRC32 and size come from the trailer of the last member, and the size is
+    stored modulo 2^32. They are not reported if another member is found, but only
+    the first `scan_size` bytes of compressed data are searched, so the size may be
+    wrong for larger files with several members or that decompress to more than
+    4 GiB.
+
+    Returns whether the reported size is known to be exact.
     """
 
     extra_fields = {}
@@ -122,91 +155,130 @@ def read_gzip_metadata(
 
         # Now seek to trailer and read CRC32 and ISIZE
         try:
-            f.seek(-8, 2)
+            data_start = f.tell()
+            trailer_start = f.seek(-8, 2)
             crc32, isize = struct.unpack("<II", read_exact(f, 8))
-            member.crc32 = crc32
-            member.file_size = isize
         except io.UnsupportedOperation:
             # Stream not seekable or not seekable to end
             logger.info(
                 "Stream not seekable to end when reading GZIP metadata: %s", path
             )
-            pass
-
-
-def _read_xz_multibyte_integer(data: bytes, offset: int) -> tuple[int, int]:
-    """
-    Read a multi-byte integer from the data at the given offset.
-    """
-    value = 0
-    shift = 0
-    while True:
-        b = data[offset]
-        offset += 1
-        value |= (b & 0x7F) << shift
-        if b & 0x80 == 0:
-            break
-        shift += 7
-
-    return value, offset
+            return False
+
+        # The trailer only describes the last member.
+        scan_end = min(trailer_start, data_start + scan_size)
+        if contains_gzip_member_header(f, data_start, scan_end):
+            logger.info("GZIP file may have several members, size unknown: %s", path)
+            return False
+        member.crc32 = crc32
+        member.file_size = isize
+        # ISIZE is the size modulo 2^32, so it's only certain if the deflate data is
+        # too small to expand past that.
+        return (
+            scan_end == trailer_start
+            and trailer_start - data_start <= _MAX_EXACT_GZIP_DATA_SIZE
+        )
 
 
-XZ_MAGIC_FOOTER = b"YZ"
-XZ_STREAM_HEADER_MAGIC = b"\xfd7zXZ\x00"
+def _find_gzip_size(path: str) -> int | None:
+    """Return the size of a gzip file, if its trailer is known to give it exactly."""
+    member = ArchiveMember(
+        filename=path,
+        file_size=None,
+        compress_size=None,
+        mtime_with_tz=None,
+        type=MemberType.FILE,
+    )
+    if not read_gzip_metadata(path, member, scan_size=_MAX_EXACT_GZIP_DATA_SIZE):
+        return None
+    return member.file_size
 
 
 def read_xz_metadata(path: str | BinaryIO, member: ArchiveMember):
     logger.info("Reading XZ metadata for %s", path)
     with open_if_file(path) as f:
         try:
-            f.seek(-12, 2)  # Footer is always 12 bytes
+            blocks = read_xz_index(f, f.tell())
         except io.UnsupportedOperation:
             # Stream not seekable or not seekable to end
             return
 
-        footer = read_exact(f, 12)
-
-        if footer[-2:] != XZ_MAGIC_FOOTER:
-            logger.warning("Invalid XZ footer, file possibly truncated: %s", path)
+        if blocks is None:
+            logger.warning("Invalid XZ index, file possibly truncated: %s", path)
             return
 
-        # Backward Size (first 4 bytes) tells how far back the Index is, in 4-byte units minus 1
-        backward_size_field = struct.unpack("<I", footer[4:8])[0]
-        index_size = (backward_size_field + 1) * 4
-        logger.info(
-            "XZ metadata: index_size=%s, backward_size_field=%s",
-            index_size,
-            backward_size_field,
+        member.file_size = sum(block.uncompressed_size for block in blocks)
+        logger.debug(
+            f"XZ metadata: total_size={member.file_size}, num_blocks={len(blocks)}"
         )
 
-        f.seek(-12 - index_size, 2)
-        index_data = read_exact(f, index_size)
 
-        # Skip index indicator byte and reserved bits (first byte)
-        if index_data[0] != 0x00:
-            logger.warning("Invalid XZ footer, file possibly corrupted: %s", path)
+def _sum_frame_sizes(sizes: list[int | None] | None) -> int | None:
+    # Frames may omit their size.
+    if sizes is None or None in sizes:
+        return None
+    return sum(cast("list[int]", sizes))
+
+
+def _find_zstd_size(path: str | BinaryIO, max_blocks: int | None = None) -> int | None:
+    with open_if_file(path) as f:
+        frames = read_zstd_frames(f, f.tell(), max_blocks)
+    return _sum_frame_sizes(
+        None if frames is None else [frame.uncompressed_size for frame in frames]
+    )
+
+
+def _find_lz4_size(path: str | BinaryIO, max_blocks: int | None = None) -> int | None:
+    with open_if_file(path) as f:
+        frames = read_lz4_frames(f, f.tell(), max_blocks)
+    return _sum_frame_sizes(
+        None if frames is None else [frame.uncompressed_size for frame in frames]
+    )
+
+
+def read_zstd_metadata(path: str | BinaryIO, member: ArchiveMember):
+    member.file_size = _find_zstd_size(path, _MAX_BLOCKS_READ_ON_OPEN)
+
+
+def read_lz4_metadata(path: str | BinaryIO, member: ArchiveMember):
+    member.file_size = _find_lz4_size(path, _MAX_BLOCKS_READ_ON_OPEN)
+
+
+def read_lzip_metadata(path: str | BinaryIO, member: ArchiveMember):
+    with open_if_file(path) as f:
+        members = read_lzip_index(f, f.tell())
+        if members is None:
+            logger.warning("Invalid lzip trailers, file possibly truncated: %s", path)
             return
+        member.file_size = sum(m.uncompressed_size for m in members)
 
-        # Next 2–10 bytes are variable-length field counts and sizes
-        # We just want the uncompressed size (encoded as a multi-byte integer)
 
-        # Decode the first count (number of records)
-        blocks = []
-        total_uncompressed_size = 0
+# Metadata readers that don't decompress anything, for each format that stores the
+# uncompressed size or the information needed to find it.
+_METADATA_READERS: dict[
+    ArchiveFormat, Callable[[str | BinaryIO, ArchiveMember], None]
+] = {
+    ArchiveFormat.XZ: read_xz_metadata,
+    ArchiveFormat.ZSTD: read_zstd_metadata,
+    ArchiveFormat.LZ4: read_lz4_metadata,
+    ArchiveFormat.LZIP: read_lzip_metadata,
+}
 
-        offset = 1
-        number_of_blocks, offset = _read_xz_multibyte_integer(index_data, offset)
+# Functions that find the exact size of a file when the metadata read on opening it
+# didn't give it, reading all the metadata needed.
+_SIZE_FINDERS: dict[ArchiveFormat, Callable[[str], int | None]] = {
+    ArchiveFormat.GZIP: _find_gzip_size,
+    ArchiveFormat.ZSTD: _find_zstd_size,
+    ArchiveFormat.LZ4: _find_lz4_size,
+}
 
-        for _ in range(number_of_blocks):
-            count, offset = _read_xz_multibyte_integer(index_data, offset)
-            uncompressed_size, offset = _read_xz_multibyte_integer(index_data, offset)
-            blocks.append((uncompressed_size, offset))
-            total_uncompressed_size += uncompressed_size
 
-        member.file_size = total_uncompressed_size
-        logger.debug(
-            f"XZ metadata: total_size={total_uncompressed_size}, num_blocks={number_of_blocks}, blocks={blocks}"
-        )
+def _open_with_known_size(
+    open_fn: Callable[[str | BinaryIO], BinaryIO],
+    size: int | Callable[[], int | None],
+    path: str | BinaryIO,
+) -> BinaryIO:
+    return KnownSizeStream(open_fn(path), size)
 
 
 class SingleFileReader(BaseArchiveReader):
@@ -283,11 +355,14 @@ class SingleFileReader(BaseArchiveReader):
             crc32=None,
         )
 
+        size_is_exact = True
         if seekable:
             if self.format == ArchiveFormat.GZIP:
-                read_gzip_metadata(archive_path, self.member, self.use_stored_metadata)
-            elif self.format == ArchiveFormat.XZ:
-                read_xz_metadata(archive_path, self.member)
+                size_is_exact = read_gzip_metadata(
+                    archive_path, self.member, self.use_stored_metadata
+                )
+            elif self.format in _METADATA_READERS:
+                _METADATA_READERS[self.format](archive_path, self.member)
 
         # Open the file to see if it's supported by the library and valid.
         # To avoid opening the file twice, we'll store the reference and return it
@@ -295,6 +370,17 @@ class SingleFileReader(BaseArchiveReader):
         self._opener, self._exception_translator = get_stream_open_fn(
             self.format.stream, self.config
         )
+        size: int | Callable[[], int | None] | None = None
+        if self.member.file_size is not None and size_is_exact:
+            size = self.member.file_size
+        elif self.path_str is not None and self.format in _SIZE_FINDERS:
+            # Read the rest of the metadata only if a seek from the end needs it.
+            size = functools.partial(_SIZE_FINDERS[self.format], self.path_str)
+
+        if streaming_only:
+            self._opener = with_read_ahead(self._opener, self.config)
+        elif size is not None:
+            self._opener = functools.partial(_open_with_known_size, self._opener, size)
 
         self.fileobj: BinaryIO | None = run_with_exception_translation(
             lambda: self._opener(archive_path),
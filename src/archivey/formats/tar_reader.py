@@ -1,9 +1,20 @@
+import contextlib
+import io
 import logging
 import os
 import stat
 import tarfile
 from datetime import datetime, timezone
-from typing import TYPE_CHECKING, BinaryIO, Iterator, List, Optional, cast
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    BinaryIO,
+    Callable,
+    Iterator,
+    Optional,
+    Sequence,
+    cast,
+)
 
 from archivey.exceptions import (
     ArchiveCorruptedError,
@@ -13,12 +24,16 @@ from archivey.exceptions import (
     ArchiveStreamNotSeekableError,
 )
 from archivey.formats.compressed_streams import open_stream
+from archivey.internal.archive_stream import ArchiveStream
 from archivey.internal.base_reader import (
     ArchiveInfo,
     ArchiveMember,
     BaseArchiveReader,
 )
 from archivey.internal.io_helpers import (
+    PREAD_SUPPORTED,
+    FileMapping,
+    PositionalReader,
     ensure_binaryio,
     ensure_bufferedio,
     is_seekable,
@@ -32,6 +47,26 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 
+# TarInfo attributes stored in the member index, enough to rebuild a TarInfo that
+# TarFile.extractfile() can open without rescanning the archive.
+_TARINFO_INDEX_ATTRS = (
+    "name",
+    "type",
+    "size",
+    "mtime",
+    "mode",
+    "uid",
+    "gid",
+    "uname",
+    "gname",
+    "linkname",
+    "devmajor",
+    "devminor",
+    "offset",
+    "offset_data",
+    "sparse",
+)
+
 
 class TarReader(BaseArchiveReader):
     """Reader for TAR archives and compressed TAR archives."""
@@ -74,7 +109,7 @@ class TarReader(BaseArchiveReader):
         )
         self._streaming_only = streaming_only
         self._format_info: ArchiveInfo | None = None
-        self._fileobj: BufferedIOBase | None = None
+        self._fileobj: BufferedIOBase | BinaryIO | None = None
         self._close_fileobj: bool
 
         logger.debug(
@@ -89,8 +124,15 @@ class TarReader(BaseArchiveReader):
             # Ensure the stream is buffered. tarfile may fail when reading a file
             # if read() returns fewer bytes than requested (specifically
             # inside tarfile._FileInFile.read(), line 696 in Python 3.13.5).
-            self._fileobj = ensure_bufferedio(
-                open_stream(format.stream, archive_path, self.config)
+            # Most decompression libraries already return a buffered stream, which
+            # doesn't need a second buffer on top.
+            stream = open_stream(
+                format.stream, archive_path, self.config, streaming_only
+            )
+            self._fileobj = (
+                stream
+                if isinstance(stream, ArchiveStream) and stream.is_buffered()
+                else ensure_bufferedio(stream)
             )
 
             self._close_fileobj = True
@@ -136,16 +178,39 @@ class TarReader(BaseArchiveReader):
             self._fileobj.seekable(),
         )
 
+        # Descriptor of the archive file, for reading members with os.pread().
+        self._pread_fd: int | None = None
+        if (
+            PREAD_SUPPORTED
+            and not streaming_only
+            and format.stream == StreamFormat.UNCOMPRESSED
+            and isinstance(archive_path, str)
+        ):
+            self._pread_fd = self._fileobj.fileno()
+
+        # Memory map of the archive file, for read_member_view().
+        self._mapping: FileMapping | None = None
+        if (
+            not streaming_only
+            and format.stream == StreamFormat.UNCOMPRESSED
+            and isinstance(archive_path, str)
+        ):
+            self._mapping = FileMapping(self._fileobj.fileno())
+
     def _close_archive(self) -> None:
         """Close the archive and release any resources."""
         self._archive.close()  # type: ignore
         self._archive = None
+        self._pread_fd = None
+        if self._mapping is not None:
+            self._mapping.close()
+            self._mapping = None
 
         if self._close_fileobj and self._fileobj is not None:
             self._fileobj.close()
             self._fileobj = None
 
-    def get_members_if_available(self) -> List[ArchiveMember] | None:
+    def get_members_if_available(self) -> Sequence[ArchiveMember] | None:
         if self._streaming_only:
             return None
         return self.get_members()
@@ -195,6 +260,31 @@ class TarReader(BaseArchiveReader):
             raw_info=info,
         )
 
+    def _member_index_supported(self) -> bool:
+        return True
+
+    def _get_member_index_data(self, member: ArchiveMember) -> Any:
+        info = cast("tarfile.TarInfo", member.raw_info)
+        values: list[Any] = [getattr(info, attr) for attr in _TARINFO_INDEX_ATTRS]
+        values[_TARINFO_INDEX_ATTRS.index("type")] = info.type.decode("latin-1")
+        return values
+
+    def _restore_members_from_index(
+        self, members: list[ArchiveMember], data: list[Any]
+    ) -> bool:
+        for member, values in zip(members, data, strict=True):
+            info = tarfile.TarInfo()
+            for attr, value in zip(_TARINFO_INDEX_ATTRS, values, strict=True):
+                setattr(info, attr, value)
+            info.type = cast("str", info.type).encode("latin-1")
+            sparse = cast("list[list[int]] | None", info.sparse)
+            if sparse is not None:
+                # The index stores the (offset, size) tuples as lists. typeshed
+                # declares sparse as bytes, but tarfile uses a list of tuples.
+                info.sparse = [(offset, size) for offset, size in sparse]  # pyright: ignore[reportAttributeAccessIssue]
+            member.raw_info = info
+        return True
+
     def _check_tar_integrity(self, last_tarinfo: tarfile.TarInfo) -> None:
         # See what's after the last tarinfo. It should be two empty blocks.
         data_size = last_tarinfo.size
@@ -258,7 +348,10 @@ class TarReader(BaseArchiveReader):
 
         tarinfo = cast("tarfile.TarInfo", member.raw_info)
 
-        assert self._archive is not None
+        positional_stream = self._open_positional_stream(tarinfo)
+        if positional_stream is not None:
+            return positional_stream
+
         stream = self._archive.extractfile(tarinfo)
         if stream is None:
             raise ArchiveMemberCannotBeOpenedError(
@@ -266,6 +359,67 @@ class TarReader(BaseArchiveReader):
             )
         return ensure_binaryio(stream)
 
+    def _open_positional_stream(self, tarinfo: tarfile.TarInfo) -> BinaryIO | None:
+        """
+        Open the data of a regular member straight from its position in the archive
+        file, if possible.
+
+        Unlike `extractfile()`, this doesn't seek the TarFile's file object, so
+        members can be read concurrently from several threads.
+        """
+        if self._pread_fd is None or not tarinfo.isreg() or tarinfo.issparse():
+            return None
+        return cast(
+            "BinaryIO",
+            io.BufferedReader(
+                PositionalReader(
+                    self._pread_fd, start=tarinfo.offset_data, length=tarinfo.size
+                )
+            ),
+        )
+
+    def _supports_concurrent_reads(self) -> bool:
+        return self._pread_fd is not None
+
+    def _get_member_view(
+        self, member: ArchiveMember, pwd: bytes | str | None
+    ) -> memoryview | None:
+        tarinfo = cast("tarfile.TarInfo", member.raw_info)
+        if self._mapping is None or not tarinfo.isreg() or tarinfo.issparse():
+            return None
+        return self._mapping.view(tarinfo.offset_data, tarinfo.size)
+
+    def _create_worker_member_opener(
+        self, stack: contextlib.ExitStack
+    ) -> Callable[[ArchiveMember, bytes | str | None], BinaryIO] | None:
+        if self._pread_fd is None:
+            # Compressed tars can only be decompressed sequentially.
+            return None
+        archive_path = cast("str", self.path_str)
+        worker_archive: tarfile.TarFile | None = None
+
+        def _open(member: ArchiveMember, pwd: bytes | str | None) -> BinaryIO:
+            nonlocal worker_archive
+            tarinfo = cast("tarfile.TarInfo", member.raw_info)
+            stream = self._open_positional_stream(tarinfo)
+            if stream is not None:
+                return stream
+
+            # Sparse members need tarfile to map their data, so use a separate
+            # TarFile for this worker.
+            if worker_archive is None:
+                worker_archive = stack.enter_context(
+                    tarfile.open(archive_path, mode="r:")
+                )
+            data = worker_archive.extractfile(tarinfo)
+            if data is None:
+                raise ArchiveMemberCannotBeOpenedError(
+                    f"Member {member.filename} cannot be opened"
+                )
+            return cast("BinaryIO", data)
+
+        return _open
+
     def get_archive_info(self) -> ArchiveInfo:
         """Get detailed information about the archive's format.
 
@@ -299,6 +453,10 @@ class TarReader(BaseArchiveReader):
         try:
             tarinfo: tarfile.TarInfo | None = None
             for tarinfo in self._archive:
+                if tarinfo.isfile() and self._is_excluded_from_registration(
+                    tarinfo.name, tarinfo.size
+                ):
+                    continue
                 yield self._tarinfo_to_archive_member(tarinfo)
 
             if self.config.tar_check_integrity and tarinfo is not None:
@@ -0,0 +1,170 @@
+"""Reading the block index of .xz files.
+
+Each xz stream ends with an index listing the compressed and uncompressed size of
+each of its blocks, followed by a fixed-size footer that points to the index. Reading
+them from the end of the file gives the position of every block without
+decompressing anything.
+"""
+
+from __future__ import annotations
+
+import io
+import logging
+import struct
+import zlib
+from dataclasses import dataclass
+from typing import BinaryIO
+
+from archivey.internal.io_helpers import read_exact
+
+logger = logging.getLogger(__name__)
+
+XZ_MAGIC_FOOTER = b"YZ"
+XZ_STREAM_HEADER_MAGIC = b"\xfd7zXZ\x00"
+
+
+@dataclass
+class XzBlock:
+    """A block of an .xz file, as described by the index of its stream."""
+
+    offset: int
+    "Position of the block header in the file."
+    unpadded_size: int
+    "Size of the block header, compressed data and check, without the block padding."
+    uncompressed_offset: int
+    "Position of the block data in the uncompressed data of the whole file."
+    uncompressed_size: int
+    "Size of the uncompressed data of the block."
+    stream_flags: bytes
+    "Stream flags of the stream the block belongs to (the type of check)."
+
+    @property
+    def padded_size(self) -> int:
+        """Size of the block in the file, including the padding."""
+        return (self.unpadded_size + 3) & ~3
+
+
+def read_xz_multibyte_integer(data: bytes, offset: int) -> tuple[int, int]:
+    """
+    Read a multi-byte integer from the data at the given offset.
+    """
+    value = 0
+    shift = 0
+    while True:
+        b = data[offset]
+        offset += 1
+        value |= (b & 0x7F) << shift
+        if b & 0x80 == 0:
+            break
+        shift += 7
+
+    return value, offset
+
+
+def encode_xz_multibyte_integer(value: int) -> bytes:
+    """Encode an integer in the format read by `read_xz_multibyte_integer`."""
+    data = bytearray()
+    while value >= 0x80:
+        data.append(value & 0x7F | 0x80)
+        value >>= 7
+    data.append(value)
+    return bytes(data)
+
+
+def _crc32_matches(data: bytes, crc: bytes) -> bool:
+    return zlib.crc32(data) == struct.unpack("<I", crc)[0]
+
+
+def _read_stream_blocks(
+    f: BinaryIO, start: int, end: int
+) -> tuple[int, list[tuple[int, int, int]]] | None:
+    """Read the index of the stream that ends at `end`.
+
+    Returns the position of the stream header and the `(offset, unpadded size,
+    uncompressed size)` of its blocks, or None if the stream is not valid.
+    """
+    if end - start < 24:
+        return None
+    f.seek(end - 12)
+    footer = read_exact(f, 12)
+    if footer[-2:] != XZ_MAGIC_FOOTER or not _crc32_matches(footer[4:10], footer[:4]):
+        return None
+
+    # Backward Size tells how far back the Index is, in 4-byte units minus 1
+    index_size = (struct.unpack("<I", footer[4:8])[0] + 1) * 4
+    index_start = end - 12 - index_size
+    if index_start < start + 12:
+        return None
+    f.seek(index_start)
+    index_data = read_exact(f, index_size)
+    if index_data[0] != 0x00 or not _crc32_matches(index_data[:-4], index_data[-4:]):
+        return None
+
+    records = []
+    offset = 1
+    number_of_blocks, offset = read_xz_multibyte_integer(index_data, offset)
+    for _ in range(number_of_blocks):
+        unpadded_size, offset = read_xz_multibyte_integer(index_data, offset)
+        uncompressed_size, offset = read_xz_multibyte_integer(index_data, offset)
+        records.append((unpadded_size, uncompressed_size))
+
+    stream_start = index_start - 12 - sum((size + 3) & ~3 for size, _ in records)
+    if stream_start < start:
+        return None
+    f.seek(stream_start)
+    header = read_exact(f, 12)
+    if header[:6] != XZ_STREAM_HEADER_MAGIC or header[6:8] != footer[8:10]:
+        return None
+
+    blocks = []
+    block_offset = stream_start + 12
+    for unpadded_size, uncompressed_size in records:
+        blocks.append((block_offset, unpadded_size, uncompressed_size))
+        block_offset += (unpadded_size + 3) & ~3
+    return stream_start, blocks
+
+
+def read_xz_index(f: BinaryIO, start: int = 0) -> list[XzBlock] | None:
+    """Read the blocks of all the streams of an .xz file from their indexes.
+
+    `f` must be seekable, and `start` is the position of the first stream in it.
+    Returns None if the file doesn't end with a valid index and footer, for example
+    if it's truncated.
+    """
+    streams: list[tuple[bytes, list[tuple[int, int, int]]]] = []
+    end = f.seek(0, io.SEEK_END)
+    try:
+        while end > start:
+            # Streams may be followed by padding, in multiples of 4 null bytes.
+            if end - start >= 4:
+                f.seek(end - 4)
+                if read_exact(f, 4) == b"\x00" * 4:
+                    end -= 4
+                    continue
+
+            stream = _read_stream_blocks(f, start, end)
+            if stream is None:
+                return None
+            end, blocks = stream
+            f.seek(end + 6)
+            streams.append((read_exact(f, 2), blocks))
+    except IndexError:
+        # A multi-byte integer runs past the end of the index.
+        return None
+
+    result = []
+    uncompressed_offset = 0
+    for stream_flags, blocks in reversed(streams):
+        for offset, unpadded_size, uncompressed_size in blocks:
+            result.append(
+                XzBlock(
+                    offset,
+                    unpadded_size,
+                    uncompressed_offset,
+                    uncompressed_size,
+                    stream_flags,
+                )
+            )
+            uncompressed_offset += uncompressed_size
+    logger.debug("XZ index: %d streams, %d blocks", len(streams), len(result))
+    return result
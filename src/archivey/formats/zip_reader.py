@@ -1,11 +1,14 @@
+import contextlib
+import functools
 import io
 import logging
 import os
 import stat
 import struct
 import zipfile
+import zlib
 from datetime import datetime, timezone
-from typing import BinaryIO, Iterator, Optional, cast
+from typing import Any, BinaryIO, Callable, Iterator, Optional, cast
 
 from archivey.exceptions import (
     ArchiveCorruptedError,
@@ -14,10 +17,15 @@ from archivey.exceptions import (
     ArchiveStreamNotSeekableError,
     ArchiveUnsupportedFeatureError,
 )
+from archivey.formats.compressed_streams import ZlibDecompressorStream
 from archivey.internal.base_reader import (
     BaseArchiveReader,
 )
 from archivey.internal.io_helpers import (
+    PREAD_SUPPORTED,
+    FileMapping,
+    PositionalReader,
+    SharedFileDescriptor,
     is_seekable,
     is_stream,
     run_with_exception_translation,
@@ -34,9 +42,59 @@ from archivey.types import (
 # Encoding fallbacks used when decoding strings stored in the ZIP metadata.
 _ZIP_ENCODINGS = ["utf-8", "cp437", "cp1252", "latin-1"]
 
+# Signature and fixed size of a local file header, from the ZIP specification.
+_LOCAL_FILE_HEADER_SIGNATURE = b"PK\x03\x04"
+_LOCAL_FILE_HEADER_SIZE = 30
+
 logger = logging.getLogger(__name__)
 
 
+def _data_offset_from_header(info: zipfile.ZipInfo, header: bytes | memoryview) -> int:
+    """Return the offset of the member data, given its local file header."""
+    if len(header) < _LOCAL_FILE_HEADER_SIZE or (
+        header[:4] != _LOCAL_FILE_HEADER_SIGNATURE
+    ):
+        raise ArchiveCorruptedError(
+            f"Bad local file header signature for {info.filename}"
+        )
+    # The data starts after the local file header, whose name and extra fields
+    # may differ in length from those in the central directory.
+    name_length, extra_length = struct.unpack("<HH", header[26:30])
+    return info.header_offset + _LOCAL_FILE_HEADER_SIZE + name_length + extra_length
+
+
+def _open_member_data(
+    fileobj: BinaryIO,
+    info: zipfile.ZipInfo,
+    pwd: bytes | None,
+    close_fileobj: bool,
+) -> zipfile.ZipExtFile:
+    """Open a member like `ZipFile.open()`, with `fileobj` at the start of its data.
+
+    This skips the ZipFile, so that members can be read through any file object
+    without parsing the central directory again.
+    """
+    if info.flag_bits & 0x20:
+        raise NotImplementedError("compressed patched data (flag bit 5)")
+    if info.flag_bits & 0x40:
+        raise NotImplementedError("strong encryption (flag bit 6)")
+    end_offset = getattr(info, "_end_offset", None)
+    if end_offset is not None and fileobj.tell() + info.compress_size > end_offset:
+        # Checked by ZipFile.open() since Python 3.12.
+        raise zipfile.BadZipFile(
+            f"Overlapped entries: {info.orig_filename!r} (possible zip bomb)"
+        )
+    if info.flag_bits & 0x1:
+        if not pwd:
+            raise RuntimeError(
+                f"File {info.orig_filename!r} is encrypted, password required for "
+                "extraction"
+            )
+    else:
+        pwd = None
+    return zipfile.ZipExtFile(fileobj, "r", info, pwd, close_fileobj)
+
+
 def get_zipinfo_timestamp(zip_info: zipfile.ZipInfo) -> datetime | None:
     """Return the modification time stored in ``zip_info``.
 
@@ -134,6 +192,8 @@ class ZipReader(BaseArchiveReader):
             e, NotImplementedError
         ) and "That compression method is not supported" in str(e):
             return ArchiveUnsupportedFeatureError("Compression method is not supported")
+        if isinstance(e, zlib.error):
+            return ArchiveCorruptedError(f"Error decompressing ZIP member: {repr(e)}")
         return None
 
     def __init__(
@@ -171,10 +231,31 @@ class ZipReader(BaseArchiveReader):
             archive_path=str(archive_path),
         )
 
+        # Descriptor of the archive file, for reading members with os.pread(). Each
+        # member stream reads through its own view of the file, and keeps the
+        # descriptor open until it's closed.
+        self._pread_fd: SharedFileDescriptor | None = None
+        if PREAD_SUPPORTED and self.path_str is not None:
+            self._pread_fd = SharedFileDescriptor(
+                self._archive.fp.fileno()  # type: ignore[union-attr]
+            )
+
+        # Memory map of the archive file, for read_member_view().
+        self._mapping: FileMapping | None = None
+        if self.path_str is not None:
+            fd = self._archive.fp.fileno()  # type: ignore[union-attr]
+            self._mapping = FileMapping(fd)
+
     def _close_archive(self) -> None:
         """Close the archive and release any resources."""
         self._archive.close()  # type: ignore
         self._archive = None
+        if self._pread_fd is not None:
+            self._pread_fd.release()
+            self._pread_fd = None
+        if self._mapping is not None:
+            self._mapping.close()
+            self._mapping = None
 
     def _zipinfo_to_archive_member(self, info: zipfile.ZipInfo) -> ArchiveMember:
         """Convert ``ZipInfo`` to :class:`ArchiveMember`."""
@@ -185,7 +266,10 @@ class ZipReader(BaseArchiveReader):
         compression_method = ZIP_COMPRESSION_METHODS.get(info.compress_type, "unknown")
 
         logger.info(
-            f"Filename: {info.filename}: compression_method={compression_method} {info.compress_type}"
+            "Filename: %s: compression_method=%s %s",
+            info.filename,
+            compression_method,
+            info.compress_type,
         )
 
         return ArchiveMember(
@@ -221,6 +305,24 @@ class ZipReader(BaseArchiveReader):
             link_target=self._read_link_target(info),
         )
 
+    def _member_index_supported(self) -> bool:
+        return True
+
+    def _restore_members_from_index(
+        self, members: list[ArchiveMember], data: list[Any]
+    ) -> bool:
+        # zipfile always parses the central directory when opening the archive, so
+        # only the conversion (including reading symlink targets) is skipped here.
+        assert self._archive is not None
+        infos = self._archive.infolist()
+        if len(infos) != len(members):
+            return False
+        for member, info in zip(members, infos):
+            if member.filename != info.filename:
+                return False
+            member.raw_info = info
+        return True
+
     def _read_link_target(self, info: zipfile.ZipInfo) -> str | None:
         """Return the symlink target for ``info`` if it is a symlink."""
         assert self._archive is not None
@@ -230,6 +332,18 @@ class ZipReader(BaseArchiveReader):
                 return f.read().decode("utf-8")
         return None
 
+    def _get_data_offset(self, member: ArchiveMember) -> int:
+        """Return the offset of the member data in the archive file."""
+        info = cast("zipfile.ZipInfo", member.raw_info)
+        if self._pread_fd is not None:
+            header = os.pread(
+                self._pread_fd.fd, _LOCAL_FILE_HEADER_SIZE, info.header_offset
+            )
+        else:
+            assert self._mapping is not None
+            header = self._mapping.view(info.header_offset, _LOCAL_FILE_HEADER_SIZE)
+        return _data_offset_from_header(info, header)
+
     def _open_member(
         self,
         member: ArchiveMember,
@@ -238,15 +352,93 @@ class ZipReader(BaseArchiveReader):
     ) -> BinaryIO:
         assert self._archive is not None
 
-        return cast(
-            "BinaryIO",
-            self._archive.open(
-                cast("zipfile.ZipInfo", member.raw_info),
-                pwd=str_to_bytes(
-                    pwd if pwd is not None else self.get_archive_password()
-                ),
-            ),
+        info = cast("zipfile.ZipInfo", member.raw_info)
+        pwd_bytes = str_to_bytes(
+            pwd if pwd is not None else self.get_archive_password()
+        )
+        if self._pread_fd is None:
+            return cast("BinaryIO", self._archive.open(info, pwd=pwd_bytes))
+
+        # zipfile reads all the members through a single file object, seeking it
+        # under a lock before each read. Read each member through its own view of
+        # the file instead, so that threads read members concurrently.
+        data = PositionalReader(
+            self._pread_fd,
+            start=self._get_data_offset(member),
+            length=info.compress_size,
         )
+        checkpoint_interval = self.config.decompression_checkpoint_interval
+        try:
+            if (
+                checkpoint_interval
+                and info.compress_type == zipfile.ZIP_DEFLATED
+                and not info.flag_bits & 0x1
+                and info.file_size > checkpoint_interval
+            ):
+                # zipfile decompresses again from the start of the member when
+                # seeking backwards, so decompress large members directly, keeping
+                # checkpoints.
+                return ZlibDecompressorStream(
+                    io.BufferedReader(data),
+                    wbits=-zlib.MAX_WBITS,
+                    expected_crc=info.CRC,
+                    checkpoint_interval=checkpoint_interval,
+                )
+            return cast(
+                "BinaryIO",
+                _open_member_data(data, info, pwd_bytes, close_fileobj=True),
+            )
+        except BaseException:
+            data.close()
+            raise
+
+    def _get_member_view(
+        self, member: ArchiveMember, pwd: bytes | str | None
+    ) -> memoryview | None:
+        info = cast("zipfile.ZipInfo", member.raw_info)
+        if (
+            self._mapping is None
+            or info.compress_type != zipfile.ZIP_STORED
+            or info.flag_bits & 0x1
+        ):
+            return None
+        return self._mapping.view(self._get_data_offset(member), info.compress_size)
+
+    def _supports_concurrent_reads(self) -> bool:
+        return self._pread_fd is not None
+
+    def _create_worker_member_opener(
+        self, stack: contextlib.ExitStack
+    ) -> Callable[[ArchiveMember, bytes | str | None], BinaryIO] | None:
+        assert self._archive is not None
+        if self._pread_fd is not None:
+            # Members are already read through their own views of the file.
+            return functools.partial(self._open_member, for_iteration=False)
+        if self.path_str is None:
+            return None
+
+        # Read the members with the ZipInfo objects already parsed by this reader,
+        # through a file object used only by this opener.
+        fileobj = stack.enter_context(open(self.path_str, "rb"))
+        archive_pwd = self.get_archive_password()
+
+        def _open(member: ArchiveMember, pwd: bytes | str | None) -> BinaryIO:
+            info = cast("zipfile.ZipInfo", member.raw_info)
+            fileobj.seek(info.header_offset)
+            fileobj.seek(
+                _data_offset_from_header(info, fileobj.read(_LOCAL_FILE_HEADER_SIZE))
+            )
+            return cast(
+                "BinaryIO",
+                _open_member_data(
+                    fileobj,
+                    info,
+                    str_to_bytes(pwd if pwd is not None else archive_pwd),
+                    close_fileobj=False,
+                ),
+            )
+
+        return _open
 
     def get_archive_info(self) -> ArchiveInfo:
         """Get detailed information about the archive's format."""
@@ -274,6 +466,12 @@ class ZipReader(BaseArchiveReader):
         assert self._archive is not None
 
         for info in self._archive.infolist():
+            if (
+                not info.is_dir()
+                and not stat.S_ISLNK(info.external_attr >> 16)
+                and self._is_excluded_from_registration(info.filename, info.file_size)
+            ):
+                continue
             yield self._zipinfo_to_archive_member(info)
 
     @classmethod
@@ -0,0 +1,193 @@
+"""Listing the frames of Zstandard files without decompressing them.
+
+A .zst file is a sequence of frames, each of which can be decompressed on its own.
+Files in the seekable format end with a seek table (in a skippable frame) that lists
+the compressed and decompressed size of every frame. Otherwise, the frames can be
+found by walking the frame and block headers, and their decompressed size is known if
+their header includes it.
+"""
+
+from __future__ import annotations
+
+import io
+import logging
+import struct
+from dataclasses import dataclass
+from typing import BinaryIO
+
+from archivey.internal.io_helpers import read_exact
+
+logger = logging.getLogger(__name__)
+
+ZSTD_MAGIC = 0xFD2FB528
+ZSTD_SKIPPABLE_MAGIC = 0x184D2A50
+ZSTD_SKIPPABLE_MAGIC_MASK = 0xFFFFFFF0
+ZSTD_SEEK_TABLE_MAGIC = 0x184D2A5E
+ZSTD_SEEKABLE_FOOTER_MAGIC = 0x8F92EAB1
+
+
+@dataclass
+class ZstdFrame:
+    """A frame of a Zstandard file."""
+
+    offset: int
+    "Position of the frame in the file."
+    size: int
+    "Size of the frame in the file."
+    uncompressed_size: int | None
+    "Size of the decompressed data of the frame, if known."
+
+
+def _seek_to_end(f: BinaryIO) -> int | None:
+    """Seek to the end of `f` and return its size, or None if it's not possible."""
+    try:
+        return f.seek(0, io.SEEK_END)
+    except OSError:
+        # Includes io.UnsupportedOperation, raised by streams that claim to be
+        # seekable but can't seek to the end, such as the ones used for format
+        # detection.
+        return None
+
+
+def read_zstd_seek_table(f: BinaryIO, start: int = 0) -> list[ZstdFrame] | None:
+    """Read the frames listed in the seek table at the end of a seekable .zst file.
+
+    `f` must be seekable, and `start` is the position of the first frame in it.
+    Returns None if the file doesn't end with a valid seek table, or if its end can't
+    be reached.
+    """
+    end = _seek_to_end(f)
+    if end is None:
+        return None
+    if end - start < 17:
+        return None
+    f.seek(end - 9)
+    number_of_frames, descriptor, magic = struct.unpack("<IBI", read_exact(f, 9))
+    if magic != ZSTD_SEEKABLE_FOOTER_MAGIC:
+        return None
+
+    # Each entry has the compressed and decompressed size, and optionally a checksum.
+    entry_size = 12 if descriptor & 0x80 else 8
+    table_size = number_of_frames * entry_size + 9
+    table_start = end - 8 - table_size
+    if table_start < start:
+        return None
+    f.seek(table_start)
+    if struct.unpack("<II", read_exact(f, 8)) != (ZSTD_SEEK_TABLE_MAGIC, table_size):
+        return None
+    entries = read_exact(f, number_of_frames * entry_size)
+
+    frames = []
+    offset = start
+    for i in range(number_of_frames):
+        size, uncompressed_size = struct.unpack_from("<II", entries, i * entry_size)
+        frames.append(ZstdFrame(offset, size, uncompressed_size))
+        offset += size
+    if offset != table_start:
+        return None
+    return frames
+
+
+def _read_frame(
+    f: BinaryIO, offset: int, end: int, max_blocks: int | None
+) -> tuple[ZstdFrame, int] | None:
+    """Read the frame at `offset`, walking its block headers to find its size.
+
+    Returns the frame and the number of headers read (one for skippable frames), or
+    None if it's not valid or needs more than `max_blocks` of them.
+    """
+    f.seek(offset)
+    header = read_exact(f, 14)
+    if len(header) < 8:
+        return None
+    magic = struct.unpack_from("<I", header)[0]
+    if magic & ZSTD_SKIPPABLE_MAGIC_MASK == ZSTD_SKIPPABLE_MAGIC:
+        return ZstdFrame(offset, 8 + struct.unpack_from("<I", header, 4)[0], 0), 1
+    if magic != ZSTD_MAGIC:
+        return None
+
+    descriptor = header[4]
+    content_size_flag = descriptor >> 6
+    single_segment = descriptor & 0x20
+    has_checksum = descriptor & 0x04
+    if descriptor & 0x08:
+        # Reserved bit
+        return None
+    dict_id_size = (0, 1, 2, 4)[descriptor & 0x03]
+    content_size_size = (1 if single_segment else 0, 2, 4, 8)[content_size_flag]
+
+    pos = 5 + (0 if single_segment else 1) + dict_id_size
+    uncompressed_size = None
+    if content_size_size:
+        size_bytes = header[pos : pos + content_size_size]
+        uncompressed_size = int.from_bytes(size_bytes, "little")
+        if content_size_size == 2:
+            uncompressed_size += 256
+    pos = offset + pos + content_size_size
+
+    blocks = 0
+    while True:
+        if max_blocks is not None and blocks >= max_blocks:
+            return None
+        blocks += 1
+        f.seek(pos)
+        block_header = read_exact(f, 3)
+        if len(block_header) < 3:
+            return None
+        value = int.from_bytes(block_header, "little")
+        block_type = (value >> 1) & 0x03
+        if block_type == 3:
+            # Reserved block type
+            return None
+        # RLE blocks store a single byte.
+        pos += 3 + (1 if block_type == 1 else value >> 3)
+        if value & 0x01:
+            break
+
+    if has_checksum:
+        pos += 4
+    if pos > end:
+        return None
+    return ZstdFrame(offset, pos - offset, uncompressed_size), blocks
+
+
+def scan_zstd_frames(
+    f: BinaryIO, start: int = 0, max_blocks: int | None = None
+) -> list[ZstdFrame] | None:
+    """Find the frames of a .zst file by walking the frame and block headers.
+
+    This reads each block header, but doesn't decompress anything. `f` must be
+    seekable. Returns None if the data is not a valid sequence of frames, for
+    example if it's truncated, or if it has more than `max_blocks` blocks.
+    """
+    end = _seek_to_end(f)
+    if end is None:
+        return None
+    frames = []
+    offset = start
+    while offset < end:
+        if max_blocks is not None and max_blocks <= 0:
+            return None
+        result = _read_frame(f, offset, end, max_blocks)
+        if result is None:
+            return None
+        frame, blocks = result
+        if max_blocks is not None:
+            max_blocks -= blocks
+        frames.append(frame)
+        offset += frame.size
+    return frames
+
+
+def read_zstd_frames(
+    f: BinaryIO, start: int = 0, max_blocks: int | None = None
+) -> list[ZstdFrame] | None:
+    """List the frames of a .zst file, from its seek table if it has one.
+
+    Without a seek table, at most `max_blocks` block headers are read.
+    """
+    frames = read_zstd_seek_table(f, start)
+    if frames is None:
+        frames = scan_zstd_frames(f, start, max_blocks)
+    logger.debug("Zstandard frames: %s", None if frames is None else len(frames))
+    return frames
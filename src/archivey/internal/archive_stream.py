@@ -12,7 +12,7 @@ from typing import (
 )
 
 from archivey.exceptions import ArchiveError
-from archivey.internal.io_helpers import is_seekable
+from archivey.internal.io_helpers import is_seekable, readinto_from
 from archivey.internal.utils import ensure_not_none
 
 logger = logging.getLogger(__name__)
@@ -66,6 +66,9 @@ class ArchiveStream(io.RawIOBase, BinaryIO):
         self._translate = exception_translator
 
         self._inner: BinaryIO | None = None
+        # A nested ArchiveStream whose inner stream was adopted, closed with this one.
+        self._nested: ArchiveStream | None = None
+        self._inner_read: Callable[[int], bytes] | None = None
         self._open_fn = open_fn
         self._open_lock = threading.Lock()
 
@@ -83,14 +86,36 @@ class ArchiveStream(io.RawIOBase, BinaryIO):
             return self._inner
 
         with self._open_lock:
-            try:
-                self._inner = ensure_not_none(self._open_fn)()
-                self._open_fn = None
-
-            except Exception as e:  # noqa: BLE001
-                self._translate_exception(e)
-
-        return self._inner
+            if self._inner is None:
+                try:
+                    inner = ensure_not_none(self._open_fn)()
+                    self._open_fn = None
+                except Exception as e:  # noqa: BLE001
+                    self._translate_exception(e)
+                self._set_inner(inner)
+
+        return ensure_not_none(self._inner)
+
+    def _set_inner(self, inner: BinaryIO) -> None:
+        if isinstance(inner, ArchiveStream) and inner._inner is not None:
+            # Read from the nested stream's inner stream directly, translating
+            # exceptions with both translators.
+            nested_translate, own_translate = inner._translate, self._translate
+            self._translate = lambda e: nested_translate(e) or own_translate(e)
+            self._nested = inner
+            inner = inner._inner
+
+        self._inner = inner
+        # Once the stream is open, read() and readinto() call the inner stream
+        # directly instead of going through _ensure_open(). Cleared on close().
+        self._inner_read = inner.read
+
+    def is_buffered(self) -> bool:
+        """
+        Return whether the stream is open and reads are served by a buffered stream,
+        so that `read(n)` only returns fewer than `n` bytes at EOF.
+        """
+        return isinstance(self._inner, io.BufferedIOBase)
 
     def _translate_exception(self, e: Exception) -> NoReturn:
         if isinstance(e, ArchiveError):
@@ -117,38 +142,36 @@ class ArchiveStream(io.RawIOBase, BinaryIO):
         raise e
 
     def read(self, n: int = -1) -> bytes:
-        # Some rarfile streams don't actually prevent reading after closing, so we
-        # enforce that here.
         try:
+            inner_read = self._inner_read
+            if inner_read is not None:
+                return inner_read(n)
+            # Some rarfile streams don't actually prevent reading after closing, so
+            # we enforce that here.
             return self._ensure_open().read(n)
         except Exception as e:  # noqa: BLE001
             self._translate_exception(e)
 
-    def _readinto_fallback(self, b: bytearray | memoryview) -> int:
-        data = self.read(len(b))
-        b[: len(data)] = data
-        return len(data)
-
     def readinto(self, b: bytearray | memoryview) -> int:
         # BinaryIO objects don't necessarily have readinto (specifically, XZFile from
-        # python-xz doesn't), so we fall back to read() if needed.
-        if not hasattr(self._ensure_open(), "readinto"):
-            return self._readinto_fallback(b)
-
+        # python-xz doesn't), so readinto_from() falls back to read() if needed.
         try:
-            return self._ensure_open().readinto(b)  # type: ignore[attr-defined]
+            if self._inner_read is None:
+                return readinto_from(self._ensure_open(), b)
+            return readinto_from(self._inner, b)
         except Exception as e:  # noqa: BLE001
             self._translate_exception(e)
 
     def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
-        if self.seekable():
-            logger.debug(
-                f"ArchiveStream for {self.archive_path}:{self.member_name} seek({offset}, {whence}) (prev_pos={self.tell()}) (inner={self._inner})"
-            )
-        else:
-            logger.debug(
-                f"ArchiveStream for {self.archive_path}:{self.member_name} seek({offset}, {whence}) (not seekable) (inner={self._inner})"
-            )
+        if logger.isEnabledFor(logging.DEBUG):
+            if self.seekable():
+                logger.debug(
+                    f"ArchiveStream for {self.archive_path}:{self.member_name} seek({offset}, {whence}) (prev_pos={self.tell()}) (inner={self._inner})"
+                )
+            else:
+                logger.debug(
+                    f"ArchiveStream for {self.archive_path}:{self.member_name} seek({offset}, {whence}) (not seekable) (inner={self._inner})"
+                )
 
         try:
             return self._ensure_open().seek(offset, whence)
@@ -179,9 +202,11 @@ class ArchiveStream(io.RawIOBase, BinaryIO):
 
     def close(self) -> None:
         logger.debug(f"ArchiveStream.close: inner={self._inner}")
-        if self._inner is not None:
+        self._inner_read = None
+        to_close = self._nested if self._nested is not None else self._inner
+        if to_close is not None:
             try:
-                self._inner.close()
+                to_close.close()
             except Exception as e:  # noqa: BLE001
                 self._translate_exception(e)
 
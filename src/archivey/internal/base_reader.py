@@ -1,21 +1,41 @@
 """Defines the abstract base classes and common functionality for archive readers."""
 
 import abc
+import bisect
+import collections
+import contextlib
+import functools
+import io
+import itertools
 import logging
 import os
 import posixpath
+import queue
 import threading
-from collections import defaultdict
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+from dataclasses import replace
 from typing import (
     TYPE_CHECKING,
+    Any,
     BinaryIO,
     Callable,
     Collection,
     Iterator,
-    List,
+    Literal,
     Optional,
+    Sequence,
+    TypeAlias,
+    TypeVar,
     Union,
     cast,
+    overload,
 )
 from uuid import uuid4
 from weakref import WeakSet
@@ -24,12 +44,39 @@ from archivey.archive_reader import ArchiveReader
 from archivey.config import ArchiveyConfig, ExtractionFilter, get_archivey_config
 from archivey.exceptions import (
     ArchiveError,
+    ArchiveLinkTargetNotFoundError,
     ArchiveMemberCannotBeOpenedError,
     ArchiveMemberNotFoundError,
 )
 from archivey.filters import DEFAULT_FILTERS
 from archivey.internal.archive_stream import ArchiveStream
+from archivey.internal.directory_index import (
+    DirectoryIndex,
+    DirectoryNode,
+    Entry,
+    get_entry_member,
+    is_dir_entry,
+    split_path,
+)
 from archivey.internal.extraction_helper import ExtractionHelper
+from archivey.internal.index_cache import (
+    ArchiveFingerprint,
+    load_index,
+    member_from_index_row,
+    member_index_header,
+    member_to_index_row,
+    save_index,
+)
+from archivey.internal.io_helpers import (
+    ErrorIOStream,
+    run_with_exception_translation,
+)
+from archivey.internal.parallel_extraction import (
+    extract_members_in_worker,
+    init_worker_reader,
+    write_member_file,
+)
+from archivey.selection import MemberSelection
 from archivey.types import (
     ArchiveFormat,
     ArchiveInfo,
@@ -44,6 +91,12 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 
+_T = TypeVar("_T")
+
+# Files submitted together to an extraction worker, with the chain of files for the
+# same path that each of them belongs to.
+_ExtractionBatch: TypeAlias = list[tuple[ArchiveMember, str, collections.deque]]
+
 
 def _build_member_included_func(
     members: Collection[Union[ArchiveMember, str]]
@@ -106,6 +159,99 @@ def _build_filter(
     return _apply_filter
 
 
+class MembersView(Sequence[ArchiveMember]):
+    """
+    Read-only view of the members registered in a reader.
+
+    Returned by `get_members()` instead of a copy of the member list, which is
+    expensive for archives with millions of members. The view is only created once
+    all members have been registered, so it never changes afterwards.
+    """
+
+    __slots__ = ("_members",)
+
+    def __init__(self, members: list[ArchiveMember]):
+        self._members = members
+
+    def __len__(self) -> int:
+        return len(self._members)
+
+    @overload
+    def __getitem__(self, index: int) -> ArchiveMember: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[ArchiveMember]: ...
+
+    def __getitem__(self, index: int | slice) -> ArchiveMember | list[ArchiveMember]:
+        return self._members[index]
+
+    def __iter__(self) -> Iterator[ArchiveMember]:
+        return iter(self._members)
+
+    def __reversed__(self) -> Iterator[ArchiveMember]:
+        return reversed(self._members)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, MembersView):
+            return self._members == other._members
+        if isinstance(other, (list, tuple)):
+            return self._members == list(other)
+        return NotImplemented
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return f"MembersView({self._members!r})"
+
+
+class _WorkerMemberOpeners:
+    """Member openers shared by the threads of a worker pool.
+
+    Openers are created with `BaseArchiveReader._create_worker_member_opener()` when
+    all the existing ones are in use, so there is at most one per worker, and each
+    one is used by a single thread at a time.
+    """
+
+    def __init__(
+        self,
+        reader: "BaseArchiveReader",
+        stack: contextlib.ExitStack,
+        first_opener: Callable[[ArchiveMember, bytes | str | None], BinaryIO],
+    ):
+        self._reader = reader
+        self._stack = stack
+        self._idle: queue.SimpleQueue = queue.SimpleQueue()
+        self._idle.put(first_opener)
+        self._lock = threading.Lock()
+
+    def read_member(
+        self,
+        member: ArchiveMember,
+        pwd: bytes | str | None,
+        consume: Callable[[BinaryIO], _T],
+    ) -> _T:
+        """Open `member` with an idle opener and return `consume(stream)`."""
+        try:
+            opener = self._idle.get_nowait()
+        except queue.Empty:
+            with self._lock:
+                opener = self._reader._create_worker_member_opener(self._stack)
+            assert opener is not None
+        try:
+            stream = ArchiveStream(
+                open_fn=functools.partial(opener, member, pwd),
+                exception_translator=self._reader._translate_exception,
+                archive_path=self._reader.path_str,
+                member_name=member.filename,
+                lazy=False,
+                seekable=False,
+            )
+            with stream:
+                return consume(stream)
+        finally:
+            self._idle.put(opener)
+
+
 class BaseArchiveReader(ArchiveReader):
     """
     A base implementation of ArchiveReader providing common logic.
@@ -156,10 +302,16 @@ class BaseArchiveReader(ArchiveReader):
             self._archive_password: bytes | None = pwd
 
         self._members: list[ArchiveMember] = []
-        self._filename_to_members: dict[str, list[ArchiveMember]] = defaultdict(list)
-        self._normalized_path_to_last_member: dict[str, ArchiveMember] = {}
+        # The last member registered with each filename, and the earlier ones (in
+        # registration order) only for filenames that appear more than once.
+        self._last_member_by_filename: dict[str, ArchiveMember] = {}
+        self._earlier_members_by_filename: dict[str, list[ArchiveMember]] = {}
         self._all_members_registered: bool = False
         self._registration_lock: threading.Lock = threading.Lock()
+        # Built from the registered members on the first path-based query.
+        self._directory_index: DirectoryIndex | None = None
+        # Built from the registered members on the first link resolution.
+        self._link_targets: dict[int, ArchiveMember | None] | None = None
 
         self._archive_id: str = uuid4().hex
 
@@ -167,6 +319,10 @@ class BaseArchiveReader(ArchiveReader):
         self._early_members_list_supported = members_list_supported
 
         self._iterator_for_registration: Iterator[ArchiveMember] | None = None
+        # Set when a streaming iteration with a MemberSelection starts, so that
+        # iter_members_for_registration() can skip files that aren't selected.
+        self._registration_selection: MemberSelection | None = None
+        self._member_index_fingerprint: ArchiveFingerprint | None = None
 
         self._streaming_iteration_started: bool = False
         self._closed: bool = False
@@ -185,91 +341,129 @@ class BaseArchiveReader(ArchiveReader):
         if not member.is_link:
             return member  # Not a link or no target path specified
 
-        # Ensure all members are registered so lookups are complete, for files that
-        # support it. If the file doesn't support it, the lookup will be incomplete.
-        self.get_members_if_available()
-
-        return self._resolve_link_recursive(member, set())
+        self.check_archive_open()
+        member_id = member.member_id
 
-    def _resolve_link_recursive(
-        self, member: ArchiveMember, visited_ids: set[int]
-    ) -> ArchiveMember | None:
-        assert member.is_link, "member should be a link"
-        logger.info("resolving link: %s", member.filename)
+        if not self._all_members_registered:
+            # Ensure all members are registered so lookups are complete, for files
+            # that support it. If the file doesn't support it, the lookup will be
+            # incomplete, and more members may still be registered later, so the
+            # result is not remembered.
+            self.get_members_if_available()
+            if not self._all_members_registered:
+                return self._resolve_link_chain(member, None)
+
+        link_targets = self._get_link_targets()
+        if member_id in link_targets and self._is_registered(member):
+            return link_targets[member_id]
+        return self._resolve_link_chain(member, link_targets)
+
+    def _is_registered(self, member: ArchiveMember) -> bool:
+        """Return True if ``member`` is the registered object, not a filtered copy."""
+        member_id = member.member_id
+        return member_id < len(self._members) and self._members[member_id] is member
+
+    def _get_link_targets(self) -> dict[int, ArchiveMember | None]:
+        """
+        Return the final targets of all link members, by member_id.
 
-        # member_id should be set if it came from self.get_members() or iteration
-        if member.member_id is None:
-            logger.error(
-                f"Attempted to resolve link for member {member.filename} with no member_id."
-            )
-            return None
+        Built in a single pass once all members are registered, so that each link
+        chain is followed only once per archive and `resolve_link()` is a dict
+        lookup. Links whose chain includes a link with an unknown target (which may
+        be filled in later, e.g. for encrypted links) are not included.
+        """
+        if self._link_targets is not None:
+            return self._link_targets
 
-        if member.member_id in visited_ids:
-            logger.error(
-                f"Link loop detected involving {member.filename} (ID: {member.member_id})."
-            )
-            return None
-        visited_ids.add(member.member_id)
+        with self._registration_lock:
+            if self._link_targets is None:
+                link_targets: dict[int, ArchiveMember | None] = {}
+                for member in self._members:
+                    if member.is_link and member.member_id not in link_targets:
+                        self._resolve_link_chain(member, link_targets)
+                self._link_targets = link_targets
+            return self._link_targets
+
+    def _resolve_link_chain(
+        self,
+        member: ArchiveMember,
+        link_targets: dict[int, ArchiveMember | None] | None,
+    ) -> ArchiveMember | None:
+        """
+        Follow the chain of links starting at ``member`` to its final target.
 
-        target_member: ArchiveMember | None = None
+        Known results are taken from ``link_targets`` (except for ``member`` itself,
+        which may be a filtered copy with a different link target), and the results
+        for the registered members in the chain are added to it.
+        """
+        chain: list[ArchiveMember] = []
+        visited_ids: set[int] = set()
+        current = member
+        target: ArchiveMember | None
 
-        if member.type == MemberType.HARDLINK:
-            link_target_str = member.link_target
-            # This check is defensive, should be caught by the public resolve_link method
-            if link_target_str is None:
-                logger.warning(
-                    f"Hardlink target string is None for {member.filename} (ID: {member.member_id})"
-                )
-                return None
+        while True:
+            if (
+                link_targets is not None
+                and current is not member
+                and current.member_id in link_targets
+            ):
+                target = link_targets[current.member_id]
+                break
 
-            potential_targets = self._filename_to_members.get(link_target_str, [])
-            # Find the most recent member with the same filename and a *lower* member_id
-            # Ensure member_id is not None for potential targets as well
-            valid_targets = [
-                m
-                for m in potential_targets
-                if m.member_id is not None and m.member_id < member.member_id
-            ]
-            if not valid_targets:
-                logger.warning(
-                    f"Hardlink target {link_target_str} not found for {member.filename} (ID: {member.member_id}) or no earlier version exists."
+            if current.member_id in visited_ids:
+                logger.error(
+                    f"Link loop detected involving {current.filename} (ID: {current.member_id})."
                 )
-                return None
+                target = None
+                break
+            visited_ids.add(current.member_id)
+            chain.append(current)
 
-            target_member = max(valid_targets, key=lambda m: m.member_id)
+            target = self._get_direct_link_target(current)
+            if target is None or not target.is_link or target.link_target is None:
+                break
+            current = target
 
-        elif member.type == MemberType.SYMLINK:
-            link_target_str = member.link_target
-            if link_target_str is None:  # Defensive check
-                logger.warning(
-                    f"Symlink target string is None for {member.filename} (ID: {member.member_id})"
-                )
-                return None
-
-            # Symlink targets are relative to the symlink's own directory
-            normalized_link_target = posixpath.normpath(
-                posixpath.join(posixpath.dirname(member.filename), link_target_str)
+        if (
+            link_targets is not None
+            and all(m.link_target is not None for m in chain)
+            and (target is None or not target.is_link)
+        ):
+            for m in chain:
+                if self._is_registered(m):
+                    link_targets[m.member_id] = target
+
+        return target
+
+    def _get_direct_link_target(self, member: ArchiveMember) -> ArchiveMember | None:
+        """Return the member that the link ``member`` points to, without following it."""
+        link_target_str = member.link_target
+        if link_target_str is None:
+            logger.warning(
+                f"Link target string is None for {member.filename} (ID: {member.member_id})"
             )
-            target_member = self._normalized_path_to_last_member.get(
-                normalized_link_target
+            return None
+
+        if member.type == MemberType.HARDLINK:
+            # Find the most recent member with the same filename and a *lower* member_id
+            target_member = self._get_last_member_before(
+                link_target_str, member.member_id
             )
             if target_member is None:
                 logger.warning(
-                    f"Symlink target '{normalized_link_target}' (from '{link_target_str}') not found for {member.filename} (ID: {member.member_id})."
+                    f"Hardlink target {link_target_str} not found for {member.filename} (ID: {member.member_id}) or no earlier version exists."
                 )
-                return None
-        else:
-            # Not a link type that this method resolves, or already resolved.
-            return member  # pragma: no cover
-
-        # One of the above cases should have set target_member.
-        assert target_member is not None
-
-        # If the direct target is itself a link, resolve it further
-        if target_member.is_link and target_member.link_target is not None:
-            # Pass a copy of visited_members for the new recursion branch to handle complex cases correctly
-            return self._resolve_link_recursive(target_member, visited_ids.copy())
+            return target_member
 
+        # Symlink targets are relative to the symlink's own directory
+        normalized_link_target = posixpath.normpath(
+            posixpath.join(posixpath.dirname(member.filename), link_target_str)
+        )
+        target_member = self._get_last_member_for_path(normalized_link_target)
+        if target_member is None:
+            logger.warning(
+                f"Symlink target '{normalized_link_target}' (from '{link_target_str}') not found for {member.filename} (ID: {member.member_id})."
+            )
         return target_member
 
     def _register_member(self, member: ArchiveMember) -> None:
@@ -289,32 +483,46 @@ class BaseArchiveReader(ArchiveReader):
             member.member_id,
         )
 
-        members_with_filename = self._filename_to_members[member.filename]
-        if member not in members_with_filename:
-            members_with_filename.append(member)
-            members_with_filename.sort(key=lambda m: m.member_id)
+        # Members are registered in increasing member_id order, so the new member is
+        # always the last one with its filename and the earlier lists stay sorted.
+        previous = self._last_member_by_filename.get(member.filename)
+        if previous is not None:
+            earlier = self._earlier_members_by_filename.get(member.filename)
+            if earlier is None:
+                self._earlier_members_by_filename[member.filename] = [previous]
+            else:
+                earlier.append(previous)
+        self._last_member_by_filename[member.filename] = member
 
-        normalized_path = member.filename
-        if (
-            normalized_path not in self._normalized_path_to_last_member
-            or self._normalized_path_to_last_member[normalized_path].member_id
-            < member.member_id
+        # Link resolution is now handled by the public resolve_link method when needed,
+        # not automatically during registration.
+
+    def _get_last_member_for_path(self, path: str) -> ArchiveMember | None:
+        """
+        Return the last registered member at ``path``, which has no trailing slash.
+
+        Directory members are stored with a trailing slash, so both the plain path
+        and the path with a slash are checked, and the latest member wins.
+        """
+        member = self._last_member_by_filename.get(path)
+        dir_member = self._last_member_by_filename.get(path + "/")
+        if member is None or (
+            dir_member is not None and dir_member.member_id > member.member_id
         ):
-            self._normalized_path_to_last_member[normalized_path] = member
+            return dir_member
+        return member
 
-        # If the member is a directory, also register the path without the trailing slash
-        # so we can resolve links to directories.
-        if normalized_path.endswith("/"):
-            normalized_path = normalized_path.rstrip("/")
-            if (
-                normalized_path not in self._normalized_path_to_last_member
-                or self._normalized_path_to_last_member[normalized_path].member_id
-                < member.member_id
-            ):
-                self._normalized_path_to_last_member[normalized_path] = member
+    def _get_last_member_before(
+        self, filename: str, member_id: int
+    ) -> ArchiveMember | None:
+        """Return the last member named ``filename`` registered before ``member_id``."""
+        last = self._last_member_by_filename.get(filename)
+        if last is None or last.member_id < member_id:
+            return last
 
-        # Link resolution is now handled by the public resolve_link method when needed,
-        # not automatically during registration.
+        earlier = self._earlier_members_by_filename.get(filename, [])
+        index = bisect.bisect_left(earlier, member_id, key=lambda m: m.member_id)
+        return earlier[index - 1] if index > 0 else None
 
     @abc.abstractmethod
     def iter_members_for_registration(self) -> Iterator[ArchiveMember]:
@@ -354,21 +562,172 @@ class BaseArchiveReader(ArchiveReader):
         """
         pass  # pragma: no cover
 
-    def _register_next_member(self) -> None:
+    def _member_index_supported(self) -> bool:
+        """
+        Return True if the member list of this archive can be cached in a member index.
+
+        The member index (enabled with `ArchiveyConfig.member_index_dir`) stores the
+        metadata of all registered members after a full registration pass, and
+        restores it when the same unchanged archive file is reopened, skipping
+        `iter_members_for_registration()` entirely. Readers that support it must
+        also implement `_get_member_index_data()` and
+        `_restore_members_from_index()` so that `raw_info` can be rebuilt.
+        """
+        return False
+
+    def _get_member_index_data(self, member: ArchiveMember) -> Any:
+        """
+        Return JSON-serializable data needed to restore `member.raw_info` later.
+
+        Called for every member when saving the member index. The returned value
+        is passed back to `_restore_members_from_index()`.
+        """
+        return None
+
+    def _restore_members_from_index(
+        self, members: list[ArchiveMember], data: list[Any]
+    ) -> bool:
+        """
+        Set `raw_info` on members loaded from the member index.
+
+        Args:
+            members: The members loaded from the index, in archive order and not yet
+                registered.
+            data: The values returned by `_get_member_index_data()` for each member.
+
+        Returns:
+            False if the index doesn't match the opened archive, in which case it is
+            ignored and the members are read from the archive as usual.
+        """
+        return False
+
+    def _register_members_from_index(self) -> bool:
+        """Register all members from the member index, if there is a valid one."""
+        index_dir = self.config.member_index_dir
+        if (
+            index_dir is None
+            or self._streaming_only
+            or self.path_str is None
+            or not self._member_index_supported()
+        ):
+            return False
+
+        self._member_index_fingerprint = ArchiveFingerprint.from_path(self.path_str)
+        if self._member_index_fingerprint is None:
+            return False
+
+        data = load_index(
+            index_dir, self.path_str, "members", self._member_index_fingerprint
+        )
+        if data is None:
+            return False
+
+        try:
+            if (
+                data["format"] != str(self.format)
+                or data["fields"] != member_index_header()
+            ):
+                return False
+            members = [member_from_index_row(row) for row in data["members"]]
+            if not self._restore_members_from_index(members, data["raw"]):
+                logger.warning(
+                    "Member index for %s doesn't match the archive, ignoring it",
+                    self.path_str,
+                )
+                return False
+        except (KeyError, TypeError, ValueError) as e:
+            logger.warning("Invalid member index for %s: %s", self.path_str, e)
+            return False
+
+        logger.debug(
+            "Restored %d members of %s from the member index",
+            len(members),
+            self.path_str,
+        )
+        for member in members:
+            self._register_member(member)
+        return True
+
+    def _save_member_index(self) -> None:
+        """Store the list of registered members in the member index, if enabled."""
+        index_dir = self.config.member_index_dir
+        if index_dir is None or self._member_index_fingerprint is None:
+            return
+        assert self.path_str is not None
+
+        try:
+            data = {
+                "format": str(self.format),
+                "fields": member_index_header(),
+                "members": [member_to_index_row(m) for m in self._members],
+                "raw": [self._get_member_index_data(m) for m in self._members],
+            }
+            save_index(
+                index_dir,
+                self.path_str,
+                "members",
+                self._member_index_fingerprint,
+                data,
+            )
+        except (OSError, TypeError) as e:
+            logger.warning("Could not save member index for %s: %s", self.path_str, e)
+
+    def _push_down_selection(self, members: object) -> None:
+        """
+        Let `iter_members_for_registration()` skip files excluded by ``members``.
+
+        Only done in streaming mode, before registration starts: the archive can
+        only be iterated once, so the skipped files would never be needed. In random
+        access mode all members are always registered.
+        """
+        if not isinstance(members, MemberSelection) or not self._streaming_only:
+            return
+        with self._registration_lock:
+            if self._iterator_for_registration is None and not self._members:
+                self._registration_selection = members
+
+    def _is_excluded_from_registration(
+        self, filename: str, file_size: int | None
+    ) -> bool:
+        """
+        Return True if a regular file doesn't need to be registered.
+
+        Readers can call this from `iter_members_for_registration()` with the name
+        and size from the raw archive headers, and skip creating the ArchiveMember
+        when it returns True. Only regular files may be skipped: directories and
+        links are always registered, so that links can still be resolved.
+        """
+        selection = self._registration_selection
+        return selection is not None and not selection.matches_entry(
+            filename, file_size, MemberType.FILE
+        )
+
+    def _register_next_members(self, count: int | None = 1) -> None:
+        """
+        Register the next ``count`` members, or all remaining ones if None.
+
+        The registration lock is taken once for the whole batch. Iterating callers
+        register one member at a time so that, in streaming mode, the underlying
+        archive is not read past the member being returned.
+        """
         with self._registration_lock:
             if self._all_members_registered:
                 return
 
             if self._iterator_for_registration is None:
+                if self._register_members_from_index():
+                    self._all_members_registered = True
+                    return
                 self._iterator_for_registration = self.iter_members_for_registration()
 
-            next_member = next(self._iterator_for_registration, None)
-            if next_member is None:
-                self._all_members_registered = True
-                return
+            registered = 0
+            for member in itertools.islice(self._iterator_for_registration, count):
+                self._register_member(member)
+                registered += 1
 
-            self._register_member(next_member)
-            return
+            if count is None or registered < count:
+                self._all_members_registered = True
+                self._save_member_index()
 
     def check_archive_open(self) -> None:
         if self._closed:
@@ -380,26 +739,25 @@ class BaseArchiveReader(ArchiveReader):
                 f"Archive opened for streaming only, {method_name} not supported"
             )
 
-    def get_members(self) -> List[ArchiveMember]:
+    def get_members(self) -> Sequence[ArchiveMember]:
         """
         Get a list of all members in the archive.
 
         This method is not supported for archives opened in `streaming_only` mode.
         It ensures all members are registered by iterating through
         `iter_members_for_registration()` if not already done, then returns
-        the complete list.
+        a read-only view of the complete list.
         """
         self.check_archive_open()
         self.check_not_streaming_only("get_members()")
 
         # Ensure all members are registered by iterating through the
         # registration iterator if it hasn't been done yet.
-        while not self._all_members_registered:
-            self._register_next_member()
+        self._register_next_members(None)
 
-        return list(self._members)
+        return MembersView(self._members)
 
-    def get_members_if_available(self) -> List[ArchiveMember] | None:
+    def get_members_if_available(self) -> Sequence[ArchiveMember] | None:
         """
         Get a list of all members if readily available, otherwise None.
 
@@ -412,16 +770,18 @@ class BaseArchiveReader(ArchiveReader):
         """
         self.check_archive_open()
 
-        if self._all_members_registered:
-            return list(self._members)
+        if self._all_members_registered and self._registration_selection is None:
+            return MembersView(self._members)
 
         if self._streaming_only and not self._early_members_list_supported:
             return None
 
-        while not self._all_members_registered:
-            self._register_next_member()
+        self._register_next_members(None)
 
-        return list(self._members)
+        if self._registration_selection is not None:
+            # Some files were skipped, so the list is incomplete.
+            return None
+        return MembersView(self._members)
 
     def iter_members(self) -> Iterator[ArchiveMember]:
         """Iterate over all members, registering them as they are discovered."""
@@ -439,7 +799,7 @@ class BaseArchiveReader(ArchiveReader):
 
             # This iterator already provided all registered members, so try to advance
             # the _iter_members_for_registration() iterator to get the next member.
-            self._register_next_member()
+            self._register_next_members(1)
 
         # The flag that all members have been registered has been set, but possibly
         # from a different iterator. Yield any remaining members.
@@ -554,6 +914,47 @@ class BaseArchiveReader(ArchiveReader):
         """
         pass  # pragma: no cover
 
+    def _create_worker_member_opener(
+        self, stack: contextlib.ExitStack
+    ) -> Callable[[ArchiveMember, bytes | str | None], BinaryIO] | None:
+        """
+        Return a function that opens members from a worker thread, or None if the
+        reader can only decompress one member at a time.
+
+        Used by `iter_members_with_streams()` when called with `workers`. Each worker
+        gets its own opener, and uses it for all the members it decompresses, while
+        other workers and the caller's thread keep reading the archive. The opener
+        should therefore not share file handles or decompressor state with the
+        reader or with other openers.
+
+        The returned function is called like `_open_member(member, pwd,
+        for_iteration=False)`, only for file members. Resources that must be released
+        when the iteration ends (e.g. file handles) should be registered in `stack`.
+        """
+        return None
+
+    def _get_member_view(
+        self, member: ArchiveMember, pwd: bytes | str | None
+    ) -> memoryview | None:
+        """
+        Return the contents of a file member as a view of memory-mapped data, or
+        None if the member is not stored uncompressed and contiguously.
+
+        Used by `read_member_view()`, which falls back to reading the member when
+        this returns None. `member` has already had its links resolved.
+        """
+        return None
+
+    def _supports_concurrent_reads(self) -> bool:
+        """
+        Return whether members can be opened and read from several threads at once.
+
+        Readers that share a single file handle or decompressor between member
+        streams must return False (the default). `ArchiveReaderPool` only shares
+        readers that return True between concurrent checkouts.
+        """
+        return False
+
     def _open_internal(
         self,
         member_or_filename: ArchiveMember | str,
@@ -594,6 +995,28 @@ class BaseArchiveReader(ArchiveReader):
         stream = self._open_internal(member_or_filename, pwd=pwd, for_iteration=False)
         return self._track_stream(stream)
 
+    def read_member_view(
+        self, member_or_filename: ArchiveMember | str, *, pwd: bytes | str | None = None
+    ) -> memoryview:
+        self.check_archive_open()
+        self.check_not_streaming_only("read_member_view()")
+        member = self.get_member(member_or_filename)
+        member = self._prepare_member_for_open(member, pwd=pwd, for_iteration=False)
+        final_member, _ = self._resolve_member_to_open(member)
+
+        if final_member.is_file:
+            view = run_with_exception_translation(
+                lambda: self._get_member_view(final_member, pwd),
+                self._translate_exception,
+                archive_path=self.path_str,
+                member_name=member.filename,
+            )
+            if view is not None:
+                return view
+
+        with self._open_internal(member, pwd=pwd, for_iteration=False) as stream:
+            return memoryview(stream.read())
+
     def _start_streaming_iteration(self) -> None:
         """Ensure only a single streaming iteration is performed for non-random-access readers."""
         if not self._streaming_only:
@@ -610,6 +1033,8 @@ class BaseArchiveReader(ArchiveReader):
         *,
         pwd: bytes | str | None = None,
         filter: IteratorFilterFunc | ExtractionFilter | None = None,
+        workers: int | None = None,
+        prefetch: int | None = None,
     ) -> Iterator[tuple[ArchiveMember, BinaryIO | None]]:
         """Iterate over all members in the archive.
 
@@ -620,6 +1045,10 @@ class BaseArchiveReader(ArchiveReader):
                 iteration, so don't rely on any specific behavior.
             pwd: Password to use for decryption, if needed and different from the one
                 used when opening the archive.
+            workers: Number of threads used to decompress the following members
+                while the current one is being processed, if the reader supports it.
+            prefetch: Maximum number of members decompressed ahead when using
+                `workers`. Defaults to twice the number of workers.
 
         Yields:
             tuple[ArchiveMember, BinaryIO | None]:
@@ -638,11 +1067,21 @@ class BaseArchiveReader(ArchiveReader):
         """
         self.check_archive_open()
         self._start_streaming_iteration()
+        self._push_down_selection(members)
 
         filter_func = _build_filter(
             members, filter or self.config.extraction_filter, None
         )
 
+        if workers is not None and workers > 1 and not self._streaming_only:
+            yield from self._iter_members_with_prefetched_streams(
+                filter_func,
+                pwd=pwd,
+                workers=workers,
+                prefetch=prefetch if prefetch is not None else 2 * workers,
+            )
+            return
+
         for member in self.iter_members():
             logger.debug("iter_members_with_streams member: %s", member)
             filtered_member = filter_func(member)
@@ -662,6 +1101,104 @@ class BaseArchiveReader(ArchiveReader):
                 if stream is not None:
                     stream.close()
 
+    def _iter_members_with_prefetched_streams(
+        self,
+        filter_func: IteratorFilterFunc,
+        *,
+        pwd: bytes | str | None,
+        workers: int,
+        prefetch: int,
+    ) -> Iterator[tuple[ArchiveMember, BinaryIO | None]]:
+        """Implement `iter_members_with_streams()` with a pool of worker threads.
+
+        Up to `prefetch` file members after the one being yielded are read fully into
+        memory by the workers, as long as their total size is at most
+        `config.max_prefetch_bytes`. Members that don't fit in the budget on their own
+        are opened lazily on the caller's thread, as in the sequential iteration.
+        """
+        max_bytes = self.config.max_prefetch_bytes
+
+        with contextlib.ExitStack() as stack:
+            first_opener = self._create_worker_member_opener(stack)
+            if first_opener is None:
+                logger.debug("Reader does not support concurrent member reads")
+                yield from self.iter_members_with_streams(filter=filter_func, pwd=pwd)
+                return
+
+            openers = _WorkerMemberOpeners(self, stack, first_opener)
+
+            def _read_member(member: ArchiveMember) -> bytes:
+                return openers.read_member(member, pwd, lambda stream: stream.read())
+
+            # Entries of (member, filtered_member, future), in archive order. The
+            # future is None for members that are not prefetched.
+            pending: collections.deque[
+                tuple[ArchiveMember, ArchiveMember, Future[bytes] | None]
+            ] = collections.deque()
+            prefetched_count = 0
+            prefetched_bytes = 0
+
+            def _yield_oldest() -> Iterator[tuple[ArchiveMember, BinaryIO | None]]:
+                nonlocal prefetched_count, prefetched_bytes
+                member, filtered_member, future = pending.popleft()
+                stream: BinaryIO | None = None
+                try:
+                    if future is not None:
+                        try:
+                            stream = io.BytesIO(future.result())
+                        except Exception as e:  # noqa: BLE001
+                            # Raised when the caller reads the member, as usual.
+                            stream = ErrorIOStream(e)
+                    elif member.is_file:
+                        stream = self._open_internal(
+                            member, pwd=pwd, for_iteration=True
+                        )
+                    yield filtered_member, stream
+                finally:
+                    if future is not None:
+                        prefetched_count -= 1
+                        prefetched_bytes -= cast("int", member.file_size)
+                    if stream is not None:
+                        stream.close()
+
+            executor = ThreadPoolExecutor(
+                max_workers=workers, thread_name_prefix="archivey-prefetch"
+            )
+            try:
+                for member in self.iter_members():
+                    filtered_member = filter_func(member)
+                    if filtered_member is None:
+                        continue
+
+                    size = member.file_size
+                    if not member.is_file or size is None or size > max_bytes:
+                        pending.append((member, filtered_member, None))
+                        # Don't hold back members that don't wait for any read.
+                        while pending and not prefetched_count:
+                            yield from _yield_oldest()
+                        continue
+
+                    while prefetched_count >= prefetch or (
+                        prefetched_count and prefetched_bytes + size > max_bytes
+                    ):
+                        yield from _yield_oldest()
+
+                    member = self._prepare_member_for_open(
+                        member, pwd=pwd, for_iteration=False
+                    )
+                    pending.append(
+                        (member, filtered_member, executor.submit(_read_member, member))
+                    )
+                    prefetched_count += 1
+                    prefetched_bytes += size
+
+                while pending:
+                    yield from _yield_oldest()
+
+            finally:
+                # Wait for the running reads before the stack closes their openers.
+                executor.shutdown(wait=True, cancel_futures=True)
+
     def has_random_access(self) -> bool:
         """Check if opening members is possible (i.e. not streaming-only access)."""
         return not self._streaming_only
@@ -702,6 +1239,8 @@ class BaseArchiveReader(ArchiveReader):
         filter_func: IteratorFilterFunc,
         pwd: bytes | str | None,
         extraction_helper: ExtractionHelper,
+        workers: int | None = None,
+        executor: Literal["thread", "process"] = "thread",
     ):
         # For readers that support random access, register all members first to get
         # a complete list of members that need to be extracted, so that the
@@ -714,8 +1253,184 @@ class BaseArchiveReader(ArchiveReader):
             extraction_helper.extract_member(member, None)
 
         # Extract regular files
+        if (
+            workers is not None
+            and workers > 1
+            and self._extract_pending_files_concurrently(
+                extraction_helper, pwd, workers=workers, executor=executor
+            )
+        ):
+            return
         self._extract_pending_files(path, extraction_helper, pwd=pwd)
 
+    def _extract_pending_files_concurrently(
+        self,
+        extraction_helper: ExtractionHelper,
+        pwd: bytes | str | None,
+        *,
+        workers: int,
+        executor: Literal["thread", "process"],
+    ) -> bool:
+        """
+        Extract the files identified by the ExtractionHelper with a pool of workers.
+
+        Thread workers read the archive with the openers returned by
+        `_create_worker_member_opener()`. Process workers open their own reader for
+        the archive file. Either way, the workers only write the file contents: the
+        ExtractionHelper is only used from this thread, which checks for overwrites
+        before submitting each file, and records it (and creates any hardlinks to it)
+        once it has been written.
+
+        Returns False, without extracting anything, if the reader doesn't support
+        reading members concurrently.
+        """
+        with contextlib.ExitStack() as stack:
+            first_opener = self._create_worker_member_opener(stack)
+            if first_opener is None or (
+                executor == "process" and self.path_str is None
+            ):
+                logger.debug("Reader does not support concurrent extraction")
+                return False
+
+            # Files written to the same path are extracted one after the other, in
+            # archive order, so that the helper can decide which one to keep. Paths
+            # with the largest files are scheduled first, to avoid ending up waiting
+            # for a single worker.
+            files_by_path: dict[str, list[ArchiveMember]] = {}
+            other_members: list[ArchiveMember] = []
+            for member in extraction_helper.get_pending_extractions():
+                if member.is_file:
+                    member_path = extraction_helper.get_output_path(member)
+                    files_by_path.setdefault(member_path, []).append(member)
+                else:
+                    other_members.append(member)
+
+            chains = sorted(
+                (
+                    collections.deque(sorted(files, key=lambda m: m.member_id))
+                    for files in files_by_path.values()
+                ),
+                key=lambda chain: max(m.file_size or 0 for m in chain),
+                reverse=True,
+            )
+
+            pool: Executor
+            if executor == "process":
+                # Each task carries several small members, to amortize the cost of
+                # sending it to another process.
+                max_batch_count = 64
+                max_batch_bytes = 1024 * 1024
+                archive_path = self.path_str
+                assert archive_path is not None
+                pool = ProcessPoolExecutor(
+                    max_workers=workers,
+                    initializer=init_worker_reader,
+                    initargs=(
+                        archive_path,
+                        self.format,
+                        # The filter is not used by the workers, and may not be
+                        # picklable.
+                        replace(self.config, extraction_filter=ExtractionFilter.DATA),
+                        self.get_archive_password(),
+                    ),
+                )
+
+                def _submit(items: list[tuple[ArchiveMember, str]]) -> Future:
+                    return pool.submit(
+                        extract_members_in_worker,
+                        [(m.member_id, m.filename, p) for m, p in items],
+                        pwd,
+                    )
+
+            else:
+                max_batch_count = 1
+                max_batch_bytes = 0
+                pool = ThreadPoolExecutor(
+                    max_workers=workers, thread_name_prefix="archivey-extract"
+                )
+                openers = _WorkerMemberOpeners(self, stack, first_opener)
+
+                def _write_members(items: list[tuple[ArchiveMember, str]]) -> None:
+                    for member, member_path in items:
+                        openers.read_member(
+                            member,
+                            pwd,
+                            functools.partial(write_member_file, path=member_path),
+                        )
+
+                def _submit(items: list[tuple[ArchiveMember, str]]) -> Future:
+                    return pool.submit(_write_members, items)
+
+            running: dict[Future, _ExtractionBatch] = {}
+
+            def _submit_batch(batch: _ExtractionBatch) -> None:
+                running[_submit([(m, p) for m, p, _ in batch])] = batch
+
+            def _submit_next(ready_chains: list[collections.deque]) -> None:
+                batch: _ExtractionBatch = []
+                batch_bytes = 0
+                for chain in ready_chains:
+                    while chain:
+                        member = chain.popleft()
+                        member_path = extraction_helper.begin_regular_file(member)
+                        if member_path is not None:
+                            batch.append((member, member_path, chain))
+                            batch_bytes += member.file_size or 0
+                            break
+
+                    if batch and (
+                        len(batch) >= max_batch_count or batch_bytes >= max_batch_bytes
+                    ):
+                        _submit_batch(batch)
+                        batch = []
+                        batch_bytes = 0
+
+                if batch:
+                    _submit_batch(batch)
+
+            def _finish_batch(batch: _ExtractionBatch) -> list[collections.deque]:
+                ready_chains = []
+                for member, member_path, chain in batch:
+                    extraction_helper.finish_regular_file(member, member_path)
+                    if chain:
+                        ready_chains.append(chain)
+                return ready_chains
+
+            try:
+                _submit_next(chains)
+                while running:
+                    done, _ = wait(running, return_when=FIRST_COMPLETED)
+                    ready_chains = []
+                    error: BaseException | None = None
+                    for future in done:
+                        batch = running.pop(future)
+                        if future.exception() is not None:
+                            error = error or future.exception()
+                        else:
+                            ready_chains.extend(_finish_batch(batch))
+
+                    if error is not None:
+                        # Don't start the batches that are still queued, and wait
+                        # for the running ones, so that every file written to disk
+                        # is recorded before raising the first error.
+                        for future in running:
+                            future.cancel()
+                        wait(running)
+                        for future, batch in running.items():
+                            if not future.cancelled() and future.exception() is None:
+                                _finish_batch(batch)
+                        raise error
+
+                    _submit_next(ready_chains)
+
+            finally:
+                pool.shutdown(wait=True, cancel_futures=True)
+
+        for member in other_members:
+            extraction_helper.extract_member(member, None)
+
+        return True
+
     def _extractall_with_streaming_mode(
         self,
         path: str,
@@ -740,14 +1455,19 @@ class BaseArchiveReader(ArchiveReader):
         *,
         pwd: bytes | str | None = None,
         filter: ExtractFilterFunc | ExtractionFilter | None = None,
+        workers: int | None = None,
+        executor: Literal["thread", "process"] = "thread",
     ) -> dict[str, ArchiveMember]:
         """Extract multiple members from the archive.
 
         Notes:
             For streaming-only archives (:meth:`has_random_access` returns ``False``)
             this method may only be called once, as it exhausts the underlying stream.
+            ``workers`` is ignored in that case.
         """
         self.check_archive_open()
+        if executor not in ("thread", "process"):
+            raise ValueError(f"Unsupported executor: {executor!r}")
 
         if path is None:
             path = os.getcwd()
@@ -766,12 +1486,18 @@ class BaseArchiveReader(ArchiveReader):
         )
 
         if self._streaming_only:
+            self._push_down_selection(members)
             self._extractall_with_streaming_mode(
                 path, filter_func, pwd, extraction_helper
             )
         else:
             self._extractall_with_random_access(
-                path, filter_func, pwd, extraction_helper
+                path,
+                filter_func,
+                pwd,
+                extraction_helper,
+                workers=workers,
+                executor=executor,
             )
 
         extraction_helper.apply_metadata()
@@ -841,9 +1567,95 @@ class BaseArchiveReader(ArchiveReader):
         if not self._all_members_registered:
             self.get_members()
 
-        if member_or_filename not in self._filename_to_members:
+        member = self._last_member_by_filename.get(member_or_filename)
+        if member is None:
             raise ArchiveMemberNotFoundError(f"Member not found: {member_or_filename}")
-        return self._filename_to_members[member_or_filename][-1]
+        return member
+
+    def _get_directory_index(self, method_name: str) -> DirectoryIndex:
+        """Return the directory index, building it from all members if needed."""
+        self.check_archive_open()
+        self.check_not_streaming_only(method_name)
+        members = self.get_members()
+
+        with self._registration_lock:
+            if self._directory_index is None:
+                index = DirectoryIndex()
+                for member in members:
+                    index.add(member)
+                self._directory_index = index
+            return self._directory_index
+
+    def _find_directory(self, path: str, method_name: str) -> DirectoryNode:
+        entry = self._get_directory_index(method_name).find(path)
+        if not isinstance(entry, DirectoryNode):
+            raise ArchiveMemberNotFoundError(f"Directory not found: {path}")
+        return entry
+
+    def _is_dir_or_link_to_dir(self, entry: Entry) -> bool:
+        if is_dir_entry(entry):
+            return True
+        member = get_entry_member(entry)
+        if member is None or member.type != MemberType.SYMLINK:
+            return False
+        target = self.resolve_link(member)
+        return target is not None and target.is_dir
+
+    def stat(self, path: str, *, follow_symlinks: bool = True) -> ArchiveMember:
+        entry = self._get_directory_index("stat()").find(path)
+        if entry is None:
+            raise ArchiveMemberNotFoundError(f"Member not found: {path}")
+
+        member = get_entry_member(entry)
+        if member is None:
+            # A directory that is only implied by the paths of other members.
+            return ArchiveMember(
+                filename="/".join(split_path(path)) + "/",
+                file_size=None,
+                compress_size=None,
+                mtime_with_tz=None,
+                type=MemberType.DIR,
+            )
+
+        if follow_symlinks and member.is_link:
+            target = self.resolve_link(member)
+            if target is None:
+                raise ArchiveLinkTargetNotFoundError(
+                    f"Link target not found for {member.filename}"
+                )
+            return target
+
+        return member
+
+    def listdir(self, path: str = "") -> list[str]:
+        return list(self._find_directory(path, "listdir()").children)
+
+    def walk(self, top: str = "") -> Iterator[tuple[str, list[str], list[str]]]:
+        stack = [("/".join(split_path(top)), self._find_directory(top, "walk()"))]
+        while stack:
+            dirpath, node = stack.pop()
+            dirnames: list[str] = []
+            filenames: list[str] = []
+            for name, child in node.children.items():
+                if self._is_dir_or_link_to_dir(child):
+                    dirnames.append(name)
+                else:
+                    filenames.append(name)
+
+            yield dirpath, dirnames, filenames
+
+            # The caller may have removed entries from dirnames. Symlinks are
+            # listed but not descended into.
+            subdirs = [
+                (posixpath.join(dirpath, name), child)
+                for name in dirnames
+                if isinstance(child := node.children.get(name), DirectoryNode)
+            ]
+            stack.extend(reversed(subdirs))
+
+    def glob(self, pattern: str) -> list[str]:
+        index = self._get_directory_index("glob()")
+        return [path for path, _ in index.glob(pattern)]
 
     def extract(
         self,
@@ -899,8 +1711,10 @@ class BaseArchiveReader(ArchiveReader):
             self._close_archive()
             self._closed = True
             self._members = None  # type: ignore
-            self._filename_to_members = None  # type: ignore
-            self._normalized_path_to_last_member = None  # type: ignore
+            self._last_member_by_filename = None  # type: ignore
+            self._earlier_members_by_filename = None  # type: ignore
+            self._directory_index = None
+            self._link_targets = None
             self._iterator_for_registration = None
 
     def __str__(self) -> str:
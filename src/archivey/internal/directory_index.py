@@ -0,0 +1,176 @@
+"""A directory tree of archive members, used for path-based queries like listdir()."""
+
+from __future__ import annotations
+
+import fnmatch
+import posixpath
+import re
+from typing import TYPE_CHECKING, Union
+
+from archivey.types import ArchiveMember
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+_MAGIC_CHARS = re.compile(r"[*?[]")
+
+
+def split_path(path: str) -> list[str]:
+    """
+    Split a member name or query path into its components.
+
+    Leading and trailing slashes, empty components and "." components are dropped,
+    so "./a//b/" and "a/b" refer to the same entry, and "", "." and "/" all refer to
+    the root of the archive.
+    """
+    return [part for part in path.split("/") if part and part != "."]
+
+
+class DirectoryNode:
+    """A directory in the tree, which may or may not have a member."""
+
+    __slots__ = ("children", "member")
+
+    def __init__(self, member: ArchiveMember | None = None) -> None:
+        self.children: dict[str, Entry] = {}
+        # The last member registered with this path. None for the root and for
+        # directories that are only implied by the paths of other members.
+        self.member = member
+
+
+# Entries without children are stored as the member itself, so that the tree doesn't
+# need an extra object per file.
+Entry = Union[DirectoryNode, ArchiveMember]
+
+
+def get_entry_member(entry: Entry) -> ArchiveMember | None:
+    return entry.member if isinstance(entry, DirectoryNode) else entry
+
+
+def is_dir_entry(entry: Entry) -> bool:
+    return isinstance(entry, DirectoryNode) or entry.is_dir
+
+
+class DirectoryIndex:
+    """
+    A prefix tree of member paths.
+
+    Each path component maps to an entry, so looking up a path takes time
+    proportional to its number of components, and listing a directory takes time
+    proportional to the number of entries in it, regardless of the size of the
+    archive.
+    """
+
+    def __init__(self) -> None:
+        self.root = DirectoryNode()
+        # Members are usually grouped by directory, so the parent of the last added
+        # member is kept to avoid walking the tree again for its siblings.
+        self._last_parent: tuple[str, DirectoryNode] = ("", self.root)
+
+    def _get_or_create_dir(self, parts: list[str]) -> DirectoryNode:
+        node = self.root
+        for part in parts:
+            child = node.children.get(part)
+            if not isinstance(child, DirectoryNode):
+                # Either a new implied directory, or a non-directory member that
+                # other members are stored under.
+                child = node.children[part] = DirectoryNode(child)
+            node = child
+        return node
+
+    def add(self, member: ArchiveMember) -> None:
+        """Add a member, replacing any earlier member with the same path."""
+        parent_path, _, name = member.filename.rstrip("/").rpartition("/")
+        if name in ("", "."):
+            parts = split_path(member.filename)
+            if not parts:
+                self.root.member = member
+                return
+            parent_path, name = "/".join(parts[:-1]), parts[-1]
+
+        if parent_path == self._last_parent[0]:
+            parent = self._last_parent[1]
+        else:
+            parent = self._get_or_create_dir(split_path(parent_path))
+            self._last_parent = (parent_path, parent)
+
+        existing = parent.children.get(name)
+        if isinstance(existing, DirectoryNode):
+            existing.member = member
+        elif member.is_dir:
+            parent.children[name] = DirectoryNode(member)
+        else:
+            parent.children[name] = member
+
+    def find(self, path: str) -> Entry | None:
+        """Return the entry at ``path``, or None if there is no such entry."""
+        entry: Entry = self.root
+        for part in split_path(path):
+            if not isinstance(entry, DirectoryNode):
+                return None
+            child = entry.children.get(part)
+            if child is None:
+                return None
+            entry = child
+        return entry
+
+    def iter_descendants(
+        self, node: DirectoryNode, path: str
+    ) -> Iterator[tuple[str, Entry]]:
+        """Yield ``(path, entry)`` for every entry below ``node``, depth-first."""
+        stack = [(path, iter(node.children.items()))]
+        while stack:
+            parent_path, children = stack[-1]
+            for name, child in children:
+                child_path = posixpath.join(parent_path, name)
+                yield child_path, child
+                if isinstance(child, DirectoryNode):
+                    stack.append((child_path, iter(child.children.items())))
+                    break
+            else:
+                stack.pop()
+
+    def glob(self, pattern: str) -> Iterator[tuple[str, Entry]]:
+        """
+        Yield ``(path, entry)`` for every entry matching ``pattern``.
+
+        Each component of the pattern is matched with `fnmatch.fnmatchcase()`, and a
+        "**" component matches any number of directories (including none). Components
+        without wildcards are looked up directly, so only the directories that can
+        contain matches are visited.
+        """
+        parts = split_path(pattern)
+        if parts:
+            yield from self._glob(self.root, "", parts)
+
+    def _glob(
+        self, node: DirectoryNode, path: str, parts: list[str]
+    ) -> Iterator[tuple[str, Entry]]:
+        part, rest = parts[0], parts[1:]
+
+        if part == "**":
+            if not rest:
+                yield from self.iter_descendants(node, path)
+                return
+            yield from self._glob(node, path, rest)
+            for subpath, descendant in self.iter_descendants(node, path):
+                if isinstance(descendant, DirectoryNode):
+                    yield from self._glob(descendant, subpath, rest)
+            return
+
+        if _MAGIC_CHARS.search(part) is None:
+            child = node.children.get(part)
+            matches = [] if child is None else [(part, child)]
+        else:
+            matches = [
+                (name, child)
+                for name, child in node.children.items()
+                if fnmatch.fnmatchcase(name, part)
+            ]
+
+        for name, child in matches:
+            child_path = posixpath.join(path, name)
+            if not rest:
+                yield child_path, child
+            elif isinstance(child, DirectoryNode):
+                yield from self._glob(child, child_path, rest)
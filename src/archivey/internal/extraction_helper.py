@@ -273,14 +273,32 @@ class ExtractionHelper:
         os.makedirs(os.path.dirname(path), exist_ok=True)
         with open(path, "wb") as dst:
             shutil.copyfileobj(stream, dst)
+        self.finish_regular_file(member, path)
+
+        return True
+
+    def begin_regular_file(self, member: ArchiveMember) -> str | None:
+        """Prepare to write a pending file member outside the helper.
+
+        Returns the path the member contents should be written to, or None if the
+        member should be skipped. Once the file has been written, call
+        `finish_regular_file()`. Used to write files concurrently, while the helper
+        itself is only accessed from a single thread.
+        """
+        path = self.get_output_path(member)
+        if not self.check_overwrites(member, path):
+            return None
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        return path
+
+    def finish_regular_file(self, member: ArchiveMember, path: str) -> None:
         self.extracted_members_by_path[path] = member
         self.extracted_path_by_source_id[member.member_id] = path
 
         if member.member_id in self.pending_target_members_by_source_id:
             self.process_file_extracted(member, path)
 
-        return True
-
     def create_link(self, member: ArchiveMember, member_path: str) -> bool:
         logger.info(
             "Creating link %s to %s , path=%s",
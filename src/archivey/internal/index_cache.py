@@ -0,0 +1,260 @@
+"""
+Persistent sidecar indexes stored next to (or on behalf of) archive files.
+
+Reopening a large archive normally requires rescanning it: tar archives have no
+central directory, so listing a compressed tar means decompressing the whole
+stream again. The functions here let readers persist what they learned during a
+first pass in a cache directory, keyed by the archive path, and reuse it as long
+as the archive file has not changed.
+"""
+
+from __future__ import annotations
+
+import base64
+import hashlib
+import json
+import logging
+import os
+import tempfile
+from dataclasses import dataclass, fields
+from datetime import datetime
+from typing import Any
+
+from archivey.types import ArchiveMember, CreateSystem, MemberType
+
+logger = logging.getLogger(__name__)
+
+INDEX_FORMAT_VERSION = 1
+
+# Number of bytes at the start of the archive that are hashed into the fingerprint.
+# Together with the size and modification time, this catches archives that were
+# rewritten in place (e.g. by tools that preserve timestamps).
+_FINGERPRINT_HEADER_SIZE = 64 * 1024
+
+# ArchiveMember fields stored in the member index. raw_info is reader-specific and
+# restored by the reader itself; the member and archive IDs are reassigned on
+# registration.
+_MEMBER_INDEX_FIELDS = [
+    f.name
+    for f in fields(ArchiveMember)
+    if f.name not in ("raw_info", "_member_id", "_archive_id", "_edited_by_filter")
+]
+
+
+@dataclass(frozen=True)
+class ArchiveFingerprint:
+    """Identifies a specific version of an archive file."""
+
+    size: int
+    mtime_ns: int
+    header_digest: str
+
+    @classmethod
+    def from_path(cls, path: str) -> ArchiveFingerprint | None:
+        """Compute the fingerprint of the file at ``path``, or None if it's not a regular file."""
+        try:
+            st = os.stat(path)
+            if not os.path.isfile(path):
+                return None
+            with open(path, "rb") as f:
+                header = f.read(_FINGERPRINT_HEADER_SIZE)
+        except OSError as e:
+            logger.debug("Cannot fingerprint %s: %s", path, e)
+            return None
+
+        return cls(
+            size=st.st_size,
+            mtime_ns=st.st_mtime_ns,
+            header_digest=hashlib.sha256(header).hexdigest(),
+        )
+
+    def to_json(self) -> dict[str, Any]:
+        return {
+            "size": self.size,
+            "mtime_ns": self.mtime_ns,
+            "header_digest": self.header_digest,
+        }
+
+
+def get_index_path(
+    index_dir: str, archive_path: str, kind: str, extension: str = "json"
+) -> str:
+    """Return the path of the sidecar index of the given ``kind`` for ``archive_path``."""
+    path_digest = hashlib.sha256(
+        os.path.realpath(archive_path).encode("utf-8", "surrogateescape")
+    ).hexdigest()[:32]
+    return os.path.join(index_dir, f"{path_digest}.{kind}.{extension}")
+
+
+def _make_header(
+    archive_path: str, kind: str, fingerprint: ArchiveFingerprint
+) -> dict[str, Any]:
+    return {
+        "version": INDEX_FORMAT_VERSION,
+        "kind": kind,
+        "archive_path": os.path.realpath(archive_path),
+        "fingerprint": fingerprint.to_json(),
+    }
+
+
+def _is_valid_header(
+    contents: Any, kind: str, fingerprint: ArchiveFingerprint, index_path: str
+) -> bool:
+    if (
+        not isinstance(contents, dict)
+        or contents.get("version") != INDEX_FORMAT_VERSION
+        or contents.get("kind") != kind
+        or contents.get("fingerprint") != fingerprint.to_json()
+    ):
+        logger.debug("Index %s is stale, ignoring it", index_path)
+        return False
+    return True
+
+
+def _write_atomically(index_dir: str, index_path: str, data: bytes) -> None:
+    os.makedirs(index_dir, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=index_dir, prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, index_path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def load_index(
+    index_dir: str, archive_path: str, kind: str, fingerprint: ArchiveFingerprint
+) -> Any | None:
+    """Load the data stored by :func:`save_index`.
+
+    Returns None if there is no index, or if it was created for a different version
+    of the archive or by an incompatible version of this module.
+    """
+    index_path = get_index_path(index_dir, archive_path, kind)
+    try:
+        with open(index_path, encoding="utf-8") as f:
+            contents = json.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        logger.warning("Ignoring unreadable index %s: %s", index_path, e)
+        return None
+
+    if not _is_valid_header(contents, kind, fingerprint, index_path):
+        return None
+
+    return contents.get("data")
+
+
+def save_index(
+    index_dir: str,
+    archive_path: str,
+    kind: str,
+    fingerprint: ArchiveFingerprint,
+    data: Any,
+) -> None:
+    """Atomically store ``data`` (which must be JSON-serializable) as an index."""
+    contents = _make_header(archive_path, kind, fingerprint)
+    contents["data"] = data
+    _write_atomically(
+        index_dir,
+        get_index_path(index_dir, archive_path, kind),
+        json.dumps(contents, separators=(",", ":")).encode("utf-8"),
+    )
+
+
+def load_binary_index(
+    index_dir: str, archive_path: str, kind: str, fingerprint: ArchiveFingerprint
+) -> bytes | None:
+    """Load the data stored by :func:`save_binary_index`, like :func:`load_index`."""
+    index_path = get_index_path(index_dir, archive_path, kind, "bin")
+    try:
+        with open(index_path, "rb") as f:
+            contents = json.loads(f.readline())
+            if not _is_valid_header(contents, kind, fingerprint, index_path):
+                return None
+            return f.read()
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        logger.warning("Ignoring unreadable index %s: %s", index_path, e)
+        return None
+
+
+def save_binary_index(
+    index_dir: str,
+    archive_path: str,
+    kind: str,
+    fingerprint: ArchiveFingerprint,
+    data: bytes,
+) -> None:
+    """Atomically store binary ``data`` as an index.
+
+    The file starts with the same JSON header as :func:`save_index` files, on a line
+    of its own, followed by the data.
+    """
+    header = json.dumps(
+        _make_header(archive_path, kind, fingerprint), separators=(",", ":")
+    )
+    _write_atomically(
+        index_dir,
+        get_index_path(index_dir, archive_path, kind, "bin"),
+        header.encode("utf-8") + b"\n" + data,
+    )
+
+
+def _encode_value(value: Any) -> Any:
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, bytes):
+        return {"$bytes": base64.b64encode(value).decode("ascii")}
+    if isinstance(value, dict):
+        if not all(isinstance(k, str) for k in value):
+            raise TypeError(f"Cannot store dict with non-string keys: {value!r}")
+        return {"$dict": {k: _encode_value(v) for k, v in value.items()}}
+    raise TypeError(f"Cannot store value of type {type(value)} in an index")
+
+
+def _decode_value(value: Any) -> Any:
+    if isinstance(value, dict):
+        if "$bytes" in value:
+            return base64.b64decode(value["$bytes"])
+        return {k: _decode_value(v) for k, v in value["$dict"].items()}
+    return value
+
+
+def member_to_index_row(member: ArchiveMember) -> list[Any]:
+    """Serialize the metadata of ``member`` (except ``raw_info``) as a JSON-compatible row.
+
+    Raises:
+        TypeError: If some field (typically in ``extra``) can't be serialized.
+    """
+    row = []
+    for name in _MEMBER_INDEX_FIELDS:
+        value = getattr(member, name)
+        if isinstance(value, datetime):
+            value = value.isoformat()
+        elif isinstance(value, (MemberType, CreateSystem)):
+            value = value.value
+        else:
+            value = _encode_value(value)
+        row.append(value)
+    return row
+
+
+def member_from_index_row(row: list[Any]) -> ArchiveMember:
+    """Rebuild an unregistered :class:`ArchiveMember` from a row created by :func:`member_to_index_row`."""
+    values = dict(zip(_MEMBER_INDEX_FIELDS, row, strict=True))
+    if values["mtime_with_tz"] is not None:
+        values["mtime_with_tz"] = datetime.fromisoformat(values["mtime_with_tz"])
+    values["type"] = MemberType(values["type"])
+    if values["create_system"] is not None:
+        values["create_system"] = CreateSystem(values["create_system"])
+    values["extra"] = _decode_value(values["extra"])
+    return ArchiveMember(**values)
+
+
+def member_index_header() -> list[str]:
+    """Return the names of the fields stored in each member index row."""
+    return list(_MEMBER_INDEX_FIELDS)
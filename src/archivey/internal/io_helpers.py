@@ -1,8 +1,12 @@
 """Provides I/O helper classes, including exception translation and lazy opening."""
 
+import collections
 import io
 import logging
+import mmap
 import os
+import sys
+import threading
 from contextlib import contextmanager  # Added for open_if_file
 from dataclasses import dataclass, field
 from typing import (
@@ -19,7 +23,7 @@ from typing import (
     runtime_checkable,
 )
 
-from archivey.exceptions import ArchiveError
+from archivey.exceptions import ArchiveCorruptedError, ArchiveError
 from archivey.internal.utils import ensure_not_none
 from archivey.types import ReadableBinaryStream, ReadableStreamLikeOrSimilar
 
@@ -86,6 +90,26 @@ def is_seekable(
         return False
 
 
+def readinto_from(stream: Any, b: bytearray | memoryview) -> int:
+    """
+    Read up to `len(b)` bytes from `stream` into `b`, and return the number of bytes
+    read.
+
+    Uses the stream's `readinto()` if it has one, so that the data is written
+    directly into `b`, and falls back to copying the result of `read()`.
+    """
+    readinto = getattr(stream, "readinto", None)
+    if readinto is not None:
+        try:
+            return readinto(b) or 0
+        except (NotImplementedError, io.UnsupportedOperation):
+            pass
+
+    data = stream.read(len(b))
+    b[: len(data)] = data
+    return len(data)
+
+
 class BinaryIOWrapper(io.RawIOBase, BinaryIO):
     """
     Wraps an object that doesn't match the BinaryIO protocol, adding any missing
@@ -324,6 +348,152 @@ class ErrorIOStream(io.RawIOBase, BinaryIO):
         return False  # pragma: no cover - trivial
 
 
+class ReadAheadStream(io.BufferedIOBase, BinaryIO):
+    """
+    Reads a stream on a background thread, staying ahead of the caller.
+
+    The reads of the inner stream (and so the decompression, if it's a decompressor
+    stream) overlap with whatever the caller does with the data. The thread stops
+    reading while `max_buffered` bytes or more are waiting to be read. Exceptions
+    raised by the inner stream are raised by the read that reaches them, as they
+    would have been without the read-ahead.
+
+    The stream is not seekable. The inner stream is closed when this one is.
+    """
+
+    def __init__(
+        self, inner: BinaryIO, max_buffered: int, chunk_size: int = 65536
+    ) -> None:
+        super().__init__()
+        self._inner = inner
+        self._max_buffered = max_buffered
+        self._chunk_size = chunk_size
+        # Data read ahead that hasn't been returned yet: _chunks, without the first
+        # _chunk_pos bytes of the first chunk.
+        self._chunks: collections.deque[bytes] = collections.deque()
+        self._chunk_pos = 0
+        self._buffered = 0
+        self._eof = False
+        self._error: Exception | None = None
+        self._stopping = False
+        self._pos = 0
+        self._condition = threading.Condition()
+        self._thread = threading.Thread(
+            target=self._read_ahead, name="archivey-read-ahead", daemon=True
+        )
+        self._thread.start()
+
+    def _read_ahead(self) -> None:
+        while True:
+            with self._condition:
+                while self._buffered >= self._max_buffered and not self._stopping:
+                    self._condition.wait()
+                if self._stopping:
+                    return
+            try:
+                data = self._inner.read(self._chunk_size)
+            except Exception as e:  # noqa: BLE001
+                with self._condition:
+                    self._error = e
+                    self._eof = True
+                    self._condition.notify_all()
+                return
+
+            with self._condition:
+                if data:
+                    self._chunks.append(data)
+                    self._buffered += len(data)
+                else:
+                    self._eof = True
+                self._condition.notify_all()
+            if not data:
+                return
+
+    def _take(self, n: int, wait_for_all: bool) -> bytes:
+        """Return up to `n` bytes, waiting for all of them if `wait_for_all` is set.
+
+        Otherwise, return as soon as some data is available.
+        """
+        if self.closed:
+            raise ValueError("I/O operation on closed file.")
+        parts = []
+        with self._condition:
+            while n > 0:
+                while not self._chunks and not self._eof:
+                    self._condition.wait()
+                if not self._chunks:
+                    break
+                chunk = self._chunks[0]
+                end = min(self._chunk_pos + n, len(chunk))
+                if self._chunk_pos == 0 and end == len(chunk):
+                    part = chunk
+                else:
+                    part = chunk[self._chunk_pos : end]
+                if end == len(chunk):
+                    self._chunks.popleft()
+                    self._chunk_pos = 0
+                else:
+                    self._chunk_pos = end
+                parts.append(part)
+                n -= len(part)
+                self._buffered -= len(part)
+                self._condition.notify_all()
+                if not wait_for_all:
+                    break
+
+            if self._error is not None and (not parts or (wait_for_all and n > 0)):
+                # Like the inner stream, a read that can't be completed raises the
+                # error. The data is kept, so that smaller reads can still get it.
+                if parts:
+                    if self._chunk_pos:
+                        self._chunks[0] = self._chunks[0][self._chunk_pos :]
+                        self._chunk_pos = 0
+                    self._chunks.appendleft(b"".join(parts))
+                    self._buffered += sum(len(part) for part in parts)
+                raise self._error
+
+        data = parts[0] if len(parts) == 1 else b"".join(parts)
+        self._pos += len(data)
+        return data
+
+    def read(self, n: int | None = -1) -> bytes:
+        if n is None or n < 0:
+            return self._take(sys.maxsize, wait_for_all=True)
+        return self._take(n, wait_for_all=True)
+
+    def read1(self, n: int = -1) -> bytes:
+        return self._take(n if n >= 0 else sys.maxsize, wait_for_all=False)
+
+    def readinto(self, b: bytearray | memoryview) -> int:  # type: ignore[override]
+        view = memoryview(b).cast("B")
+        data = self.read(len(view))
+        view[: len(data)] = data
+        return len(data)
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return False
+
+    def tell(self) -> int:
+        return self._pos
+
+    def close(self) -> None:
+        if self.closed:
+            return
+        with self._condition:
+            self._stopping = True
+            self._chunks.clear()
+            self._buffered = 0
+            self._condition.notify_all()
+        # Wait for the read in progress, as the inner stream can't be closed while
+        # it's being read.
+        self._thread.join()
+        self._inner.close()
+        super().close()
+
+
 T = TypeVar("T")
 
 
@@ -387,18 +557,10 @@ class StatsIO(io.RawIOBase, BinaryIO):
         return data
 
     def readinto(self, b: bytearray | memoryview) -> int:  # type: ignore[override]
-        try:
-            n = self._inner.readinto(b)  # type: ignore[attr-defined]
-            self.stats.bytes_read += n
-            self.stats.read_ranges[-1][1] += n
-            return n
-        except NotImplementedError:
-            # Some streams don't support readinto, so we fall back to read()
-            data = self.read(len(b))
-            b[: len(data)] = data
-            self.stats.bytes_read += len(data)
-            self.stats.read_ranges[-1][1] += len(data)
-            return len(data)
+        n = readinto_from(self._inner, b)
+        self.stats.bytes_read += n
+        self.stats.read_ranges[-1][1] += n
+        return n
 
     def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
         newpos = self._inner.seek(offset, whence)
@@ -466,10 +628,19 @@ class ConcatenationStream(io.RawIOBase, BinaryIO):
         return b""
 
     def readinto(self, b: bytearray | memoryview) -> int:  # type: ignore[override]
-        data = self.read(len(b))
-        n = len(data)
-        b[:n] = data
-        return n
+        if self.closed:
+            raise ValueError("I/O operation on closed file.")
+        if len(b) == 0:
+            return 0
+
+        while self._index < len(self._streams):
+            n = readinto_from(self._streams[self._index], b)
+            if n:
+                return n
+            self._index += 1
+
+        # All streams are exhausted.
+        return 0
 
     # Properties -------------------------------------------------------
     def readable(self) -> bool:  # pragma: no cover - trivial
@@ -549,9 +720,25 @@ class RecordableStream(io.RawIOBase, BinaryIO):
         return bytes(data)
 
     def readinto(self, b: bytearray | memoryview) -> int:  # type: ignore[override]
-        data = self.read(len(b))
-        n = len(data)
-        b[:n] = data
+        if self.closed:
+            raise ValueError("I/O operation on closed file.")
+
+        view = memoryview(b).cast("B")
+        # Replay recorded data first, then read the rest straight into the caller's
+        # buffer and record it from there.
+        n = min(len(view), len(self._buffer) - self._pos)
+        if n > 0:
+            view[:n] = memoryview(self._buffer)[self._pos : self._pos + n]
+            self._pos += n
+
+        if n < len(view) and not self._inner_eof:
+            read = readinto_from(self._inner, view[n:])
+            if not read:
+                self._inner_eof = True
+            self._buffer += view[n : n + read]
+            self._pos += read
+            n += read
+
         return n
 
     # Seek/Tell --------------------------------------------------------
@@ -695,9 +882,13 @@ class SlicingStream(io.RawIOBase, BinaryIO):
         return data
 
     def readinto(self, b: bytearray | memoryview) -> int:
-        buf = self.read(len(b))
-        b[: len(buf)] = buf
-        return len(buf)
+        n = self._compute_bytes_to_read(len(b))
+        if n == 0:
+            return 0
+
+        read = readinto_from(self._stream, memoryview(b).cast("B")[:n])
+        self._pos += read
+        return read
 
     def tell(self) -> int:
         """Return the current position within the slice."""
@@ -787,6 +978,171 @@ class SlicingStream(io.RawIOBase, BinaryIO):
         return self._seekable
 
 
+PREAD_SUPPORTED = hasattr(os, "pread")
+"""Whether `PositionalReader` can be used on this platform."""
+
+_PREADV_SUPPORTED = hasattr(os, "preadv")
+
+
+class SharedFileDescriptor:
+    """
+    A duplicate of a file descriptor, closed when its last user releases it.
+
+    The creator holds the first reference, and each `PositionalReader` created from
+    it takes another one, so that a view never reads from a descriptor that was
+    closed (and possibly reused for another file) while it was still in use.
+    """
+
+    def __init__(self, fd: int):
+        self.fd = os.dup(fd)
+        self._refs = 1
+        self._lock = threading.Lock()
+
+    def acquire(self) -> int:
+        """Take a reference to the descriptor and return it."""
+        with self._lock:
+            if self._refs == 0:
+                raise ValueError("I/O operation on closed file.")
+            self._refs += 1
+            return self.fd
+
+    def release(self) -> None:
+        """Release a reference, closing the descriptor if it was the last one."""
+        with self._lock:
+            self._refs -= 1
+            if self._refs > 0:
+                return
+        os.close(self.fd)
+
+
+class PositionalReader(io.RawIOBase, BinaryIO):
+    """
+    A read-only, seekable view of a range of a file, read with `os.pread()`.
+
+    Each view has its own position and never moves the file offset of the
+    descriptor, so several views can read the same file from different threads
+    without seeking or locking a shared handle. A plain descriptor is not owned by
+    the view, and must stay open while the view is in use; a `SharedFileDescriptor`
+    is kept open until the view is closed.
+    """
+
+    def __init__(
+        self,
+        fd: int | SharedFileDescriptor,
+        start: int = 0,
+        length: int | None = None,
+    ):
+        super().__init__()
+        self._shared_fd: SharedFileDescriptor | None = None
+        if isinstance(fd, SharedFileDescriptor):
+            shared_fd = fd
+            fd = shared_fd.acquire()
+            self._shared_fd = shared_fd
+        self._fd = fd
+        self._start = start
+        self._length = os.fstat(fd).st_size - start if length is None else length
+        self._pos = 0
+
+    def read(self, n: int | None = -1) -> bytes:
+        if self.closed:
+            raise ValueError("I/O operation on closed file.")
+
+        remaining = max(0, self._length - self._pos)
+        n = remaining if n is None or n < 0 else min(n, remaining)
+        if n == 0:
+            return b""
+
+        data = os.pread(self._fd, n, self._start + self._pos)
+        self._pos += len(data)
+        return data
+
+    def readinto(self, b: bytearray | memoryview) -> int:  # type: ignore[override]
+        if not _PREADV_SUPPORTED:
+            data = self.read(len(b))
+            b[: len(data)] = data
+            return len(data)
+
+        if self.closed:
+            raise ValueError("I/O operation on closed file.")
+        view = memoryview(b).cast("B")[: max(0, self._length - self._pos)]
+        if len(view) == 0:
+            return 0
+        n = os.preadv(self._fd, [view], self._start + self._pos)
+        self._pos += n
+        return n
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_SET:
+            pos = offset
+        elif whence == io.SEEK_CUR:
+            pos = self._pos + offset
+        elif whence == io.SEEK_END:
+            pos = self._length + offset
+        else:
+            raise ValueError(f"Invalid whence: {whence}")
+        if pos < 0:
+            raise ValueError(f"Negative seek position {pos}")
+        self._pos = pos
+        return pos
+
+    def tell(self) -> int:
+        return self._pos
+
+    def readable(self) -> bool:
+        return True
+
+    def writable(self) -> bool:
+        return False
+
+    def seekable(self) -> bool:
+        return True
+
+    def close(self) -> None:
+        if not self.closed and self._shared_fd is not None:
+            self._shared_fd.release()
+        super().close()
+
+
+class FileMapping:
+    """
+    A read-only memory map of a whole file, created when it's first needed.
+
+    `view()` returns slices of the map without copying. The descriptor is not
+    owned by the mapping, and can be closed independently.
+    """
+
+    def __init__(self, fd: int):
+        self._fd = fd
+        self._mmap: mmap.mmap | None = None
+        self._lock = threading.Lock()
+
+    def view(self, start: int, length: int) -> memoryview:
+        """Return a view of `length` bytes of the file starting at `start`."""
+        if length == 0:
+            return memoryview(b"")
+        with self._lock:
+            if self._mmap is None:
+                self._mmap = mmap.mmap(self._fd, 0, access=mmap.ACCESS_READ)
+            mapped = self._mmap
+        if start < 0 or start + length > len(mapped):
+            raise ArchiveCorruptedError(
+                f"Data range {start}-{start + length} is past the end of the file "
+                f"({len(mapped)} bytes)"
+            )
+        return memoryview(mapped)[start : start + length]
+
+    def close(self) -> None:
+        with self._lock:
+            mapped, self._mmap = self._mmap, None
+        if mapped is not None:
+            try:
+                mapped.close()
+            except BufferError:
+                # Views returned by view() are still alive; the file is unmapped
+                # when the last of them is released.
+                pass
+
+
 def fix_stream_start_position(stream: BinaryIO) -> BinaryIO:
     if not is_seekable(stream):
         return stream
@@ -0,0 +1,56 @@
+"""Functions run by the worker processes of `extractall(executor="process")`.
+
+Each worker process opens its own reader for the archive once, in
+`init_worker_reader()`, and then writes the members it is sent to the paths chosen by
+the `ExtractionHelper` in the main process.
+"""
+
+from __future__ import annotations
+
+import shutil
+from typing import TYPE_CHECKING, BinaryIO
+
+from archivey.internal.utils import ensure_not_none
+
+if TYPE_CHECKING:
+    from archivey.archive_reader import ArchiveReader
+    from archivey.config import ArchiveyConfig
+    from archivey.types import ArchiveFormat
+
+# The reader is left open until the worker process exits.
+_worker_reader: ArchiveReader | None = None
+
+
+def write_member_file(stream: BinaryIO, path: str) -> None:
+    with open(path, "wb") as dst:
+        shutil.copyfileobj(stream, dst)
+
+
+def init_worker_reader(
+    archive_path: str,
+    format: ArchiveFormat,
+    config: ArchiveyConfig,
+    pwd: bytes | str | None,
+) -> None:
+    from archivey.core import open_archive
+
+    global _worker_reader
+    _worker_reader = open_archive(archive_path, format=format, config=config, pwd=pwd)
+
+
+def extract_members_in_worker(
+    items: list[tuple[int, str, str]], pwd: bytes | str | None
+) -> None:
+    """Write each `(member_id, filename, path)` in `items` to `path`."""
+    reader = ensure_not_none(_worker_reader)
+    members = reader.get_members()
+    for member_id, filename, path in items:
+        # Readers register members in archive order, so the member usually has the
+        # same id as in the main process; fall back to the name if it doesn't.
+        if member_id < len(members) and members[member_id].filename == filename:
+            member = members[member_id]
+        else:
+            member = reader.get_member(filename)
+
+        with reader.open(member, pwd=pwd) as stream:
+            write_member_file(stream, path)
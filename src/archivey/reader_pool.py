@@ -0,0 +1,430 @@
+"""A pool of open archive readers, for serving members of many archives.
+
+Opening an archive detects its format, creates a reader and parses the list of
+members (the central directory of a ZIP, or a full scan of a TAR). Services that read
+a few members from the same archives over and over can keep the readers open in an
+`ArchiveReaderPool` and only pay that cost once per archive.
+"""
+
+from __future__ import annotations
+
+import collections
+import logging
+import os
+import threading
+from dataclasses import dataclass
+from typing import (
+    TYPE_CHECKING,
+    BinaryIO,
+    Callable,
+    Collection,
+    Iterator,
+    Literal,
+    NamedTuple,
+    Sequence,
+)
+
+from archivey.archive_reader import ArchiveReader
+from archivey.config import get_archivey_config
+from archivey.core import open_archive
+from archivey.internal.base_reader import BaseArchiveReader
+
+if TYPE_CHECKING:
+    from archivey.config import ArchiveyConfig
+    from archivey.types import (
+        ArchiveFormat,
+        ArchiveInfo,
+        ArchiveMember,
+        ContainerFormat,
+        ExtractFilterFunc,
+        ExtractionFilter,
+        IteratorFilterFunc,
+        StreamFormat,
+    )
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_READERS = 128
+"""Default maximum number of readers kept open by an `ArchiveReaderPool`."""
+
+
+class _FileId(NamedTuple):
+    """Identifies a version of a file, from a single `os.stat()` call."""
+
+    device: int
+    inode: int
+    size: int
+    mtime_ns: int
+
+    @classmethod
+    def from_path(cls, path: str) -> _FileId:
+        st = os.stat(path)
+        return cls(st.st_dev, st.st_ino, st.st_size, st.st_mtime_ns)
+
+
+@dataclass(eq=False)
+class _PoolEntry:
+    path: str
+    format: ArchiveFormat | ContainerFormat | StreamFormat | None
+    pwd: bytes | str | None
+    config: ArchiveyConfig
+    file_id: _FileId
+    reader: BaseArchiveReader
+    shared: bool
+    """Whether the reader can be checked out by several callers at once."""
+    checkouts: int = 0
+    retired: bool = False
+    """Set when the entry is removed from the pool. The reader is closed as soon as
+    it's not checked out."""
+    closed: bool = False
+
+    def matches(
+        self,
+        format: ArchiveFormat | ContainerFormat | StreamFormat | None,
+        pwd: bytes | str | None,
+        config: ArchiveyConfig,
+    ) -> bool:
+        return self.format == format and self.pwd == pwd and self.config == config
+
+
+class ArchiveReaderPool:
+    """
+    A thread-safe, least-recently-used pool of open archive readers.
+
+    [`open()`][archivey.ArchiveReaderPool.open] returns a reader for an archive
+    path, reusing one that is already open if the file hasn't changed since (same
+    inode, size and modification time). Each call returns a separate handle to the
+    pooled reader; closing the handle, or leaving its `with` block, returns the
+    reader to the pool instead of closing it.
+
+    ZIP archives, uncompressed TAR archives and folders can be read from several
+    threads at once, so a single reader is shared by all the callers that open
+    them. For other formats, each reader is only checked out by one caller at a
+    time, and concurrent callers get separate readers.
+
+    At most `max_readers` readers are kept open, each of which usually holds one
+    file descriptor. When the limit is reached, the least recently used readers
+    that are not checked out are closed. Readers that are checked out are never
+    closed by the pool; if all of them are in use, the pool temporarily grows past
+    the limit.
+
+    Example:
+        ```python
+        pool = ArchiveReaderPool(max_readers=64)
+
+        def handle_request(archive_path: str, member_name: str) -> bytes:
+            with pool.open(archive_path) as archive:
+                with archive.open(member_name) as stream:
+                    return stream.read()
+        ```
+    """
+
+    def __init__(self, max_readers: int = DEFAULT_MAX_READERS):
+        """
+        Args:
+            max_readers: Maximum number of readers kept open while not in use.
+        """
+        if max_readers < 1:
+            raise ValueError(f"max_readers must be at least 1, got {max_readers}")
+        self.max_readers = max_readers
+        self._lock = threading.Lock()
+        # All the entries in the pool, from least to most recently used.
+        self._entries: collections.OrderedDict[_PoolEntry, None] = (
+            collections.OrderedDict()
+        )
+        self._entries_by_path: dict[str, list[_PoolEntry]] = {}
+
+    def open(
+        self,
+        path: str | bytes | os.PathLike,
+        *,
+        format: ArchiveFormat | ContainerFormat | StreamFormat | None = None,
+        pwd: bytes | str | None = None,
+        config: ArchiveyConfig | None = None,
+    ) -> ArchiveReader:
+        """
+        Check out a random-access reader for the archive at `path`.
+
+        The arguments are the same as for [`open_archive`][archivey.open_archive].
+        Readers are only reused for calls with equal `format`, `pwd` and `config`.
+
+        The returned handle must be closed when the caller is done with it, usually
+        with a `with` block; closing it more than once has no further effect. Streams
+        opened from it should be closed before that, as the underlying reader may be
+        closed by the pool at any time afterwards.
+
+        Raises:
+            FileNotFoundError: If `path` doesn't exist.
+            ArchiveError: If the archive can't be opened, as in `open_archive`.
+        """
+        if isinstance(path, bytes):
+            path = path.decode("utf-8")
+        path_str = os.path.realpath(os.fspath(path))
+        if config is None:
+            config = get_archivey_config()
+        file_id = _FileId.from_path(path_str)
+
+        with self._lock:
+            to_close = [
+                entry
+                for entry in self._entries_by_path.get(path_str, [])
+                if entry.file_id != file_id
+            ]
+            for entry in to_close:
+                logger.debug("Archive %s changed, retiring its reader", path_str)
+                self._retire(entry)
+            entry = self._checkout_existing(path_str, format, pwd, config)
+        self._close_entries(to_close)
+        if entry is not None:
+            return _PooledReader(self, entry)
+
+        reader = open_archive(path_str, format=format, pwd=pwd, config=config)
+        if not isinstance(reader, BaseArchiveReader):  # pragma: no cover
+            return reader
+        try:
+            # Register all the members now, so they are not read again by each
+            # caller that checks out the reader.
+            reader.get_members()
+        except BaseException:
+            reader.close()
+            raise
+
+        entry = _PoolEntry(
+            path=path_str,
+            format=format,
+            pwd=pwd,
+            config=config,
+            file_id=file_id,
+            reader=reader,
+            shared=reader._supports_concurrent_reads(),
+        )
+
+        with self._lock:
+            existing = (
+                self._checkout_existing(path_str, format, pwd, config)
+                if entry.shared
+                else None
+            )
+            if existing is None:
+                entry.checkouts = 1
+                self._entries[entry] = None
+                self._entries_by_path.setdefault(path_str, []).append(entry)
+                to_close = self._evict_idle()
+        if existing is not None:
+            # Another caller opened the same archive in the meantime.
+            reader.close()
+            return _PooledReader(self, existing)
+
+        self._close_entries(to_close)
+        return _PooledReader(self, entry)
+
+    def invalidate(self, path: str | bytes | os.PathLike | None = None) -> None:
+        """
+        Remove the readers of the archive at `path` from the pool, or all readers if
+        `path` is None.
+
+        Readers that are not checked out are closed immediately, and the others as
+        soon as they are returned. Later calls to `open()` open new readers.
+        """
+        with self._lock:
+            if path is None:
+                entries = list(self._entries)
+            else:
+                if isinstance(path, bytes):
+                    path = path.decode("utf-8")
+                path_str = os.path.realpath(os.fspath(path))
+                entries = list(self._entries_by_path.get(path_str, []))
+            for entry in entries:
+                self._retire(entry)
+        self._close_entries(entries)
+
+    def close(self) -> None:
+        """Remove all readers from the pool, closing them once they are returned."""
+        self.invalidate()
+
+    def __len__(self) -> int:
+        """Return the number of readers in the pool, including checked out ones."""
+        with self._lock:
+            return len(self._entries)
+
+    def __enter__(self) -> ArchiveReaderPool:
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def _checkout_existing(
+        self,
+        path: str,
+        format: ArchiveFormat | ContainerFormat | StreamFormat | None,
+        pwd: bytes | str | None,
+        config: ArchiveyConfig,
+    ) -> _PoolEntry | None:
+        for entry in self._entries_by_path.get(path, []):
+            if entry.matches(format, pwd, config) and (
+                entry.shared or entry.checkouts == 0
+            ):
+                entry.checkouts += 1
+                self._entries.move_to_end(entry)
+                return entry
+        return None
+
+    def _retire(self, entry: _PoolEntry) -> None:
+        """Remove `entry` from the pool. Must be called with the lock held."""
+        entry.retired = True
+        del self._entries[entry]
+        path_entries = self._entries_by_path[entry.path]
+        path_entries.remove(entry)
+        if not path_entries:
+            del self._entries_by_path[entry.path]
+
+    def _evict_idle(self) -> list[_PoolEntry]:
+        """
+        Retire the least recently used entries that are not checked out, until the
+        pool is within its size limit. Must be called with the lock held.
+        """
+        evicted = []
+        excess = len(self._entries) - self.max_readers
+        for entry in list(self._entries):
+            if excess <= 0:
+                break
+            if entry.checkouts == 0:
+                self._retire(entry)
+                evicted.append(entry)
+                excess -= 1
+        return evicted
+
+    def _close_entries(self, entries: list[_PoolEntry]) -> None:
+        """Close the readers of the given retired entries that are not in use."""
+        for entry in entries:
+            with self._lock:
+                if entry.checkouts > 0 or entry.closed:
+                    continue
+                entry.closed = True
+            entry.reader.close()
+
+    def _release(self, handle: _PooledReader) -> None:
+        """Called by `handle.close()`. Returns the reader to the pool."""
+        entry = handle._entry
+        with self._lock:
+            if handle._closed:
+                return
+            handle._closed = True
+            entry.checkouts -= 1
+            if entry.checkouts > 0:
+                return
+            # The pool may have grown past its limit while all readers were in use.
+            to_close = [entry] if entry.retired else self._evict_idle()
+        self._close_entries(to_close)
+
+
+class _PooledReader(ArchiveReader):
+    """
+    A checkout of a pooled reader, returned by `ArchiveReaderPool.open()`.
+
+    Shared readers are handed out to several callers at once, so each of them gets
+    its own handle: closing a handle returns the reader to the pool once, and later
+    calls to the handle raise ValueError as for a closed reader.
+    """
+
+    def __init__(self, pool: ArchiveReaderPool, entry: _PoolEntry):
+        super().__init__(entry.reader.path_or_stream, entry.reader.format)
+        self._pool = pool
+        self._entry = entry
+        self._closed = False
+
+    @property
+    def _reader(self) -> BaseArchiveReader:
+        if self._closed:
+            raise ValueError("Archive is closed")
+        return self._entry.reader
+
+    def close(self) -> None:
+        self._pool._release(self)
+
+    def get_members(self) -> Sequence[ArchiveMember]:
+        return self._reader.get_members()
+
+    def get_members_if_available(self) -> Sequence[ArchiveMember] | None:
+        return self._reader.get_members_if_available()
+
+    def iter_members_with_streams(
+        self,
+        members: Collection[ArchiveMember | str]
+        | Callable[[ArchiveMember], bool]
+        | None = None,
+        *,
+        pwd: bytes | str | None = None,
+        filter: IteratorFilterFunc | ExtractionFilter | None = None,
+        workers: int | None = None,
+        prefetch: int | None = None,
+    ) -> Iterator[tuple[ArchiveMember, BinaryIO | None]]:
+        return self._reader.iter_members_with_streams(
+            members, pwd=pwd, filter=filter, workers=workers, prefetch=prefetch
+        )
+
+    def get_archive_info(self) -> ArchiveInfo:
+        return self._reader.get_archive_info()
+
+    def has_random_access(self) -> bool:
+        return self._reader.has_random_access()
+
+    def get_member(self, member_or_filename: ArchiveMember | str) -> ArchiveMember:
+        return self._reader.get_member(member_or_filename)
+
+    def stat(self, path: str, *, follow_symlinks: bool = True) -> ArchiveMember:
+        return self._reader.stat(path, follow_symlinks=follow_symlinks)
+
+    def listdir(self, path: str = "") -> list[str]:
+        return self._reader.listdir(path)
+
+    def walk(self, top: str = "") -> Iterator[tuple[str, list[str], list[str]]]:
+        return self._reader.walk(top)
+
+    def glob(self, pattern: str) -> list[str]:
+        return self._reader.glob(pattern)
+
+    def open(
+        self, member_or_filename: ArchiveMember | str, *, pwd: bytes | str | None = None
+    ) -> BinaryIO:
+        return self._reader.open(member_or_filename, pwd=pwd)
+
+    def read_member_view(
+        self, member_or_filename: ArchiveMember | str, *, pwd: bytes | str | None = None
+    ) -> memoryview:
+        return self._reader.read_member_view(member_or_filename, pwd=pwd)
+
+    def extract(
+        self,
+        member_or_filename: ArchiveMember | str,
+        path: str | os.PathLike | None = None,
+        pwd: bytes | str | None = None,
+    ) -> str | None:
+        return self._reader.extract(member_or_filename, path, pwd)
+
+    def extractall(
+        self,
+        path: str | os.PathLike | None = None,
+        members: Collection[ArchiveMember | str]
+        | Callable[[ArchiveMember], bool]
+        | None = None,
+        *,
+        pwd: bytes | str | None = None,
+        filter: ExtractFilterFunc | ExtractionFilter | None = None,
+        workers: int | None = None,
+        executor: Literal["thread", "process"] = "thread",
+    ) -> dict[str, ArchiveMember]:
+        return self._reader.extractall(
+            path,
+            members,
+            pwd=pwd,
+            filter=filter,
+            workers=workers,
+            executor=executor,
+        )
+
+    def resolve_link(self, member: ArchiveMember) -> ArchiveMember | None:
+        return self._reader.resolve_link(member)
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} reader={self._entry.reader!r}>"
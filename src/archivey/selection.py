@@ -0,0 +1,127 @@
+"""
+Declarative member selections for Archivey.
+
+A [MemberSelection][archivey.MemberSelection] can be passed as the `members` argument
+of `iter_members_with_streams()` and `extractall()`, like any other predicate. Since
+its criteria are known in advance, readers can also check them against the raw
+archive headers, and skip building `ArchiveMember` objects for files that are not
+selected when the archive is read in streaming mode.
+"""
+
+from __future__ import annotations
+
+import fnmatch
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+from archivey.internal.directory_index import split_path
+
+if TYPE_CHECKING:
+    from collections.abc import Collection
+
+    from archivey.types import ArchiveMember, MemberType
+
+
+def _match_parts(pattern: list[str], parts: list[str]) -> bool:
+    if not pattern:
+        return not parts
+    head = pattern[0]
+    if head == "**":
+        return any(_match_parts(pattern[1:], parts[i:]) for i in range(len(parts) + 1))
+    return (
+        bool(parts)
+        and fnmatch.fnmatchcase(parts[0], head)
+        and _match_parts(pattern[1:], parts[1:])
+    )
+
+
+@dataclass(frozen=True)
+class MemberSelection:
+    """
+    Select archive members by name, size and type.
+
+    A member is selected if its name matches any of `names`, `patterns` or
+    `prefixes` (or if none of them is set), and it also satisfies the size and type
+    bounds. Instances are callable, taking an `ArchiveMember` and returning whether
+    it is selected.
+
+    Example:
+        ```python
+        selection = MemberSelection(patterns=["logs/**/*.parquet"], min_size=1)
+        for member, stream in archive.iter_members_with_streams(selection):
+            ...
+        ```
+    """
+
+    names: Collection[str] | None = None
+    "Exact member filenames to select. Directory names end with a slash."
+
+    patterns: Collection[str] | None = None
+    "Shell-style patterns matched against member paths one component at a time, as in `ArchiveReader.glob()`: `*` doesn't match slashes, and a `**` component matches any number of directories."
+
+    prefixes: Collection[str] | None = None
+    "Directories whose contents (at any depth) are selected, e.g. `logs/2026`. The directories themselves are selected too."
+
+    min_size: int | None = None
+    "Minimum `file_size`, in bytes. Members whose size is unknown are not excluded."
+
+    max_size: int | None = None
+    "Maximum `file_size`, in bytes. Members whose size is unknown are not excluded."
+
+    types: Collection[MemberType] | None = None
+    "Member types to select. By default, members of all types are selected."
+
+    _names: frozenset[str] | None = field(init=False, repr=False, compare=False)
+    _patterns: tuple[list[str], ...] = field(init=False, repr=False, compare=False)
+    _prefixes: tuple[list[str], ...] = field(init=False, repr=False, compare=False)
+    _types: frozenset[MemberType] | None = field(init=False, repr=False, compare=False)
+    _any_name: bool = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        _set = object.__setattr__
+        _set(self, "_names", None if self.names is None else frozenset(self.names))
+        _set(self, "_patterns", tuple(split_path(p) for p in self.patterns or ()))
+        _set(self, "_prefixes", tuple(split_path(p) for p in self.prefixes or ()))
+        _set(self, "_types", None if self.types is None else frozenset(self.types))
+        _set(
+            self,
+            "_any_name",
+            self.names is None and self.patterns is None and self.prefixes is None,
+        )
+
+    def matches_entry(
+        self,
+        filename: str,
+        file_size: int | None = None,
+        type: MemberType | None = None,
+    ) -> bool:
+        """
+        Return whether an entry with the given properties is selected.
+
+        Used by readers to check raw archive headers before building an
+        `ArchiveMember`. Criteria for properties passed as None are not checked.
+        """
+        if self._types is not None and type is not None and type not in self._types:
+            return False
+        if file_size is not None and (
+            (self.min_size is not None and file_size < self.min_size)
+            or (self.max_size is not None and file_size > self.max_size)
+        ):
+            return False
+
+        if self._any_name or (self._names is not None and filename in self._names):
+            return True
+        if not self._patterns and not self._prefixes:
+            return False
+
+        parts = split_path(filename)
+        return any(parts[: len(prefix)] == prefix for prefix in self._prefixes) or any(
+            _match_parts(pattern, parts) for pattern in self._patterns
+        )
+
+    def matches(self, member: ArchiveMember) -> bool:
+        """Return whether ``member`` is selected."""
+        return self.matches_entry(member.filename, member.file_size, member.type)
+
+    def __call__(self, member: ArchiveMember) -> bool:
+        return self.matches(member)
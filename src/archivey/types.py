@@ -205,7 +205,7 @@ class ArchiveInfo:
     )
 
 
-@dataclass
+@dataclass(slots=True)
 class ArchiveMember:
     """Represents a file within an archive."""
 
@@ -428,3 +428,11 @@ class ReadableBinaryStream(Protocol):
 
 ReadableStreamLikeOrSimilar = ReadableBinaryStream | io.IOBase | IO[bytes]
 """A readable binary stream or similar object (e.g. IO[bytes])."""
+
+
+@runtime_checkable
+class AsyncReadableBinaryStream(Protocol):
+    """Protocol for a binary stream with an async read() method, such as the body of
+    an async HTTP response."""
+
+    async def read(self, n: int = -1, /) -> bytes: ...
@@ -470,7 +470,7 @@ ZSTD_CMD = ArchiveCreationInfo(
     format=ArchiveFormat.ZSTD,
     generation_method=GenerationMethod.SINGLE_FILE_COMMAND_LINE,
     generation_method_options={"compression_cmd": "zstd"},
-    features=ArchiveFormatFeatures(file_size=False, mtime_with_tz=True),
+    features=ArchiveFormatFeatures(file_size=True, mtime_with_tz=True),
 )
 LZ4_CMD = ArchiveCreationInfo(
     file_suffix="cmd.lz4",
@@ -515,7 +515,7 @@ LZIP_LIBRARY = ArchiveCreationInfo(
     file_suffix="lib.lz",
     format=ArchiveFormat.LZIP,
     generation_method=GenerationMethod.SINGLE_FILE_LIBRARY,
-    features=ArchiveFormatFeatures(file_size=False, mtime_with_tz=True),
+    features=ArchiveFormatFeatures(file_size=True, mtime_with_tz=True),
 )
 ZLIB_LIBRARY = ArchiveCreationInfo(
     file_suffix="lib.zz",
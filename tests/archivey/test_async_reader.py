@@ -0,0 +1,155 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from archivey.async_reader import open_archive_async
+from archivey.types import MemberType
+from tests.archivey.sample_archives import (
+    BASIC_ARCHIVES,
+    SampleArchive,
+    filter_archives,
+)
+from tests.archivey.testing_utils import skip_if_package_missing
+
+
+class _AsyncBody:
+    """An async byte source returning small chunks, like an HTTP response body."""
+
+    def __init__(self, data: bytes, chunk_size: int = 7):
+        self._data = data
+        self._chunk_size = chunk_size
+        self._pos = 0
+
+    async def read(self, n: int = -1) -> bytes:
+        await asyncio.sleep(0)
+        n = self._chunk_size if n < 0 else min(n, self._chunk_size)
+        chunk = self._data[self._pos : self._pos + n]
+        self._pos += len(chunk)
+        return chunk
+
+
+async def _iter_chunks(data: bytes, chunk_size: int = 5):
+    for i in range(0, len(data), chunk_size):
+        await asyncio.sleep(0)
+        yield data[i : i + chunk_size]
+
+
+def _expected_files(sample_archive: SampleArchive) -> dict[str, bytes]:
+    return {
+        f.name: f.contents or b""
+        for f in sample_archive.contents.files
+        if f.type == MemberType.FILE
+    }
+
+
+async def _read_files(archive, read_size: int = -1) -> dict[str, bytes]:
+    files = {}
+    async for member, stream in archive.iter_members_with_streams():
+        if stream is None:
+            continue
+        if read_size < 0:
+            files[member.filename] = await stream.read()
+        else:
+            chunks = []
+            while chunk := await stream.read(read_size):
+                chunks.append(chunk)
+            files[member.filename] = b"".join(chunks)
+    return files
+
+
+@pytest.mark.parametrize(
+    "sample_archive",
+    filter_archives(BASIC_ARCHIVES, extensions=[".zip", ".tar", ".tar.gz", "/"]),
+    ids=lambda a: a.filename,
+)
+@pytest.mark.parametrize("batch_size", [1024 * 1024, 3])
+def test_async_iteration_from_path(
+    sample_archive: SampleArchive, sample_archive_path: str, batch_size: int
+):
+    skip_if_package_missing(sample_archive.creation_info.format, None)
+
+    async def _run():
+        async with await open_archive_async(
+            sample_archive_path, batch_size=batch_size
+        ) as archive:
+            assert await _read_files(archive) == _expected_files(sample_archive)
+            assert await _read_files(archive, 2) == _expected_files(sample_archive)
+
+            stream = await archive.open("subdir/file2.txt")
+            async with stream:
+                data = b"".join([chunk async for chunk in stream])
+            assert data == _expected_files(sample_archive)["subdir/file2.txt"]
+
+    asyncio.run(_run())
+
+
+@pytest.mark.parametrize(
+    "sample_archive",
+    filter_archives(BASIC_ARCHIVES, extensions=[".zip", "/"]),
+    ids=lambda a: a.filename,
+)
+def test_async_iteration_with_workers(
+    sample_archive: SampleArchive, sample_archive_path: str
+):
+    async def _run():
+        async with await open_archive_async(sample_archive_path) as archive:
+            files = {}
+            async for member, stream in archive.iter_members_with_streams(
+                workers=2, prefetch=2
+            ):
+                if stream is not None:
+                    files[member.filename] = await stream.read()
+            assert files == _expected_files(sample_archive)
+
+    asyncio.run(_run())
+
+
+@pytest.mark.parametrize(
+    "sample_archive",
+    filter_archives(BASIC_ARCHIVES, extensions=[".tar", ".tar.gz"]),
+    ids=lambda a: a.filename,
+)
+@pytest.mark.parametrize("source_type", ["read", "iterable"])
+def test_async_iteration_from_async_source(
+    sample_archive: SampleArchive, sample_archive_path: str, source_type: str
+):
+    with open(sample_archive_path, "rb") as f:
+        data = f.read()
+
+    async def _run():
+        source = _AsyncBody(data) if source_type == "read" else _iter_chunks(data)
+        async with await open_archive_async(
+            source, streaming_only=True, batch_size=16
+        ) as archive:
+            assert await _read_files(archive, 5) == _expected_files(sample_archive)
+
+    asyncio.run(_run())
+
+
+@pytest.mark.parametrize(
+    "sample_archive",
+    filter_archives(BASIC_ARCHIVES, extensions=[".tar.gz"]),
+    ids=lambda a: a.filename,
+)
+def test_many_concurrent_async_archives(
+    sample_archive: SampleArchive, sample_archive_path: str
+):
+    with open(sample_archive_path, "rb") as f:
+        data = f.read()
+
+    async def _read_one() -> dict[str, bytes]:
+        async with await open_archive_async(
+            _AsyncBody(data), streaming_only=True, executor=executor, batch_size=64
+        ) as archive:
+            return await _read_files(archive)
+
+    async def _run():
+        return await asyncio.gather(*(_read_one() for _ in range(100)))
+
+    # Far fewer threads than archives: workers waiting for data from an async source
+    # must not prevent the event loop from reading it.
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        results = asyncio.run(_run())
+
+    assert all(r == _expected_files(sample_archive) for r in results)
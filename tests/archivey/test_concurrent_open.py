@@ -0,0 +1,99 @@
+import io
+import os
+import tarfile
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from archivey.core import open_archive
+from archivey.types import MemberType
+from tests.archivey.sample_archives import (
+    BASIC_ARCHIVES,
+    HARDLINK_ARCHIVES,
+    LARGE_ARCHIVES,
+    SampleArchive,
+    filter_archives,
+)
+from tests.archivey.testing_utils import skip_if_package_missing
+
+
+def _read_in_chunks(archive, filename: str) -> bytes:
+    chunks = []
+    with archive.open(filename) as stream:
+        while chunk := stream.read(7):
+            chunks.append(chunk)
+    return b"".join(chunks)
+
+
+@pytest.mark.parametrize(
+    "sample_archive",
+    filter_archives(
+        BASIC_ARCHIVES + LARGE_ARCHIVES + HARDLINK_ARCHIVES,
+        extensions=[".zip", ".tar", "/"],
+    ),
+    ids=lambda a: a.filename,
+)
+def test_concurrent_member_reads(
+    sample_archive: SampleArchive, sample_archive_path: str
+):
+    skip_if_package_missing(sample_archive.creation_info.format, None)
+    expected = {
+        f.name: f.contents or b""
+        for f in sample_archive.contents.files
+        if f.type == MemberType.FILE
+    }
+
+    with open_archive(sample_archive_path) as archive:
+        # Every member is read by several threads at once, in small chunks, so that
+        # reads from the same archive file interleave.
+        names = list(expected) * 8
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(
+                executor.map(lambda name: _read_in_chunks(archive, name), names)
+            )
+
+    assert results == [expected[name] for name in names]
+
+
+def test_uncompressed_tar_read_with_workers(tmp_path):
+    path = str(tmp_path / "archive.tar")
+    data = b"hello world\n" * 1000
+    with tarfile.open(path, "w") as tar:
+        info = tarfile.TarInfo("plain.txt")
+        info.size = len(data)
+        tar.addfile(info, fileobj=io.BytesIO(data))
+
+    with open_archive(path) as archive:
+        # Members are read from the archive file without seeking the shared handle.
+        assert archive._pread_fd is not None
+        assert [
+            (member.filename, stream.read() if stream is not None else None)
+            for member, stream in archive.iter_members_with_streams(workers=2)
+        ] == [("plain.txt", data)]
+
+
+@pytest.mark.parametrize(
+    "sample_archive",
+    filter_archives(BASIC_ARCHIVES + LARGE_ARCHIVES, extensions=[".zip"]),
+    ids=lambda a: a.filename,
+)
+def test_zip_member_streams_release_archive_descriptor(
+    sample_archive: SampleArchive, sample_archive_path: str
+):
+    file_info = next(
+        f
+        for f in sample_archive.contents.files
+        if f.type == MemberType.FILE and f.contents
+    )
+
+    with open_archive(sample_archive_path) as archive:
+        shared_fd = archive._pread_fd
+        assert shared_fd is not None
+        stream = archive.open(file_info.name)
+        assert stream.read() == file_info.contents
+
+    # Closing the archive closes the stream, which held the last reference to the
+    # descriptor.
+    assert stream.closed
+    with pytest.raises(OSError):
+        os.fstat(shared_fd.fd)
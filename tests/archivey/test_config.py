@@ -37,6 +37,10 @@ def test_archivey_config_fields_apply():
                 ExtractionFilter.FULLY_TRUSTED,
                 custom_filter,
             ]
+        elif param_type == "str | None":
+            possible_values = ["some/directory", None]
+        elif param_type == "int":
+            possible_values = [1, 1024 * 1024]
         else:
             raise TypeError(f"Add test value logic for type {param_type} please")
 
@@ -0,0 +1,151 @@
+import posixpath
+
+import pytest
+
+from archivey.core import open_archive
+from archivey.exceptions import ArchiveMemberNotFoundError
+from archivey.types import MemberType
+from tests.archivey.sample_archives import (
+    BASIC_ARCHIVES,
+    SYMLINK_ARCHIVES,
+    SampleArchive,
+    filter_archives,
+)
+from tests.archivey.testing_utils import skip_if_package_missing
+
+
+def _expected_paths(sample_archive: SampleArchive) -> dict[str, MemberType]:
+    """Return all paths in the archive, including implied directories."""
+    paths: dict[str, MemberType] = {}
+    for file in sample_archive.contents.files:
+        name = file.name.rstrip("/")
+        paths[name] = file.type
+        parent = posixpath.dirname(name)
+        while parent and parent not in paths:
+            paths[parent] = MemberType.DIR
+            parent = posixpath.dirname(parent)
+
+    if not sample_archive.creation_info.features.dir_entries:
+        # Empty directories are lost when the archive doesn't store directories.
+        children = {posixpath.dirname(path) for path in paths}
+        paths = {
+            path: type
+            for path, type in paths.items()
+            if type != MemberType.DIR or path in children
+        }
+    return paths
+
+
+@pytest.mark.parametrize(
+    "sample_archive",
+    filter_archives(BASIC_ARCHIVES + SYMLINK_ARCHIVES),
+    ids=lambda a: a.filename,
+)
+def test_directory_queries(sample_archive: SampleArchive, sample_archive_path: str):
+    skip_if_package_missing(sample_archive.creation_info.format, None)
+    expected = _expected_paths(sample_archive)
+
+    with open_archive(sample_archive_path) as archive:
+        assert sorted(archive.glob("**")) == sorted(expected)
+
+        walked = {}
+        for dirpath, dirnames, filenames in archive.walk():
+            for name in dirnames:
+                walked[posixpath.join(dirpath, name)] = MemberType.DIR
+            for name in filenames:
+                walked[posixpath.join(dirpath, name)] = MemberType.FILE
+        assert walked.keys() == expected.keys()
+
+        for path, type in expected.items():
+            assert archive.stat(path, follow_symlinks=False).type == type
+            if type == MemberType.DIR:
+                assert walked[path] == MemberType.DIR
+                assert sorted(archive.listdir(path)) == sorted(
+                    posixpath.basename(p)
+                    for p in expected
+                    if posixpath.dirname(p) == path
+                )
+
+        assert sorted(archive.listdir()) == sorted(p for p in expected if "/" not in p)
+        assert sorted(archive.glob("*.txt")) == sorted(
+            p for p in expected if "/" not in p and p.endswith(".txt")
+        )
+        assert sorted(archive.glob("**/*.txt")) == sorted(
+            p for p in expected if p.endswith(".txt")
+        )
+
+
+@pytest.mark.parametrize(
+    "sample_archive",
+    filter_archives(BASIC_ARCHIVES, prefixes=["basic_nonsolid"], extensions=[".zip"]),
+    ids=lambda a: a.filename,
+)
+def test_directory_queries_paths(
+    sample_archive: SampleArchive, sample_archive_path: str
+):
+    with open_archive(sample_archive_path) as archive:
+        assert archive.stat("subdir").filename == "subdir/"
+        assert archive.stat("./subdir//") is archive.stat("subdir")
+        assert archive.stat("subdir/file2.txt") is archive.get_member(
+            "subdir/file2.txt"
+        )
+
+        implicit = archive.stat("implicit_subdir")
+        assert implicit.type == MemberType.DIR
+        assert implicit.filename == "implicit_subdir/"
+
+        assert archive.listdir("implicit_subdir") == ["file3.txt"]
+        assert archive.listdir("empty_subdir") == []
+        assert sorted(archive.glob("*/file?.txt")) == [
+            "implicit_subdir/file3.txt",
+            "subdir/file2.txt",
+        ]
+        assert archive.glob("missing/*") == []
+
+        # Pruning dirnames stops the walk from descending.
+        dirpaths = []
+        for dirpath, dirnames, _ in archive.walk():
+            dirpaths.append(dirpath)
+            dirnames[:] = [d for d in dirnames if d != "subdir"]
+        assert "subdir" not in dirpaths
+        assert "implicit_subdir" in dirpaths
+
+        with pytest.raises(ArchiveMemberNotFoundError):
+            archive.stat("missing.txt")
+        with pytest.raises(ArchiveMemberNotFoundError):
+            archive.listdir("file1.txt")
+        with pytest.raises(ArchiveMemberNotFoundError):
+            list(archive.walk("missing"))
+
+
+@pytest.mark.parametrize(
+    "sample_archive",
+    filter_archives(SYMLINK_ARCHIVES, extensions=[".tar", ".zip"]),
+    ids=lambda a: a.filename,
+)
+def test_directory_queries_symlinks(
+    sample_archive: SampleArchive, sample_archive_path: str
+):
+    with open_archive(sample_archive_path) as archive:
+        link = archive.stat("subdir_link", follow_symlinks=False)
+        assert link.type == MemberType.SYMLINK
+        assert archive.stat("subdir_link") is archive.get_member("subdir/")
+        assert archive.stat("symlink_to_file1.txt") is archive.get_member("file1.txt")
+
+        root, dirnames, filenames = next(archive.walk())
+        assert root == ""
+        assert "subdir_link" in dirnames
+        assert "symlink_to_file1.txt" in filenames
+        # Symlinks to directories are not descended into.
+        walked = [dirpath for dirpath, _, _ in archive.walk()]
+        assert "subdir_link" not in walked
+
+
+def test_directory_queries_not_supported_in_streaming_mode():
+    sample_archive = filter_archives(BASIC_ARCHIVES, extensions=[".tar"])[0]
+    archive_path = sample_archive.get_archive_path()
+    with open_archive(archive_path, streaming_only=True) as archive:
+        with pytest.raises(ValueError):
+            archive.listdir()
+        with pytest.raises(ValueError):
+            archive.glob("*")
@@ -1,11 +1,15 @@
 import logging
 import os
+import time
 from datetime import datetime
 from pathlib import Path
+from typing import Literal
 
 import pytest
 
+from archivey.config import ArchiveyConfig, OverwriteMode
 from archivey.core import open_archive
+from archivey.internal.base_reader import BaseArchiveReader
 from archivey.internal.utils import (
     ensure_not_none,
     platform_supports_setting_symlink_mtime,
@@ -19,6 +23,7 @@ from tests.archivey.sample_archives import (
     SYMLINK_ARCHIVES,
     FileInfo,
     SampleArchive,
+    filter_archives,
 )
 from tests.archivey.testing_utils import remove_duplicate_files, skip_if_package_missing
 
@@ -59,8 +64,16 @@ def _check_file_metadata(path: Path, info: FileInfo, sample: SampleArchive):
     BASIC_ARCHIVES + DUPLICATE_FILES_ARCHIVES + SYMLINK_ARCHIVES + HARDLINK_ARCHIVES,
     ids=lambda x: x.filename,
 )
+@pytest.mark.parametrize(
+    "extractall_kwargs",
+    [{}, {"workers": 4}, {"workers": 2, "executor": "process"}],
+    ids=["sequential", "threads", "processes"],
+)
 def test_extractall(
-    tmp_path: Path, sample_archive: SampleArchive, sample_archive_path: str
+    tmp_path: Path,
+    sample_archive: SampleArchive,
+    sample_archive_path: str,
+    extractall_kwargs: dict,
 ):
     skip_if_package_missing(sample_archive.creation_info.format, None)
 
@@ -70,7 +83,7 @@ def test_extractall(
     logger.info(f"Extracting {sample_archive_path} to {dest}")
 
     with open_archive(sample_archive_path) as archive:
-        extractall_result = archive.extractall(dest)
+        extractall_result = archive.extractall(dest, **extractall_kwargs)
         members_by_filename = {
             m.filename: m for m in ensure_not_none(archive.get_members_if_available())
         }
@@ -191,3 +204,85 @@ def test_extractall_members(
         _check_file_metadata(p, info, sample_archive)
 
     assert not (dest / "implicit_subdir" / "file3.txt").exists()
+
+
+@pytest.mark.parametrize(
+    "sample_archive",
+    filter_archives(BASIC_ARCHIVES, extensions=[".zip", "/"]),
+    ids=lambda x: x.filename,
+)
+@pytest.mark.parametrize("executor", ["thread", "process"])
+def test_extractall_with_workers_keeps_overwrite_mode(
+    tmp_path: Path,
+    sample_archive: SampleArchive,
+    sample_archive_path: str,
+    executor: Literal["thread", "process"],
+    monkeypatch,
+):
+    dest = tmp_path / "out"
+    dest.mkdir()
+    (dest / "file1.txt").write_bytes(b"existing")
+
+    def _fail(*args, **kwargs):
+        raise AssertionError("files should be extracted concurrently")
+
+    monkeypatch.setattr(BaseArchiveReader, "_extract_pending_files", _fail)
+
+    config = ArchiveyConfig(overwrite_mode=OverwriteMode.SKIP)
+    with open_archive(sample_archive_path, config=config) as archive:
+        result = archive.extractall(dest, workers=2, executor=executor)
+
+    assert (dest / "file1.txt").read_bytes() == b"existing"
+    assert str(dest / "file1.txt") not in result
+    for info in sample_archive.contents.files:
+        if info.type == MemberType.FILE and info.name != "file1.txt":
+            assert (dest / info.name).read_bytes() == (info.contents or b"")
+            assert str(dest / info.name) in result
+
+
+@pytest.mark.parametrize(
+    "sample_archive",
+    filter_archives(BASIC_ARCHIVES, extensions=[".zip"]),
+    ids=lambda x: x.filename,
+)
+def test_extractall_with_workers_records_completed_files_on_error(
+    tmp_path: Path,
+    sample_archive: SampleArchive,
+    sample_archive_path: str,
+    monkeypatch,
+):
+    from archivey.internal import base_reader
+    from archivey.internal.extraction_helper import ExtractionHelper
+
+    dest = tmp_path / "out"
+    dest.mkdir()
+
+    original_write = base_reader.write_member_file
+
+    def _write_member_file(stream, path):
+        if path.endswith("file1.txt"):
+            raise ValueError("write failed")
+        # Still be writing the other files when the error is raised.
+        time.sleep(0.1)
+        original_write(stream, path)
+
+    finished: list[str] = []
+    original_finish = ExtractionHelper.finish_regular_file
+
+    def _finish_regular_file(self, member, path):
+        finished.append(member.filename)
+        original_finish(self, member, path)
+
+    monkeypatch.setattr(base_reader, "write_member_file", _write_member_file)
+    monkeypatch.setattr(ExtractionHelper, "finish_regular_file", _finish_regular_file)
+
+    with open_archive(sample_archive_path) as archive:
+        with pytest.raises(ValueError, match="write failed"):
+            archive.extractall(dest, workers=len(sample_archive.contents.files))
+
+    # Every file written before the error was raised has been recorded.
+    written = [
+        path.relative_to(dest).as_posix() for path in dest.rglob("*") if path.is_file()
+    ]
+    assert written
+    assert sorted(finished) == sorted(written)
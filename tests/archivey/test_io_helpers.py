@@ -1,22 +1,44 @@
+import gzip
 import io
+import os
+import random
 import tempfile
+import time
+import zipfile
+import zlib
 from pathlib import Path
 from unittest.mock import Mock
 
 import pytest
 
-from archivey.core import open_compressed_stream
-from archivey.formats.compressed_streams import get_stream_open_fn
+from archivey.config import ArchiveyConfig
+from archivey.core import open_archive, open_compressed_stream
+from archivey.exceptions import ArchiveCorruptedError
+from archivey.formats import compressed_streams
+from archivey.formats.compressed_streams import (
+    BrotliDecompressorStream,
+    GzipDecompressorStream,
+    KnownSizeStream,
+    LzipDecompressorStream,
+    ZlibDecompressorStream,
+    get_stream_open_fn,
+)
 from archivey.internal.archive_stream import ArchiveStream
 from archivey.internal.io_helpers import (
     BinaryIOWrapper,
     ConcatenationStream,
+    IOStats,
+    PositionalReader,
+    ReadAheadStream,
     RecordableStream,
+    SharedFileDescriptor,
     SlicingStream,
+    StatsIO,
     ensure_binaryio,
     ensure_bufferedio,
     is_stream,
     read_exact,
+    readinto_from,
 )
 from tests.archivey.sample_archives import ALTERNATIVE_CONFIG, SINGLE_FILE_ARCHIVES
 from tests.archivey.test_open_nonseekable import NonSeekableBytesIO
@@ -308,6 +330,83 @@ def test_lazy_open_closes_inner_stream():
         wrapper.read()
 
 
+class _FailingStream(io.BytesIO):
+    def read(self, size=-1):
+        raise zlib.error("bad data")
+
+
+def test_archive_stream_translates_errors_after_open():
+    wrapper = ArchiveStream(
+        lambda: _FailingStream(),
+        exception_translator=lambda e: (
+            ArchiveCorruptedError(str(e)) if isinstance(e, zlib.error) else None
+        ),
+        seekable=False,
+        lazy=False,
+        archive_path="archive.bin",
+        member_name="member",
+    )
+    for _ in range(2):
+        with pytest.raises(ArchiveCorruptedError) as exc_info:
+            wrapper.read(1)
+        assert exc_info.value.member_name == "member"
+        assert exc_info.value.archive_path == "archive.bin"
+
+
+def test_nested_archive_stream_is_collapsed():
+    inner = io.BytesIO(b"hello world")
+    nested = ArchiveStream(
+        lambda: inner,
+        exception_translator=lambda e: None,
+        seekable=True,
+        lazy=False,
+        archive_path=None,
+        member_name="<stream>",
+    )
+    wrapper = ArchiveStream(
+        lambda: nested,
+        exception_translator=lambda e: None,
+        seekable=True,
+        lazy=False,
+        archive_path="archive.bin",
+        member_name="member",
+    )
+    assert wrapper._inner is inner
+    assert wrapper.is_buffered()
+    assert wrapper.read(5) == b"hello"
+    buf = bytearray(3)
+    assert wrapper.readinto(buf) == 3
+    assert buf == b" wo"
+
+    wrapper.close()
+    assert nested.closed and inner.closed
+    with pytest.raises(ValueError):
+        wrapper.read()
+    with pytest.raises(ValueError):
+        wrapper.readinto(buf)
+
+
+def test_archive_stream_read_without_other_references():
+    # Closing the stream when it's freed must not happen during the read call, even
+    # if the caller doesn't keep a reference to it.
+    def open_stream() -> ArchiveStream:
+        return ArchiveStream(
+            lambda: io.BytesIO(b"data"),
+            exception_translator=lambda e: None,
+            seekable=True,
+            lazy=False,
+            archive_path=None,
+            member_name="member",
+        )
+
+    # Not inside the assert, as pytest keeps references to the intermediate values.
+    data = open_stream().read()
+    assert data == b"data"
+    buf = bytearray(4)
+    count = open_stream().readinto(buf)
+    assert count == 4
+
+
 DATA = b"0123456789abcdef"
 
 
@@ -357,6 +456,17 @@ class TestRecordableStream:
         assert stream.readinto(buf) == 5
         assert bytes(buf) == b"01234"
 
+    def test_readinto_records_data(self):
+        stream = create_stream()
+        buf = bytearray(4)
+        assert stream.readinto(buf) == 4
+        stream.seek(2)
+        buf = bytearray(10)
+        assert stream.readinto(buf) == 10
+        assert bytes(buf) == DATA[2:12]
+        assert stream.get_all_data() == DATA[:12]
+        assert stream.get_complete_stream().read() == DATA
+
     def test_properties_and_close(self):
         stream = create_stream()
         assert stream.readable() is True
@@ -423,6 +533,404 @@ def test_concatenation_stream_composition():
     assert second_stream.read() == b"foo789abcdef"
 
 
+def _readinto_all(stream, chunk_size: int) -> bytes:
+    result = bytearray()
+    buf = memoryview(bytearray(chunk_size))
+    while n := stream.readinto(buf):
+        result += buf[:n]
+    return bytes(result)
+
+
+def test_concatenation_stream_readinto():
+    stream = ConcatenationStream(
+        [io.BytesIO(b"abc"), OnlyReadStream(b""), OnlyReadStream(b"defgh")]
+    )
+    assert _readinto_all(stream, 3) == b"abcdefgh"
+
+
+def test_readinto_from_read_only_stream():
+    buf = bytearray(4)
+    assert readinto_from(OnlyReadStream(b"abcdef"), buf) == 4
+    assert buf == b"abcd"
+
+
+@pytest.mark.parametrize("chunk_size", [1, 1000, 1 << 20])
+def test_decompressor_stream_read_and_readinto(chunk_size: int):
+    data = b"".join(b"line %d\n" % i for i in range(100_000))
+    compressed = zlib.compress(data)
+
+    stream = ZlibDecompressorStream(io.BytesIO(compressed))
+    assert _readinto_all(stream, chunk_size) == data
+    assert stream.tell() == len(data)
+
+    stream = ZlibDecompressorStream(io.BytesIO(compressed))
+    chunks = []
+    while chunk := stream.read(chunk_size):
+        chunks.append(chunk)
+    assert b"".join(chunks) == data
+
+    # Mix read(), readinto(), seeks and readall().
+    stream.seek(10)
+    assert stream.read(5) == data[10:15]
+    buf = bytearray(7)
+    assert stream.readinto(buf) == 7
+    assert buf == data[15:22]
+    stream.seek(200_000)
+    assert stream.read() == data[200_000:]
+    stream.seek(-5, io.SEEK_END)
+    assert stream.read() == data[-5:]
+
+
+@pytest.mark.parametrize(
+    "stream_class,compress",
+    [
+        (ZlibDecompressorStream, zlib.compress),
+        (GzipDecompressorStream, gzip.compress),
+    ],
+    ids=["zlib", "gzip"],
+)
+def test_decompressor_stream_read_across_chunks(stream_class, compress):
+    # Incompressible data, so that each input chunk decompresses to about 64 KiB.
+    data = random.Random(0).randbytes(1_000_000)
+    stream = stream_class(io.BytesIO(compress(data)))
+    # Each large read starts inside a decompressed chunk, and needs several more.
+    for pos in (0, 100_000, 500_000):
+        stream.seek(pos)
+        assert stream.read(100) == data[pos : pos + 100]
+        assert stream.read(200_000) == data[pos + 100 : pos + 200_100]
+    stream.seek(len(data) - 1000)
+    assert stream.read(200_000) == data[-1000:]
+    assert stream.read(200_000) == b""
+
+
+def _compress_brotli(data: bytes) -> bytes:
+    return pytest.importorskip("brotli").compress(data)
+
+
+def _compress_lzip(data: bytes) -> bytes:
+    return pytest.importorskip("lzip").compress_to_buffer(data)
+
+
+@pytest.mark.parametrize(
+    "stream_class,compress,max_buffer",
+    [
+        # At least 64 KiB are decompressed at a time.
+        (ZlibDecompressorStream, zlib.compress, 70_000),
+        (
+            GzipDecompressorStream,
+            lambda d: gzip.compress(d[:5_000_000]) + gzip.compress(d[5_000_000:]),
+            70_000,
+        ),
+        # brotli returns its output in blocks of 32 KiB.
+        (BrotliDecompressorStream, _compress_brotli, 140_000),
+        # lzip_extension can't limit its output, only the input fed to it.
+        (LzipDecompressorStream, _compress_lzip, 16 * 1024 * 1024),
+    ],
+    ids=["zlib", "gzip", "brotli", "lzip"],
+)
+def test_decompressor_stream_bounded_output(stream_class, compress, max_buffer):
+    # Highly compressible data, so that each input chunk expands a lot.
+    data = bytes(10_000_000) + b"end" + bytes(10_000_000)
+    stream = stream_class(io.BytesIO(compress(data)))
+    largest_buffer = 0
+    chunks = []
+    while chunk := stream.read(4096):
+        largest_buffer = max(largest_buffer, len(stream._buffer))
+        chunks.append(chunk)
+    assert b"".join(chunks) == data
+    assert largest_buffer <= max_buffer
+
+    buf = bytearray(1000)
+    stream.seek(10_000_000)
+    assert stream.readinto(buf) == 1000
+    assert buf[:3] == b"end"
+    # Seeks decompress up to 1 MiB at a time.
+    assert len(stream._buffer) <= max(max_buffer, 4 * 1024 * 1024)
+
+
+@pytest.mark.parametrize(
+    "stream_class,compress",
+    [
+        (ZlibDecompressorStream, zlib.compress),
+        # Two members, with zero padding between them.
+        (
+            GzipDecompressorStream,
+            lambda d: (
+                gzip.compress(d[:300_000]) + b"\0" * 10 + gzip.compress(d[300_000:])
+            ),
+        ),
+    ],
+    ids=["zlib", "gzip"],
+)
+def test_decompressor_stream_checkpoints(stream_class, compress):
+    data = random.Random(0).randbytes(1_000_000)
+    data = b"".join(data[i : i + 500] * 4 for i in range(0, len(data), 2000))
+    stats = IOStats()
+    stream = stream_class(
+        StatsIO(io.BytesIO(compress(data)), stats), checkpoint_interval=100_000
+    )
+    assert stream.read() == data
+    # Checkpoints are taken between input chunks, after at least 100_000 bytes.
+    assert len(stream._checkpoints) >= 3
+
+    # Seeking backwards resumes from the nearest checkpoint.
+    positions = random.Random(1).sample(range(len(data)), 20)
+    for pos in positions:
+        stream.seek(pos)
+        assert stream.read(1000) == data[pos : pos + 1000]
+
+    stats.bytes_read = 0
+    stream.seek(len(data) - 1000)
+    stream.seek(len(data) - 200_000)
+    assert stream.read(10) == data[-200_000:-199_990]
+    assert stats.bytes_read < len(compress(data)) // 2
+
+    stream.seek(-5, io.SEEK_END)
+    assert stream.read() == data[-5:]
+
+
+def test_decompressor_stream_checkpoints_are_capped(monkeypatch):
+    monkeypatch.setattr(compressed_streams, "_MAX_CHECKPOINTS", 8)
+    data = random.Random(0).randbytes(2_000_000)
+    stream = ZlibDecompressorStream(
+        io.BytesIO(zlib.compress(data)), checkpoint_interval=65536
+    )
+    assert stream.read() == data
+    # Every other checkpoint is dropped and the interval doubled when the limit is
+    # reached, so the remaining ones still cover the whole stream.
+    positions = [checkpoint[0] for checkpoint in stream._checkpoints]
+    assert len(positions) <= 8
+    assert positions[-1] > len(data) // 2
+    assert stream._checkpoint_interval > 65536
+
+    for pos in random.Random(1).sample(range(len(data)), 10):
+        stream.seek(pos)
+        assert stream.read(1000) == data[pos : pos + 1000]
+
+
+def test_zip_deflated_member_checkpoints(tmp_path: Path):
+    data = b"".join(b"line %d\n" % i for i in range(300_000))
+    path = tmp_path / "archive.zip"
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr("big.txt", data)
+        zf.writestr("small.txt", data[:1000])
+
+    config = ArchiveyConfig(decompression_checkpoint_interval=100_000)
+    with open_archive(path, config=config) as archive:
+        with archive.open("big.txt") as stream:
+            assert stream.read() == data
+            stream.seek(1_500_000)
+            assert stream.read(100) == data[1_500_000:1_500_100]
+            stream.seek(12)
+            assert stream.read(100) == data[12:112]
+        assert archive.open("small.txt").read() == data[:1000]
+
+    # Corrupt the CRC of the first central directory entry.
+    with zipfile.ZipFile(path) as zf:
+        central_dir_offset = zf.start_dir  # type: ignore[attr-defined]
+    contents = bytearray(path.read_bytes())
+    contents[central_dir_offset + 16] ^= 0xFF
+    path.write_bytes(contents)
+    with open_archive(path, config=config) as archive:
+        with pytest.raises(ArchiveCorruptedError):
+            archive.open("big.txt").read()
+
+
+def test_known_size_stream_seeks_lazily():
+    data = b"".join(b"line %d\n" % i for i in range(100_000))
+    stats = IOStats()
+    stream = KnownSizeStream(
+        GzipDecompressorStream(StatsIO(io.BytesIO(gzip.compress(data)), stats)),
+        len(data),
+    )
+    assert stream.seek(0, io.SEEK_END) == len(data)
+    assert stream.tell() == len(data)
+    assert stream.seek(-10, io.SEEK_CUR) == len(data) - 10
+    assert stream.seek(0) == 0
+    assert stats.bytes_read == 0
+
+    stream.seek(500_000)
+    assert stream.read(10) == data[500_000:500_010]
+    buf = bytearray(10)
+    assert stream.readinto(buf) == 10
+    assert buf == data[500_010:500_020]
+    stream.seek(-5, io.SEEK_END)
+    assert stream.read() == data[-5:]
+
+
+@pytest.mark.parametrize(
+    "compressed,size,exact",
+    [
+        (gzip.compress(b"hello " * 1000), 6000, True),
+        # Too large to be sure that the size is below 4 GiB, but still reported.
+        (gzip.compress(random.Random(0).randbytes(5_000_000)), 5_000_000, False),
+        # The trailer only has the size of the last member.
+        (gzip.compress(b"hello " * 1000) + gzip.compress(b"world"), None, False),
+    ],
+    ids=["single_member", "large_single_member", "multiple_members"],
+)
+def test_gzip_size_from_trailer(compressed: bytes, size: int | None, exact: bool):
+    stats = IOStats()
+    with open_archive(StatsIO(io.BytesIO(compressed), stats)) as archive:
+        member = archive.get_members()[0]
+        assert member.file_size == size
+        with archive.open(member) as stream:
+            stats.bytes_read = 0
+            end = stream.seek(0, io.SEEK_END)
+            stream.seek(0)
+            assert end == len(gzip.decompress(compressed))
+            # Only an exact size is used to seek from the end.
+            assert (stats.bytes_read == 0) == exact
+            assert len(stream.read()) == end
+
+
+def _compress_zstd_frames(data: bytes) -> bytes:
+    pyzstd = pytest.importorskip("pyzstd")
+    return b"".join(
+        pyzstd.compress(data[i : i + 1000]) for i in range(0, len(data), 1000)
+    )
+
+
+def _compress_lz4_frames(data: bytes) -> bytes:
+    lz4_frame = pytest.importorskip("lz4.frame")
+    return b"".join(
+        lz4_frame.compress(data[i : i + 1000], store_size=True)
+        for i in range(0, len(data), 1000)
+    )
+
+
+@pytest.mark.parametrize(
+    "suffix,compress,size_on_open",
+    [
+        # More data than is scanned for other members when opening the file.
+        (".gz", gzip.compress, 1_000_000),
+        # More frames than are walked when opening the file.
+        (".zst", _compress_zstd_frames, None),
+        (".lz4", _compress_lz4_frames, None),
+    ],
+    ids=["gzip", "zstd", "lz4"],
+)
+def test_size_found_when_seeking_from_end(
+    tmp_path: Path, suffix: str, compress, size_on_open: int | None
+):
+    data = random.Random(0).randbytes(1_000_000)
+    path = tmp_path / f"data{suffix}"
+    path.write_bytes(compress(data))
+
+    with open_archive(path) as archive:
+        assert archive.get_members()[0].file_size == size_on_open
+        stream = archive.fileobj
+        assert isinstance(stream, KnownSizeStream)
+        assert stream.seek(0, io.SEEK_END) == len(data)
+        # The rest of the metadata was read, without decompressing anything.
+        assert stream._inner.tell() == 0
+        stream.seek(0)
+        assert stream.read() == data
+
+
+class _CountingStream(io.BytesIO):
+    """A BytesIO that can be made to block or fail after some bytes have been read."""
+
+    def __init__(self, data: bytes, fail_at: int | None = None):
+        super().__init__(data)
+        self.fail_at = fail_at
+
+    def read(self, n: int | None = -1) -> bytes:
+        if self.fail_at is not None and self.tell() >= self.fail_at:
+            raise EOFError("Compressed file ended before the end-of-stream marker")
+        if self.fail_at is not None and n is not None and n >= 0:
+            n = min(n, self.fail_at - self.tell())
+        return super().read(n)
+
+
+@pytest.mark.parametrize("read_size", [1, 1000, 65536, 100_000, -1])
+def test_read_ahead_stream_read(read_size: int):
+    data = random.Random(0).randbytes(300_000)
+    with ReadAheadStream(io.BytesIO(data), max_buffered=50_000, chunk_size=8192) as s:
+        assert not s.seekable()
+        out = bytearray()
+        while chunk := s.read(read_size):
+            if read_size > 0:
+                assert len(chunk) == read_size or len(out) + len(chunk) == len(data)
+            out += chunk
+            assert s.tell() == len(out)
+        assert bytes(out) == data
+        assert s.read(10) == b""
+
+
+def test_read_ahead_stream_read1_and_readinto():
+    data = random.Random(0).randbytes(100_000)
+    with ReadAheadStream(io.BytesIO(data), max_buffered=50_000, chunk_size=8192) as s:
+        first = s.read1(100_000)
+        assert 0 < len(first) <= 100_000
+        assert _readinto_all(s, 777) == data[len(first) :]
+
+
+def test_read_ahead_stream_limits_buffered_data():
+    data = bytes(1_000_000)
+    inner = io.BytesIO(data)
+    with ReadAheadStream(inner, max_buffered=100_000, chunk_size=10_000) as s:
+        consumed = 0
+        for _ in range(20):
+            time.sleep(0.01)
+            # The thread can read one more chunk after reaching the limit.
+            assert inner.tell() <= consumed + 100_000 + 10_000
+            consumed += len(s.read(25_000))
+
+
+def test_read_ahead_stream_raises_error_after_data():
+    data = random.Random(0).randbytes(100_000)
+    inner = _CountingStream(data, fail_at=30_000)
+    with ReadAheadStream(inner, max_buffered=1_000_000, chunk_size=8192) as s:
+        assert s.read(20_000) == data[:20_000]
+        with pytest.raises(EOFError):
+            s.read(50_000)
+        assert s.read1(50_000) == data[20_000:30_000]
+        with pytest.raises(EOFError):
+            s.read(10)
+
+
+def test_read_ahead_stream_close_while_buffer_full():
+    inner = io.BytesIO(bytes(1_000_000))
+    s = ReadAheadStream(inner, max_buffered=10_000, chunk_size=1000)
+    assert s.read(10) == bytes(10)
+    s.close()
+    assert inner.closed
+    assert not s._thread.is_alive()
+    with pytest.raises(ValueError):
+        s.read()
+
+
+def test_positional_reader_readinto(tmp_path: Path):
+    path = tmp_path / "data.bin"
+    path.write_bytes(b"0123456789")
+    with open(path, "rb") as f:
+        reader = PositionalReader(f.fileno(), start=2, length=5)
+        buf = bytearray(3)
+        assert reader.readinto(buf) == 3
+        assert buf == b"234"
+        assert reader.readinto(buf) == 2
+        assert buf[:2] == b"56"
+        assert reader.readinto(buf) == 0
+
+
+def test_positional_reader_keeps_shared_descriptor_open(tmp_path):
+    path = tmp_path / "data.bin"
+    path.write_bytes(b"0123456789")
+    with open(path, "rb") as f:
+        shared_fd = SharedFileDescriptor(f.fileno())
+    reader = PositionalReader(shared_fd, start=2, length=5)
+    shared_fd.release()
+
+    assert reader.read() == b"23456"
+    reader.close()
+    reader.close()
+    with pytest.raises(OSError):
+        os.fstat(shared_fd.fd)
+    with pytest.raises(ValueError):
+        PositionalReader(shared_fd)
+
+
 class OnlyReadStream:
     def __init__(self, data: bytes):
         self._inner = io.BytesIO(data)
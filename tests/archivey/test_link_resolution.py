@@ -0,0 +1,71 @@
+import pytest
+
+from archivey.core import open_archive
+from archivey.internal.base_reader import BaseArchiveReader
+from archivey.types import MemberType
+from tests.archivey.sample_archives import (
+    HARDLINK_ARCHIVES,
+    SYMLINK_ARCHIVES,
+    SYMLINK_LOOP_ARCHIVES,
+    SampleArchive,
+    filter_archives,
+)
+from tests.archivey.testing_utils import skip_if_package_missing
+
+LINK_ARCHIVES = filter_archives(
+    HARDLINK_ARCHIVES + SYMLINK_ARCHIVES + SYMLINK_LOOP_ARCHIVES,
+    extensions=[".tar", ".tar.gz", ".zip", "/"],
+)
+
+
+@pytest.mark.parametrize("sample_archive", LINK_ARCHIVES, ids=lambda a: a.filename)
+def test_link_targets_resolved_once(
+    sample_archive: SampleArchive, sample_archive_path: str, monkeypatch
+):
+    skip_if_package_missing(sample_archive.creation_info.format, None)
+
+    calls = []
+    original = BaseArchiveReader._get_direct_link_target
+
+    def _counting_get_direct_link_target(self, member):
+        calls.append(member.member_id)
+        return original(self, member)
+
+    monkeypatch.setattr(
+        BaseArchiveReader, "_get_direct_link_target", _counting_get_direct_link_target
+    )
+
+    with open_archive(sample_archive_path) as archive:
+        links = [m for m in archive.get_members() if m.is_link]
+        assert links
+
+        # Following each chain separately gives the same results.
+        expected = [archive._resolve_link_chain(m, None) for m in links]
+        calls.clear()
+
+        assert [archive.resolve_link(m) for m in links] == expected
+        # Each link was followed at most once.
+        assert len(calls) == len(set(calls)) <= len(links)
+
+        calls.clear()
+        assert [archive.resolve_link(m) for m in links] == expected
+        assert calls == []
+
+
+@pytest.mark.parametrize(
+    "sample_archive",
+    filter_archives(SYMLINK_ARCHIVES, extensions=[".tar"]),
+    ids=lambda a: a.filename,
+)
+def test_resolve_link_of_edited_member(
+    sample_archive: SampleArchive, sample_archive_path: str
+):
+    with open_archive(sample_archive_path) as archive:
+        link = archive.get_member("symlink_to_file1.txt")
+        assert archive.resolve_link(link) is archive.get_member("file1.txt")
+
+        # A filter may change the link target of a copy of the member.
+        edited = link.replace(link_target="subdir")
+        target = archive.resolve_link(edited)
+        assert target is not None and target.type == MemberType.DIR
+        assert archive.resolve_link(link) is archive.get_member("file1.txt")
@@ -0,0 +1,175 @@
+import os
+import shutil
+
+import pytest
+
+from archivey.config import ArchiveyConfig
+from archivey.core import open_archive
+from archivey.internal.index_cache import get_index_path
+from archivey.types import ContainerFormat, MemberType
+from tests.archivey.sample_archives import (
+    BASIC_ARCHIVES,
+    HARDLINK_ARCHIVES,
+    SYMLINK_ARCHIVES,
+    SampleArchive,
+    filter_archives,
+)
+from tests.archivey.testing_utils import skip_if_package_missing
+
+INDEXED_ARCHIVES = filter_archives(
+    BASIC_ARCHIVES + SYMLINK_ARCHIVES + HARDLINK_ARCHIVES,
+    custom_filter=lambda a: (
+        a.creation_info.format.container
+        in (
+            ContainerFormat.TAR,
+            ContainerFormat.ZIP,
+            ContainerFormat.RAR,
+            ContainerFormat.SEVENZIP,
+        )
+    ),
+)
+
+
+def _member_summary(archive) -> list[tuple]:
+    summary = []
+    for member in archive.get_members():
+        data = None
+        if member.is_file or (
+            member.is_link
+            and (target := archive.resolve_link(member)) is not None
+            and target.is_file
+        ):
+            with archive.open(member) as f:
+                data = f.read()
+        summary.append(
+            (
+                member.filename,
+                member.type,
+                member.file_size,
+                member.mtime_with_tz,
+                member.mode,
+                member.link_target,
+                member.extra,
+                data,
+            )
+        )
+    return summary
+
+
+@pytest.mark.parametrize("sample_archive", INDEXED_ARCHIVES, ids=lambda a: a.filename)
+def test_member_index_restores_members(
+    sample_archive: SampleArchive, sample_archive_path: str, tmp_path, monkeypatch
+):
+    skip_if_package_missing(sample_archive.creation_info.format, None)
+
+    archive_path = str(tmp_path / os.path.basename(sample_archive_path))
+    shutil.copy2(sample_archive_path, archive_path)
+    index_dir = str(tmp_path / "index")
+    config = ArchiveyConfig(member_index_dir=index_dir)
+
+    with open_archive(archive_path, config=config) as archive:
+        expected = _member_summary(archive)
+
+    assert os.path.exists(get_index_path(index_dir, archive_path, "members"))
+
+    def _fail(self):
+        raise AssertionError("The archive should not be rescanned")
+
+    with monkeypatch.context() as m:
+        for cls in type(archive).__mro__:
+            if "iter_members_for_registration" in cls.__dict__:
+                m.setattr(cls, "iter_members_for_registration", _fail)
+
+        with open_archive(archive_path, config=config) as archive:
+            assert _member_summary(archive) == expected
+
+
+@pytest.mark.parametrize(
+    "sample_archive",
+    filter_archives(BASIC_ARCHIVES, extensions=[".tar", ".tar.gz", ".zip"]),
+    ids=lambda a: a.filename,
+)
+def test_member_index_invalidated_when_archive_changes(
+    sample_archive: SampleArchive, sample_archive_path: str, tmp_path, monkeypatch
+):
+    archive_path = str(tmp_path / os.path.basename(sample_archive_path))
+    shutil.copy2(sample_archive_path, archive_path)
+    index_dir = str(tmp_path / "index")
+    config = ArchiveyConfig(member_index_dir=index_dir)
+
+    scans = []
+    with open_archive(archive_path, config=config) as archive:
+        reader_class = type(archive)
+        original = reader_class.iter_members_for_registration
+
+        def _counting_iter(self):
+            scans.append(self.path_str)
+            return original(self)
+
+        monkeypatch.setattr(
+            reader_class, "iter_members_for_registration", _counting_iter
+        )
+        members = [m.filename for m in archive.get_members()]
+
+    with open_archive(archive_path, config=config) as archive:
+        assert [m.filename for m in archive.get_members()] == members
+    assert len(scans) == 1
+
+    # Same contents, but a different modification time.
+    st = os.stat(archive_path)
+    os.utime(archive_path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+    with open_archive(archive_path, config=config) as archive:
+        assert [m.filename for m in archive.get_members()] == members
+    assert len(scans) == 2
+
+    # The index was rewritten for the new version of the file.
+    with open_archive(archive_path, config=config) as archive:
+        assert [m.filename for m in archive.get_members()] == members
+    assert len(scans) == 2
+
+
+@pytest.mark.parametrize(
+    "sample_archive",
+    filter_archives(BASIC_ARCHIVES, extensions=[".tar.gz"]),
+    ids=lambda a: a.filename,
+)
+def test_member_index_not_used_in_streaming_mode(
+    sample_archive: SampleArchive, sample_archive_path: str, tmp_path, monkeypatch
+):
+    archive_path = str(tmp_path / os.path.basename(sample_archive_path))
+    shutil.copy2(sample_archive_path, archive_path)
+    index_dir = str(tmp_path / "index")
+    config = ArchiveyConfig(member_index_dir=index_dir)
+    expected = [f.name for f in sample_archive.contents.files]
+
+    def _streamed_names() -> list[str]:
+        names = []
+        with open_archive(archive_path, config=config, streaming_only=True) as archive:
+            for member, stream in archive.iter_members_with_streams():
+                names.append(member.filename)
+                if member.type == MemberType.FILE:
+                    assert stream is not None
+                    stream.read()
+        return names
+
+    # Streaming reads don't write an index.
+    assert sorted(_streamed_names()) == sorted(expected)
+    assert not os.path.exists(index_dir)
+
+    # Nor do they use an existing one: the archive is still scanned.
+    with open_archive(archive_path, config=config) as archive:
+        archive.get_members()
+    assert os.path.exists(get_index_path(index_dir, archive_path, "members"))
+
+    scans = []
+    reader_class = type(archive)
+    original = reader_class.iter_members_for_registration
+
+    def _counting_iter(self):
+        scans.append(self.path_str)
+        return original(self)
+
+    monkeypatch.setattr(reader_class, "iter_members_for_registration", _counting_iter)
+    assert sorted(_streamed_names()) == sorted(expected)
+    assert scans == [archive_path]
@@ -0,0 +1,153 @@
+import pytest
+
+from archivey.core import open_archive
+from archivey.formats.tar_reader import TarReader
+from archivey.formats.zip_reader import ZipReader
+from archivey.selection import MemberSelection
+from archivey.types import ArchiveMember, MemberType
+from tests.archivey.sample_archives import (
+    BASIC_ARCHIVES,
+    SampleArchive,
+    filter_archives,
+)
+from tests.archivey.testing_utils import skip_if_package_missing
+
+
+def _member(filename: str, size: int | None = 0, type=MemberType.FILE):
+    return ArchiveMember(
+        filename=filename,
+        file_size=size,
+        compress_size=None,
+        mtime_with_tz=None,
+        type=type,
+    )
+
+
+def test_member_selection_names():
+    selection = MemberSelection(names=["a.txt", "dir/"])
+    assert selection(_member("a.txt"))
+    assert selection(_member("dir/", type=MemberType.DIR))
+    assert not selection(_member("b.txt"))
+    assert not selection(_member("dir/a.txt"))
+    assert not MemberSelection(names=[])(_member("a.txt"))
+    assert MemberSelection()(_member("a.txt"))
+
+
+def test_member_selection_patterns():
+    selection = MemberSelection(patterns=["*.txt", "logs/**/*.json"])
+    assert selection(_member("a.txt"))
+    assert not selection(_member("dir/a.txt"))
+    assert selection(_member("logs/a.json"))
+    assert selection(_member("logs/2026/01/a.json"))
+    assert selection(_member("./logs/2026/a.json"))
+    assert not selection(_member("logs/2026/a.txt"))
+    assert not selection(_member("other/logs/a.json"))
+
+
+def test_member_selection_prefixes():
+    selection = MemberSelection(prefixes=["logs/2026/"])
+    assert selection(_member("logs/2026/", type=MemberType.DIR))
+    assert selection(_member("logs/2026/01/a.json"))
+    assert not selection(_member("logs/2025/a.json"))
+    assert not selection(_member("logs/20261/a.json"))
+
+
+def test_member_selection_size_and_type():
+    selection = MemberSelection(
+        patterns=["*"], min_size=2, max_size=10, types=[MemberType.FILE]
+    )
+    assert selection(_member("a", 2))
+    assert selection(_member("a", 10))
+    assert selection(_member("a", None))
+    assert not selection(_member("a", 1))
+    assert not selection(_member("a", 11))
+    assert not selection(_member("a/", 5, type=MemberType.DIR))
+
+    # Unknown properties are not checked.
+    assert selection.matches_entry("a")
+
+
+SELECTION = MemberSelection(patterns=["**/file?.txt"], prefixes=["empty_subdir"])
+EXPECTED = {"file1.txt", "subdir/file2.txt", "implicit_subdir/file3.txt"}
+
+
+@pytest.mark.parametrize(
+    "sample_archive",
+    filter_archives(BASIC_ARCHIVES),
+    ids=lambda a: a.filename,
+)
+@pytest.mark.parametrize("streaming_only", [False, True])
+def test_iter_members_with_selection(
+    sample_archive: SampleArchive, sample_archive_path: str, streaming_only: bool
+):
+    skip_if_package_missing(sample_archive.creation_info.format, None)
+    expected = {
+        f.name
+        for f in sample_archive.contents.files
+        if f.name in EXPECTED
+        or (
+            f.name.startswith("empty_subdir/")
+            and sample_archive.creation_info.features.dir_entries
+        )
+    }
+
+    with open_archive(sample_archive_path, streaming_only=streaming_only) as archive:
+        selected = {}
+        for member, stream in archive.iter_members_with_streams(SELECTION):
+            selected[member.filename] = stream.read() if stream is not None else None
+
+    assert selected.keys() == expected
+    contents = {f.name: f.contents for f in sample_archive.contents.files}
+    for name in EXPECTED:
+        assert selected[name] == contents[name]
+
+
+@pytest.mark.parametrize(
+    ("sample_archive", "reader_class", "convert_method"),
+    [
+        (
+            filter_archives(BASIC_ARCHIVES, extensions=[".tar.gz"])[0],
+            TarReader,
+            "_tarinfo_to_archive_member",
+        ),
+        (
+            filter_archives(BASIC_ARCHIVES, extensions=[".zip"])[0],
+            ZipReader,
+            "_zipinfo_to_archive_member",
+        ),
+    ],
+    ids=["tar", "zip"],
+)
+def test_selection_pushed_down_in_streaming_mode(
+    sample_archive: SampleArchive,
+    sample_archive_path: str,
+    reader_class: type,
+    convert_method: str,
+    monkeypatch,
+):
+    converted = []
+    original = getattr(reader_class, convert_method)
+
+    def _counting_convert(self, info):
+        member = original(self, info)
+        converted.append(member.filename)
+        return member
+
+    monkeypatch.setattr(reader_class, convert_method, _counting_convert)
+
+    selection = MemberSelection(names=["subdir/file2.txt"])
+    with open_archive(sample_archive_path, streaming_only=True) as archive:
+        selected = [m.filename for m, _ in archive.iter_members_with_streams(selection)]
+        assert archive.get_members_if_available() is None
+
+    assert selected == ["subdir/file2.txt"]
+    # Only the selected file and the non-file members are converted.
+    assert set(converted) == {"subdir/file2.txt", "subdir/", "empty_subdir/"}
+
+    # In random access mode, all members are still registered.
+    converted.clear()
+    with open_archive(sample_archive_path) as archive:
+        selected = [m.filename for m, _ in archive.iter_members_with_streams(selection)]
+        assert len(archive.get_members()) == len(sample_archive.contents.files)
+    assert selected == ["subdir/file2.txt"]
+    assert len(converted) == len(sample_archive.contents.files)
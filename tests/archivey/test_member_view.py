@@ -0,0 +1,65 @@
+import mmap
+import zipfile
+
+import pytest
+
+from archivey.core import open_archive
+from archivey.types import MemberType
+from tests.archivey.sample_archives import (
+    BASIC_ARCHIVES,
+    LARGE_ARCHIVES,
+    SYMLINK_ARCHIVES,
+    SampleArchive,
+    filter_archives,
+)
+from tests.archivey.testing_utils import skip_if_package_missing
+
+
+@pytest.mark.parametrize(
+    "sample_archive",
+    filter_archives(
+        BASIC_ARCHIVES + LARGE_ARCHIVES + SYMLINK_ARCHIVES,
+        extensions=[".zip", ".tar", ".tar.gz", ".7z", "/"],
+    ),
+    ids=lambda a: a.filename,
+)
+def test_member_view_matches_contents(
+    sample_archive: SampleArchive, sample_archive_path: str
+):
+    skip_if_package_missing(sample_archive.creation_info.format, None)
+    with open_archive(sample_archive_path) as archive:
+        for file in sample_archive.contents.files:
+            if file.type == MemberType.DIR:
+                continue
+            if file.type == MemberType.SYMLINK:
+                target = archive.resolve_link(archive.get_member(file.name))
+                if target is None or not target.is_file:
+                    continue
+                with archive.open(file.name) as stream:
+                    expected = stream.read()
+            else:
+                expected = file.contents or b""
+
+            view = archive.read_member_view(file.name)
+            assert view.readonly
+            assert view.tobytes() == expected
+
+
+def test_stored_zip_member_view_is_mapped(tmp_path):
+    path = str(tmp_path / "archive.zip")
+    data = bytes(range(256)) * 1000
+    with zipfile.ZipFile(path, "w") as zf:
+        zf.writestr("stored.bin", data, compress_type=zipfile.ZIP_STORED)
+        zf.writestr("deflated.bin", data, compress_type=zipfile.ZIP_DEFLATED)
+        zf.writestr("empty.bin", b"", compress_type=zipfile.ZIP_STORED)
+
+    with open_archive(path) as archive:
+        stored = archive.read_member_view("stored.bin")
+        deflated = archive.read_member_view("deflated.bin")
+        assert isinstance(stored.obj, mmap.mmap)
+        assert not isinstance(deflated.obj, mmap.mmap)
+        assert stored == deflated == data
+        assert archive.read_member_view("empty.bin") == b""
+
+    # The view outlives the archive.
+    assert stored[:256] == bytes(range(256))
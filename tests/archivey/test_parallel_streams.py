@@ -0,0 +1,709 @@
+import bz2
+import gzip
+import io
+import lzma
+import random
+import shutil
+import subprocess
+
+import pytest
+
+from archivey.config import ArchiveyConfig
+from archivey.core import open_archive, open_compressed_stream
+from archivey.exceptions import ArchiveCorruptedError, ArchiveEOFError
+from archivey.formats import parallel_streams
+from archivey.formats.lz4_frames import read_lz4_frames
+from archivey.formats.lzip_index import read_lzip_index
+from archivey.formats.parallel_streams import (
+    Bzip2Block,
+    Bzip2BlockSplitter,
+    GzipMemberSplitter,
+    ParallelBzip2DecompressorStream,
+    ParallelGzipDecompressorStream,
+    ParallelLz4DecompressorStream,
+    ParallelLzipDecompressorStream,
+    ParallelXzDecompressorStream,
+    ParallelZstdDecompressorStream,
+    decode_bzip2_block,
+    decode_gzip_members,
+    open_parallel_lz4_stream,
+    open_parallel_lzip_stream,
+    open_parallel_xz_stream,
+    open_parallel_zstd_stream,
+)
+from archivey.formats.xz_index import read_xz_index
+from archivey.formats.zstd_frames import read_zstd_frames, read_zstd_seek_table
+from archivey.internal.io_helpers import IOStats, StatsIO
+from archivey.types import MemberType
+from tests.archivey.sample_archives import (
+    BASIC_ARCHIVES,
+    SINGLE_FILE_ARCHIVES,
+    SampleArchive,
+    filter_archives,
+)
+from tests.archivey.test_open_nonseekable import NonSeekableBytesIO
+from tests.archivey.testing_utils import skip_if_package_missing
+
+
+def _text(size: int, seed: int = 0) -> bytes:
+    """Compressible data that still takes several bzip2 blocks at level 1."""
+    rng = random.Random(seed)
+    words = [
+        bytes(rng.choice(b"abcdefghij") for _ in range(rng.randint(1, 8)))
+        for _ in range(2000)
+    ]
+    data = b" ".join(rng.choice(words) for _ in range(size // 5))
+    return data[:size]
+
+
+DATA = _text(1_500_000)
+
+
+def _read_in_chunks(stream, size: int) -> bytes:
+    chunks = []
+    while chunk := stream.read(size):
+        chunks.append(chunk)
+    return b"".join(chunks)
+
+
+@pytest.mark.parametrize("threads", [1, 4])
+def test_parallel_bzip2_multiple_blocks_and_streams(threads: int):
+    half = len(DATA) // 2
+    # An empty stream and streams with different block sizes, followed by data that
+    # is not a bzip2 stream and is ignored like in the bz2 module.
+    compressed = (
+        bz2.compress(DATA[:half], 1)
+        + bz2.compress(b"", 5)
+        + bz2.compress(DATA[half:], 2)
+        + b"trailing data"
+    )
+    with bz2.open(io.BytesIO(compressed)) as f:
+        assert f.read() == DATA
+
+    stream = ParallelBzip2DecompressorStream(io.BytesIO(compressed), threads)
+    assert _read_in_chunks(stream, 10_000) == DATA
+
+    stream.seek(half - 5)
+    assert stream.read(10) == DATA[half - 5 : half + 5]
+    stream.seek(100)
+    assert stream.read(100) == DATA[100:200]
+    stream.seek(-3, io.SEEK_END)
+    assert stream.read() == DATA[-3:]
+    stream.close()
+
+
+def test_parallel_bzip2_splitter_finds_all_blocks():
+    compressed = bz2.compress(DATA, 1)
+    splitter = Bzip2BlockSplitter()
+    blocks = []
+    for i in range(0, len(compressed), 1000):
+        blocks += splitter.feed(compressed[i : i + 1000])
+    blocks += splitter.finish()
+    assert splitter.finished
+
+    # Each block holds at most 100k of data at level 1.
+    assert len(blocks) >= len(DATA) // 100_000
+    assert b"".join(decode_bzip2_block(block) for block in blocks) == DATA
+
+
+def _split_block(block: Bzip2Block, bits: int) -> tuple[Bzip2Block, Bzip2Block]:
+    end_bit = block.start_bit + bits
+    first = Bzip2Block(
+        block.data[: (end_bit + 7) // 8],
+        block.offset,
+        block.start_bit,
+        bits,
+        block.level,
+    )
+    second = Bzip2Block(
+        block.data[end_bit // 8 :],
+        block.offset + end_bit // 8,
+        end_bit % 8,
+        block.size_bits - bits,
+        block.level,
+    )
+    return first, second
+
+
+class _FalseMagicSplitter(Bzip2BlockSplitter):
+    """Splits the first block in two, as if a block magic appeared inside it."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._split_done = False
+
+    def finish(self) -> list[Bzip2Block]:
+        blocks = super().finish()
+        if not self._split_done and blocks:
+            self._split_done = True
+            blocks[0:1] = _split_block(blocks[0], blocks[0].size_bits // 2)
+        return blocks
+
+
+class _FalseMagicStream(ParallelBzip2DecompressorStream):
+    def _create_splitter(self) -> Bzip2BlockSplitter:
+        return _FalseMagicSplitter()
+
+
+def test_parallel_bzip2_block_magic_inside_block():
+    compressed = bz2.compress(DATA[:200_000], 9)
+    stream = _FalseMagicStream(io.BytesIO(compressed), 2)
+    assert stream.read() == DATA[:200_000]
+
+
+class _DelayedFalseMagicSplitter(Bzip2BlockSplitter):
+    """Splits the first block in two, and only returns its second half with the
+    blocks found in the next chunk."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._held: list[Bzip2Block] | None = None
+
+    def _hold_second_half(self, blocks: list[Bzip2Block]) -> list[Bzip2Block]:
+        if self._held is None and blocks:
+            first, second = _split_block(blocks[0], blocks[0].size_bits // 2)
+            self._held = [second, *blocks[1:]]
+            return [first]
+        held, self._held = self._held or [], []
+        return held + blocks
+
+    def feed(self, chunk: bytes) -> list[Bzip2Block]:
+        return self._hold_second_half(super().feed(chunk))
+
+    def finish(self) -> list[Bzip2Block]:
+        return self._hold_second_half(super().finish())
+
+
+class _DelayedFalseMagicStream(ParallelBzip2DecompressorStream):
+    def _create_splitter(self) -> Bzip2BlockSplitter:
+        return _DelayedFalseMagicSplitter()
+
+
+def test_parallel_bzip2_block_magic_inside_block_not_split_yet():
+    compressed = bz2.compress(DATA, 1)
+    stream = _DelayedFalseMagicStream(io.BytesIO(compressed), 2)
+    assert _read_in_chunks(stream, 10_000) == DATA
+
+
+def test_parallel_bzip2_truncated():
+    compressed = bz2.compress(DATA, 1)
+    stream = ParallelBzip2DecompressorStream(io.BytesIO(compressed[:-20]), 2)
+    with pytest.raises(ArchiveEOFError):
+        stream.read()
+
+
+def test_parallel_bzip2_corrupted():
+    compressed = bytearray(bz2.compress(DATA, 1))
+    compressed[len(compressed) // 2] ^= 0xFF
+    stream = ParallelBzip2DecompressorStream(io.BytesIO(bytes(compressed)), 2)
+    with pytest.raises(OSError, match="Invalid data stream"):
+        stream.read()
+
+    config = ArchiveyConfig(decompression_threads=2)
+    with (
+        open_compressed_stream(io.BytesIO(bytes(compressed)), config=config) as f,
+        pytest.raises(ArchiveCorruptedError),
+    ):
+        f.read()
+
+
+def _gzip_members(parts: list[bytes]) -> bytes:
+    return b"".join(gzip.compress(part, mtime=0) for part in parts)
+
+
+@pytest.mark.parametrize("threads", [1, 4])
+def test_parallel_gzip_members(threads: int):
+    parts = [DATA[i : i + 65536] for i in range(0, len(DATA), 65536)]
+    # Zero padding between members is skipped, like in the gzip module.
+    compressed = _gzip_members(parts[:3]) + b"\x00" * 5 + _gzip_members(parts[3:])
+    with gzip.open(io.BytesIO(compressed)) as f:
+        assert f.read() == DATA
+
+    stats = IOStats()
+    stream = ParallelGzipDecompressorStream(
+        StatsIO(io.BytesIO(compressed), stats), threads
+    )
+    assert _read_in_chunks(stream, 10_000) == DATA
+
+    # Seeking backwards resumes from the start of a member.
+    stats.bytes_read = 0
+    stream.seek(1_200_000)
+    assert stream.read(100) == DATA[1_200_000:1_200_100]
+    assert stats.bytes_read < len(compressed) // 2
+    stream.seek(-3, io.SEEK_END)
+    assert stream.read() == DATA[-3:]
+    stream.close()
+
+    stream = ParallelGzipDecompressorStream(NonSeekableBytesIO(compressed), threads)
+    assert _read_in_chunks(stream, 10_000) == DATA
+
+
+def test_parallel_gzip_single_member_not_buffered():
+    compressed = gzip.compress(DATA, mtime=0)
+    stats = IOStats()
+    stream = ParallelGzipDecompressorStream(StatsIO(io.BytesIO(compressed), stats), 2)
+    # The member is decompressed as it's read, without waiting for its end.
+    assert stream.read(10_000) == DATA[:10_000]
+    assert stats.bytes_read < len(compressed) // 2
+    assert stream.read() == DATA[10_000:]
+
+    with pytest.raises(ArchiveEOFError):
+        ParallelGzipDecompressorStream(io.BytesIO(compressed[:-10]), 2).read()
+
+
+def test_parallel_gzip_splitter_finds_all_members():
+    parts = [DATA[:100], DATA[100:300_000], b"", DATA[300_000:]]
+    compressed = _gzip_members(parts)
+    splitter = GzipMemberSplitter()
+    blocks = []
+    for i in range(0, len(compressed), 1000):
+        blocks += splitter.feed(compressed[i : i + 1000])
+    blocks += splitter.finish()
+    assert splitter.finished
+
+    assert [len(block.data) for block in blocks] == [
+        len(gzip.compress(part)) for part in parts
+    ]
+    assert all(block.complete for block in blocks)
+    assert b"".join(decode_gzip_members(block.data) for block in blocks) == DATA
+
+
+def test_parallel_gzip_member_start_inside_member():
+    # Members stored uncompressed that contain gzip files, so that the splitter
+    # finds member starts inside them.
+    inner = gzip.compress(DATA[:1000])
+    parts = [
+        DATA[:100_000] + inner + DATA[100_000:200_000] + inner,
+        inner + DATA[200_000:300_000],
+    ]
+    expected = b"".join(parts)
+    compressed = b"".join(gzip.compress(part, compresslevel=0) for part in parts)
+    for threads in [1, 3]:
+        stream = ParallelGzipDecompressorStream(io.BytesIO(compressed), threads)
+        assert _read_in_chunks(stream, 10_000) == expected
+
+
+def test_parallel_gzip_large_members(monkeypatch):
+    # A member with more compressed data than the limit, and a member that
+    # decompresses to more than the limit.
+    monkeypatch.setattr(parallel_streams, "MAX_PARALLEL_BLOCK_SIZE", 1_000_000)
+    parts = [DATA[:500_000], DATA[500_000:], bytes(2_000_000), DATA[:100_000]]
+    expected = b"".join(parts)
+    compressed = _gzip_members(parts)
+    for threads in [1, 3]:
+        stream = ParallelGzipDecompressorStream(
+            io.BytesIO(compressed), threads, max_member_size=200_000
+        )
+        assert _read_in_chunks(stream, 10_000) == expected
+        stream.seek(10)
+        assert stream.read(100) == expected[10:110]
+
+        stream = ParallelGzipDecompressorStream(io.BytesIO(compressed), threads)
+        assert stream.read() == expected
+
+    with pytest.raises(ArchiveEOFError):
+        ParallelGzipDecompressorStream(
+            io.BytesIO(compressed[:-10]), 2, max_member_size=200_000
+        ).read()
+
+
+def test_parallel_gzip_truncated_and_corrupted():
+    compressed = _gzip_members([DATA[:500_000], DATA[500_000:]])
+    config = ArchiveyConfig(decompression_threads=2)
+    with (
+        open_compressed_stream(io.BytesIO(compressed[:-20]), config=config) as f,
+        pytest.raises(ArchiveEOFError),
+    ):
+        f.read()
+
+    corrupted = bytearray(compressed)
+    corrupted[len(corrupted) // 4] ^= 0xFF
+    with (
+        open_compressed_stream(io.BytesIO(bytes(corrupted)), config=config) as f,
+        pytest.raises(ArchiveCorruptedError),
+    ):
+        f.read()
+
+
+def _xz_streams(parts: list[bytes]) -> bytes:
+    """Concatenated single-block streams, with different check types."""
+    checks = [lzma.CHECK_CRC64, lzma.CHECK_NONE, lzma.CHECK_SHA256, lzma.CHECK_CRC32]
+    return b"".join(
+        lzma.compress(part, check=checks[i % len(checks)])
+        for i, part in enumerate(parts)
+    )
+
+
+def test_parallel_xz_multiple_streams(tmp_path):
+    parts = [DATA[:500_000], b"", DATA[500_000:1_000_000], DATA[1_000_000:]]
+    compressed = _xz_streams(parts)
+    # Stream padding between the streams.
+    first_size = len(_xz_streams(parts[:1]))
+    padded = compressed[:first_size] + b"\0" * 8 + compressed[first_size:]
+
+    blocks = read_xz_index(io.BytesIO(padded))
+    assert blocks is not None
+    assert [block.uncompressed_offset for block in blocks] == [0, 500_000, 1_000_000]
+    path = tmp_path / "data.xz"
+    path.write_bytes(padded)
+    with open_archive(path) as archive:
+        assert archive.get_members()[0].file_size == len(DATA)
+
+    stats = IOStats()
+    stream = open_parallel_xz_stream(StatsIO(io.BytesIO(padded), stats), 2)
+    assert isinstance(stream, ParallelXzDecompressorStream)
+    assert _read_in_chunks(stream, 10_000) == DATA
+
+    # Seeks jump to the block containing the target position.
+    stats.bytes_read = 0
+    stream.seek(1_200_000)
+    assert stream.read(100) == DATA[1_200_000:1_200_100]
+    assert stats.bytes_read < len(padded) // 2
+    stream.seek(10)
+    assert stream.read(100) == DATA[10:110]
+    stream.seek(-3, io.SEEK_END)
+    assert stream.read() == DATA[-3:]
+    stream.close()
+
+
+@pytest.mark.skipif(shutil.which("xz") is None, reason="xz is not installed")
+def test_parallel_xz_multiple_blocks():
+    compressed = subprocess.run(
+        ["xz", "-T2", "--block-size=100000", "-c"],
+        input=DATA,
+        capture_output=True,
+        check=True,
+    ).stdout
+    blocks = read_xz_index(io.BytesIO(compressed))
+    assert blocks is not None
+    assert len(blocks) == (len(DATA) + 99_999) // 100_000
+
+    stream = open_parallel_xz_stream(io.BytesIO(compressed), 3)
+    assert isinstance(stream, ParallelXzDecompressorStream)
+    assert stream.read() == DATA
+    stream.seek(654_321)
+    assert stream.read(1000) == DATA[654_321:655_321]
+
+    corrupted = bytearray(compressed)
+    corrupted[len(corrupted) // 2] ^= 0xFF
+    stream = open_parallel_xz_stream(io.BytesIO(bytes(corrupted)), 3)
+    with pytest.raises(lzma.LZMAError):
+        stream.read()
+
+
+def test_parallel_xz_fallback():
+    compressed = _xz_streams([DATA[:500_000], DATA[500_000:]])
+    stream = open_parallel_xz_stream(NonSeekableBytesIO(compressed), 2)
+    assert not isinstance(stream, ParallelXzDecompressorStream)
+    assert stream.read() == DATA
+
+    # The index can't be read, so errors are left to the lzma module.
+    stream = open_parallel_xz_stream(io.BytesIO(compressed[:-10]), 2)
+    assert not isinstance(stream, ParallelXzDecompressorStream)
+    with pytest.raises(EOFError):
+        stream.read()
+
+
+@pytest.mark.parametrize("use_zstandard", [False, True])
+def test_parallel_zstd_seekable_format(use_zstandard: bool):
+    pyzstd = pytest.importorskip("pyzstd")
+    if use_zstandard:
+        pytest.importorskip("zstandard")
+    output = io.BytesIO()
+    with pyzstd.SeekableZstdFile(output, "w", max_frame_content_size=200_000) as f:
+        f.write(DATA)
+    compressed = output.getvalue()
+    frames = read_zstd_seek_table(io.BytesIO(compressed))
+    assert frames is not None
+    assert len(frames) == (len(DATA) + 199_999) // 200_000
+
+    stats = IOStats()
+    stream = open_parallel_zstd_stream(
+        StatsIO(io.BytesIO(compressed), stats), 2, use_zstandard
+    )
+    assert isinstance(stream, ParallelZstdDecompressorStream)
+    assert _read_in_chunks(stream, 10_000) == DATA
+
+    stats.bytes_read = 0
+    stream.seek(1_200_000)
+    assert stream.read(100) == DATA[1_200_000:1_200_100]
+    assert stats.bytes_read < len(compressed) // 2
+    stream.seek(-3, io.SEEK_END)
+    assert stream.read() == DATA[-3:]
+    stream.close()
+
+
+def test_parallel_zstd_concatenated_frames():
+    pyzstd = pytest.importorskip("pyzstd")
+    # A skippable frame between the frames is ignored.
+    skippable = b"\x50\x2a\x4d\x18" + (4).to_bytes(4, "little") + b"skip"
+    compressed = (
+        pyzstd.compress(DATA[:700_000])
+        + skippable
+        + pyzstd.compress(b"")
+        + pyzstd.compress(DATA[700_000:], {pyzstd.CParameter.checksumFlag: 1})
+    )
+    frames = read_zstd_frames(io.BytesIO(compressed))
+    assert frames is not None
+    assert [frame.uncompressed_size for frame in frames] == [
+        700_000,
+        0,
+        0,
+        len(DATA) - 700_000,
+    ]
+
+    stream = open_parallel_zstd_stream(io.BytesIO(compressed), 3)
+    assert isinstance(stream, ParallelZstdDecompressorStream)
+    assert stream.read() == DATA
+    stream.seek(800_000)
+    assert stream.read(10) == DATA[800_000:800_010]
+
+    corrupted = bytearray(compressed)
+    corrupted[len(corrupted) // 4] ^= 0xFF
+    stream = open_parallel_zstd_stream(io.BytesIO(bytes(corrupted)), 3)
+    with pytest.raises(pyzstd.ZstdError):
+        stream.read()
+
+    config = ArchiveyConfig(decompression_threads=2)
+    with (
+        open_compressed_stream(io.BytesIO(bytes(corrupted)), config=config) as f,
+        pytest.raises(ArchiveCorruptedError),
+    ):
+        f.read()
+
+
+def test_parallel_zstd_fallback():
+    zstandard = pytest.importorskip("zstandard")
+    pytest.importorskip("pyzstd")
+    # Without the content size in the frame headers, the frames are decompressed
+    # sequentially.
+    compressor = zstandard.ZstdCompressor(write_content_size=False)
+    compressed = compressor.compress(DATA[:500_000]) + compressor.compress(
+        DATA[500_000:]
+    )
+    frames = read_zstd_frames(io.BytesIO(compressed))
+    assert frames is not None
+    assert [frame.uncompressed_size for frame in frames] == [None, None]
+
+    stream = open_parallel_zstd_stream(io.BytesIO(compressed), 2)
+    assert not isinstance(stream, ParallelZstdDecompressorStream)
+    assert stream.read() == DATA
+
+    compressor = zstandard.ZstdCompressor()
+    compressed = compressor.compress(DATA[:500_000]) + compressor.compress(
+        DATA[500_000:]
+    )
+    stream = open_parallel_zstd_stream(NonSeekableBytesIO(compressed), 2)
+    assert not isinstance(stream, ParallelZstdDecompressorStream)
+    assert stream.read() == DATA
+
+    assert read_zstd_frames(io.BytesIO(compressed[:-10])) is None
+
+
+def test_parallel_lz4_frames():
+    lz4_frame = pytest.importorskip("lz4.frame")
+    skippable = b"\x50\x2a\x4d\x18" + (4).to_bytes(4, "little") + b"skip"
+    compressed = (
+        lz4_frame.compress(DATA[:700_000], block_size=lz4_frame.BLOCKSIZE_MAX256KB)
+        + skippable
+        + lz4_frame.compress(b"")
+        + lz4_frame.compress(DATA[700_000:], block_checksum=True, content_checksum=True)
+    )
+    frames = read_lz4_frames(io.BytesIO(compressed))
+    assert frames is not None
+    # An empty frame doesn't store its size.
+    assert [frame.uncompressed_size for frame in frames] == [
+        700_000,
+        0,
+        None,
+        len(DATA) - 700_000,
+    ]
+
+    stats = IOStats()
+    stream = open_parallel_lz4_stream(StatsIO(io.BytesIO(compressed), stats), 3)
+    assert isinstance(stream, ParallelLz4DecompressorStream)
+    assert _read_in_chunks(stream, 10_000) == DATA
+
+    stats.bytes_read = 0
+    stream.seek(1_200_000)
+    assert stream.read(100) == DATA[1_200_000:1_200_100]
+    # Only the last frame is read.
+    assert stats.bytes_read <= len(compressed) - frames[0].size
+    stream.seek(-3, io.SEEK_END)
+    assert stream.read() == DATA[-3:]
+    stream.close()
+
+    # The last frame has checksums.
+    corrupted = bytearray(compressed)
+    corrupted[-1000] ^= 0xFF
+    config = ArchiveyConfig(decompression_threads=2)
+    with (
+        open_compressed_stream(io.BytesIO(bytes(corrupted)), config=config) as f,
+        pytest.raises(ArchiveCorruptedError),
+    ):
+        f.read()
+
+
+def test_parallel_lz4_frames_without_content_size():
+    lz4_frame = pytest.importorskip("lz4.frame")
+    parts = [DATA[:400_000], DATA[400_000:1_000_000], DATA[1_000_000:]]
+    compressed = b"".join(lz4_frame.compress(part, store_size=False) for part in parts)
+    stream = open_parallel_lz4_stream(io.BytesIO(compressed), 2)
+    assert isinstance(stream, ParallelLz4DecompressorStream)
+
+    # The frame starts are found as the frames are decompressed.
+    assert stream.read(10) == DATA[:10]
+    stream.seek(1_200_000)
+    assert stream.read(100) == DATA[1_200_000:1_200_100]
+    assert [checkpoint[0] for checkpoint in stream._checkpoints] == [
+        0,
+        400_000,
+        1_000_000,
+    ]
+    stream.seek(500_000)
+    assert stream.read(100) == DATA[500_000:500_100]
+    stream.seek(-3, io.SEEK_END)
+    assert stream.read() == DATA[-3:]
+
+
+def test_parallel_lz4_fallback():
+    lz4_frame = pytest.importorskip("lz4.frame")
+    compressed = lz4_frame.compress(DATA[:500_000]) + lz4_frame.compress(DATA[500_000:])
+    stream = open_parallel_lz4_stream(NonSeekableBytesIO(compressed), 2)
+    assert not isinstance(stream, ParallelLz4DecompressorStream)
+    assert stream.read() == DATA
+
+    assert read_lz4_frames(io.BytesIO(compressed[:-10])) is None
+    stream = open_parallel_lz4_stream(io.BytesIO(compressed[:-10]), 2)
+    assert not isinstance(stream, ParallelLz4DecompressorStream)
+
+
+def test_parallel_lzip_members():
+    lzip = pytest.importorskip("lzip")
+    parts = [DATA[:500_000], b"", DATA[500_000:1_000_000], DATA[1_000_000:]]
+    compressed = b"".join(lzip.compress_to_buffer(part) for part in parts)
+    members = read_lzip_index(io.BytesIO(compressed))
+    assert members is not None
+    assert [member.uncompressed_size for member in members] == [
+        len(part) for part in parts
+    ]
+
+    stats = IOStats()
+    stream = open_parallel_lzip_stream(StatsIO(io.BytesIO(compressed), stats), 3)
+    assert isinstance(stream, ParallelLzipDecompressorStream)
+    assert _read_in_chunks(stream, 10_000) == DATA
+
+    # Seeks jump to the member containing the target position.
+    stats.bytes_read = 0
+    stream.seek(1_200_000)
+    assert stream.read(100) == DATA[1_200_000:1_200_100]
+    assert stats.bytes_read < len(compressed) // 2
+    stream.seek(10)
+    assert stream.read(100) == DATA[10:110]
+    stream.seek(-3, io.SEEK_END)
+    assert stream.read() == DATA[-3:]
+    stream.close()
+
+    corrupted = bytearray(compressed)
+    corrupted[len(corrupted) // 4] ^= 0xFF
+    config = ArchiveyConfig(decompression_threads=2)
+    with (
+        open_compressed_stream(io.BytesIO(bytes(corrupted)), config=config) as f,
+        pytest.raises(ArchiveCorruptedError),
+    ):
+        f.read()
+
+
+def test_parallel_lzip_fallback():
+    lzip = pytest.importorskip("lzip")
+    compressed = lzip.compress_to_buffer(DATA[:500_000]) + lzip.compress_to_buffer(
+        DATA[500_000:]
+    )
+    stream = open_parallel_lzip_stream(NonSeekableBytesIO(compressed), 2)
+    assert not isinstance(stream, ParallelLzipDecompressorStream)
+    assert stream.read() == DATA
+
+    # The trailers can't be read, so errors are left to the sequential decoder.
+    assert read_lzip_index(io.BytesIO(compressed[:-10])) is None
+    config = ArchiveyConfig(decompression_threads=2)
+    with (
+        open_compressed_stream(io.BytesIO(compressed[:-10]), config=config) as f,
+        pytest.raises(ArchiveEOFError),
+    ):
+        f.read()
+
+
+@pytest.mark.parametrize(
+    "sample_archive",
+    filter_archives(
+        SINGLE_FILE_ARCHIVES + BASIC_ARCHIVES,
+        extensions=[".gz", ".bz2", ".xz", ".zst", ".lz4", ".lz"],
+    ),
+    ids=lambda a: a.filename,
+)
+def test_parallel_sample_archives(
+    sample_archive: SampleArchive, sample_archive_path: str
+):
+    config = ArchiveyConfig(
+        decompression_threads=2, use_single_file_stored_metadata=True
+    )
+    skip_if_package_missing(sample_archive.creation_info.format, config)
+    expected = {
+        f.name: f.contents
+        for f in sample_archive.contents.files
+        if f.contents is not None
+    }
+    with open_archive(sample_archive_path, config=config) as archive:
+        for member, stream in archive.iter_members_with_streams():
+            if stream is not None and member.filename in expected:
+                assert stream.read() == expected.pop(member.filename)
+    assert not expected
+
+
+@pytest.mark.parametrize(
+    "sample_archive",
+    filter_archives(
+        SINGLE_FILE_ARCHIVES + BASIC_ARCHIVES, extensions=[".xz", ".zst", ".lz4", ".lz"]
+    ),
+    ids=lambda a: a.filename,
+)
+def test_parallel_non_seekable_archives(
+    sample_archive: SampleArchive, sample_archive_path: str
+):
+    # The index can't be read, so the file is decompressed sequentially.
+    config = ArchiveyConfig(decompression_threads=2)
+    skip_if_package_missing(sample_archive.creation_info.format, config)
+    with open(sample_archive_path, "rb") as f:
+        data = f.read()
+    contents = []
+    with open_archive(
+        NonSeekableBytesIO(data), config=config, streaming_only=True
+    ) as archive:
+        for _, stream in archive.iter_members_with_streams():
+            if stream is not None:
+                contents.append(stream.read())
+    # Single-file archives read from a stream don't know the member name.
+    assert sorted(contents) == sorted(
+        f.contents or b""
+        for f in sample_archive.contents.files
+        if f.type == MemberType.FILE
+    )
+
+
+class _NoSeekToEnd(io.BytesIO):
+    """A stream that claims to be seekable but can't seek to its end, like the ones
+    used for format detection."""
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_END:
+            raise io.UnsupportedOperation("seek to end")
+        return super().seek(offset, whence)
+
+
+@pytest.mark.parametrize(
+    "read_index",
+    [read_zstd_seek_table, read_zstd_frames, read_lz4_frames, read_lzip_index],
+    ids=lambda f: f.__name__,
+)
+def test_index_readers_without_seek_to_end(read_index):
+    assert read_index(_NoSeekToEnd(b"\0" * 100)) is None
@@ -0,0 +1,100 @@
+import pytest
+
+from archivey.config import ArchiveyConfig
+from archivey.core import open_archive
+from archivey.exceptions import ArchiveEncryptedError
+from tests.archivey.sample_archives import (
+    BASIC_ARCHIVES,
+    ENCRYPTION_ARCHIVES,
+    LARGE_ARCHIVES,
+    SampleArchive,
+    filter_archives,
+)
+from tests.archivey.testing_utils import skip_if_package_missing
+
+
+def _read_all(archive, **kwargs) -> list[tuple[str, bytes | None]]:
+    return [
+        (member.filename, stream.read() if stream is not None else None)
+        for member, stream in archive.iter_members_with_streams(**kwargs)
+    ]
+
+
+@pytest.mark.parametrize(
+    "sample_archive",
+    filter_archives(
+        BASIC_ARCHIVES + LARGE_ARCHIVES, extensions=[".zip", "/", ".tar.gz"]
+    ),
+    ids=lambda a: a.filename,
+)
+@pytest.mark.parametrize("max_prefetch_bytes", [1 << 20, 10])
+def test_prefetched_iteration_matches_sequential(
+    sample_archive: SampleArchive, sample_archive_path: str, max_prefetch_bytes: int
+):
+    skip_if_package_missing(sample_archive.creation_info.format, None)
+    config = ArchiveyConfig(max_prefetch_bytes=max_prefetch_bytes)
+
+    with open_archive(sample_archive_path, config=config) as archive:
+        expected = _read_all(archive)
+        assert _read_all(archive, workers=3, prefetch=2) == expected
+        assert _read_all(archive, workers=2) == expected
+
+
+@pytest.mark.parametrize(
+    "sample_archive",
+    filter_archives(BASIC_ARCHIVES, extensions=[".zip", "/"]),
+    ids=lambda a: a.filename,
+)
+def test_prefetch_opener_per_worker(
+    sample_archive: SampleArchive, sample_archive_path: str, monkeypatch
+):
+    openers = []
+
+    with open_archive(sample_archive_path) as archive:
+        original_create = archive._create_worker_member_opener
+
+        def _counting_create(stack):
+            opener = original_create(stack)
+            openers.append(opener)
+            return opener
+
+        monkeypatch.setattr(archive, "_create_worker_member_opener", _counting_create)
+
+        iterator = archive.iter_members_with_streams(workers=2, prefetch=4)
+        member, stream = next(iterator)
+        # Closing the iterator early waits for the workers and releases the openers.
+        iterator.close()
+        assert 1 <= len(openers) <= 2
+
+        # The reader is still usable afterwards.
+        assert _read_all(archive) == _read_all(archive, workers=2)
+
+
+@pytest.mark.parametrize(
+    "sample_archive",
+    filter_archives(
+        ENCRYPTION_ARCHIVES,
+        prefixes=["encryption"],
+        extensions=[".zip"],
+        custom_filter=lambda a: (
+            not a.contents.has_multiple_passwords()
+            and a.contents.header_password is None
+        ),
+    ),
+    ids=lambda a: a.filename,
+)
+def test_prefetched_iteration_errors_raised_on_read(
+    sample_archive: SampleArchive, sample_archive_path: str
+):
+    with open_archive(sample_archive_path) as archive:
+        encrypted_files = 0
+        for member, stream in archive.iter_members_with_streams(
+            pwd="wrong password", workers=2
+        ):
+            if stream is None or not member.encrypted:
+                continue
+            encrypted_files += 1
+            with pytest.raises(ArchiveEncryptedError):
+                stream.read()
+
+        assert encrypted_files > 0
@@ -605,3 +605,26 @@ def test_read_hardlinks_archives(
 def test_read_folder_archives(sample_archive: SampleArchive, sample_archive_path: str):
     logger.info(f"Testing {sample_archive.filename}; files at {sample_archive_path}")
     check_iter_members(sample_archive, archive_path=sample_archive_path)
+
+
+@pytest.mark.parametrize(
+    "sample_archive",
+    filter_archives(SAMPLE_ARCHIVES, prefixes=["basic_nonsolid", "basic_solid"]),
+    ids=lambda x: x.filename,
+)
+def test_get_members_returns_read_only_view(
+    sample_archive: SampleArchive, sample_archive_path: str
+):
+    skip_if_package_missing(sample_archive.creation_info.format, None)
+    with open_archive(sample_archive_path) as archive:
+        members = archive.get_members()
+        assert archive.get_members() == members
+        assert archive.get_members_if_available() == members
+        assert list(members) == [members[i] for i in range(len(members))]
+        assert [m.member_id for m in members] == list(range(len(members)))
+        assert members[-1] is list(members)[-1]
+
+        with pytest.raises(AttributeError):
+            members.append(members[0])  # type: ignore
+        with pytest.raises(TypeError):
+            members[0] = members[0]  # type: ignore
@@ -0,0 +1,179 @@
+import io
+import os
+import tarfile
+import threading
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from archivey.config import ArchiveyConfig
+from archivey.exceptions import ArchiveError
+from archivey.reader_pool import ArchiveReaderPool
+
+
+def _create_zip(path, contents: bytes = b"hello") -> str:
+    with zipfile.ZipFile(path, "w") as zf:
+        zf.writestr("file.txt", contents)
+    return str(path)
+
+
+def _read_member(archive) -> bytes:
+    with archive.open("file.txt") as stream:
+        return stream.read()
+
+
+def _underlying(handle):
+    """Return the pooled reader behind a handle returned by the pool."""
+    return handle._entry.reader
+
+
+def _read(pool: ArchiveReaderPool, path: str, **kwargs) -> bytes:
+    with pool.open(path, **kwargs) as archive:
+        return _read_member(archive)
+
+
+def test_reader_reused_until_file_changes(tmp_path):
+    path = _create_zip(tmp_path / "a.zip")
+    pool = ArchiveReaderPool()
+
+    with pool.open(path) as first:
+        pass
+    # Returning the reader to the pool doesn't close it.
+    assert not _underlying(first)._closed
+    with pool.open(path) as second:
+        assert _underlying(second) is _underlying(first)
+        assert _read_member(second) == b"hello"
+
+    # Replace the file, keeping the same modification time.
+    st = os.stat(path)
+    new_path = _create_zip(tmp_path / "new.zip", b"changed contents")
+    os.replace(new_path, path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns))
+
+    assert _read(pool, path) == b"changed contents"
+    assert _underlying(first)._closed
+    assert len(pool) == 1
+
+
+def test_shared_reader_for_concurrent_callers(tmp_path):
+    path = _create_zip(tmp_path / "a.zip")
+    pool = ArchiveReaderPool()
+
+    with pool.open(path) as first, pool.open(path) as second:
+        assert _underlying(first) is _underlying(second)
+    assert not _underlying(first)._closed
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(lambda _: _read(pool, path), range(100)))
+    assert results == [b"hello"] * 100
+    assert len(pool) == 1
+
+
+def test_exclusive_reader_for_non_concurrent_formats(tmp_path):
+    path = str(tmp_path / "a.tar.gz")
+    with tarfile.open(path, "w:gz") as tar:
+        info = tarfile.TarInfo("file.txt")
+        info.size = 5
+        tar.addfile(info, io.BytesIO(b"hello"))
+    pool = ArchiveReaderPool()
+
+    with pool.open(path) as first:
+        with pool.open(path) as second:
+            assert _underlying(second) is not _underlying(first)
+            assert _read_member(first) == _read_member(second) == b"hello"
+    assert len(pool) == 2
+
+    with pool.open(path) as third:
+        assert _underlying(third) in (_underlying(first), _underlying(second))
+
+
+def test_pool_evicts_least_recently_used_idle_readers(tmp_path):
+    paths = [_create_zip(tmp_path / f"{i}.zip") for i in range(3)]
+    pool = ArchiveReaderPool(max_readers=2)
+
+    with pool.open(paths[0]) as reader0, pool.open(paths[1]) as reader1:
+        with pool.open(paths[2]) as reader2:
+            # All readers are in use, so none of them can be closed.
+            assert len(pool) == 3
+        # reader2 was the only idle one when it was returned.
+        assert _underlying(reader2)._closed
+        assert len(pool) == 2
+    assert not _underlying(reader0)._closed
+    assert not _underlying(reader1)._closed
+
+    with pool.open(paths[1]):
+        pass
+    _read(pool, paths[2])
+    assert _underlying(reader0)._closed
+    assert not _underlying(reader1)._closed
+
+
+def test_invalidate_waits_for_checked_out_readers(tmp_path):
+    path = _create_zip(tmp_path / "a.zip")
+    pool = ArchiveReaderPool()
+
+    with pool.open(path) as reader:
+        pool.invalidate(path)
+        assert len(pool) == 0
+        assert _read_member(reader) == b"hello"
+    assert _underlying(reader)._closed
+
+    with pool.open(path) as new_reader:
+        assert _underlying(new_reader) is not _underlying(reader)
+
+
+def test_readers_keyed_by_config(tmp_path):
+    path = _create_zip(tmp_path / "a.zip")
+    with ArchiveReaderPool() as pool:
+        with pool.open(path) as default_reader:
+            pass
+        with pool.open(path, config=ArchiveyConfig(use_rar_stream=True)) as reader:
+            assert _underlying(reader) is not _underlying(default_reader)
+        assert len(pool) == 2
+    assert _underlying(default_reader)._closed
+    assert _underlying(reader)._closed
+
+
+def test_open_errors_are_not_pooled(tmp_path):
+    path = tmp_path / "broken.zip"
+    path.write_bytes(b"PK\x03\x04 not really a zip")
+    pool = ArchiveReaderPool()
+
+    with pytest.raises(ArchiveError):
+        pool.open(str(path))
+    with pytest.raises(FileNotFoundError):
+        pool.open(str(tmp_path / "missing.zip"))
+    assert len(pool) == 0
+
+
+def test_concurrent_open_of_new_archive(tmp_path):
+    path = _create_zip(tmp_path / "a.zip")
+    pool = ArchiveReaderPool()
+    barrier = threading.Barrier(4)
+
+    def _open_after_barrier(_):
+        barrier.wait()
+        return _read(pool, path)
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        assert list(executor.map(_open_after_barrier, range(4))) == [b"hello"] * 4
+    assert len(pool) == 1
+
+
+def test_closing_a_handle_twice_releases_it_once(tmp_path):
+    path = _create_zip(tmp_path / "a.zip")
+    pool = ArchiveReaderPool()
+
+    first = pool.open(path)
+    second = pool.open(path)
+    first.close()
+    first.close()
+    with pytest.raises(ValueError, match="Archive is closed"):
+        first.open("file.txt")
+
+    # The other checkout keeps the reader open, even if the pool drops it.
+    pool.invalidate()
+    assert _read_member(second) == b"hello"
+    second.close()
+    assert _underlying(second)._closed
@@ -0,0 +1,122 @@
+import json
+import os
+from dataclasses import replace
+
+import pytest
+
+from archivey.core import open_archive
+from archivey.formats import compressed_streams
+from archivey.internal.index_cache import (
+    ArchiveFingerprint,
+    load_binary_index,
+    save_binary_index,
+)
+from tests.archivey.sample_archives import (
+    ALTERNATIVE_CONFIG,
+    SINGLE_FILE_ARCHIVES,
+    SampleArchive,
+    filter_archives,
+)
+from tests.archivey.testing_utils import skip_if_package_missing
+
+SEEK_INDEX_ARCHIVES = filter_archives(
+    SINGLE_FILE_ARCHIVES, extensions=[".gz", ".bz2", ".Z"]
+)
+
+
+def _read_all(archive_path: str, config) -> bytes:
+    with open_archive(archive_path, config=config, streaming_only=True) as archive:
+        data = b""
+        for _, stream in archive.iter_members_with_streams():
+            assert stream is not None
+            data += stream.read()
+        return data
+
+
+def _count_saves(monkeypatch) -> list[str]:
+    saved = []
+    for name in ("save_index", "save_binary_index"):
+        original = getattr(compressed_streams, name)
+
+        def _save(*args, _original=original):
+            saved.append(args[2])
+            _original(*args)
+
+        monkeypatch.setattr(compressed_streams, name, _save)
+    return saved
+
+
+@pytest.mark.parametrize(
+    "sample_archive", SEEK_INDEX_ARCHIVES, ids=lambda a: a.filename
+)
+def test_seek_index_stored_after_first_pass(
+    sample_archive: SampleArchive, sample_archive_path: str, tmp_path, monkeypatch
+):
+    index_dir = tmp_path / "index"
+    config = replace(ALTERNATIVE_CONFIG, seek_index_dir=str(index_dir))
+    skip_if_package_missing(sample_archive.creation_info.format, config)
+    contents = sample_archive.contents.files[0].contents
+    assert contents is not None
+    saved = _count_saves(monkeypatch)
+
+    assert _read_all(sample_archive_path, config) == contents
+    assert len(saved) == 1
+    assert len(os.listdir(index_dir)) == 1
+
+    # Later opens import the index instead of storing it again.
+    middle = len(contents) // 2
+    with open_archive(sample_archive_path, config=config) as archive:
+        with archive.open(archive.get_members()[0]) as stream:
+            stream.seek(middle)
+            assert stream.read() == contents[middle:]
+            stream.seek(0)
+            assert stream.read(10) == contents[:10]
+    assert len(saved) == 1
+
+
+@pytest.mark.parametrize(
+    "sample_archive", SEEK_INDEX_ARCHIVES, ids=lambda a: a.filename
+)
+def test_invalid_seek_index_is_replaced(
+    sample_archive: SampleArchive, sample_archive_path: str, tmp_path, monkeypatch
+):
+    index_dir = tmp_path / "index"
+    config = replace(ALTERNATIVE_CONFIG, seek_index_dir=str(index_dir))
+    skip_if_package_missing(sample_archive.creation_info.format, config)
+    contents = sample_archive.contents.files[0].contents
+    _read_all(sample_archive_path, config)
+
+    # Keep the header, so that the index is considered valid for the file.
+    (index_file,) = index_dir.iterdir()
+    with open(index_file, "rb") as f:
+        header = f.readline()
+    if index_file.suffix == ".json":
+        data = json.loads(header)
+        data["data"] = {"invalid": True}
+        index_file.write_text(json.dumps(data))
+    else:
+        index_file.write_bytes(header + b"invalid")
+
+    saved = _count_saves(monkeypatch)
+    assert _read_all(sample_archive_path, config) == contents
+    assert len(saved) == 1
+
+
+def test_binary_index_roundtrip(tmp_path):
+    archive_path = tmp_path / "archive.bin"
+    archive_path.write_bytes(b"contents")
+    index_dir = str(tmp_path / "index")
+    fingerprint = ArchiveFingerprint.from_path(str(archive_path))
+    assert fingerprint is not None
+
+    data = b"\n\x00binary\ndata"
+    save_binary_index(index_dir, str(archive_path), "test", fingerprint, data)
+    assert load_binary_index(index_dir, str(archive_path), "test", fingerprint) == data
+    assert load_binary_index(index_dir, str(archive_path), "other", fingerprint) is None
+
+    archive_path.write_bytes(b"new contents")
+    new_fingerprint = ArchiveFingerprint.from_path(str(archive_path))
+    assert new_fingerprint is not None
+    assert (
+        load_binary_index(index_dir, str(archive_path), "test", new_fingerprint) is None
+    )
@@ -1,10 +1,13 @@
+import gzip
 import logging
+from pathlib import Path
 from typing import IO
 
 import pytest
 
 from archivey.config import ArchiveyConfig
 from archivey.core import open_archive
+from archivey.exceptions import ArchiveEOFError
 from archivey.types import ContainerFormat, MemberType
 from tests.archivey.sample_archives import (
     SAMPLE_ARCHIVES,
@@ -329,3 +332,50 @@ def test_resolve_link_symlink_without_target(
                         assert f.read() == sample_file.contents
                     with archive.open(member) as f:
                         assert f.read() == sample_file.contents
+
+
+@pytest.mark.parametrize(
+    "sample_archive",
+    filter_archives(
+        SAMPLE_ARCHIVES,
+        prefixes=["large_files_solid", "large_single_file"],
+        extensions=[".gz", ".bz2", ".xz"],
+    ),
+    ids=lambda a: a.filename,
+)
+def test_streaming_only_with_read_ahead(
+    sample_archive: SampleArchive, sample_archive_path: str
+):
+    config = ArchiveyConfig(streaming_read_ahead_bytes=1000)
+    skip_if_package_missing(sample_archive.creation_info.format, config)
+
+    expected = {
+        f.name: f.contents
+        for f in sample_archive.contents.files
+        if f.type == MemberType.FILE
+    }
+    with open_archive(
+        sample_archive_path, streaming_only=True, config=config
+    ) as archive:
+        contents = {
+            m.filename: stream.read()
+            for m, stream in archive.iter_members_with_streams()
+            if stream is not None
+        }
+    assert contents == expected
+
+
+@pytest.mark.parametrize("threads", [0, 2])
+def test_streaming_only_with_read_ahead_truncated(tmp_path: Path, threads: int):
+    data = b"".join(f"line {i}\n".encode() for i in range(100_000))
+    path = tmp_path / "truncated.txt.gz"
+    path.write_bytes(gzip.compress(data)[:-1000])
+
+    config = ArchiveyConfig(
+        streaming_read_ahead_bytes=1000, decompression_threads=threads
+    )
+    with open_archive(path, streaming_only=True, config=config) as archive:
+        for _, stream in archive.iter_members_with_streams():
+            assert stream is not None
+            with pytest.raises(ArchiveEOFError):
+                stream.read()